@@ -0,0 +1 @@
+"""Load and latency benchmarks run against the local KIS simulator."""
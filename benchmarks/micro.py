@@ -0,0 +1,412 @@
+"""Micro-benchmarks for hot pure-Python paths, checked against stored baselines.
+
+Each case builds its fixture in a scratch directory and returns the operation
+to time.  Timings are the per-call median and minimum over ``--repeat`` runs,
+in microseconds::
+
+    python -m benchmarks.micro                       # run and compare with baselines
+    python -m benchmarks.micro --filter ledger       # only matching cases
+    python -m benchmarks.micro --check               # exit 1 on a regression
+    python -m benchmarks.micro --update-baselines    # record this machine's numbers
+
+A case regresses when its median exceeds the baseline median by more than
+``--tolerance`` (a ratio, 1.5 by default).  Baselines are machine-specific;
+refresh them on the machine you compare against before judging a change.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+BASELINE_PATH = Path(__file__).with_name("baselines.json")
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 1.5
+MIN_LOOP_SECONDS = 0.2
+
+Operation = Callable[[], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class MicroBenchmark:
+    name: str
+    setup: Callable[[Path], Operation]
+    # Stateful or slow operations run a fixed number of calls per repeat.
+    number: int | None = None
+
+
+CASES: dict[str, MicroBenchmark] = {}
+
+
+def case(name: str, *, number: int | None = None):
+    def register(setup: Callable[[Path], Operation]) -> Callable[[Path], Operation]:
+        if name in CASES:
+            raise ValueError(f"duplicate micro-benchmark {name!r}")
+        CASES[name] = MicroBenchmark(name, setup, number)
+        return setup
+
+    return register
+
+
+@dataclass(frozen=True, slots=True)
+class Measurement:
+    name: str
+    number: int
+    median_us: float
+    min_us: float
+
+    def as_baseline(self) -> dict[str, float]:
+        return {"median_us": round(self.median_us, 3), "min_us": round(self.min_us, 3)}
+
+
+def _loop_seconds(operation: Operation, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        operation()
+    return time.perf_counter() - started
+
+
+def _calibrate(operation: Operation) -> int:
+    """Pick a call count whose loop takes at least ``MIN_LOOP_SECONDS`` (like ``timeit.autorange``)."""
+
+    number = 1
+    while True:
+        if _loop_seconds(operation, number) >= MIN_LOOP_SECONDS or number >= 1_000_000:
+            return number
+        number *= 10
+
+
+def measure(benchmark: MicroBenchmark, workdir: Path, *, repeat: int = DEFAULT_REPEAT) -> Measurement:
+    operation = benchmark.setup(workdir)
+    number = benchmark.number or _calibrate(operation)
+    per_call = [_loop_seconds(operation, number) / number for _ in range(max(1, repeat))]
+    return Measurement(
+        benchmark.name,
+        number,
+        statistics.median(per_call) * 1e6,
+        min(per_call) * 1e6,
+    )
+
+
+def load_baselines(path: Path = BASELINE_PATH) -> dict[str, dict[str, float]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+    return data.get("cases", {})
+
+
+def save_baselines(measurements: Sequence[Measurement], path: Path = BASELINE_PATH) -> None:
+    try:
+        existing = json.loads(path.read_text(encoding="utf-8")).get("cases", {})
+    except FileNotFoundError:
+        existing = {}
+    existing.update({item.name: item.as_baseline() for item in measurements})
+    payload = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": dict(sorted(existing.items())),
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def regressions(
+    measurements: Sequence[Measurement],
+    baselines: dict[str, dict[str, float]],
+    *,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[str]:
+    failures = []
+    for item in measurements:
+        baseline = baselines.get(item.name)
+        if baseline and item.median_us > baseline["median_us"] * tolerance:
+            failures.append(
+                f"{item.name}: {item.median_us:.2f} us vs baseline {baseline['median_us']:.2f} us "
+                f"(x{item.median_us / baseline['median_us']:.2f})"
+            )
+    return failures
+
+
+# -- fixtures -----------------------------------------------------------------
+
+def _buy_payload(index: int = 0, *, market: str = "KR") -> dict[str, Any]:
+    return {
+        "signal_id": f"micro-{index:06d}",
+        "type": "BUY",
+        "ticker": "005930" if market == "KR" else "AAPL",
+        "company_name": "Samsung Electronics" if market == "KR" else "Apple",
+        "market": market,
+        "price": 82000 if market == "KR" else 210.5,
+        "target_price": 90000 if market == "KR" else 240.0,
+        "stop_loss": 75000 if market == "KR" else 190.0,
+        "buy_score": 8,
+        "rationale": "AI chip demand recovery and improving memory pricing",
+    }
+
+
+def _counter() -> Callable[[], int]:
+    state = {"value": 0}
+
+    def next_value() -> int:
+        state["value"] += 1
+        return state["value"]
+
+    return next_value
+
+
+# A fixed Friday evening in KST / Friday morning in New York, so next-open
+# lookups have to skip the weekend.
+_MARKET_HOURS_NOW = datetime(2026, 5, 8, 11, 30, tzinfo=timezone.utc)
+
+
+# -- cases --------------------------------------------------------------------
+
+@case("schema.parse_signal_bytes")
+def _parse_signal_bytes(workdir: Path) -> Operation:
+    from trading.schema import parse_signal_bytes
+
+    data = json.dumps(_buy_payload(), ensure_ascii=False).encode("utf-8")
+    return lambda: parse_signal_bytes(data)
+
+
+@case("execution_ledger.execution_identity[signal_id]")
+def _execution_identity_by_id(workdir: Path) -> Operation:
+    from trading.execution_ledger import execution_identity
+
+    payload = _buy_payload()
+    return lambda: execution_identity(payload, "prod:12345678:01")
+
+
+@case("execution_ledger.execution_identity[payload]")
+def _execution_identity_by_payload(workdir: Path) -> Operation:
+    from trading.execution_ledger import execution_identity
+
+    payload = _buy_payload()
+    payload.pop("signal_id")
+    return lambda: execution_identity(payload, "prod:12345678:01")
+
+
+@case("execution_ledger.claim_finalize[10k]", number=20)
+def _ledger_claim_finalize(workdir: Path) -> Operation:
+    from trading.execution_ledger import MAX_LEDGER_ENTRIES, ExecutionLedger
+
+    ledger = ExecutionLedger(workdir / "ledger" / "execution_ledger.json")
+    now = datetime.now(timezone.utc)
+    entries = {
+        f"{index:064x}": {
+            "status": "executed",
+            "claimed_at": (now - timedelta(seconds=index)).isoformat(),
+            "finished_at": (now - timedelta(seconds=index)).isoformat(),
+        }
+        for index in range(MAX_LEDGER_ENTRIES)
+    }
+    ledger.path.write_text(json.dumps(entries, sort_keys=True), encoding="utf-8")
+    next_id = _counter()
+
+    def claim_and_finalize() -> None:
+        identity = f"micro-{next_id():058d}"
+        ledger.claim(identity)
+        ledger.finalize(identity, "executed")
+
+    return claim_and_finalize
+
+
+def _fill_queue(path: Path, *, target_bytes: int, execute_at: str) -> int:
+    """Write a pending queue of roughly ``target_bytes`` in the queue's on-disk format."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    created_at = datetime.now(timezone.utc).isoformat()
+    record_template = {
+        "signal": {**_buy_payload(), "rationale": "x" * 1500},
+        "execute_at": execute_at,
+        "created_at": created_at,
+        "execution_context": {"queue_id": ""},
+    }
+    record_bytes = len(json.dumps(record_template, ensure_ascii=False, indent=2)) + 4
+    count = max(1, target_bytes // record_bytes)
+    records = []
+    for index in range(count):
+        record = json.loads(json.dumps(record_template))
+        record["signal"]["signal_id"] = f"queued-{index:06d}"
+        record["execution_context"]["queue_id"] = f"{index:064x}"
+        records.append(record)
+    path.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
+    return count
+
+
+# Leave headroom below the 16 MB cap for the items the benchmark adds and the
+# failure-metadata reserve enqueue checks for every pending item.
+_QUEUE_FILL_BYTES = 12 * 1024 * 1024
+
+
+def _near_cap_queue(workdir: Path, backend: str, *, execute_at: str):
+    from trading.off_hours_queue import open_off_hours_queue
+
+    queue = open_off_hours_queue(workdir / "queue" / "off_hours_queue.json", backend=backend)
+    _fill_queue(queue.storage_path, target_bytes=_QUEUE_FILL_BYTES, execute_at=execute_at)
+    # The journal backend imports the JSON document on first use; keep that out of the timing.
+    queue.pending_count()
+    return queue
+
+
+for _backend, _suffix in (("json", ""), ("journal", "journal,")):
+
+    @case(f"off_hours_queue.enqueue[{_suffix}near-cap]", number=1)
+    def _queue_enqueue(workdir: Path, backend: str = _backend) -> Operation:
+        from trading.schema import parse_signal_payload
+
+        future = (datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+        queue = _near_cap_queue(workdir, backend, execute_at=future)
+        next_id = _counter()
+        return lambda: queue.enqueue(parse_signal_payload(_buy_payload(1_000_000 + next_id())))
+
+    @case(f"off_hours_queue.drain_due[{_suffix}near-cap]", number=1)
+    def _queue_drain_due(workdir: Path, backend: str = _backend) -> Operation:
+        from trading.off_hours_queue import QueueExecutionResult
+
+        past = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+        queue = _near_cap_queue(workdir, backend, execute_at=past)
+
+        def drain_one() -> int:
+            # Execute the first due item and defer the rest: one full scan plus one write.
+            calls = {"count": 0}
+
+            def executor(payload: dict) -> QueueExecutionResult:
+                calls["count"] += 1
+                if calls["count"] == 1:
+                    return QueueExecutionResult("processed")
+                return QueueExecutionResult("deferred")
+
+            return queue.drain_due(executor)
+
+        return drain_one
+
+    @case(f"off_hours_queue.drain_due_batch[{_suffix}near-cap]", number=1)
+    def _queue_drain_due_batch(workdir: Path, backend: str = _backend) -> Operation:
+        from trading.off_hours_queue import OutcomeRecorder, QueueExecutionResult
+
+        past = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+        queue = _near_cap_queue(workdir, backend, execute_at=past)
+
+        def drain_batch() -> int:
+            # Execute the first 32 due items and defer the rest: one scan plus one commit.
+            batches = {"count": 0}
+
+            def executor(payloads: list[dict], record: OutcomeRecorder) -> list[QueueExecutionResult]:
+                batches["count"] += 1
+                disposition = "processed" if batches["count"] == 1 else "deferred"
+                return [QueueExecutionResult(disposition)] * len(payloads)
+
+            return queue.drain_due_batch(executor, batch_size=32)
+
+        return drain_batch
+
+
+for _market in ("KR", "US"):
+
+    @case(f"market_hours.is_market_open[{_market}]")
+    def _is_market_open(workdir: Path, market: str = _market) -> Operation:
+        from trading.market_hours import is_market_open
+
+        return lambda: is_market_open(market, now=_MARKET_HOURS_NOW)
+
+    @case(f"market_hours.next_market_open[{_market}]")
+    def _next_market_open(workdir: Path, market: str = _market) -> Operation:
+        from trading.market_hours import next_market_open
+
+        return lambda: next_market_open(market, now=_MARKET_HOURS_NOW)
+
+
+_TELEGRAM_POST = """
+<div class="tgme_widget_message_wrap js-widget_message_wrap">
+  <div class="tgme_widget_message js-widget_message" data-post="prism_insight_global_en/{index}">
+    <div class="tgme_widget_message_text js-message_text" dir="auto">📈 New Buy: Samsung Electronics(005930)<br>Buy Price: 82,000 KRW<br>Target Price: 90,000 KRW<br>Stop Loss: 75,000 KRW<br>Buy Score: 8<br>Rationale: AI chip demand recovery &amp; <b>memory</b> pricing</div>
+    <a class="tgme_widget_message_date" href="/prism_insight_global_en/{index}"><time datetime="2026-05-09T08:00:00+00:00"></time></a>
+  </div>
+</div>
+"""
+
+
+@case("telegram_fetch.extract_channel_posts[200 posts]")
+def _extract_channel_posts(workdir: Path) -> Operation:
+    from trading.telegram_fetch import extract_channel_posts
+
+    page = "<html><body>" + "".join(_TELEGRAM_POST.format(index=index) for index in range(200)) + "</body></html>"
+    return lambda: extract_channel_posts(page, channel="prism_insight_global_en")
+
+
+@case("masking.mask_text[log tail]")
+def _mask_text(workdir: Path) -> Operation:
+    from webui.services.masking import mask_text
+
+    lines = []
+    for index in range(1000):
+        lines.append(
+            f"2026-05-09 09:00:{index % 60:02d} INFO trading.domestic: [Account: 1234{index % 10000:04d}-01] "
+            f"order {index:010d} executed 3 shares x 82,000 KRW"
+        )
+        if index % 10 == 0:
+            lines.append(f"2026-05-09 09:00:00 DEBUG root: authorization: Bearer eyJ0eXAiOiJKV1Qi{index:08d}abcdef")
+        if index % 25 == 0:
+            lines.append(f'2026-05-09 09:00:00 DEBUG root: {{"app_key": "PSAPPKEY{index:08d}", "token": "tok{index}"}}')
+    tail = "\n".join(lines)
+    return lambda: mask_text(tail, extra_values={"KIS_APP_SECRET": "super-secret-value"})
+
+
+# -- CLI ----------------------------------------------------------------------
+
+def select_cases(pattern: str | None) -> list[MicroBenchmark]:
+    return [item for name, item in CASES.items() if not pattern or pattern in name]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run pure-Python micro-benchmarks against stored baselines")
+    parser.add_argument("--filter", default=None, help="only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed median ratio over the baseline before a case counts as a regression")
+    parser.add_argument("--baselines", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true", help="exit 1 when a case regresses")
+    parser.add_argument("--update-baselines", action="store_true")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    selected = select_cases(args.filter)
+    if not selected:
+        print(f"No micro-benchmarks match {args.filter!r}", file=sys.stderr)
+        return 2
+    baselines = load_baselines(args.baselines)
+
+    measurements = []
+    for benchmark in selected:
+        with tempfile.TemporaryDirectory(prefix="prism-micro-") as workdir:
+            item = measure(benchmark, Path(workdir), repeat=args.repeat)
+        measurements.append(item)
+        baseline = baselines.get(item.name)
+        ratio = f"x{item.median_us / baseline['median_us']:.2f}" if baseline else "new"
+        print(f"{item.name:<52} median {item.median_us:>12.2f} us  min {item.min_us:>12.2f} us  {ratio}")
+
+    if args.update_baselines:
+        save_baselines(measurements, args.baselines)
+        print(f"Baselines written to {args.baselines}")
+        return 0
+    failures = regressions(measurements, baselines, tolerance=args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures and args.check else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
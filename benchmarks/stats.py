@@ -0,0 +1,70 @@
+"""Latency samples, percentiles and fixed-bucket histograms for benchmark reports."""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from typing import Any, Iterable
+
+# Upper bounds in milliseconds; the last bucket is open-ended.
+HISTOGRAM_BOUNDS_MS = (
+    0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000,
+)
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+
+    if not sorted_values:
+        return math.nan
+    position = (len(sorted_values) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def histogram(values_ms: Iterable[float], bounds: tuple[float, ...] = HISTOGRAM_BOUNDS_MS) -> list[list[Any]]:
+    """Count samples per bucket as ``[upper_bound_ms, count]`` pairs (``"inf"`` last)."""
+
+    counts = [0] * (len(bounds) + 1)
+    for value in values_ms:
+        counts[bisect.bisect_left(bounds, value)] += 1
+    return [[bound, count] for bound, count in zip((*bounds, "inf"), counts)]
+
+
+def summarize(values_seconds: Iterable[float]) -> dict[str, Any]:
+    values_ms = sorted(value * 1000.0 for value in values_seconds)
+    if not values_ms:
+        return {"count": 0}
+    return {
+        "count": len(values_ms),
+        "mean_ms": round(sum(values_ms) / len(values_ms), 3),
+        "p50_ms": round(percentile(values_ms, 0.50), 3),
+        "p90_ms": round(percentile(values_ms, 0.90), 3),
+        "p99_ms": round(percentile(values_ms, 0.99), 3),
+        "max_ms": round(values_ms[-1], 3),
+        "histogram": histogram(values_ms),
+    }
+
+
+class StageRecorder:
+    """Thread-safe collection of per-stage latency samples in seconds."""
+
+    def __init__(self) -> None:
+        self._samples: dict[str, list[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(stage, []).append(max(0.0, seconds))
+
+    def stages(self) -> dict[str, list[float]]:
+        with self._lock:
+            return {stage: list(values) for stage, values in self._samples.items()}
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        return {stage: summarize(values) for stage, values in self.stages().items()}
@@ -0,0 +1,523 @@
+"""End-to-end throughput benchmark: synthetic Pub/Sub → dispatcher → simulated KIS.
+
+Feeds ``subscriber.build_callback`` with synthetic messages at a configured
+rate and arrival shape, runs the real ``TradeDispatcher`` with strategies and
+multi-account fan-out enabled, and sends every broker call to a local
+``KISSimulator``.  Per-stage latencies are written as JSON so runs can be
+compared::
+
+    python -m benchmarks.throughput --accounts 3 --tickers 20 --rate 50 --messages 500
+    python -m benchmarks.throughput --shape burst --burst-size 25 --compare runtime/benchmarks/old.json
+
+Stages per message:
+
+``queue``
+    scheduled publish time until a callback thread picks the message up.
+``parse``
+    ``parse_signal_bytes``.
+``ledger_claim``
+    execution-ledger claims, summed across accounts.
+``strategy``
+    per-account dispatch time excluding broker calls, summed across accounts.
+``broker``
+    ``_url_fetch``/``_url_fetch_async`` time including client-side rate
+    limiting and retries, summed across accounts.
+``ack``
+    dispatcher return until the message is acknowledged.
+``end_to_end``
+    scheduled publish time until the acknowledgement.
+
+The run uses a throwaway KIS config, token directory, ledger and queue, and
+treats markets as open unless ``--respect-market-hours`` is given.  Because
+``trading.kis_auth`` reads its config at import, run it in a fresh
+interpreter.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Sequence
+
+from trading.kis_simulator import KISSimulator, LatencyModel, SimulatorConfig
+
+from .stats import StageRecorder
+
+logger = logging.getLogger(__name__)
+
+ARRIVAL_SHAPES = ("steady", "poisson", "burst")
+STAGES = ("queue", "parse", "ledger_claim", "strategy", "broker", "ack", "end_to_end")
+DEFAULT_OUTPUT_DIR = Path("runtime") / "benchmarks"
+KR_BASE_PRICE = 50_000.0
+US_BASE_PRICE = 100.0
+
+
+@dataclass(slots=True)
+class BenchmarkConfig:
+    accounts: int = 1
+    tickers: int = 10
+    market: str = "KR"
+    messages: int = 200
+    rate: float = 20.0
+    shape: str = "steady"
+    burst_size: int = 10
+    sell_ratio: float = 0.0
+    callback_threads: int = 10
+    strategy: str = "balanced_risk"
+    max_concurrency: int | None = None
+    warmup_messages: int = 0
+    latency: str = "fixed:0"
+    rate_limit_error_rate: float = 0.0
+    token_expiry_rate: float = 0.0
+    respect_market_hours: bool = False
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.accounts < 1 or self.tickers < 1 or self.messages < 1:
+            raise ValueError("accounts, tickers and messages must be at least 1")
+        if not math.isfinite(self.rate) or self.rate <= 0:
+            raise ValueError("rate must be a finite positive number")
+        if self.shape not in ARRIVAL_SHAPES:
+            raise ValueError(f"shape must be one of {', '.join(ARRIVAL_SHAPES)}")
+        if self.market not in {"KR", "US"}:
+            raise ValueError("market must be KR or US")
+        if not 0.0 <= self.sell_ratio <= 1.0:
+            raise ValueError("sell_ratio must be between 0 and 1")
+        LatencyModel.parse(self.latency)
+
+
+def arrival_offsets(config: BenchmarkConfig, rng: random.Random) -> list[float]:
+    """Return each message's publish time in seconds from the start of the run."""
+
+    total = config.warmup_messages + config.messages
+    if config.shape == "steady":
+        return [index / config.rate for index in range(total)]
+    if config.shape == "poisson":
+        offsets, now = [], 0.0
+        for _ in range(total):
+            offsets.append(now)
+            now += rng.expovariate(config.rate)
+        return offsets
+    # burst: ``burst_size`` messages at once, bursts spaced to keep the average rate.
+    size = max(1, config.burst_size)
+    return [(index // size) * size / config.rate for index in range(total)]
+
+
+def ticker_symbols(config: BenchmarkConfig) -> list[str]:
+    if config.market == "US":
+        return [f"BM{index:03d}" for index in range(config.tickers)]
+    return [f"{900000 + index:06d}" for index in range(config.tickers)]
+
+
+def synthetic_payload(index: int, ticker: str, config: BenchmarkConfig, rng: random.Random) -> dict[str, Any]:
+    price = US_BASE_PRICE if config.market == "US" else KR_BASE_PRICE
+    payload: dict[str, Any] = {
+        "signal_id": f"bench-{index:06d}",
+        "type": "SELL" if rng.random() < config.sell_ratio else "BUY",
+        "ticker": ticker,
+        "company_name": f"Bench {ticker}",
+        "market": config.market,
+        "price": price,
+        "target_price": round(price * 1.15, 2),
+        "stop_loss": round(price * 0.95, 2),
+        "buy_score": 8,
+        "rationale": "synthetic benchmark signal",
+    }
+    if payload["type"] == "SELL":
+        payload.update(buy_price=round(price * 0.9, 2), profit_rate=10.0, sell_reason="benchmark")
+    return payload
+
+
+class SyntheticMessage:
+    """Minimal stand-in for a Pub/Sub ``Message`` handed to the callback."""
+
+    def __init__(self, data: bytes, message_id: str) -> None:
+        self.data = data
+        self.message_id = message_id
+        self.publish_time = None
+        self.ordering_key = ""
+        self.delivery_attempt = None
+        self.acked = False
+        self.nacked = False
+
+    def ack(self) -> None:
+        self.acked = True
+
+    def nack(self) -> None:
+        self.nacked = True
+
+
+@dataclass(slots=True, eq=False)
+class _Sample:
+    scheduled: float
+    started: float = math.nan
+    dispatch_end: float = math.nan
+    totals: dict[str, float] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self.lock:
+            self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+
+
+_CURRENT_SAMPLE: contextvars.ContextVar[_Sample | None] = contextvars.ContextVar(
+    "benchmark_sample", default=None
+)
+
+
+def _timed(stage: str, function):
+    """Wrap ``function`` so its duration is added to the current message's ``stage``."""
+
+    if inspect.iscoroutinefunction(function):
+        @functools.wraps(function)
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                sample = _CURRENT_SAMPLE.get()
+                if sample is not None:
+                    sample.add(stage, time.perf_counter() - started)
+
+        return async_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            sample = _CURRENT_SAMPLE.get()
+            if sample is not None:
+                sample.add(stage, time.perf_counter() - started)
+
+    return wrapper
+
+
+@contextmanager
+def _patched(target: Any, name: str, value: Any) -> Iterator[None]:
+    # getattr_static keeps staticmethod wrappers intact when restoring.
+    original = inspect.getattr_static(target, name)
+    setattr(target, name, value)
+    try:
+        yield
+    finally:
+        setattr(target, name, original)
+
+
+def _write_kis_config(path: Path, config: BenchmarkConfig, simulator: KISSimulator) -> None:
+    from trading import yaml_compat as yaml
+
+    accounts = [
+        {
+            "name": f"bench-{index + 1}",
+            "enabled": True,
+            "mode": "real",
+            "market": "all",
+            "account": f"{90000000 + index + 1}",
+            "product": "01",
+            "primary": index == 0,
+            # One app key per account, as KIS rate limits are per app key.
+            "app_key": f"PSBENCHKEY{index + 1:04d}",
+            "app_secret": f"bench-secret-{index + 1}",
+        }
+        for index in range(config.accounts)
+    ]
+    payload = {
+        "default_mode": "real",
+        "auto_trading": True,
+        "multi_account_trading": {
+            "enabled": True,
+            "max_concurrency": config.max_concurrency or config.accounts,
+        },
+        "default_unit_amount": 1_000_000,
+        "default_unit_amount_usd": 1_000,
+        # Asset-percent sizing keeps the balance inquiry in every buy; a tiny
+        # percentage keeps the simulated cash from running out.
+        "default_unit_asset_percent": 0.01,
+        "default_unit_asset_percent_usd": 0.01,
+        "auto_exchange_usd_on_buy": False,
+        "default_product_code": "01",
+        "my_htsid": "bench",
+        "my_app": "PSBENCHKEY0000",
+        "my_sec": "bench-secret",
+        "paper_app": "PSVTBENCHKEY00",
+        "paper_sec": "bench-secret",
+        "accounts": accounts,
+        "signal_strategy": {"name": config.strategy},
+        "my_agent": "prism-insight-light-benchmark",
+        "my_token": "",
+        "prod": simulator.rest_url,
+        "vps": simulator.rest_url,
+        "ops": simulator.ws_url,
+        "vops": simulator.ws_url,
+    }
+    path.write_text(yaml.safe_dump(payload, allow_unicode=True, sort_keys=False), encoding="utf-8")
+
+
+def run_benchmark(config: BenchmarkConfig, *, workdir: Path) -> dict[str, Any]:
+    """Run one benchmark and return the JSON-serializable report."""
+
+    if "trading.kis_auth" in sys.modules:
+        raise RuntimeError("run the throughput benchmark in a fresh interpreter; trading.kis_auth is already loaded")
+
+    rng = random.Random(config.seed)
+    tickers = ticker_symbols(config)
+    base_price = US_BASE_PRICE if config.market == "US" else KR_BASE_PRICE
+    simulator_config = SimulatorConfig(
+        latency=LatencyModel.parse(config.latency),
+        rate_limit_error_rate=config.rate_limit_error_rate,
+        token_expiry_rate=config.token_expiry_rate,
+        krw_cash=1e13,
+        usd_cash=1e10,
+        prices={ticker: base_price for ticker in tickers},
+        seed=config.seed,
+    )
+
+    with ExitStack() as stack:
+        simulator = stack.enter_context(KISSimulator(simulator_config))
+        config_path = workdir / "kis_devlp.yaml"
+        _write_kis_config(config_path, config, simulator)
+        token_dir = workdir / "tokens"
+        token_dir.mkdir(parents=True, exist_ok=True)
+        os.environ["PRISM_KIS_CONFIG_PATH"] = str(config_path)
+        os.environ["KIS_RATE_LIMIT_SHARED_DIR"] = str(workdir / "kis_rate_limit")
+
+        import subscriber
+        from trading import dispatch as dispatch_module
+        from trading import domestic as domestic_module
+        from trading import kis_auth as ka
+        from trading.dispatch_loop import DispatchLoop
+        from trading.execution_ledger import ExecutionLedger
+        from trading.us import USStockTrading
+
+        # Keep benchmark tokens out of the real config directory.
+        ka.config_root = str(token_dir)
+        ka.token_tmp = str(token_dir / "KISbench")
+
+        stack.enter_context(_patched(subscriber, "parse_signal_bytes", _timed("parse", subscriber.parse_signal_bytes)))
+        stack.enter_context(_patched(ExecutionLedger, "claim", _timed("ledger_claim", ExecutionLedger.claim)))
+        stack.enter_context(
+            _patched(
+                dispatch_module.TradeDispatcher,
+                "_dispatch_serialized",
+                _timed("dispatch", dispatch_module.TradeDispatcher._dispatch_serialized),
+            )
+        )
+        stack.enter_context(_patched(ka, "_url_fetch", _timed("broker", ka._url_fetch)))
+        stack.enter_context(_patched(ka, "_url_fetch_async", _timed("broker", ka._url_fetch_async)))
+        if not config.respect_market_hours:
+            stack.enter_context(_patched(dispatch_module, "is_market_open", lambda market: True))
+            stack.enter_context(_patched(domestic_module, "_is_regular_session", lambda now: True))
+            stack.enter_context(_patched(USStockTrading, "is_market_open", lambda self: True))
+
+        original_dispatch = dispatch_module.TradeDispatcher.dispatch
+
+        async def dispatch_and_stamp(self, signal, *, allow_queue=True):
+            try:
+                return await original_dispatch(self, signal, allow_queue=allow_queue)
+            finally:
+                sample = _CURRENT_SAMPLE.get()
+                if sample is not None:
+                    sample.dispatch_end = time.perf_counter()
+
+        stack.enter_context(_patched(dispatch_module.TradeDispatcher, "dispatch", dispatch_and_stamp))
+
+        dispatcher = dispatch_module.TradeDispatcher(
+            trading_mode="real",
+            queue_path=workdir / "off_hours_queue.json",
+            execution_ledger_path=workdir / "execution_ledger.json",
+        )
+        dispatch_loop = DispatchLoop(name="benchmark-dispatch-loop")
+        dispatch_loop.start()
+        stack.callback(dispatch_loop.stop)
+        callback = subscriber.build_callback(dispatcher, dispatch_loop=dispatch_loop)
+
+        recorder = StageRecorder()
+        statuses: dict[str, int] = {}
+        statuses_lock = threading.Lock()
+        offsets = arrival_offsets(config, rng)
+        payloads = [
+            synthetic_payload(index, tickers[index % len(tickers)], config, rng)
+            for index in range(len(offsets))
+        ]
+
+        original_aggregate = dispatch_module.MultiAccountTradeDispatcher._aggregate
+
+        def count_status(signal, results):
+            result = original_aggregate(signal, results)
+            with statuses_lock:
+                for account_result in results:
+                    statuses[account_result.status] = statuses.get(account_result.status, 0) + 1
+            return result
+
+        stack.enter_context(
+            _patched(dispatch_module.MultiAccountTradeDispatcher, "_aggregate", staticmethod(count_status))
+        )
+
+        def handle(index: int, scheduled: float) -> None:
+            sample = _Sample(scheduled=scheduled, started=time.perf_counter())
+            _CURRENT_SAMPLE.set(sample)
+            message = SyntheticMessage(json.dumps(payloads[index]).encode(), f"bench-{index}")
+            callback(message)
+            acked = time.perf_counter()
+            if index < config.warmup_messages:
+                return
+            totals = sample.totals
+            recorder.record("queue", sample.started - scheduled)
+            recorder.record("parse", totals.get("parse", 0.0))
+            if "ledger_claim" in totals:
+                recorder.record("ledger_claim", totals["ledger_claim"])
+            broker = totals.get("broker", 0.0)
+            recorder.record("broker", broker)
+            recorder.record("strategy", totals.get("dispatch", 0.0) - broker)
+            if not math.isnan(sample.dispatch_end):
+                recorder.record("ack", acked - sample.dispatch_end)
+            recorder.record("end_to_end", acked - scheduled)
+
+        executor = ThreadPoolExecutor(max_workers=config.callback_threads, thread_name_prefix="bench-callback")
+        started_wall = datetime.now().astimezone()
+        start = time.perf_counter()
+        futures = []
+        for index, offset in enumerate(offsets):
+            delay = start + offset - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            # contextvars.Context.run keeps each message's sample isolated per task.
+            futures.append(
+                executor.submit(contextvars.copy_context().run, handle, index, start + offset)
+            )
+        for future in futures:
+            future.result()
+        executor.shutdown()
+        elapsed = time.perf_counter() - start
+
+        measured = config.messages
+        measured_elapsed = elapsed - (offsets[config.warmup_messages] if config.warmup_messages else 0.0)
+        return {
+            "benchmark": "throughput",
+            "started_at": started_wall.isoformat(timespec="seconds"),
+            "config": asdict(config),
+            "duration_seconds": round(elapsed, 3),
+            "messages": measured,
+            "throughput_per_second": round(measured / measured_elapsed, 3) if measured_elapsed > 0 else None,
+            "account_results": dict(sorted(statuses.items())),
+            "stages": {stage: summary for stage in STAGES if (summary := recorder.summary().get(stage))},
+            "simulator": simulator.stats(),
+        }
+
+
+def compare_reports(current: dict[str, Any], previous: dict[str, Any]) -> list[str]:
+    """Describe p50/p99 and throughput changes against a previous report."""
+
+    lines = []
+    before, after = previous.get("throughput_per_second"), current.get("throughput_per_second")
+    if before and after:
+        lines.append(f"throughput: {before:.2f} -> {after:.2f} msg/s ({(after - before) / before * 100:+.1f}%)")
+    for stage in STAGES:
+        old, new = previous.get("stages", {}).get(stage), current.get("stages", {}).get(stage)
+        if not old or not new or not old.get("count") or not new.get("count"):
+            continue
+        lines.append(
+            f"{stage}: p50 {old['p50_ms']:.2f} -> {new['p50_ms']:.2f} ms, "
+            f"p99 {old['p99_ms']:.2f} -> {new['p99_ms']:.2f} ms"
+        )
+    return lines
+
+
+def build_parser() -> argparse.ArgumentParser:
+    defaults = BenchmarkConfig()
+    parser = argparse.ArgumentParser(description="End-to-end signal throughput benchmark against the KIS simulator")
+    parser.add_argument("--accounts", type=int, default=defaults.accounts)
+    parser.add_argument("--tickers", type=int, default=defaults.tickers)
+    parser.add_argument("--market", choices=("KR", "US"), default=defaults.market)
+    parser.add_argument("--messages", type=int, default=defaults.messages)
+    parser.add_argument("--rate", type=float, default=defaults.rate, help="average messages per second")
+    parser.add_argument("--shape", choices=ARRIVAL_SHAPES, default=defaults.shape)
+    parser.add_argument("--burst-size", type=int, default=defaults.burst_size)
+    parser.add_argument("--sell-ratio", type=float, default=defaults.sell_ratio)
+    parser.add_argument("--callback-threads", type=int, default=defaults.callback_threads,
+                        help="Pub/Sub callback executor size")
+    parser.add_argument("--strategy", default=defaults.strategy, help="signal_strategy.name; blank for legacy orders")
+    parser.add_argument("--max-concurrency", type=int, default=None,
+                        help="multi_account_trading.max_concurrency (default: --accounts)")
+    parser.add_argument("--lanes", type=int, default=None, help="BROKER_MAX_CONCURRENT_LANES for this run")
+    parser.add_argument("--warmup-messages", type=int, default=defaults.warmup_messages)
+    parser.add_argument("--latency", default=defaults.latency, help="simulator latency, e.g. lognormal:40:15")
+    parser.add_argument("--rate-limit-error-rate", type=float, default=defaults.rate_limit_error_rate)
+    parser.add_argument("--token-expiry-rate", type=float, default=defaults.token_expiry_rate)
+    parser.add_argument("--respect-market-hours", action="store_true")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--output", type=Path, default=None,
+                        help=f"report path (default: {DEFAULT_OUTPUT_DIR}/throughput-<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="previous report to compare against")
+    parser.add_argument("--log-level", default="WARNING")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        config = BenchmarkConfig(
+            accounts=args.accounts,
+            tickers=args.tickers,
+            market=args.market,
+            messages=args.messages,
+            rate=args.rate,
+            shape=args.shape,
+            burst_size=args.burst_size,
+            sell_ratio=args.sell_ratio,
+            callback_threads=args.callback_threads,
+            strategy=args.strategy,
+            max_concurrency=args.max_concurrency,
+            warmup_messages=args.warmup_messages,
+            latency=args.latency,
+            rate_limit_error_rate=args.rate_limit_error_rate,
+            token_expiry_rate=args.token_expiry_rate,
+            respect_market_hours=args.respect_market_hours,
+            seed=args.seed,
+        )
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    if args.lanes is not None:
+        os.environ["BROKER_MAX_CONCURRENT_LANES"] = str(args.lanes)
+
+    with tempfile.TemporaryDirectory(prefix="prism-throughput-") as workdir:
+        report = run_benchmark(config, workdir=Path(workdir))
+
+    output = args.output or DEFAULT_OUTPUT_DIR / f"throughput-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    print(f"{report['messages']} messages in {report['duration_seconds']}s "
+          f"({report['throughput_per_second']} msg/s); account results {report['account_results']}")
+    for stage, summary in report["stages"].items():
+        print(f"  {stage:<12} p50 {summary['p50_ms']:>9.2f} ms  p99 {summary['p99_ms']:>9.2f} ms  "
+              f"max {summary['max_ms']:>9.2f} ms  (n={summary['count']})")
+    if args.compare is not None:
+        previous = json.loads(args.compare.read_text(encoding="utf-8"))
+        for line in compare_reports(report, previous):
+            print(f"  {line}")
+    print(f"Report written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,7 +4,6 @@
 from __future__ import annotations
 
 import argparse
-import asyncio
 import datetime
 import json
 import logging
@@ -22,9 +21,17 @@ from dotenv import load_dotenv
 ROOT = Path(__file__).parent
 load_dotenv(ROOT / ".env")
 
-from trading.dispatch import TradeDispatcher  # noqa: E402 - config env must load first
+from trading.dispatch import (  # noqa: E402 - config env must load first
+    TradeDispatcher,
+    broker_lane_snapshot,
+    broker_lane_wait_stats,
+)
+from trading.dispatch_loop import DispatchLoop, run_dispatch_coroutine  # noqa: E402
+from trading import kis_auth  # noqa: E402
+from trading import market_hours, memory, metrics, preopen, profiler, tracing  # noqa: E402
+from trading.trader_pool import TRADER_POOL  # noqa: E402
 from trading.market_hours import KST  # noqa: E402 - config env must load first
-from trading.off_hours_queue import QueueCapacityError  # noqa: E402
+from trading.off_hours_queue import QueueCapacityError, parse_execute_at  # noqa: E402
 from trading.schema import SignalValidationError, parse_signal_bytes  # noqa: E402
 
 LOGGER = logging.getLogger("subscriber")
@@ -247,11 +254,40 @@ def _configure_raw_pubsub_logging(log_file: str | None) -> logging.Logger | None
 
 
 class QueueWorker:
-    def __init__(self, dispatcher: TradeDispatcher, poll_seconds: int, work_tracker: ActiveWorkTracker):
+    """Drain the off-hours queue when its earliest pending item falls due.
+
+    The worker sleeps until the queue's next ``execute_at`` instant, waking
+    early when a new item is enqueued in this process.  ``poll_seconds`` caps
+    each sleep, so items queued by another process are still noticed, and is
+    the retry interval for due items that were deferred.  ``stage_lead``
+    before each due instant it stages the orders due then (see
+    ``trading.preopen``) so the drain at the open only submits orders.
+
+    In real mode it also wakes the moment each off-hours order window opens
+    (``market_hours.next_off_hours_window``) and submits that market's queued
+    orders as closing-price or reserved orders instead of holding them for
+    the regular open.
+    """
+
+    def __init__(
+        self,
+        dispatcher: TradeDispatcher,
+        poll_seconds: int,
+        work_tracker: ActiveWorkTracker,
+        *,
+        dispatch_loop: DispatchLoop | None = None,
+        stage_lead: datetime.timedelta | None = None,
+    ):
         self.dispatcher = dispatcher
         self.poll_seconds = poll_seconds
         self.work_tracker = work_tracker
+        self.dispatch_loop = dispatch_loop
+        self.stage_lead = stage_lead if stage_lead is not None else preopen.stage_lead_from_env()
+        self._staged_for: datetime.datetime | None = None
+        # Next (or, at start-up, current) window opening per market, real mode only.
+        self._windows: dict[str, tuple[str, datetime.datetime]] = {}
         self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
         self._activity_lock = threading.Lock()
         self._thread: threading.Thread | None = None
 
@@ -259,42 +295,161 @@ class QueueWorker:
         if self.dispatcher.dry_run:
             LOGGER.info("Queue worker disabled in dry-run mode")
             return
+        self.dispatcher.queue.add_enqueue_listener(self._on_enqueue)
+        if self.dispatcher.trading_mode == "real":
+            for market in market_hours.OFF_HOURS_WINDOW_OPENINGS:
+                self._windows[market] = market_hours.current_off_hours_window(
+                    market
+                ) or market_hours.next_off_hours_window(market)
         self._thread = threading.Thread(target=self._run, name="off-hours-queue", daemon=True)
         self._thread.start()
         LOGGER.info(
-            "Queue worker started (mode=%s, poll_seconds=%s)",
+            "Queue worker started (mode=%s, poll_seconds=%s, stage_lead=%s)",
             self.dispatcher.trading_mode,
             self.poll_seconds,
+            self.stage_lead or "disabled",
         )
 
     def request_stop(self) -> None:
         with self._activity_lock:
             self._stop_event.set()
+            self._wake_event.set()
 
     def stop(self) -> None:
         self.request_stop()
         if self._thread:
+            self.dispatcher.queue.remove_enqueue_listener(self._on_enqueue)
             self._thread.join(timeout=5)
             if self._thread.is_alive():
                 LOGGER.warning("Queue worker thread did not exit after active work drained")
             else:
                 LOGGER.info("Queue worker stopped")
 
+    def _on_enqueue(self, _item) -> None:  # noqa: ANN001 - QueuedSignal from either backend
+        self._wake_event.set()
+
+    def _next_due(self) -> datetime.datetime | None:
+        try:
+            return self.dispatcher.queue.next_due_at()
+        except Exception as exc:  # noqa: BLE001 - keep the queue worker alive
+            LOGGER.exception("Queue worker error: %s", exc)
+            return None
+
+    def _stage_at(self, due: datetime.datetime, now: datetime.datetime) -> datetime.datetime | None:
+        if self.stage_lead is None or self._staged_for == due or due <= now:
+            return None
+        return due - self.stage_lead
+
+    def _stage(self, due: datetime.datetime) -> None:
+        self._staged_for = due
+        try:
+            items = [
+                item
+                for item in self.dispatcher.queue.items()
+                if item.status == "pending" and parse_execute_at(item.execute_at) == due
+            ]
+            if self.dispatch_loop is None:
+                report = self.dispatcher.stage_queued_orders(items)
+            else:
+                report = self.dispatcher.stage_queued_orders(items, dispatch_loop=self.dispatch_loop)
+        except Exception as exc:  # noqa: BLE001 - staging only saves latency at the open
+            LOGGER.exception("Pre-open staging failed: %s", exc)
+            return
+        LOGGER.info(
+            "Staged %s queued order(s) due %s: %s account(s) authenticated, %s quote(s) warmed",
+            report.items,
+            due.isoformat(),
+            report.accounts,
+            report.quotes,
+        )
+        for error in report.errors:
+            LOGGER.warning("Pre-open staging: %s", error)
+
+    def _submit_window(self, market: str) -> None:
+        window, opened_at = self._windows[market]
+        self._windows[market] = market_hours.next_off_hours_window(market, now=opened_at)
+        try:
+            if self.dispatch_loop is None:
+                report = self.dispatcher.submit_window_orders(market, window, opened_at)
+            else:
+                report = self.dispatcher.submit_window_orders(
+                    market, window, opened_at, dispatch_loop=self.dispatch_loop
+                )
+        except Exception as exc:  # noqa: BLE001 - keep the queue worker alive
+            LOGGER.exception("Queue worker error: %s", exc)
+            return
+        if report.latencies:
+            LOGGER.info(
+                "Submitted %s queued %s order(s) in the %s window opened %s: first %.3fs, last %.3fs after opening",
+                report.submitted,
+                market,
+                window,
+                opened_at.isoformat(),
+                min(report.latencies),
+                max(report.latencies),
+            )
+        if report.deferred or report.failed:
+            LOGGER.warning(
+                "%s %s window: %s queued order(s) deferred, %s failed",
+                market,
+                window,
+                report.deferred,
+                report.failed,
+            )
+
+    def _begin_work(self) -> bool:
+        with self._activity_lock:
+            if self._stop_event.is_set():
+                return False
+            return self.work_tracker.begin()
+
     def _run(self) -> None:
-        while not self._stop_event.wait(self.poll_seconds):
-            with self._activity_lock:
-                if self._stop_event.is_set():
-                    return
-                if not self.work_tracker.begin():
+        last_drain: datetime.datetime | None = None
+        while not self._stop_event.is_set():
+            now = datetime.datetime.now(datetime.timezone.utc)
+            opened = [market for market, (_, opened_at) in self._windows.items() if opened_at <= now]
+            if opened:
+                if not self._begin_work():
                     return
+                try:
+                    for market in opened:
+                        self._submit_window(market)
+                finally:
+                    self.work_tracker.end()
+                continue
+            due = self._next_due()
+            wake_at = due
+            if due is not None and last_drain is not None and due <= last_drain:
+                # Already offered to the last drain and deferred: retry on the poll interval.
+                wake_at = last_drain + datetime.timedelta(seconds=self.poll_seconds)
+            elif due is not None:
+                stage_at = self._stage_at(due, now)
+                if stage_at is not None and stage_at <= now:
+                    self._stage(due)
+                    continue
+                wake_at = stage_at or due
+            window_at = min((opened_at for _, opened_at in self._windows.values()), default=None)
+            if window_at is not None and (wake_at is None or window_at < wake_at):
+                wake_at = window_at
+            delay = self.poll_seconds if wake_at is None else (wake_at - now).total_seconds()
+            if delay > 0:
+                self._wake_event.wait(min(delay, self.poll_seconds))
+                self._wake_event.clear()
+                continue
+            if not self._begin_work():
+                return
             try:
-                drained = self.dispatcher.drain_due_orders()
+                if self.dispatch_loop is None:
+                    drained = self.dispatcher.drain_due_orders()
+                else:
+                    drained = self.dispatcher.drain_due_orders(dispatch_loop=self.dispatch_loop)
                 if drained:
                     LOGGER.info("Executed %s queued orders", drained)
             except Exception as exc:  # noqa: BLE001 - keep the queue worker alive
                 LOGGER.exception("Queue worker error: %s", exc)
             finally:
                 self.work_tracker.end()
+            last_drain = now
 
 
 def _message_context(message) -> str:
@@ -329,61 +484,74 @@ def _handle_message(
     dispatcher: TradeDispatcher,
     logger: logging.Logger | None = None,
     raw_logger: logging.Logger | None = None,
+    dispatch_loop: DispatchLoop | None = None,
 ) -> None:
     active_logger = logger or LOGGER
     context = _message_context(message)
     _log_raw_pubsub_message(message, context, raw_logger)
     active_logger.info("Received Pub/Sub message (%s, bytes=%s)", context, len(message.data or b""))
-    acknowledge = True
-    try:
-        signal = parse_signal_bytes(message.data)
-        active_logger.info(
-            "Dispatching %s %s(%s) market=%s price=%s (%s)",
-            signal.signal_type,
-            signal.company_name,
-            signal.ticker,
-            signal.market,
-            signal.price,
-            context,
-        )
-        result = asyncio.run(dispatcher.dispatch(signal))
-        active_logger.info(
-            "Handled %s %s(%s) -> %s: %s (%s)",
-            signal.signal_type,
-            signal.company_name,
-            signal.ticker,
-            result.status,
-            result.message,
-            context,
-        )
-    except SignalValidationError as exc:
-        active_logger.warning("Acknowledging invalid signal (%s): %s", context, exc)
-    except QueueCapacityError as exc:
-        acknowledge = False
-        active_logger.error(
-            "Releasing message for redelivery because the durable queue is full "
-            "(%s): %s",
-            context,
-            exc,
-        )
-    except Exception as exc:  # noqa: BLE001 - safe ack avoids duplicate trading
-        active_logger.exception("Acknowledging processing failure (%s): %s", context, exc)
-    finally:
-        if acknowledge:
-            message.ack()
-            active_logger.info("Acknowledged Pub/Sub message (%s)", context)
-        else:
-            _release_message_for_redelivery(
-                message, reason="durable off-hours queue capacity is exhausted"
+    metrics.PUBSUB_MESSAGES.inc(outcome="received")
+    with tracing.start_trace(
+        "pubsub.message", trace_id=getattr(message, "message_id", None), bytes=len(message.data or b"")
+    ):
+        acknowledge = True
+        try:
+            with tracing.span("parse_signal_bytes"):
+                signal = parse_signal_bytes(message.data)
+            tracing.set_attributes(ticker=signal.ticker, type=signal.signal_type, market=signal.market)
+            active_logger.info(
+                "Dispatching %s %s(%s) market=%s price=%s (%s)",
+                signal.signal_type,
+                signal.company_name,
+                signal.ticker,
+                signal.market,
+                signal.price,
+                context,
+            )
+            result = run_dispatch_coroutine(dispatcher.dispatch(signal), dispatch_loop)
+            tracing.set_attributes(status=result.status)
+            active_logger.info(
+                "Handled %s %s(%s) -> %s: %s (%s)",
+                signal.signal_type,
+                signal.company_name,
+                signal.ticker,
+                result.status,
+                result.message,
+                context,
+            )
+        except SignalValidationError as exc:
+            active_logger.warning("Acknowledging invalid signal (%s): %s", context, exc)
+        except QueueCapacityError as exc:
+            acknowledge = False
+            active_logger.error(
+                "Releasing message for redelivery because the durable queue is full "
+                "(%s): %s",
+                context,
+                exc,
             )
+        except Exception as exc:  # noqa: BLE001 - safe ack avoids duplicate trading
+            active_logger.exception("Acknowledging processing failure (%s): %s", context, exc)
+        finally:
+            if acknowledge:
+                with tracing.span("ack"):
+                    message.ack()
+                metrics.PUBSUB_MESSAGES.inc(outcome="acked")
+                active_logger.info("Acknowledged Pub/Sub message (%s)", context)
+            else:
+                _release_message_for_redelivery(
+                    message, reason="durable off-hours queue capacity is exhausted"
+                )
 
 
 def build_callback(
     dispatcher: TradeDispatcher,
     logger: logging.Logger | None = None,
     raw_logger: logging.Logger | None = None,
+    dispatch_loop: DispatchLoop | None = None,
 ):
-    return lambda message: _handle_message(message, dispatcher, logger, raw_logger)
+    return lambda message: _handle_message(
+        message, dispatcher, logger, raw_logger, dispatch_loop=dispatch_loop
+    )
 
 
 def _release_message_for_redelivery(message, *, reason: str) -> None:
@@ -394,6 +562,7 @@ def _release_message_for_redelivery(message, *, reason: str) -> None:
         modify_ack_deadline = getattr(message, "modify_ack_deadline", None)
         if callable(modify_ack_deadline):
             modify_ack_deadline(0)
+    metrics.PUBSUB_MESSAGES.inc(outcome="nacked")
     LOGGER.info("Released Pub/Sub message for redelivery: %s", reason)
 
 
@@ -430,6 +599,12 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         default=os.environ.get("PUBSUB_MAX_IN_FLIGHT_MESSAGES", "1"),
         help="Maximum received but unprocessed Pub/Sub messages (default: 1)",
     )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=os.environ.get("METRICS_PORT", "0"),
+        help="Serve Prometheus metrics on this local port for headless runs (default: disabled)",
+    )
     parser.add_argument(
         "--web-ui",
         action="store_true",
@@ -502,6 +677,23 @@ def _start_web_ui_thread(
     return thread
 
 
+def _start_kis_connection_warmup(trading_mode: str) -> threading.Thread | None:
+    """Pre-open the KIS keep-alive connection without delaying Pub/Sub intake."""
+
+    if os.environ.get("KIS_HTTP_WARMUP", "true").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    svr = "vps" if trading_mode == "demo" else "prod"
+
+    def warm() -> None:
+        results = kis_auth.warm_kis_connections(svr)
+        for origin, connected in results.items():
+            LOGGER.info("KIS connection warm-up %s: %s", "ready" if connected else "failed", origin)
+
+    thread = threading.Thread(target=warm, name="kis-http-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
 def main(argv: list[str] | None = None) -> None:
     args = parse_args(argv)
     try:
@@ -526,7 +718,10 @@ def main(argv: list[str] | None = None) -> None:
         dry_run=args.dry_run,
         queue_path=Path(args.queue_path),
     )
-    queue_worker = QueueWorker(dispatcher, args.queue_poll_seconds, work_tracker)
+    dispatch_loop = DispatchLoop()
+    queue_worker = QueueWorker(
+        dispatcher, args.queue_poll_seconds, work_tracker, dispatch_loop=dispatch_loop
+    )
 
     credentials = None
     if args.credentials_path:
@@ -547,9 +742,12 @@ def main(argv: list[str] | None = None) -> None:
     )
 
     callback = work_tracker.wrap(
-        lambda message: _handle_message(message, dispatcher, raw_logger=raw_pubsub_logger),
+        lambda message: _handle_message(
+            message, dispatcher, raw_logger=raw_pubsub_logger, dispatch_loop=dispatch_loop
+        ),
         on_rejected=_nack_message_during_shutdown,
     )
+    dispatch_loop.start()
     try:
         streaming_pull_future = subscriber.subscribe(
             subscription_path,
@@ -560,6 +758,7 @@ def main(argv: list[str] | None = None) -> None:
             await_callbacks_on_shutdown=True,
         )
     except BaseException:
+        dispatch_loop.stop()
         subscriber.close()
         raise
     stop_event = threading.Event()
@@ -573,8 +772,21 @@ def main(argv: list[str] | None = None) -> None:
     previous_sigterm = signal.getsignal(signal.SIGTERM)
     signal.signal(signal.SIGINT, request_stop)
     signal.signal(signal.SIGTERM, request_stop)
+    previous_sigusr1 = profiler.install_signal_handler()
 
+    metrics_server = None
+    memory_watch = None
     try:
+        metrics_server = metrics.start_metrics_server(args.metrics_port)
+        memory_watch = memory.start_memory_watch()
+        if os.environ.get("PROFILE_ON_START_SECONDS", "").strip() not in ("", "0"):
+            profiler.PROFILER.start(
+                _positive_seconds_from_env("PROFILE_ON_START_SECONDS", profiler.DEFAULT_PROFILE_SECONDS),
+                reason="PROFILE_ON_START_SECONDS",
+            )
+        if not dispatcher.dry_run:
+            _start_kis_connection_warmup(dispatcher.trading_mode)
+            kis_auth.start_token_refresher()
         queue_worker.start()
         if args.web_ui:
             assert web_ui_stop_event is not None
@@ -600,6 +812,8 @@ def main(argv: list[str] | None = None) -> None:
     finally:
         signal.signal(signal.SIGINT, previous_sigint)
         signal.signal(signal.SIGTERM, previous_sigterm)
+        if previous_sigusr1 is not None:
+            signal.signal(signal.SIGUSR1, previous_sigusr1)
         streaming_pull_future.cancel()
         queue_worker.request_stop()
         work_tracker.close()
@@ -615,10 +829,14 @@ def main(argv: list[str] | None = None) -> None:
             LOGGER.debug("Pub/Sub subscriber shutdown completed with %s", type(exc).__name__)
         drain_seconds = _positive_seconds_from_env("SUBSCRIBER_SHUTDOWN_DRAIN_SECONDS", 180.0)
         if work_tracker.active_count:
+            lanes = broker_lane_snapshot()
             LOGGER.info(
-                "Waiting up to %s seconds for %s active broker operation(s)",
+                "Waiting up to %s seconds for %s active broker operation(s) "
+                "(broker lanes: %s running, %s waiting)",
                 drain_seconds,
                 work_tracker.active_count,
+                lanes.active,
+                lanes.waiting,
             )
         if not work_tracker.wait_for_idle(drain_seconds):
             LOGGER.error(
@@ -627,6 +845,7 @@ def main(argv: list[str] | None = None) -> None:
             )
             work_tracker.wait_for_idle(None)
         queue_worker.stop()
+        kis_auth.stop_token_refresher()
         try:
             # ``await_callbacks_on_shutdown`` keeps Pub/Sub's ack dispatcher alive
             # until every admitted callback has returned.  The bounded wait above
@@ -637,11 +856,58 @@ def main(argv: list[str] | None = None) -> None:
             LOGGER.debug("Pub/Sub subscriber final shutdown wait was interrupted")
         except Exception as exc:  # noqa: BLE001 - cancellation raises a library-specific exception
             LOGGER.debug("Pub/Sub subscriber final shutdown completed with %s", type(exc).__name__)
+        try:
+            dispatch_loop.run(kis_auth.KIS_ASYNC_HTTP_POOL.aclose(), timeout=5.0)
+        except Exception as exc:  # noqa: BLE001 - connection cleanup is best effort
+            LOGGER.debug("KIS async HTTP clients did not close cleanly: %s", exc)
+        dispatch_loop.stop()
         subscriber.close()
+        if metrics_server is not None:
+            metrics_server.stop()
+        if profiler.PROFILER.running:
+            profiler.PROFILER.stop()
+        if memory_watch is not None:
+            memory_watch.stop()
         if web_ui_thread is not None:
             web_ui_thread.join(timeout=10)
             if web_ui_thread.is_alive():
                 LOGGER.warning("WebUI thread did not exit after broker work drained")
+        for priority, stats in broker_lane_wait_stats().items():
+            LOGGER.info(
+                "Broker lane wait (%s): acquisitions=%s avg=%.3fs max=%.3fs",
+                priority,
+                stats.acquisitions,
+                stats.average_wait_seconds,
+                stats.max_wait_seconds,
+            )
+        for (app_key, server), stats in kis_auth.KIS_RATE_LIMITER.stats().items():
+            LOGGER.info(
+                "KIS rate limit (%s/%s): requests=%s delayed=%s backoffs=%s avg=%.3fs max=%.3fs",
+                app_key,
+                server,
+                stats.acquisitions,
+                stats.delayed,
+                stats.backoffs,
+                stats.average_wait_seconds,
+                stats.max_wait_seconds,
+            )
+        token_stats = kis_auth.KIS_TOKEN_BROKER.stats()
+        LOGGER.info(
+            "KIS tokens: hits=%s (memory=%s file=%s other-process=%s) issued=%s",
+            token_stats.hits,
+            token_stats.memory_hits,
+            token_stats.file_hits,
+            token_stats.shared_issues,
+            token_stats.issued,
+        )
+        pool_stats = TRADER_POOL.stats()
+        LOGGER.info(
+            "Trader pool: hits=%s misses=%s evictions=%s size=%s",
+            pool_stats.hits,
+            pool_stats.misses,
+            pool_stats.evictions,
+            pool_stats.size,
+        )
         LOGGER.info("Subscriber shutdown complete")
 
 
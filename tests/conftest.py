@@ -10,6 +10,7 @@ sys.path.insert(0, str(PROJECT_ROOT))
 _TEST_CONFIG_DIR = tempfile.TemporaryDirectory(prefix="prism-insight-light-tests-")
 CONFIG_FILE = Path(_TEST_CONFIG_DIR.name) / "kis_devlp.yaml"
 os.environ["PRISM_KIS_CONFIG_PATH"] = str(CONFIG_FILE)
+os.environ.setdefault("KIS_RATE_LIMIT_SHARED_DIR", str(Path(_TEST_CONFIG_DIR.name) / "kis_rate_limit"))
 CONFIG_FILE.write_text(
     textwrap.dedent(
             """
@@ -48,6 +49,15 @@ CONFIG_FILE.write_text(
 )
 
 
+def awaitable(func):
+    """Wrap a plain function as a coroutine function for patching async trader methods."""
+
+    async def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
 def pytest_configure(config):
     config.addinivalue_line("markers", "asyncio: run async tests without requiring pytest-asyncio")
 
@@ -66,3 +76,14 @@ def pytest_pyfunc_call(pyfuncitem):
     fixture_args = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
     asyncio.run(testfunction(**fixture_args))
     return True
+
+
+def pytest_runtest_setup(item):
+    # Patched trader classes and tokens must not leak into later tests.
+    from trading.kis_auth import KIS_TOKEN_CACHE
+    from trading.trader_pool import TRADER_POOL
+    from trading.us import clear_resolved_exchanges
+
+    TRADER_POOL.clear()
+    KIS_TOKEN_CACHE.clear()
+    clear_resolved_exchanges()
@@ -30,7 +30,7 @@ class FakeUSTrader:
         self.success = success
         self.buy_calls = []
 
-    def get_account_summary(self):
+    async def async_get_account_summary(self):
         return {"available_amount": self.available_amount}
 
     async def async_buy_stock(self, ticker, buy_amount=None, limit_price=None):
@@ -59,7 +59,7 @@ class FakeAutoExchangeUSTrader(FakeUSTrader):
         self.exchange_rate = exchange_rate
         self.buyable_calls = []
 
-    def get_overseas_buyable_amount(self, ticker, price, exchange=None):
+    async def async_get_overseas_buyable_amount(self, ticker, price, exchange=None):
         self.buyable_calls.append((ticker, price, exchange))
         return {
             "ord_psbl_frcr_amt": str(self.current_orderable_amount),
@@ -78,7 +78,7 @@ class FakeKRTrader:
         self.total_amount = total_amount
         self.buy_calls = []
 
-    def get_account_summary(self):
+    async def async_get_account_summary(self):
         summary = {"available_amount": self.available_amount}
         if self.deposit is not None:
             summary["deposit"] = self.deposit
@@ -407,6 +407,40 @@ async def test_concurrent_kr_buys_serialize_cash_sizing(balance_split_strategy):
     assert max_active == 1
 
 
+@pytest.mark.asyncio
+async def test_slow_account_summary_does_not_block_other_lanes(balance_split_strategy):
+    import asyncio
+
+    inquiring = asyncio.Event()
+    released = asyncio.Event()
+
+    class SlowSummaryTrader(FakeKRTrader):
+        async def async_get_account_summary(self):
+            inquiring.set()
+            await released.wait()
+            return await super().async_get_account_summary()
+
+    async def other_lane():
+        # Only runs if the pending summary inquiry yields the dispatch loop.
+        await inquiring.wait()
+        released.set()
+
+    strategy = balance_split_strategy(split_count=2)
+    signal = parse_signal_payload(
+        {"type": "BUY", "ticker": "005930", "market": "KR", "price": 100}
+    )
+
+    result, _ = await asyncio.wait_for(
+        asyncio.gather(
+            strategy._execute_kr(signal, trader=SlowSummaryTrader(total_cash=10_000)),
+            other_lane(),
+        ),
+        timeout=5,
+    )
+
+    assert result.status == "executed"
+
+
 @pytest.mark.asyncio
 async def test_concurrent_us_buys_reserve_stale_cash(balance_split_strategy):
     import asyncio
@@ -323,7 +323,7 @@ def test_example_config_uses_requested_execution_defaults():
 
     assert payload["default_mode"] == "real"
     assert payload["auto_trading"] is True
-    assert payload["multi_account_trading"] == {"enabled": False}
+    assert payload["multi_account_trading"] == {"enabled": False, "max_concurrency": 1}
     assert payload["default_unit_amount"] == 1_000_000
     assert payload["default_unit_amount_usd"] == 1_000
     assert payload["default_unit_asset_percent"] == 10
@@ -0,0 +1,72 @@
+import json
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.stats import histogram, percentile, summarize
+from benchmarks.throughput import BenchmarkConfig, arrival_offsets, compare_reports
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def test_arrival_shapes_keep_the_requested_average_rate():
+    rng = random.Random(3)
+    steady = arrival_offsets(BenchmarkConfig(messages=5, rate=10), rng)
+    assert steady == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4])
+
+    burst = arrival_offsets(BenchmarkConfig(messages=6, rate=10, shape="burst", burst_size=3), rng)
+    assert burst == pytest.approx([0.0, 0.0, 0.0, 0.3, 0.3, 0.3])
+
+    poisson = arrival_offsets(BenchmarkConfig(messages=2000, rate=50, shape="poisson"), rng)
+    assert poisson == sorted(poisson)
+    assert poisson[-1] / len(poisson) == pytest.approx(1 / 50, rel=0.1)
+
+    with pytest.raises(ValueError):
+        BenchmarkConfig(shape="sawtooth")
+
+
+def test_stage_summary_reports_percentiles_and_histogram():
+    assert percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+    summary = summarize([0.001, 0.002, 0.003, 0.100])
+    assert summary["count"] == 4
+    assert summary["p50_ms"] == 2.5
+    assert summary["max_ms"] == 100.0
+    assert sum(count for _, count in summary["histogram"]) == 4
+    assert histogram([20000.0])[-1] == ["inf", 1]
+
+
+def test_compare_reports_lists_throughput_and_stage_changes():
+    stage = {"count": 1, "p50_ms": 10.0, "p99_ms": 20.0}
+    previous = {"throughput_per_second": 10.0, "stages": {"broker": stage}}
+    current = {"throughput_per_second": 12.0, "stages": {"broker": {**stage, "p50_ms": 8.0}}}
+
+    lines = compare_reports(current, previous)
+
+    assert lines[0] == "throughput: 10.00 -> 12.00 msg/s (+20.0%)"
+    assert lines[1] == "broker: p50 10.00 -> 8.00 ms, p99 20.00 -> 20.00 ms"
+
+
+def test_throughput_benchmark_runs_end_to_end_against_the_simulator(tmp_path):
+    output = tmp_path / "report.json"
+    completed = subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.throughput",
+            "--accounts", "2", "--tickers", "2", "--messages", "4", "--rate", "50",
+            "--output", str(output), "--log-level", "ERROR",
+        ],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert report["messages"] == 4
+    assert report["account_results"] == {"executed": 8}
+    assert set(report["stages"]) >= {"queue", "parse", "ledger_claim", "strategy", "broker", "ack", "end_to_end"}
+    assert report["stages"]["end_to_end"]["count"] == 4
+    assert report["simulator"]["orders"] == 8
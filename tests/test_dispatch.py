@@ -3,6 +3,7 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from trading import metrics
 from trading.dispatch import DispatchResult, TradeDispatcher
 from trading.schema import parse_signal_payload
 
@@ -226,7 +227,7 @@ async def test_balance_split_buy_routes_with_fractional_buy_amount(monkeypatch,
         def __init__(self, mode):
             results["mode"] = mode
 
-        def get_account_summary(self):
+        async def async_get_account_summary(self):
             return {"available_amount": 800.0}
 
         async def async_buy_stock(self, ticker, buy_amount=None, limit_price=None):
@@ -393,3 +394,142 @@ async def test_broker_workflows_are_serialized_across_dispatchers(monkeypatch):
     await asyncio.gather(first_task, second_task)
     assert calls == ["AAPL", "MSFT"]
     assert max_active == 1
+
+
+@pytest.mark.asyncio
+async def test_broker_lanes_run_independent_tickers_concurrently(monkeypatch):
+    from trading.dispatch_lanes import LaneScheduler
+
+    calls = []
+    active = 0
+    max_active = 0
+
+    async def fake_execute(self, signal):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        calls.append(signal.ticker)
+        await asyncio.sleep(0.03)
+        active -= 1
+        return DispatchResult("executed", "done", signal.signal_type, signal.market)
+
+    monkeypatch.setattr("trading.dispatch._BROKER_LANES", LaneScheduler(max_concurrency=4))
+    monkeypatch.setattr("trading.dispatch.is_market_open", lambda market: True)
+    monkeypatch.setattr(TradeDispatcher, "_execute_legacy_trade", fake_execute)
+    dispatcher = TradeDispatcher(trading_mode="demo", strategy_config={"name": ""})
+    signals = [
+        parse_signal_payload({"type": "BUY", "ticker": ticker, "market": market, "price": 100})
+        for ticker, market in (("AAPL", "US"), ("005930", "KR"), ("AAPL", "US"))
+    ]
+
+    results = await asyncio.gather(*(dispatcher.dispatch(signal) for signal in signals))
+
+    assert [result.status for result in results] == ["executed"] * 3
+    # AAPL signals share a lane, so only the KR lane overlaps with them.
+    assert max_active == 2
+    assert calls.count("AAPL") == 2
+
+
+def test_drain_due_orders_runs_on_persistent_dispatch_loop(monkeypatch, tmp_path):
+    from trading.dispatch_loop import DispatchLoop
+
+    monkeypatch.setattr(
+        "trading.off_hours_queue.next_market_open",
+        lambda market: datetime.now(timezone.utc) - timedelta(minutes=1),
+    )
+    dispatcher = TradeDispatcher(trading_mode="demo", queue_path=tmp_path / "queue.json")
+    dispatcher.queue.enqueue(
+        parse_signal_payload({"type": "BUY", "ticker": "005930", "market": "KR", "price": 82000})
+    )
+    dispatcher.queue.enqueue(
+        parse_signal_payload({"type": "BUY", "ticker": "000660", "market": "KR", "price": 150000})
+    )
+    loops = []
+
+    async def execute(payload):
+        loops.append(asyncio.get_running_loop())
+        return DispatchResult("executed", "ok", "BUY", "KR")
+
+    monkeypatch.setattr(dispatcher, "execute_queued_signal", execute)
+    dispatch_loop = DispatchLoop()
+    dispatch_loop.start()
+    try:
+        assert dispatcher.drain_due_orders(dispatch_loop=dispatch_loop) == 2
+    finally:
+        dispatch_loop.stop()
+
+    assert dispatcher.queue.pending_count() == 0
+    assert len(loops) == 2 and loops[0] is loops[1]
+
+
+def test_batched_drain_runs_lanes_concurrently_and_commits_once(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        "trading.off_hours_queue.next_market_open",
+        lambda market: datetime.now(timezone.utc) - timedelta(minutes=1),
+    )
+    monkeypatch.setenv("OFF_HOURS_QUEUE_DRAIN_BATCH", "8")
+    dispatcher = TradeDispatcher(trading_mode="demo", queue_path=tmp_path / "queue.json")
+    for ticker in ("005930", "000660", "035420"):
+        dispatcher.queue.enqueue(
+            parse_signal_payload({"type": "BUY", "ticker": ticker, "market": "KR", "price": 1000})
+        )
+    active = 0
+    max_active = 0
+
+    async def execute(payload):
+        nonlocal active, max_active
+        active += 1
+        max_active = max(max_active, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        if payload["ticker"] == "000660":
+            raise RuntimeError("broken payload")
+        return DispatchResult("executed", "ok", "BUY", "KR")
+
+    saves = []
+    save = dispatcher.queue._save
+    monkeypatch.setattr(dispatcher.queue, "_save", lambda items, **kwargs: (saves.append(1), save(items, **kwargs))[1])
+    monkeypatch.setattr(dispatcher, "execute_queued_signal", execute)
+
+    assert dispatcher.drain_due_orders() == 2
+    assert max_active == 3
+    assert len(saves) == 1
+    [failed] = dispatcher.queue.items()
+    assert failed.signal["ticker"] == "000660"
+    assert failed.failure_message == "RuntimeError: broken payload"
+
+
+def test_window_submission_sends_every_queued_order_for_the_market(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        "trading.off_hours_queue.next_market_open",
+        lambda market: datetime.now(timezone.utc) + timedelta(hours=12),
+    )
+    dispatcher = TradeDispatcher(trading_mode="real", queue_path=tmp_path / "queue.json")
+    for ticker, market in (("005930", "KR"), ("AAPL", "US"), ("000660", "KR"), ("035420", "KR")):
+        dispatcher.queue.enqueue(
+            parse_signal_payload({"type": "BUY", "ticker": ticker, "market": market, "price": 1000})
+        )
+    outcomes = {"000660": "deferred", "035420": "failed"}
+    seen = []
+
+    async def execute(payload):
+        seen.append(payload["ticker"])
+        return DispatchResult(outcomes.get(payload["ticker"], "executed"), "ok", "BUY", payload["market"])
+
+    monkeypatch.setattr(dispatcher, "execute_queued_signal", execute)
+    opened_at = datetime.now(timezone.utc) - timedelta(seconds=2)
+    before = metrics.OFF_HOURS_WINDOW_SUBMIT_SECONDS.count(market="KR", window="closing")
+
+    report = dispatcher.submit_window_orders("KR", "closing", opened_at, batch_size=1)
+
+    assert seen == ["005930", "000660", "035420"]
+    assert (report.submitted, report.deferred, report.failed) == (1, 1, 1)
+    [latency] = report.latencies
+    assert 2 <= latency < 10
+    assert metrics.OFF_HOURS_WINDOW_SUBMIT_SECONDS.count(market="KR", window="closing") == before + 1
+    assert sorted(item.signal["ticker"] for item in dispatcher.queue.items()) == ["000660", "035420", "AAPL"]
+
+    demo = TradeDispatcher(trading_mode="demo", queue_path=tmp_path / "demo.json")
+    demo.queue.enqueue(parse_signal_payload({"type": "BUY", "ticker": "005930", "market": "KR", "price": 1000}))
+    assert demo.submit_window_orders("KR", "closing", opened_at).submitted == 0
+    assert demo.queue.pending_count() == 1
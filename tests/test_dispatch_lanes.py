@@ -0,0 +1,234 @@
+import asyncio
+
+import pytest
+
+from trading.dispatch_lanes import LaneScheduler, lane_key, max_concurrent_lanes_from_env
+
+
+@pytest.mark.asyncio
+async def test_same_lane_runs_in_arrival_order():
+    scheduler = LaneScheduler(max_concurrency=4)
+    key = lane_key("kr", "005930", "default")
+    order = []
+
+    async def work(index):
+        async with scheduler.lane(key):
+            order.append(("start", index))
+            await asyncio.sleep(0.01)
+            order.append(("end", index))
+
+    await asyncio.gather(*(work(index) for index in range(4)))
+
+    assert order == [
+        (phase, index) for index in range(4) for phase in ("start", "end")
+    ]
+    assert scheduler.snapshot().lanes == 0
+
+
+@pytest.mark.asyncio
+async def test_independent_lanes_share_bounded_slots():
+    scheduler = LaneScheduler(max_concurrency=2)
+    active = 0
+    max_active = 0
+
+    async def work(ticker):
+        nonlocal active, max_active
+        async with scheduler.lane(lane_key("US", ticker, "default")):
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.03)
+            active -= 1
+
+    await asyncio.gather(*(work(ticker) for ticker in ("AAPL", "MSFT", "NVDA", "TSLA")))
+
+    assert max_active == 2
+    snapshot = scheduler.snapshot()
+    assert (snapshot.active, snapshot.waiting, snapshot.lanes) == (0, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_exclusive_lane_waits_for_active_lanes_and_blocks_new_ones():
+    scheduler = LaneScheduler(max_concurrency=3)
+    events = []
+    first_entered = asyncio.Event()
+    release_first = asyncio.Event()
+
+    async def buy(ticker):
+        async with scheduler.lane(lane_key("KR", ticker, "a")):
+            events.append(f"buy-{ticker}")
+            if ticker == "000001":
+                first_entered.set()
+                await release_first.wait()
+
+    async def risk_off():
+        async with scheduler.lane(lane_key("KR", "", "a"), exclusive=True):
+            events.append("risk-off")
+
+    first = asyncio.create_task(buy("000001"))
+    await first_entered.wait()
+    exclusive = asyncio.create_task(risk_off())
+    await asyncio.sleep(0.03)
+    later = asyncio.create_task(buy("000002"))
+    await asyncio.sleep(0.03)
+    assert events == ["buy-000001"]
+
+    release_first.set()
+    await asyncio.gather(first, exclusive, later)
+    assert events == ["buy-000001", "risk-off", "buy-000002"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_stall_its_lane():
+    scheduler = LaneScheduler(max_concurrency=1)
+    key = lane_key("US", "AAPL", "default")
+    release = asyncio.Event()
+    completed = []
+
+    async def holder():
+        async with scheduler.lane(key):
+            await release.wait()
+
+    async def waiter(name):
+        async with scheduler.lane(key):
+            completed.append(name)
+
+    holding = asyncio.create_task(holder())
+    await asyncio.sleep(0.01)
+    cancelled = asyncio.create_task(waiter("cancelled"))
+    follower = asyncio.create_task(waiter("follower"))
+    await asyncio.sleep(0.02)
+    cancelled.cancel()
+    release.set()
+    await asyncio.gather(holding, follower)
+
+    assert completed == ["follower"]
+    assert cancelled.cancelled()
+    assert scheduler.snapshot().waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_reservation_keeps_its_place_and_cancelled_ones_free_the_lane():
+    scheduler = LaneScheduler(max_concurrency=4)
+    key = lane_key("KR", "005930", "default")
+    completed = []
+
+    first = scheduler.reserve(key)
+    unused = scheduler.reserve(key)
+
+    async def run(name, reservation=None):
+        async with scheduler.lane(key, reservation=reservation):
+            completed.append(name)
+
+    later = asyncio.create_task(run("later"))
+    await asyncio.sleep(0.01)
+    assert completed == []
+
+    await run("first", first)
+    scheduler.cancel(unused)
+    scheduler.cancel(unused)
+    await later
+
+    assert completed == ["first", "later"]
+    assert scheduler.snapshot().active == 0
+    with pytest.raises(RuntimeError, match="already used"):
+        async with scheduler.lane(key, reservation=first):
+            pass
+
+
+def test_max_concurrent_lanes_env_validation(monkeypatch):
+    monkeypatch.setenv("BROKER_MAX_CONCURRENT_LANES", "4")
+    assert max_concurrent_lanes_from_env() == 4
+    monkeypatch.setenv("BROKER_MAX_CONCURRENT_LANES", "0")
+    assert max_concurrent_lanes_from_env() == 1
+    monkeypatch.setenv("BROKER_MAX_CONCURRENT_LANES", "two")
+    assert max_concurrent_lanes_from_env() == 1
+
+
+@pytest.mark.asyncio
+async def test_urgent_lanes_jump_ahead_of_pending_buys():
+    from trading.dispatch_lanes import PRIORITY_URGENT
+
+    scheduler = LaneScheduler(max_concurrency=1)
+    release = asyncio.Event()
+    order = []
+
+    async def holder():
+        async with scheduler.lane(lane_key("KR", "000001", "a")):
+            await release.wait()
+
+    async def work(ticker, priority=0):
+        async with scheduler.lane(lane_key("KR", ticker, "a"), priority=priority):
+            order.append(ticker)
+
+    holding = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    buys = [asyncio.create_task(work(f"00000{index}")) for index in (2, 3)]
+    await asyncio.sleep(0)
+    sell = asyncio.create_task(work("000009", PRIORITY_URGENT))
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.gather(holding, sell, *buys)
+
+    assert order == ["000009", "000002", "000003"]
+    stats = scheduler.wait_stats()
+    assert stats[PRIORITY_URGENT].acquisitions == 1
+    assert stats[0].acquisitions == 3
+    assert stats[0].max_wait_seconds >= stats[PRIORITY_URGENT].last_wait_seconds
+
+
+@pytest.mark.asyncio
+async def test_exclusive_waiter_behind_same_lane_buy_does_not_deadlock():
+    scheduler = LaneScheduler(max_concurrency=2)
+    key = lane_key("KR", "005930", "a")
+    release = asyncio.Event()
+    order = []
+
+    async def holder():
+        async with scheduler.lane(lane_key("KR", "000660", "a")):
+            await release.wait()
+
+    async def work(name, lane, exclusive=False):
+        async with scheduler.lane(lane, exclusive=exclusive):
+            order.append(name)
+
+    holding = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    buy = asyncio.create_task(work("buy", key))
+    event = asyncio.create_task(work("event", key, exclusive=True))
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.wait_for(asyncio.gather(holding, buy, event), timeout=1)
+
+    assert order == ["buy", "event"]
+
+
+def test_lane_scheduler_wakes_waiters_on_other_threads_event_loops():
+    import threading
+
+    scheduler = LaneScheduler(max_concurrency=1)
+    key = lane_key("US", "AAPL", "default")
+    entered = threading.Event()
+    release = threading.Event()
+    order = []
+
+    async def hold():
+        async with scheduler.lane(key):
+            order.append("first")
+            entered.set()
+            await asyncio.to_thread(release.wait, 2)
+
+    async def follow():
+        async with scheduler.lane(key):
+            order.append("second")
+
+    first = threading.Thread(target=lambda: asyncio.run(hold()))
+    first.start()
+    assert entered.wait(timeout=1)
+    second = threading.Thread(target=lambda: asyncio.run(follow()))
+    second.start()
+    release.set()
+    first.join(timeout=2)
+    second.join(timeout=2)
+
+    assert order == ["first", "second"]
+    assert scheduler.snapshot().active == 0
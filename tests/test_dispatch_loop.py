@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import pytest
+
+from trading.dispatch_loop import DispatchLoop, DispatchLoopClosedError, run_dispatch_coroutine
+
+
+def test_dispatch_loop_runs_coroutines_from_many_threads_on_one_loop():
+    dispatch_loop = DispatchLoop(name="test-loop")
+    dispatch_loop.start()
+    seen_loops = []
+    lock = asyncio.Lock()
+
+    async def work(index):
+        # Loop-bound primitives survive across submissions on a persistent loop.
+        async with lock:
+            seen_loops.append(asyncio.get_running_loop())
+            await asyncio.sleep(0)
+            return index * 2
+
+    results = []
+
+    def caller(index):
+        results.append(dispatch_loop.run(work(index)))
+
+    try:
+        threads = [threading.Thread(target=caller, args=(index,)) for index in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+    finally:
+        dispatch_loop.stop()
+
+    assert sorted(results) == [index * 2 for index in range(8)]
+    assert len({id(loop) for loop in seen_loops}) == 1
+    assert dispatch_loop.is_running is False
+
+
+def test_dispatch_loop_propagates_exceptions_to_caller():
+    dispatch_loop = DispatchLoop()
+    dispatch_loop.start()
+
+    async def boom():
+        raise ValueError("broker rejected")
+
+    try:
+        with pytest.raises(ValueError, match="broker rejected"):
+            dispatch_loop.run(boom())
+    finally:
+        dispatch_loop.stop()
+
+
+def test_stopped_dispatch_loop_rejects_new_work():
+    dispatch_loop = DispatchLoop()
+    dispatch_loop.start()
+    dispatch_loop.stop()
+
+    async def work():
+        return 1
+
+    with pytest.raises(DispatchLoopClosedError):
+        dispatch_loop.run(work())
+    with pytest.raises(DispatchLoopClosedError):
+        dispatch_loop.start()
+
+
+def test_run_dispatch_coroutine_falls_back_to_fresh_loop():
+    async def work():
+        return "done"
+
+    assert run_dispatch_coroutine(work()) == "done"
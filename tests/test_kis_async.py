@@ -0,0 +1,330 @@
+import asyncio
+import json
+import threading
+import time
+from collections import namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from trading import domestic as dst
+from trading import kis_auth as ka
+from trading import us as ust
+from trading.kis_http import KISAsyncHttpPool
+from trading.rate_limit import KISRateLimiter
+
+
+class _ScriptedKISHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    replies: list = []
+    requests: list = []
+    delay_seconds = 0.0
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        cls = type(self)
+        cls.requests.append(
+            {
+                "path": self.path,
+                "port": self.client_address[1],
+                "authorization": self.headers.get("authorization"),
+                "tr_id": self.headers.get("tr_id"),
+                "body": body,
+            }
+        )
+        if cls.delay_seconds:
+            time.sleep(cls.delay_seconds)
+        status, payload = cls.replies.pop(0) if cls.replies else (200, _ok())
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("tr_cont", "M")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = _reply  # noqa: N815 - http.server API
+    do_POST = _reply  # noqa: N815 - http.server API
+
+    def log_message(self, *args):
+        pass
+
+
+def _ok(output=None):
+    return {"rt_cd": "0", "msg_cd": "0", "msg1": "OK", "output": output or {}}
+
+
+@pytest.fixture
+def kis_server(monkeypatch):
+    _ScriptedKISHandler.replies = []
+    _ScriptedKISHandler.requests = []
+    _ScriptedKISHandler.delay_seconds = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ScriptedKISHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    tokens = ["token-0"]
+
+    monkeypatch.setattr(ka, "getTREnv", lambda: SimpleNamespace(my_url=base_url, my_token=tokens[-1]))
+    monkeypatch.setattr(ka, "_getBaseHeader", lambda: {"authorization": f"Bearer {tokens[-1]}"})
+    monkeypatch.setattr(ka, "isPaperTrading", lambda: False)
+    monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_ATTEMPTS", 3)
+    monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_BASE_SECONDS", 0.0)
+    monkeypatch.setattr(ka, "KIS_ASYNC_HTTP_POOL", KISAsyncHttpPool())
+    monkeypatch.setattr(ka, "KIS_RATE_LIMITER", KISRateLimiter())
+    try:
+        yield SimpleNamespace(url=base_url, tokens=tokens)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_async_fetch_retries_rate_limit_on_one_keep_alive_connection(kis_server):
+    _ScriptedKISHandler.replies = [
+        (500, {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "rate limited"}),
+        (200, _ok({"odno": "0001"})),
+    ]
+
+    try:
+        response = await ka._url_fetch_async(
+            "/uapi/test", "TTTC0012U", "", {"PDNO": "005930"}, postFlag=True
+        )
+    finally:
+        await ka.KIS_ASYNC_HTTP_POOL.aclose()
+
+    assert isinstance(response, ka.APIResp)
+    assert response.isOK()
+    assert response.getBody().output == {"odno": "0001"}
+    assert response.getHeader().tr_cont == "M"
+    assert len(_ScriptedKISHandler.requests) == 2
+    assert len({request["port"] for request in _ScriptedKISHandler.requests}) == 1
+    assert json.loads(_ScriptedKISHandler.requests[0]["body"]) == {"PDNO": "005930"}
+
+
+_Env = namedtuple("KISEnv", "my_url my_token my_app my_sec my_prod")
+
+
+def _client_context(base_url, token, account="12345678", svr="prod"):
+    env = _Env(base_url, token, f"APP-{account}", "secret", "01")
+    return ka.KISClientContext(env=env, svr=svr, account_key=f"{svr}:{account}:01")
+
+
+@pytest.mark.asyncio
+async def test_async_fetch_refreshes_expired_token_for_the_calling_account(kis_server, monkeypatch):
+    refreshed = []
+    adopted = []
+    _ScriptedKISHandler.replies = [
+        (500, {"rt_cd": "1", "msg_cd": "EGW00123", "msg1": "expired"}),
+        (200, _ok()),
+    ]
+
+    def fake_refresh(context):
+        refreshed.append(context.account_key)
+        return context.with_env(context.env._replace(my_token="token-1"))
+
+    monkeypatch.setattr(ka, "refresh_client_context", fake_refresh)
+    monkeypatch.setattr(
+        ka, "_refresh_after_expired_token_response", lambda: pytest.fail("shared env refreshed")
+    )
+    context = _client_context(kis_server.url, "token-0", svr="vps")
+
+    try:
+        response = await ka._url_fetch_async(
+            "/uapi/test",
+            "TTTC8434R",
+            "",
+            {"CANO": "12345678"},
+            context=context,
+            on_token_refresh=adopted.append,
+        )
+    finally:
+        await ka.KIS_ASYNC_HTTP_POOL.aclose()
+
+    assert response.isOK()
+    assert refreshed == ["vps:12345678:01"]
+    assert [item.env.my_token for item in adopted] == ["token-1"]
+    assert context.env.my_token == "token-0"
+    assert [request["authorization"] for request in _ScriptedKISHandler.requests] == [
+        "Bearer token-0",
+        "Bearer token-1",
+    ]
+    assert {request["tr_id"] for request in _ScriptedKISHandler.requests} == {"VTTC8434R"}
+
+
+@pytest.mark.asyncio
+async def test_async_fetch_sends_each_account_context_concurrently(kis_server, monkeypatch):
+    _ScriptedKISHandler.delay_seconds = 0.2
+    contexts = [
+        _client_context(kis_server.url, f"token-{account}", account=account)
+        for account in ("11111111", "22222222", "33333333")
+    ]
+
+    def fail_shared_env():
+        raise AssertionError("context requests must not read the shared environment")
+
+    monkeypatch.setattr(ka, "getTREnv", fail_shared_env)
+    monkeypatch.setattr(ka, "_getBaseHeader", fail_shared_env)
+    started = time.monotonic()
+    try:
+        responses = await asyncio.gather(
+            *(
+                ka._url_fetch_async("/uapi/test", "TTTC8434R", "", {}, context=context)
+                for context in contexts
+            )
+        )
+    finally:
+        await ka.KIS_ASYNC_HTTP_POOL.aclose()
+    elapsed = time.monotonic() - started
+
+    assert all(response.isOK() for response in responses)
+    assert elapsed < 0.2 * len(contexts)
+    assert sorted(request["authorization"] for request in _ScriptedKISHandler.requests) == [
+        "Bearer token-11111111",
+        "Bearer token-22222222",
+        "Bearer token-33333333",
+    ]
+    assert {request["tr_id"] for request in _ScriptedKISHandler.requests} == {"TTTC8434R"}
+
+
+@pytest.mark.asyncio
+async def test_async_fetch_keeps_requests_in_flight_without_holding_env_lock(kis_server):
+    _ScriptedKISHandler.delay_seconds = 0.2
+    lock_free_during_request = []
+
+    async def probe_lock():
+        await asyncio.sleep(0.05)
+        acquired = ka.get_trading_env_lock().acquire(blocking=False)
+        if acquired:
+            ka.get_trading_env_lock().release()
+        lock_free_during_request.append(acquired)
+
+    started = time.monotonic()
+    try:
+        responses = await asyncio.gather(
+            *(ka._url_fetch_async("/uapi/test", "FHKST01010100", "", {}) for _ in range(5)),
+            probe_lock(),
+        )
+    finally:
+        await ka.KIS_ASYNC_HTTP_POOL.aclose()
+    elapsed = time.monotonic() - started
+
+    assert all(response.isOK() for response in responses[:5])
+    assert lock_free_during_request == [True]
+    assert elapsed < 0.2 * 5
+
+
+@pytest.mark.asyncio
+async def test_async_pool_shares_client_per_origin_within_a_loop():
+    pool = KISAsyncHttpPool(max_connections=3)
+    try:
+        first = pool.client_for("https://openapi.example.com:9443/uapi/a")
+        second = pool.client_for("HTTPS://OPENAPI.example.com:9443/oauth2/tokenP")
+        paper = pool.client_for("https://openapivts.example.com:29443/uapi/a")
+
+        assert first is second
+        assert paper is not first
+        assert pool.origins() == [
+            "https://openapi.example.com:9443",
+            "https://openapivts.example.com:29443",
+        ]
+    finally:
+        await pool.aclose()
+    assert pool.origins() == []
+
+
+class _Response:
+    def __init__(self, output=None, ok=True):
+        self._output = output or {}
+        self._ok = ok
+
+    def isOK(self):
+        return self._ok
+
+    def getBody(self):
+        return SimpleNamespace(output=self._output)
+
+    def getErrorCode(self):
+        return "EGW00201"
+
+    def getErrorMessage(self):
+        return "rate limited"
+
+
+def _bare_domestic_trader(responses):
+    trader = dst.DomesticStockTrading.__new__(dst.DomesticStockTrading)
+    trader.mode = "demo"
+    trader.auto_trading = True
+    trader.trenv = SimpleNamespace(my_acct="12345678", my_prod="01")
+    requests = []
+
+    async def fake_request_async(api_url, tr_id, params, **kwargs):
+        requests.append((api_url, tr_id, dict(params), kwargs))
+        return responses.pop(0)
+
+    def fail_sync_request(*args, **kwargs):
+        raise AssertionError("async path must not use the blocking transport")
+
+    trader._request_async = fake_request_async
+    trader._request = fail_sync_request
+    return trader, requests
+
+
+@pytest.mark.asyncio
+async def test_domestic_async_quote_and_limit_buy_use_async_transport():
+    trader, requests = _bare_domestic_trader(
+        [
+            _Response({"rprs_mrkt_kor_name": "KOSPI", "stck_prpr": "70000", "prdy_ctrt": "1.5", "acml_vol": "10"}),
+            _Response({"odno": "A-1"}),
+        ]
+    )
+
+    quote = await trader.async_get_current_price("005930")
+    order = await trader.async_buy_limit_price("005930", 69000, buy_amount=140000)
+
+    assert quote["current_price"] == 70000
+    assert order["success"] is True
+    assert order["order_no"] == "A-1"
+    assert order["quantity"] == 2
+    assert requests[1][1] == "VTTC0012U"
+    assert requests[1][2]["ORD_DVSN"] == "00"
+    assert requests[1][2]["ORD_UNPR"] == "69000"
+    assert requests[1][3] == {"postFlag": True}
+
+
+@pytest.mark.asyncio
+async def test_domestic_async_sell_reports_kis_rejection_like_sync_path():
+    trader, requests = _bare_domestic_trader([_Response(ok=False)])
+
+    result = await trader.async_sell_all_market_price("005930", holding_quantity=3)
+
+    assert result["success"] is False
+    assert result["quantity"] == 3
+    assert result["message"] == "Sell order failed: EGW00201 - rate limited"
+    assert requests[0][2]["ORD_DVSN"] == "01"
+
+
+@pytest.mark.asyncio
+async def test_us_async_sell_prices_limit_from_async_quote():
+    trader = ust.USStockTrading.__new__(ust.USStockTrading)
+    trader.mode = "demo"
+    trader.auto_trading = True
+    trader.trenv = SimpleNamespace(my_acct="12345678", my_prod="01")
+    responses = [_Response({"last": "101.25", "name": "APPLE"}), _Response({"ODNO": "U-1"})]
+    requests = []
+
+    async def fake_request_async(api_url, tr_id, params, **kwargs):
+        requests.append((tr_id, dict(params)))
+        return responses.pop(0)
+
+    trader._request_async = fake_request_async
+
+    result = await trader.async_sell_all_market_price("AAPL", "NASD", holding_quantity=4)
+
+    assert result["success"] is True
+    assert result["order_no"] == "U-1"
+    assert requests[1][0] == "VTTT1001U"
+    assert requests[1][1]["OVRS_ORD_UNPR"] == "101.25"
+    assert requests[1][1]["ORD_QTY"] == "4"
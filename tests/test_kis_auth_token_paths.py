@@ -21,3 +21,31 @@ def test_per_account_token_round_trip_uses_hashed_token_filename(tmp_path, monke
     account_hash = hashlib.sha256(account_key.encode()).hexdigest()[:8]
     assert (tmp_path / f"KIS_acct_{account_hash}.token").exists()
     assert kis_auth.read_token(account_key=account_key) == token
+
+
+def test_read_token_serves_cached_token_and_falls_back_to_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(kis_auth, "config_root", str(tmp_path))
+    monkeypatch.setattr(kis_auth, "token_tmp", str(tmp_path / "KIS.token"))
+
+    account_key = "real:account-beta:01"
+    expiry = (datetime.now(kis_auth.KIS_TOKEN_EXPIRY_TZ) + timedelta(hours=1)).strftime(
+        "%Y-%m-%d %H:%M:%S"
+    )
+    kis_auth.save_token("token-value-cached-in-memory", expiry, account_key=account_key)
+
+    load_key = kis_auth._get_or_create_encryption_key
+
+    def fail_decrypt():
+        raise AssertionError("cached tokens must not be read from disk")
+
+    monkeypatch.setattr(kis_auth, "_get_or_create_encryption_key", fail_decrypt)
+    assert kis_auth.read_token(account_key=account_key) == "token-value-cached-in-memory"
+
+    monkeypatch.setattr(kis_auth, "_get_or_create_encryption_key", load_key)
+    kis_auth.KIS_TOKEN_CACHE.clear()
+    assert kis_auth.read_token(account_key=account_key) == "token-value-cached-in-memory"
+    assert kis_auth.KIS_TOKEN_CACHE.get(account_key) == "token-value-cached-in-memory"
+
+    kis_auth._discard_saved_token(account_key=account_key)
+    assert kis_auth.KIS_TOKEN_CACHE.get(account_key) is None
+    assert kis_auth.read_token(account_key=account_key) is None
@@ -0,0 +1,101 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from trading.kis_http import KISHttpPool
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    client_ports: list = []
+
+    def _reply(self, body: bytes = b"{}") -> None:
+        type(self).client_ports.append(self.client_address[1])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        self._reply()
+
+    def do_HEAD(self):  # noqa: N802 - http.server API
+        self._reply()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def keep_alive_server():
+    _KeepAliveHandler.client_ports = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_pool_shares_one_session_per_origin():
+    pool = KISHttpPool(pool_connections=2, pool_maxsize=7)
+    try:
+        first = pool.session_for("https://openapi.example.com:9443/uapi/a")
+        second = pool.session_for("HTTPS://OPENAPI.example.com:9443/oauth2/tokenP")
+        paper = pool.session_for("https://openapivts.example.com:29443/uapi/a")
+
+        assert first is second
+        assert paper is not first
+        assert pool.origins() == [
+            "https://openapi.example.com:9443",
+            "https://openapivts.example.com:29443",
+        ]
+        adapter = first.get_adapter("https://openapi.example.com:9443/")
+        assert adapter._pool_maxsize == 7
+        assert adapter._pool_connections == 2
+    finally:
+        pool.close()
+    assert pool.origins() == []
+
+
+def test_pool_rejects_relative_urls():
+    with pytest.raises(ValueError):
+        KISHttpPool().session_for("/uapi/domestic-stock")
+
+
+def test_pool_reuses_warmed_keep_alive_connection(keep_alive_server):
+    pool = KISHttpPool()
+    try:
+        assert pool.warm_up([keep_alive_server, keep_alive_server + "/ignored"]) == {
+            keep_alive_server: True
+        }
+        session = pool.session_for(keep_alive_server)
+        for _ in range(3):
+            assert session.get(f"{keep_alive_server}/uapi/quote", timeout=5).status_code == 200
+    finally:
+        pool.close()
+
+    assert len(_KeepAliveHandler.client_ports) == 4
+    assert len(set(_KeepAliveHandler.client_ports)) == 1
+
+
+def test_pool_warm_up_failures_are_reported_not_raised():
+    pool = KISHttpPool()
+    try:
+        assert pool.warm_up(["http://127.0.0.1:9"], timeout=0.5) == {"http://127.0.0.1:9": False}
+    finally:
+        pool.close()
+
+
+def test_pool_sizes_from_env(monkeypatch):
+    monkeypatch.setenv("KIS_HTTP_POOL_CONNECTIONS", "3")
+    monkeypatch.setenv("KIS_HTTP_POOL_MAXSIZE", "bad")
+    pool = KISHttpPool.from_env()
+
+    assert pool.pool_connections == 3
+    assert pool.pool_maxsize == 10
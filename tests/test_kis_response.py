@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from trading import kis_auth as ka
+from trading import kis_response
+from trading.kis_response import ResponseView, decode_json_body
+
+
+class _Response:
+    def __init__(self, payload, headers=None):
+        self.status_code = 200
+        self.content = json.dumps(payload).encode()
+        self.headers = headers or {}
+        self.json_calls = 0
+
+    def json(self):
+        self.json_calls += 1
+        return json.loads(self.content)
+
+
+def test_view_exposes_fields_like_the_old_namedtuples():
+    rows = [{"pdno": "005930"}] * 300
+    data = {"rt_cd": "0", "msg_cd": "MCA00000", "output1": rows, "output2": [{"dnca_tot_amt": "1"}]}
+    body = ResponseView(data)
+
+    assert body.rt_cd == "0"
+    assert body.output1 is rows
+    assert body._fields == ("rt_cd", "msg_cd", "output1", "output2")
+    assert body._asdict() == data
+    assert getattr(body, "output", {}) == {}
+    assert not hasattr(body, "output")
+    with pytest.raises(AttributeError):
+        body.rt_cd = "1"
+
+
+def test_api_resp_decodes_body_once_and_keeps_lowercase_headers():
+    payload = {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": "OK", "output1": [{"pdno": "005930"}]}
+    response = _Response(payload, headers={"tr_id": "TTTC8434R", "tr_cont": "M", "Content-Type": "application/json"})
+
+    api_response = ka.APIResp(response)
+
+    assert api_response.isOK()
+    assert api_response.getBody().output1 == [{"pdno": "005930"}]
+    assert api_response.getHeader()._fields == ("tr_id", "tr_cont")
+    assert api_response.getErrorCode() == "MCA00000"
+    assert response.json_calls == (0 if kis_response.orjson is not None else 1)
+
+
+def test_decode_falls_back_to_response_json_without_orjson(monkeypatch):
+    monkeypatch.setattr(kis_response, "orjson", None)
+    response = _Response({"rt_cd": "0"})
+
+    assert decode_json_body(response) == {"rt_cd": "0"}
+    assert response.json_calls == 1
+    assert kis_response.loads('{"a": 1}') == {"a": 1}
+
+
+def test_system_resp_returns_shared_message_type():
+    message = ka.system_resp(
+        json.dumps(
+            {
+                "header": {"tr_id": "H0STCNT0", "tr_key": "005930", "encrypt": "N"},
+                "body": {"rt_cd": "0", "msg1": "SUBSCRIBE SUCCESS", "output": {"iv": "iv", "key": "key"}},
+            }
+        )
+    )
+    pingpong = ka.system_resp(json.dumps({"header": {"tr_id": "PINGPONG"}}))
+
+    assert type(message) is type(pingpong) is ka.SystemMessage
+    assert (message.isOk, message.tr_key, message.iv, message.ekey) == (True, "005930", "iv", "key")
+    assert pingpong.isPingPong and not pingpong.isUnSub
@@ -0,0 +1,177 @@
+import asyncio
+import json
+from collections import namedtuple
+
+import httpx
+import pytest
+
+from trading import kis_auth as ka
+from trading.kis_simulator import (
+    KISSimulator,
+    LatencyModel,
+    SimulatedBroker,
+    SimulatorConfig,
+)
+from trading.rate_limit import KISRateLimiter
+
+_Env = namedtuple("KISEnv", "my_url my_token my_app my_sec my_prod")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _token(broker, app_key="PSAPPKEY000"):
+    response = broker.handle("POST", "/oauth2/tokenP", {}, {"appkey": app_key, "appsecret": "secret"})
+    assert response.status == 200
+    return response.payload["access_token"]
+
+
+def _price(broker, token, app_key="PSAPPKEY000"):
+    return broker.handle(
+        "GET",
+        "/uapi/domestic-stock/v1/quotations/inquire-price",
+        {"authorization": f"Bearer {token}", "appkey": app_key, "tr_id": "FHKST01010100"},
+        {"fid_cond_mrkt_div_code": "J", "fid_input_iscd": "005930"},
+    )
+
+
+@pytest.fixture
+def simulator(monkeypatch):
+    monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_BASE_SECONDS", 0.0)
+    monkeypatch.setattr(ka, "KIS_RATE_LIMITER", KISRateLimiter())
+    config = SimulatorConfig(prices={"005930": 70000, "AAPL": 200.0}, quote_interval_seconds=0.05, seed=7)
+    with KISSimulator(config) as sim:
+        yield sim
+
+
+def test_latency_spec_parses_and_samples_with_the_requested_shape():
+    model = LatencyModel.parse("lognormal:40:10")
+    assert model == LatencyModel("lognormal", 40.0, 10.0)
+
+    import random
+
+    rng = random.Random(1)
+    samples = [model.sample_seconds(rng) for _ in range(4000)]
+    assert min(samples) > 0
+    assert abs(sum(samples) / len(samples) - 0.040) < 0.002
+    assert LatencyModel.parse("fixed:5").sample_seconds(rng) == 0.005
+    with pytest.raises(ValueError):
+        LatencyModel.parse("gamma:1")
+
+
+def test_rolling_rate_limit_answers_egw00201_per_app_key():
+    clock = _Clock()
+    broker = SimulatedBroker(SimulatorConfig(real_rate_limit=2), clock=clock)
+    token = _token(broker)
+
+    assert _price(broker, token).status == 200
+    assert _price(broker, token).status == 200
+    limited = _price(broker, token)
+    assert limited.status == 500
+    assert limited.payload["msg_cd"] == ka.KIS_RATE_LIMIT_ERROR_CODE
+
+    clock.now += 1.0
+    assert _price(broker, token).status == 200
+    assert broker.stats()["rate_limited"] == 1
+
+
+def test_expired_and_unknown_tokens_answer_egw00123():
+    clock = _Clock()
+    broker = SimulatedBroker(SimulatorConfig(token_ttl_seconds=60), clock=clock)
+    token = _token(broker)
+
+    assert _price(broker, token).status == 200
+    clock.now += 61
+    expired = _price(broker, token)
+    assert expired.status == 500
+    assert expired.payload["msg_cd"] == ka.KIS_EXPIRED_TOKEN_ERROR_CODE
+    assert _price(broker, "never-issued").payload["msg_cd"] == ka.KIS_EXPIRED_TOKEN_ERROR_CODE
+
+    fresh = _token(broker)
+    assert _price(broker, fresh).status == 200
+    broker.expire_tokens()
+    assert _price(broker, fresh).payload["msg_cd"] == ka.KIS_EXPIRED_TOKEN_ERROR_CODE
+
+
+def test_url_fetch_places_orders_and_reads_balance_against_the_simulator(simulator):
+    token = httpx.post(
+        f"{simulator.rest_url}/oauth2/tokenP",
+        json={"grant_type": "client_credentials", "appkey": "PSAPPKEY000", "appsecret": "secret"},
+    ).json()["access_token"]
+    context = ka.KISClientContext(
+        env=_Env(simulator.rest_url, token, "PSAPPKEY000", "secret", "01"),
+        svr="prod",
+        account_key="prod:12345678:01",
+    )
+    account = {"CANO": "12345678", "ACNT_PRDT_CD": "01"}
+
+    price = ka._url_fetch(
+        "/uapi/domestic-stock/v1/quotations/inquire-price",
+        "FHKST01010100",
+        "",
+        {"fid_cond_mrkt_div_code": "J", "fid_input_iscd": "005930"},
+        context=context,
+    )
+    assert price.isOK()
+    assert int(price.getBody().output["stck_prpr"]) > 0
+
+    order = ka._url_fetch(
+        "/uapi/domestic-stock/v1/trading/order-cash",
+        "TTTC0012U",
+        "",
+        {**account, "PDNO": "005930", "ORD_DVSN": "00", "ORD_QTY": "3", "ORD_UNPR": "70000"},
+        postFlag=True,
+        context=context,
+    )
+    assert order.isOK()
+    assert order.getBody().output["odno"]
+    assert order.getHeader().tr_id == "TTTC0012U"
+
+    balance = ka._url_fetch(
+        "/uapi/domestic-stock/v1/trading/inquire-balance", "TTTC8434R", "", account, context=context
+    )
+    assert balance.isOK()
+    [holding] = balance.getBody().output1
+    assert holding["pdno"] == "005930"
+    assert holding["hldg_qty"] == "3"
+    assert float(balance.getBody().output2[0]["dnca_tot_amt"]) == 100_000_000 - 3 * 70000
+
+    oversell = ka._url_fetch(
+        "/uapi/domestic-stock/v1/trading/order-cash",
+        "TTTC0011U",
+        "",
+        {**account, "PDNO": "005930", "ORD_DVSN": "01", "ORD_QTY": "5", "ORD_UNPR": "0"},
+        postFlag=True,
+        context=context,
+    )
+    assert not oversell.isOK()
+    assert simulator.stats()["orders"] == 1
+
+
+def test_websocket_stream_acknowledges_subscriptions_and_pushes_quotes(simulator):
+    from websockets.asyncio.client import connect
+
+    async def scenario():
+        async with connect(simulator.ws_url) as ws:
+            await ws.send(json.dumps({
+                "header": {"approval_key": "key", "custtype": "P", "tr_type": "1", "content-type": "utf-8"},
+                "body": {"input": {"tr_id": "H0STCNT0", "tr_key": "005930"}},
+            }))
+            ack = ka.system_resp(await asyncio.wait_for(ws.recv(), 5))
+            record = await asyncio.wait_for(ws.recv(), 5)
+            return ack, record
+
+    ack, record = asyncio.run(scenario())
+
+    assert ack.isOk and ack.tr_id == "H0STCNT0" and ack.tr_key == "005930"
+    assert ack.encrypt == "N"
+    marker, tr_id, count, data = record.split("|")
+    assert (marker, tr_id, count) == ("0", "H0STCNT0", "001")
+    fields = data.split("^")
+    assert fields[0] == "005930"
+    assert int(fields[2]) > 0
@@ -1,6 +1,12 @@
 from datetime import datetime, timezone
 
-from trading.market_hours import is_market_open, is_off_hours_order_available, next_market_open
+from trading.market_hours import (
+    current_off_hours_window,
+    is_market_open,
+    is_off_hours_order_available,
+    next_market_open,
+    next_off_hours_window,
+)
 
 
 def test_kr_market_open_during_session():
@@ -49,3 +55,33 @@ def test_us_reserved_order_window_is_available_in_kst():
 
 def test_us_reserved_order_maintenance_window_is_unavailable():
     assert is_off_hours_order_available("US", now=datetime(2026, 4, 8, 16, 35)) is False
+
+
+def test_next_off_hours_window_tracks_each_opening():
+    assert next_off_hours_window("KR", now=datetime(2026, 4, 8, 15, 0)) == (
+        "closing",
+        datetime(2026, 4, 8, 6, 40, tzinfo=timezone.utc),
+    )
+    assert next_off_hours_window("KR", now=datetime(2026, 4, 8, 15, 40)) == (
+        "reserved",
+        datetime(2026, 4, 8, 15, 10, tzinfo=timezone.utc),
+    )
+    assert next_off_hours_window("US", now=datetime(2026, 4, 8, 16, 35)) == (
+        "reserved",
+        datetime(2026, 4, 8, 7, 45, 1, tzinfo=timezone.utc),
+    )
+    assert next_off_hours_window("US", now=datetime(2026, 4, 8, 23, 30))[1] == datetime(
+        2026, 4, 9, 1, 0, tzinfo=timezone.utc
+    )
+
+
+def test_current_off_hours_window_reports_when_the_open_window_opened():
+    assert current_off_hours_window("KR", now=datetime(2026, 4, 8, 8, 0)) is None
+    assert current_off_hours_window("KR", now=datetime(2026, 4, 8, 20, 0)) == (
+        "closing",
+        datetime(2026, 4, 8, 6, 40, tzinfo=timezone.utc),
+    )
+    assert current_off_hours_window("US", now=datetime(2026, 4, 8, 9, 0)) is None
+    assert current_off_hours_window("US", now=datetime(2026, 4, 8, 18, 0))[1] == datetime(
+        2026, 4, 8, 7, 45, 1, tzinfo=timezone.utc
+    )
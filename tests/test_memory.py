@@ -0,0 +1,121 @@
+import asyncio
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+
+from trading import domestic as dst
+from trading import memory, metrics
+from trading.memory import MemoryWatch
+from trading.stock_locks import StockLockMap, stock_lock_totals
+from webui.app import WebUISettings, create_app
+
+
+@pytest.mark.asyncio
+async def test_stock_lock_map_evicts_least_recently_used_idle_locks():
+    locks = StockLockMap(max_entries=2)
+    locks["A"] = asyncio.Lock()
+    locks["B"] = asyncio.Lock()
+    locks["A"]  # touch A so B is the least recently used
+    locks["C"] = asyncio.Lock()
+
+    assert list(locks) == ["A", "C"]
+    assert locks.evictions == 1
+
+    held = locks["A"]
+    await held.acquire()
+    waiter = asyncio.create_task(held.acquire())
+    await asyncio.sleep(0)
+    locks["D"] = asyncio.Lock()
+    locks["E"] = asyncio.Lock()
+
+    assert list(locks) == ["A", "E"]
+    assert locks["A"] is held
+    held.release()
+    await waiter
+    held.release()
+
+
+@pytest.mark.asyncio
+async def test_traders_keep_a_bounded_lock_map(monkeypatch):
+    monkeypatch.setenv("STOCK_LOCK_CACHE_SIZE", "3")
+    trader = dst.DomesticStockTrading.__new__(dst.DomesticStockTrading)
+    trader._reset_async_primitives()
+    before_entries, _ = stock_lock_totals()
+
+    first = await trader._get_stock_lock("000001")
+    assert await trader._get_stock_lock("000001") is first
+    for code in range(2, 20):
+        await trader._get_stock_lock(f"{code:06d}")
+
+    assert isinstance(trader._stock_locks, StockLockMap)
+    assert len(trader._stock_locks) == 3
+    assert stock_lock_totals()[0] >= before_entries + 3
+    assert memory.cache_sizes()["trader.stock_locks"] == stock_lock_totals()[0]
+
+
+def test_cache_sizes_cover_long_lived_structures():
+    from trading import kis_auth  # noqa: F401 - registers the websocket maps
+
+    sizes = memory.cache_sizes()
+
+    assert {
+        "trader.stock_locks",
+        "kis_auth.open_map",
+        "kis_auth.data_map",
+        "trader_pool.traders",
+        "execution_ledger.entries",
+        "off_hours_queue.items",
+    } <= set(sizes)
+
+    memory.register_cache("broken", lambda: 1 / 0)
+    try:
+        assert "broken" not in memory.cache_sizes()
+    finally:
+        memory._CACHES.pop("broken")
+
+
+_RETAINED = []
+
+
+def _grow(blocks: int) -> None:
+    _RETAINED.extend(bytearray(4096) for _ in range(blocks))
+
+
+def test_memory_watch_reports_top_allocation_growth():
+    assert not tracemalloc.is_tracing()
+    watch = MemoryWatch(3600).start()
+    try:
+        _grow(256)
+        report = watch.snapshot()
+    finally:
+        watch.stop()
+        _RETAINED.clear()
+
+    assert not tracemalloc.is_tracing()
+    assert report.tracemalloc and report.snapshots == 2
+    top = report.since_previous[0]
+    assert top.location.endswith("test_memory.py:" + str(_grow.__code__.co_firstlineno + 1))
+    assert top.size_diff >= 256 * 4096
+    assert report.since_start[0].location == top.location
+    assert metrics.TRACEMALLOC_BYTES.value() == report.traced_bytes
+
+
+def test_start_memory_watch_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("MEMORY_SNAPSHOT_SECONDS", raising=False)
+
+    assert memory.start_memory_watch() is None
+    assert memory.start_memory_watch(0) is None
+
+
+def test_webui_memory_page_shows_caches_and_metrics():
+    client = TestClient(create_app(WebUISettings(csrf_token="local-webui")), base_url="http://127.0.0.1")
+
+    page = client.get("/memory")
+    summary = client.get("/memory/api").json()
+    exported = client.get("/metrics").text
+
+    assert page.status_code == 200
+    assert "trader.stock_locks" in page.text
+    assert summary["ok"] and "kis_auth.open_map" in summary["report"]["caches"]
+    assert 'prism_cache_entries{cache="trader.stock_locks"}' in exported
@@ -0,0 +1,166 @@
+import asyncio
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import subscriber
+from trading import kis_auth as ka
+from trading import metrics
+from trading.dispatch import TradeDispatcher
+from trading.execution_ledger import ExecutionLedger
+from trading.kis_simulator import KISSimulator, SimulatorConfig
+from trading.metrics import MetricsRegistry, MetricsServer
+from trading.off_hours_queue import OffHoursOrderQueue, QueueCapacityError
+from trading.rate_limit import KISRateLimiter
+from trading.schema import parse_signal_payload
+from webui.app import WebUISettings, create_app
+
+_Env = namedtuple("KISEnv", "my_url my_token my_app my_sec my_prod")
+
+
+class _Message:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.message_id = "metrics-1"
+
+    def ack(self):
+        pass
+
+    def nack(self):
+        pass
+
+
+def test_registry_renders_prometheus_text_with_cumulative_buckets():
+    registry = MetricsRegistry()
+    counter = registry.counter("demo_total", "Demo counter.", ("outcome",))
+    histogram = registry.histogram("demo_seconds", "Demo latency.", ("tr_id",), buckets=(0.1, 1.0))
+    gauge = registry.gauge("demo_depth", "Demo depth.")
+
+    counter.inc(outcome='say "hi"')
+    counter.inc(2, outcome='say "hi"')
+    histogram.observe(0.05, tr_id="T1")
+    histogram.observe(0.1, tr_id="T1")
+    histogram.observe(3.0, tr_id="T1")
+    gauge.set(7)
+
+    text = registry.render()
+
+    assert '# TYPE demo_total counter\ndemo_total{outcome="say \\"hi\\""} 3' in text
+    assert 'demo_seconds_bucket{tr_id="T1",le="0.1"} 2' in text
+    assert 'demo_seconds_bucket{tr_id="T1",le="1"} 2' in text
+    assert 'demo_seconds_bucket{tr_id="T1",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{tr_id="T1"} 3' in text
+    assert "demo_depth 7" in text
+    assert registry.counter("demo_total", "Demo counter.", ("outcome",)) is counter
+    with pytest.raises(ValueError):
+        registry.gauge("demo_total", "Different type.")
+    with pytest.raises(ValueError):
+        counter.inc(kind="missing outcome label")
+
+
+def test_metrics_server_and_webui_route_expose_the_registry():
+    metrics.PUBSUB_MESSAGES.inc(0, outcome="received")
+
+    server = MetricsServer("127.0.0.1", 0).start()
+    try:
+        host, port = server.address
+        response = httpx.get(f"http://{host}:{port}/metrics")
+        missing = httpx.get(f"http://{host}:{port}/other")
+    finally:
+        server.stop()
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE prism_pubsub_messages_total counter" in response.text
+    assert missing.status_code == 404
+
+    webui = TestClient(create_app(WebUISettings(csrf_token="local-webui")), base_url="http://127.0.0.1")
+    page = webui.get("/metrics")
+    assert page.status_code == 200
+    assert "# TYPE prism_kis_request_seconds histogram" in page.text
+
+
+def test_pubsub_outcomes_and_dispatch_latency_are_counted(tmp_path):
+    received = metrics.PUBSUB_MESSAGES.value(outcome="received")
+    acked = metrics.PUBSUB_MESSAGES.value(outcome="acked")
+    nacked = metrics.PUBSUB_MESSAGES.value(outcome="nacked")
+    dry_runs = metrics.DISPATCH_SECONDS.count(status="dry-run")
+
+    dispatcher = TradeDispatcher(dry_run=True, trading_mode="demo", queue_path=tmp_path / "queue.json")
+    subscriber._handle_message(
+        _Message(b'{"type":"BUY","ticker":"005930","market":"KR","price":82000}'), dispatcher
+    )
+
+    class FullQueueDispatcher:
+        async def dispatch(self, signal):
+            raise QueueCapacityError("full")
+
+    subscriber._handle_message(
+        _Message(b'{"type":"BUY","ticker":"005930","market":"KR","price":82000}'), FullQueueDispatcher()
+    )
+
+    assert metrics.PUBSUB_MESSAGES.value(outcome="received") == received + 2
+    assert metrics.PUBSUB_MESSAGES.value(outcome="acked") == acked + 1
+    assert metrics.PUBSUB_MESSAGES.value(outcome="nacked") == nacked + 1
+    assert metrics.DISPATCH_SECONDS.count(status="dry-run") == dry_runs + 1
+
+
+def test_queue_depth_and_ledger_size_follow_writes(tmp_path):
+    queue = OffHoursOrderQueue(tmp_path / "queue.json")
+    queue.enqueue(parse_signal_payload({"type": "BUY", "ticker": "005930", "market": "KR", "price": 82000}))
+    queue.enqueue(parse_signal_payload({"type": "BUY", "ticker": "000660", "market": "KR", "price": 1000}))
+    assert metrics.QUEUE_DEPTH.value(status="pending") == 2
+    assert metrics.QUEUE_DEPTH.value(status="failed") == 0
+
+    ledger = ExecutionLedger(tmp_path / "ledger.json")
+    ledger.claim("a")
+    ledger.claim("b")
+    ledger.finalize("a", "executed")
+    assert metrics.LEDGER_ENTRIES.value() == 2
+
+    later = datetime.now(timezone.utc) + timedelta(days=30)
+    queue.drain_due(lambda payload: None, now=later)
+    assert metrics.QUEUE_DEPTH.value(status="pending") == 0
+
+
+def test_kis_requests_are_timed_per_tr_id_and_rate_limit_retries_counted(monkeypatch):
+    monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_BASE_SECONDS", 0.0)
+    monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_ATTEMPTS", 3)
+    monkeypatch.setattr(ka, "KIS_RATE_LIMITER", KISRateLimiter())
+    retries = metrics.KIS_RETRIES.value(code=ka.KIS_RATE_LIMIT_ERROR_CODE)
+    ok = metrics.KIS_REQUEST_SECONDS.count(tr_id="FHKST01010100", result="ok")
+    limited = metrics.KIS_REQUEST_SECONDS.count(
+        tr_id="FHKST01010100", result=ka.KIS_RATE_LIMIT_ERROR_CODE
+    )
+
+    with KISSimulator(SimulatorConfig(real_rate_limit=1, prices={"005930": 70000}, seed=3)) as simulator:
+        token = httpx.post(
+            f"{simulator.rest_url}/oauth2/tokenP",
+            json={"grant_type": "client_credentials", "appkey": "PSAPPKEY000", "appsecret": "secret"},
+        ).json()["access_token"]
+        context = ka.KISClientContext(
+            env=_Env(simulator.rest_url, token, "PSAPPKEY000", "secret", "01"),
+            svr="prod",
+            account_key="prod:12345678:01",
+        )
+
+        async def fetch_twice():
+            params = {"fid_cond_mrkt_div_code": "J", "fid_input_iscd": "005930"}
+            path = "/uapi/domestic-stock/v1/quotations/inquire-price"
+            first = await ka._url_fetch_async(path, "FHKST01010100", "", params, context=context)
+            second = await ka._url_fetch_async(path, "FHKST01010100", "", params, context=context)
+            await ka.KIS_ASYNC_HTTP_POOL.aclose()
+            return first, second
+
+        first, second = asyncio.run(fetch_twice())
+
+    assert first.isOK()
+    assert second.getErrorCode() == ka.KIS_RATE_LIMIT_ERROR_CODE
+    assert metrics.KIS_REQUEST_SECONDS.count(tr_id="FHKST01010100", result="ok") == ok + 1
+    assert metrics.KIS_REQUEST_SECONDS.count(
+        tr_id="FHKST01010100", result=ka.KIS_RATE_LIMIT_ERROR_CODE
+    ) == limited + 3
+    assert metrics.KIS_RETRIES.value(code=ka.KIS_RATE_LIMIT_ERROR_CODE) == retries + 2
+    assert simulator.stats()["rate_limited"] == 3
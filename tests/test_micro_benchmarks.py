@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from benchmarks.micro import CASES, Measurement, load_baselines, measure, regressions
+
+REQUIRED_TARGETS = (
+    "schema.parse_signal_bytes",
+    "execution_identity",
+    "claim_finalize",
+    "off_hours_queue.enqueue",
+    "off_hours_queue.drain_due",
+    "is_market_open[KR]",
+    "is_market_open[US]",
+    "next_market_open[KR]",
+    "next_market_open[US]",
+    "extract_channel_posts",
+    "mask_text",
+)
+
+
+def test_suite_covers_hot_paths_and_every_case_has_a_baseline():
+    for target in REQUIRED_TARGETS:
+        assert any(target in name for name in CASES), target
+    assert set(load_baselines()) >= set(CASES)
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_micro_benchmark_case_runs(name, tmp_path):
+    operation = CASES[name].setup(tmp_path)
+
+    operation()
+
+
+def test_regressions_flag_medians_over_tolerance():
+    baselines = {"fast": {"median_us": 10.0, "min_us": 9.0}, "slow": {"median_us": 10.0, "min_us": 9.0}}
+    measurements = [Measurement("fast", 100, 14.0, 13.0), Measurement("slow", 100, 16.0, 15.0), Measurement("new", 1, 5.0, 5.0)]
+
+    failures = regressions(measurements, baselines, tolerance=1.5)
+
+    assert len(failures) == 1
+    assert failures[0].startswith("slow: 16.00 us vs baseline 10.00 us")
+
+
+@pytest.mark.skipif(not os.getenv("PRISM_RUN_MICRO_BENCHMARKS"), reason="set PRISM_RUN_MICRO_BENCHMARKS=1 to compare with baselines")
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_micro_benchmark_within_baseline(name, tmp_path):
+    measurement = measure(CASES[name], tmp_path)
+
+    assert regressions([measurement], load_baselines()) == []
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from pathlib import Path
 
 import pytest
 
 from trading.dispatch import DispatchResult, TradeDispatcher
-from trading.off_hours_queue import OffHoursOrderQueue
+from trading.dispatch_lanes import LaneScheduler
+from trading.off_hours_queue import OffHoursOrderQueue, queue_payload
 from trading.schema import parse_signal_payload
 
 
@@ -20,11 +23,18 @@ def account(name: str, number: str, *, market: str = "kr", product: str = "01")
     }
 
 
-def make_dispatcher(monkeypatch, tmp_path: Path, *, strategy_config: dict | None = None) -> TradeDispatcher:
+def make_dispatcher(
+    monkeypatch,
+    tmp_path: Path,
+    *,
+    strategy_config: dict | None = None,
+    multi_account: dict | None = None,
+) -> TradeDispatcher:
+    setting = {"enabled": True, **(multi_account or {})}
     monkeypatch.setattr(
         TradeDispatcher,
         "_load_runtime_config",
-        staticmethod(lambda: {"multi_account_trading": {"enabled": True}}),
+        staticmethod(lambda: {"multi_account_trading": setting}),
     )
     return TradeDispatcher(
         trading_mode="demo",
@@ -163,6 +173,45 @@ async def test_multi_account_queue_preserves_original_targets_and_skips_changed_
     ]
 
 
+@pytest.mark.asyncio
+async def test_batched_multi_account_queue_items_keep_lane_order_on_one_ticker(monkeypatch, tmp_path):
+    accounts = [account("KR-A", "11111111"), account("KR-B", "22222222")]
+    calls: list[tuple[str, float]] = []
+    calendar_checks = 0
+
+    def slow_first_calendar_check(market):
+        nonlocal calendar_checks
+        calendar_checks += 1
+        if calendar_checks == 1:
+            # The first queued item's check finishes after the second one's.
+            time.sleep(0.2)
+        return True
+
+    monkeypatch.setattr("trading.dispatch.ka.get_configured_accounts", lambda **kwargs: accounts)
+    monkeypatch.setattr("trading.dispatch._BROKER_LANES", LaneScheduler(8))
+    monkeypatch.setattr("trading.dispatch.is_market_open", lambda market: False)
+    dispatcher = make_dispatcher(monkeypatch, tmp_path, multi_account={"max_concurrency": 2})
+    for price in (1000, 2000):
+        await dispatcher.dispatch(
+            parse_signal_payload({"type": "BUY", "ticker": "005930", "market": "KR", "price": price})
+        )
+
+    async def execute(self, signal, *, account=None):
+        calls.append((account["name"], signal.price))
+        return DispatchResult("executed", "sent", signal.signal_type, signal.market)
+
+    monkeypatch.setattr(TradeDispatcher, "_execute_legacy_trade", execute)
+    monkeypatch.setattr("trading.dispatch.is_market_open", slow_first_calendar_check)
+
+    outcomes = await dispatcher._execute_queued_batch(
+        [queue_payload(item) for item in dispatcher.queue.items()]
+    )
+
+    assert [outcome.disposition for outcome in outcomes] == ["processed", "processed"]
+    for name in ("KR-A", "KR-B"):
+        assert [price for account_name, price in calls if account_name == name] == [1000, 2000]
+
+
 @pytest.mark.asyncio
 async def test_multi_account_duplicate_signal_is_suppressed_per_account(monkeypatch, tmp_path):
     accounts = [account("KR-A", "11111111"), account("KR-B", "22222222")]
@@ -243,3 +292,52 @@ async def test_multi_account_dispatch_skips_disabled_account(monkeypatch, tmp_pa
         ("KR-B", "skipped"),
         ("KR-A", "executed"),
     ]
+
+
+@pytest.mark.asyncio
+async def test_multi_account_fan_out_runs_accounts_concurrently_within_limit(monkeypatch, tmp_path):
+    accounts = [account(f"KR-{index}", f"{index}" * 8) for index in range(1, 6)]
+    in_flight = 0
+    peak = 0
+
+    monkeypatch.setattr("trading.dispatch.ka.get_configured_accounts", lambda **kwargs: accounts)
+    monkeypatch.setattr("trading.dispatch.is_market_open", lambda market: True)
+    monkeypatch.setattr("trading.dispatch._BROKER_LANES", LaneScheduler(8))
+
+    async def execute(self, signal, *, account=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Finish in reverse order to show results keep the configured order.
+        await asyncio.sleep(0.3 - 0.05 * int(account["account"][0]))
+        in_flight -= 1
+        if account["name"] == "KR-2":
+            raise RuntimeError("B credential rejected")
+        return DispatchResult("executed", "sent", signal.signal_type, signal.market)
+
+    monkeypatch.setattr(TradeDispatcher, "_execute_legacy_trade", execute)
+    dispatcher = make_dispatcher(monkeypatch, tmp_path, multi_account={"max_concurrency": 3})
+    signal = parse_signal_payload({"id": "fan-out", "type": "BUY", "ticker": "005930", "market": "KR", "price": 82000})
+
+    result = await dispatcher.dispatch(signal)
+    replay = await dispatcher.dispatch(signal)
+
+    assert dispatcher.multi_account_dispatcher.max_concurrency == 3
+    assert peak == 3
+    assert result.status == "partial_success"
+    assert [(item.account, item.status) for item in result.accounts] == [
+        ("KR-1", "executed"),
+        ("KR-2", "failed"),
+        ("KR-3", "executed"),
+        ("KR-4", "executed"),
+        ("KR-5", "executed"),
+    ]
+    assert replay.status == "skipped"
+    assert [item.status for item in replay.accounts] == ["skipped"] * 5
+
+
+@pytest.mark.parametrize("value", [0, "many", 1.5])
+def test_multi_account_invalid_max_concurrency_falls_back_to_sequential(monkeypatch, tmp_path, value):
+    dispatcher = make_dispatcher(monkeypatch, tmp_path, multi_account={"max_concurrency": value})
+
+    assert dispatcher.multi_account_dispatcher.max_concurrency == 1
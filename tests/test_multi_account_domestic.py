@@ -1,9 +1,9 @@
 import threading
-import time
 from datetime import datetime
 from types import SimpleNamespace
 
 import pytest
+from conftest import awaitable
 
 from trading import domestic as dst
 
@@ -95,48 +95,56 @@ async def test_multi_account_trading_context_fans_out_orders_but_reads_primary(m
         assert trader.get_portfolio() == [{"account_name": "kr-primary"}]
 
 
-def test_domestic_request_serializes_activation_and_fetch(monkeypatch):
-    order = []
-    barrier = threading.Barrier(2)
-    results = []
-    results_lock = threading.Lock()
+def test_domestic_requests_pass_account_context_without_shared_lock(monkeypatch):
+    barrier = threading.Barrier(2, timeout=1)
+    seen = []
 
-    trader = dst.DomesticStockTrading.__new__(dst.DomesticStockTrading)
-
-    def fake_activate():
-        order.append(f"activate-{threading.current_thread().name}")
-
-    def fake_fetch(api_url, tr_id, hashkey, params, **kwargs):
-        order.append(f"fetch-start-{threading.current_thread().name}")
-        time.sleep(0.05)
-        order.append(f"fetch-end-{threading.current_thread().name}")
+    def fake_fetch(api_url, tr_id, tr_cont, params, *, context, on_token_refresh, **kwargs):
+        barrier.wait()
+        seen.append((context, on_token_refresh.__self__))
         return {"api_url": api_url, "tr_id": tr_id}
 
-    trader._activate_account = fake_activate
     monkeypatch.setattr(dst.ka, "_url_fetch", fake_fetch)
+    traders = []
+    for account in ("11111111", "22222222"):
+        trader = dst.DomesticStockTrading.__new__(dst.DomesticStockTrading)
+        trader._adopt_client_context(
+            dst.ka.KISClientContext(
+                env=SimpleNamespace(my_token=account, my_app="PSVTAPP", my_sec="secret"),
+                svr="vps",
+                account_key=f"vps:{account}:01",
+            )
+        )
+        traders.append(trader)
 
-    def worker():
-        barrier.wait()
-        value = dst.DomesticStockTrading._request(trader, "/uapi/test", "TEST0001", {})
-        with results_lock:
-            results.append(value)
-
-    thread_a = threading.Thread(target=worker, name="A")
-    thread_b = threading.Thread(target=worker, name="B")
-    thread_a.start()
-    thread_b.start()
-    thread_a.join()
-    thread_b.join()
+    threads = [
+        threading.Thread(target=trader._request, args=("/uapi/test", "TEST0001", {}))
+        for trader in traders
+    ]
+    with dst.ka.get_trading_env_lock():
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=2)
 
-    assert len(results) == 2
-    assert len(order) == 6
+    assert not barrier.broken
+    assert {context.account_key: owner for context, owner in seen} == {
+        "vps:11111111:01": traders[0],
+        "vps:22222222:01": traders[1],
+    }
 
 
 def test_domestic_trader_uses_account_buy_amount_override(monkeypatch):
     account = {"name": "kr-override", "account_key": "vps:10101010:01", "product": "01", "buy_amount_krw": 54321}
     monkeypatch.setattr(dst.ka, "resolve_account", lambda **kwargs: account)
     monkeypatch.setattr(dst.ka, "auth", lambda **kwargs: None)
-    monkeypatch.setattr(dst.ka, "getTREnv", lambda: SimpleNamespace(my_acct="10101010", my_prod="01", my_token="token"))
+    monkeypatch.setattr(
+        dst.ka,
+        "getTREnv",
+        lambda: SimpleNamespace(
+            my_acct="10101010", my_prod="01", my_token="token", my_app="PSVTAPP", my_sec="secret"
+        ),
+    )
 
     trader = dst.DomesticStockTrading(mode="demo", account_name="kr-override")
 
@@ -251,9 +259,9 @@ async def test_async_buy_uses_lower_limit_for_affordability(monkeypatch):
     trader._semaphore = dst.asyncio.Semaphore(1)
     trader._global_lock = dst.asyncio.Lock()
     trader._resolve_buy_amount = lambda buy_amount=None: 100
-    trader.get_current_price = lambda stock_code: {"current_price": 110}
+    trader.async_get_current_price = awaitable(lambda stock_code: {"current_price": 110})
     calls = []
-    trader.smart_buy = (
+    trader.async_smart_buy = awaitable(
         lambda stock_code, buy_amount=None, limit_price=None: calls.append(
             (stock_code, buy_amount, limit_price)
         )
@@ -285,7 +293,7 @@ async def test_async_sell_reuses_verified_holding_quantity(monkeypatch):
     trader._stock_locks = {}
     trader._semaphore = dst.asyncio.Semaphore(1)
     trader._global_lock = dst.asyncio.Lock()
-    trader.get_portfolio = lambda **kwargs: [
+    trader._async_inquire_portfolio = awaitable(lambda **kwargs: ([
         {
             "stock_code": "005930",
             "quantity": 18,
@@ -293,8 +301,8 @@ async def test_async_sell_reuses_verified_holding_quantity(monkeypatch):
             "profit_amount": 1000,
             "profit_rate": 1.2,
         }
-    ]
-    trader.get_current_price = lambda stock_code: {"current_price": 70000}
+    ], None))
+    trader.async_get_current_price = awaitable(lambda stock_code: {"current_price": 70000})
 
     def fail_if_rechecked(stock_code):
         raise AssertionError("holding quantity should not be rechecked after portfolio verification")
@@ -312,7 +320,7 @@ async def test_async_sell_reuses_verified_holding_quantity(monkeypatch):
         }
 
     trader.get_holding_quantity = fail_if_rechecked
-    trader.smart_sell_all = fake_smart_sell_all
+    trader.async_smart_sell_all = awaitable(fake_smart_sell_all)
 
     result = await trader._execute_sell_stock("005930", limit_price=70000)
 
@@ -327,7 +335,7 @@ async def test_async_sell_without_limit_preserves_market_order_intent(monkeypatc
     trader._stock_locks = {}
     trader._semaphore = dst.asyncio.Semaphore(1)
     trader._global_lock = dst.asyncio.Lock()
-    trader.get_portfolio = lambda **kwargs: [
+    trader._async_inquire_portfolio = awaitable(lambda **kwargs: ([
         {
             "stock_code": "005930",
             "quantity": 18,
@@ -335,8 +343,8 @@ async def test_async_sell_without_limit_preserves_market_order_intent(monkeypatc
             "profit_amount": 1000,
             "profit_rate": 1.2,
         }
-    ]
-    trader.get_current_price = lambda stock_code: {"current_price": 70000}
+    ], None))
+    trader.async_get_current_price = awaitable(lambda stock_code: {"current_price": 70000})
     calls = []
 
     def fake_smart_sell_all(stock_code, limit_price=None, holding_quantity=None):
@@ -349,7 +357,7 @@ async def test_async_sell_without_limit_preserves_market_order_intent(monkeypatc
             "message": "sold",
         }
 
-    trader.smart_sell_all = fake_smart_sell_all
+    trader.async_smart_sell_all = awaitable(fake_smart_sell_all)
 
     result = await trader._execute_sell_stock("005930")
 
@@ -383,6 +391,56 @@ def test_get_portfolio_can_raise_temporary_kis_inquiry_failure():
         trader.get_portfolio(raise_on_error=True)
 
 
+@pytest.mark.asyncio
+async def test_concurrent_portfolio_inquiries_report_only_their_own_error():
+    trader = dst.DomesticStockTrading.__new__(dst.DomesticStockTrading)
+    trader.mode = "demo"
+    trader.trenv = SimpleNamespace(my_acct="12345678", my_prod="01")
+    failed_sent = dst.asyncio.Event()
+
+    class Failed:
+        @staticmethod
+        def isOK():
+            return False
+
+        @staticmethod
+        def getErrorCode():
+            return "EGW00215"
+
+        @staticmethod
+        def getErrorMessage():
+            return "ledger request rate limit exceeded"
+
+    class Empty:
+        @staticmethod
+        def isOK():
+            return True
+
+        @staticmethod
+        def getBody():
+            return SimpleNamespace(output1=[], output2=[{}])
+
+    responses = iter([Empty(), Failed()])
+
+    async def request(*args, **kwargs):
+        response = next(responses)
+        if isinstance(response, Empty):
+            # Resolve only after the other call on this trader has failed.
+            await failed_sent.wait()
+        else:
+            failed_sent.set()
+        return response
+
+    trader._request_async = request
+
+    ok, failed = await dst.asyncio.gather(
+        trader._async_inquire_portfolio(), trader._async_inquire_portfolio()
+    )
+
+    assert ok == ([], None)
+    assert failed[0] == [] and "EGW00215" in failed[1]
+
+
 @pytest.mark.asyncio
 async def test_async_sell_surfaces_portfolio_inquiry_failure_without_order_submission():
     trader = dst.DomesticStockTrading.__new__(dst.DomesticStockTrading)
@@ -390,10 +448,11 @@ async def test_async_sell_surfaces_portfolio_inquiry_failure_without_order_submi
     trader._semaphore = dst.asyncio.Semaphore(1)
     trader._global_lock = dst.asyncio.Lock()
 
-    trader.get_portfolio = lambda: []
-    trader._last_portfolio_inquiry_error = "Balance inquiry failed: EGW00215 - ledger rate limit exceeded"
-    trader.get_current_price = lambda stock_code: pytest.fail("price lookup must not run")
-    trader.smart_sell_all = lambda *args, **kwargs: pytest.fail("sell order must not run")
+    trader._async_inquire_portfolio = awaitable(
+        lambda: ([], "Balance inquiry failed: EGW00215 - ledger rate limit exceeded")
+    )
+    trader.async_get_current_price = awaitable(lambda stock_code: pytest.fail("price lookup must not run"))
+    trader.async_smart_sell_all = awaitable(lambda *args, **kwargs: pytest.fail("sell order must not run"))
 
     result = await trader._execute_sell_stock("005930")
 
@@ -1,11 +1,25 @@
 import threading
 import re
 import time
+from collections import namedtuple
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
 
 from trading import kis_auth as ka
+from trading.rate_limit import KISRateLimiter, RateLimit
+
+
+def _fake_rate_limiter(sleep):
+    now = [0.0]
+
+    def advance(seconds):
+        sleep(seconds)
+        now[0] += seconds
+
+    limit = RateLimit(per_second=1000.0)
+    return KISRateLimiter({"prod": limit, "vps": limit}, clock=lambda: now[0], sleep=advance)
 
 
 def _patch_cfg(monkeypatch, cfg):
@@ -335,7 +349,7 @@ def test_url_fetch_retries_kis_rate_limit_then_succeeds(monkeypatch):
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_ATTEMPTS", 3)
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_BASE_SECONDS", 0.25)
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_MAX_SECONDS", 1.0)
-    monkeypatch.setattr(ka.time, "sleep", lambda seconds: sleeps.append(seconds))
+    monkeypatch.setattr(ka, "KIS_RATE_LIMITER", _fake_rate_limiter(sleeps.append))
 
     def fake_post(url, headers, data, **kwargs):
         calls.append((url, headers, data))
@@ -350,7 +364,7 @@ def test_url_fetch_retries_kis_rate_limit_then_succeeds(monkeypatch):
             )
         return _FakeResponse(200, {"rt_cd": "0", "msg_cd": "0", "msg1": "OK", "output": {}})
 
-    monkeypatch.setattr(ka.requests, "post", fake_post)
+    monkeypatch.setattr(ka, "_http_post", fake_post)
 
     response = ka._url_fetch("/uapi/test", "TTTC0012U", "", {"PDNO": "085620"}, postFlag=True)
 
@@ -372,7 +386,7 @@ def test_url_fetch_retries_kis_ledger_rate_limit_then_succeeds(monkeypatch):
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_ATTEMPTS", 3)
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_BASE_SECONDS", 0.25)
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_MAX_SECONDS", 1.0)
-    monkeypatch.setattr(ka.time, "sleep", lambda seconds: sleeps.append(seconds))
+    monkeypatch.setattr(ka, "KIS_RATE_LIMITER", _fake_rate_limiter(sleeps.append))
 
     def fake_post(url, headers, data, **kwargs):
         calls.append((url, headers, data))
@@ -387,7 +401,7 @@ def test_url_fetch_retries_kis_ledger_rate_limit_then_succeeds(monkeypatch):
             )
         return _FakeResponse(200, {"rt_cd": "0", "msg_cd": "0", "msg1": "OK", "output": {}})
 
-    monkeypatch.setattr(ka.requests, "post", fake_post)
+    monkeypatch.setattr(ka, "_http_post", fake_post)
 
     response = ka._url_fetch("/uapi/test", "TTTC0012U", "", {"PDNO": "085620"}, postFlag=True)
 
@@ -409,7 +423,7 @@ def test_url_fetch_stops_after_configured_rate_limit_retries(monkeypatch):
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_ATTEMPTS", 2)
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_BASE_SECONDS", 0.5)
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_MAX_SECONDS", 1.0)
-    monkeypatch.setattr(ka.time, "sleep", lambda seconds: sleeps.append(seconds))
+    monkeypatch.setattr(ka, "KIS_RATE_LIMITER", _fake_rate_limiter(sleeps.append))
 
     def fake_get(url, headers, params, **kwargs):
         calls.append((url, headers, params))
@@ -422,7 +436,7 @@ def test_url_fetch_stops_after_configured_rate_limit_retries(monkeypatch):
             },
         )
 
-    monkeypatch.setattr(ka.requests, "get", fake_get)
+    monkeypatch.setattr(ka, "_http_get", fake_get)
 
     response = ka._url_fetch("/uapi/test", "FHKST01010100", "", {"fid_input_iscd": "085620"})
 
@@ -442,13 +456,17 @@ def test_url_fetch_does_not_retry_non_rate_limit_errors(monkeypatch):
     monkeypatch.setattr(ka, "_getBaseHeader", lambda: {})
     monkeypatch.setattr(ka, "isPaperTrading", lambda: False)
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_ATTEMPTS", 3)
-    monkeypatch.setattr(ka.time, "sleep", lambda seconds: pytest.fail("unexpected retry sleep"))
+    monkeypatch.setattr(
+        ka,
+        "KIS_RATE_LIMITER",
+        _fake_rate_limiter(lambda seconds: pytest.fail("unexpected retry sleep")),
+    )
 
     def fake_get(url, headers, params, **kwargs):
         calls.append((url, headers, params))
         return _FakeResponse(500, {"rt_cd": "1", "msg_cd": "OTHER", "msg1": "other failure"})
 
-    monkeypatch.setattr(ka.requests, "get", fake_get)
+    monkeypatch.setattr(ka, "_http_get", fake_get)
 
     response = ka._url_fetch("/uapi/test", "FHKST01010100", "", {})
 
@@ -490,7 +508,7 @@ def test_url_fetch_refreshes_expired_token_once(monkeypatch):
             )
         return _FakeResponse(200, {"rt_cd": "0", "msg_cd": "0", "msg1": "OK", "output": {}})
 
-    monkeypatch.setattr(ka.requests, "get", fake_get)
+    monkeypatch.setattr(ka, "_http_get", fake_get)
 
     response = ka._url_fetch("/uapi/test", "TTTC8434R", "", {"CANO": "12345678"})
 
@@ -501,6 +519,105 @@ def test_url_fetch_refreshes_expired_token_once(monkeypatch):
     assert calls[1][1]["authorization"] == "Bearer token-1"
 
 
+def test_url_fetch_with_client_context_refreshes_only_that_account(monkeypatch):
+    calls = []
+    adopted = []
+    env = namedtuple("KISEnv", "my_url my_token my_app my_sec")(
+        "https://openapivts.example.com", "token-0", "PSVTAPP", "paper-secret"
+    )
+    context = ka.KISClientContext(env=env, svr="vps", account_key="vps:12345678:01")
+
+    def fail_shared_env(*args, **kwargs):
+        raise AssertionError("context requests must not use the shared environment")
+
+    monkeypatch.setattr(ka, "getTREnv", fail_shared_env)
+    monkeypatch.setattr(ka, "_getBaseHeader", fail_shared_env)
+    monkeypatch.setattr(ka, "_refresh_after_expired_token_response", fail_shared_env)
+    monkeypatch.setattr(
+        ka,
+        "refresh_client_context",
+        lambda current: current.with_env(current.env._replace(my_token="token-1")),
+    )
+    monkeypatch.setattr(ka, "KIS_RATE_LIMITER", _fake_rate_limiter(lambda seconds: None))
+
+    def fake_get(url, headers, params, **kwargs):
+        calls.append((url, dict(headers)))
+        if len(calls) == 1:
+            return _FakeResponse(500, {"rt_cd": "1", "msg_cd": "EGW00123", "msg1": "expired"})
+        return _FakeResponse(200, {"rt_cd": "0", "msg_cd": "0", "msg1": "OK", "output": {}})
+
+    monkeypatch.setattr(ka, "_http_get", fake_get)
+
+    response = ka._url_fetch(
+        "/uapi/test", "TTTC8434R", "", {}, context=context, on_token_refresh=adopted.append
+    )
+
+    assert response.isOK()
+    assert calls[0][0] == "https://openapivts.example.com/uapi/test"
+    assert [headers["authorization"] for _url, headers in calls] == ["Bearer token-0", "Bearer token-1"]
+    assert {headers["tr_id"] for _url, headers in calls} == {"VTTC8434R"}
+    assert calls[0][1]["appkey"] == "PSVTAPP"
+    assert [item.env.my_token for item in adopted] == ["token-1"]
+    assert context.env.my_token == "token-0"
+
+
+def test_url_fetch_adopts_token_reissued_in_background(monkeypatch):
+    calls = []
+    adopted = []
+    env = namedtuple("KISEnv", "my_url my_token my_app my_sec")(
+        "https://openapivts.example.com", "token-old", "PSVTAPP", "paper-secret"
+    )
+    context = ka.KISClientContext(env=env, svr="vps", account_key="vps:12345678:01")
+    ka.KIS_TOKEN_CACHE.put(
+        "vps:12345678:01", "token-new", datetime.now(ka.KIS_TOKEN_EXPIRY_TZ) + timedelta(hours=20)
+    )
+    monkeypatch.setattr(ka, "KIS_RATE_LIMITER", _fake_rate_limiter(lambda seconds: None))
+    monkeypatch.setattr(
+        ka,
+        "_http_get",
+        lambda url, headers, params, **kwargs: calls.append(dict(headers))
+        or _FakeResponse(200, {"rt_cd": "0", "msg_cd": "0", "msg1": "OK", "output": {}}),
+    )
+
+    response = ka._url_fetch(
+        "/uapi/test", "TTTC8434R", "", {}, context=context, on_token_refresh=adopted.append
+    )
+
+    assert response.isOK()
+    assert calls[0]["authorization"] == "Bearer token-new"
+    assert [item.env.my_token for item in adopted] == ["token-new"]
+
+
+def test_background_reissue_uses_recorded_auth_params_without_switching_env(monkeypatch):
+    issued = []
+    monkeypatch.setattr(
+        ka,
+        "_TOKEN_REFRESH_PARAMS",
+        {"real:12345678:01": {
+            "svr": "prod",
+            "product": "01",
+            "account_name": "main",
+            "account_index": None,
+            "account_key": "real:12345678:01",
+        }},
+    )
+    monkeypatch.setattr(ka, "_resolve_app_credentials", lambda svr, product, **kwargs: ("APPKEY", "SECRET"))
+    monkeypatch.setattr(
+        ka,
+        "_obtain_token",
+        lambda svr, app_key, app_secret, headers, *, account_key, min_remaining_seconds: issued.append(
+            (svr, app_key, app_secret, "authorization" in headers(), account_key, min_remaining_seconds)
+        ),
+    )
+    monkeypatch.setattr(ka, "changeTREnv", lambda *args, **kwargs: pytest.fail("must not switch _TRENV"))
+
+    assert ka._reissue_cached_token("real:12345678:01") is True
+    assert ka._reissue_cached_token("real:unknown:01") is False
+    assert issued == [
+        ("prod", "APPKEY", "SECRET", False, "real:12345678:01", ka.KIS_TOKEN_REFRESH_AHEAD_SECONDS)
+    ]
+
+
 def test_url_fetch_expired_token_retry_works_with_single_rate_limit_attempt(monkeypatch):
     calls = []
     refreshes = []
@@ -520,7 +637,7 @@ def test_url_fetch_expired_token_retry_works_with_single_rate_limit_attempt(monk
             return _FakeResponse(500, {"rt_cd": "1", "msg_cd": "EGW00123", "msg1": "expired"})
         return _FakeResponse(200, {"rt_cd": "0", "msg_cd": "0", "msg1": "OK", "output": {}})
 
-    monkeypatch.setattr(ka.requests, "get", fake_get)
+    monkeypatch.setattr(ka, "_http_get", fake_get)
 
     response = ka._url_fetch("/uapi/test", "TTTC8434R", "", {})
 
@@ -585,7 +702,7 @@ def test_request_once_applies_bounded_connect_and_read_timeouts(monkeypatch):
         captured.update(kwargs)
         return Response()
 
-    monkeypatch.setattr(ka.requests, "get", fake_get)
+    monkeypatch.setattr(ka, "_http_get", fake_get)
     ka._request_once("https://example.com", {}, {}, postFlag=False)
 
     assert captured["timeout"] == ka.KIS_HTTP_TIMEOUT
@@ -631,7 +748,7 @@ def test_url_fetch_retries_http_200_kis_rate_limit_then_succeeds(monkeypatch):
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_ATTEMPTS", 3)
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_BASE_SECONDS", 0.25)
     monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_MAX_SECONDS", 1.0)
-    monkeypatch.setattr(ka.time, "sleep", lambda seconds: sleeps.append(seconds))
+    monkeypatch.setattr(ka, "KIS_RATE_LIMITER", _fake_rate_limiter(sleeps.append))
 
     def fake_get(url, headers, params, **kwargs):
         calls.append((url, headers, params))
@@ -646,7 +763,7 @@ def test_url_fetch_retries_http_200_kis_rate_limit_then_succeeds(monkeypatch):
             )
         return _FakeResponse(200, {"rt_cd": "0", "msg_cd": "0", "msg1": "OK", "output": {}})
 
-    monkeypatch.setattr(ka.requests, "get", fake_get)
+    monkeypatch.setattr(ka, "_http_get", fake_get)
 
     response = ka._url_fetch("/uapi/test", "TTTC8434R", "", {"CANO": "12345678"})
 
@@ -674,7 +791,7 @@ def test_url_fetch_refreshes_http_200_expired_token_then_succeeds(monkeypatch):
             return _FakeResponse(200, {"rt_cd": "1", "msg_cd": "EGW00123", "msg1": "expired"})
         return _FakeResponse(200, {"rt_cd": "0", "msg_cd": "0", "msg1": "OK", "output": {}})
 
-    monkeypatch.setattr(ka.requests, "get", fake_get)
+    monkeypatch.setattr(ka, "_http_get", fake_get)
 
     response = ka._url_fetch("/uapi/test", "TTTC8434R", "", {"CANO": "12345678"})
 
@@ -2,6 +2,7 @@ import asyncio
 from types import SimpleNamespace
 
 import pytest
+from conftest import awaitable
 
 from trading import us as ust
 
@@ -132,7 +133,9 @@ def test_us_trader_uses_account_buy_amount_override(monkeypatch):
     monkeypatch.setattr(
         ust.ka,
         "getTREnv",
-        lambda: SimpleNamespace(my_acct="90909090", my_prod="01", my_token="token"),
+        lambda: SimpleNamespace(
+            my_acct="90909090", my_prod="01", my_token="token", my_app="PSVTAPP", my_sec="secret"
+        ),
     )
 
     trader = ust.USStockTrading(mode="demo", account_name="us-override")
@@ -446,13 +449,13 @@ async def test_async_buy_uses_auto_exchange_before_zero_quantity_rejection():
     trader._stock_locks = {}
     trader._semaphore = asyncio.Semaphore(1)
     trader._global_lock = asyncio.Lock()
-    trader.get_current_price = lambda ticker, exchange=None: {"current_price": 50.0, "exchange": "NASD"}
-    trader.get_account_summary = lambda: {"available_amount": 20.0, "usd_cash": 20.0, "exchange_rate": 1300.0}
-    trader.get_overseas_buyable_amount = lambda *args, **kwargs: {
+    trader.async_get_current_price = awaitable(lambda ticker, exchange=None: {"current_price": 50.0, "exchange": "NASD"})
+    trader.async_get_account_summary = awaitable(lambda: {"available_amount": 20.0, "usd_cash": 20.0, "exchange_rate": 1300.0})
+    trader.async_get_overseas_buyable_amount = awaitable(lambda *args, **kwargs: {
         "ord_psbl_frcr_amt": "20.00",
         "echm_af_ord_psbl_amt": "100.00",
         "exrt": "1300.00",
-    }
+    })
 
     smart_buy_calls = []
 
@@ -460,7 +463,7 @@ async def test_async_buy_uses_auto_exchange_before_zero_quantity_rejection():
         smart_buy_calls.append((ticker, buy_amount, exchange, limit_price))
         return {"success": True, "order_no": "ord-1", "quantity": 2, "message": "ok"}
 
-    trader.smart_buy = fake_smart_buy
+    trader.async_smart_buy = awaitable(fake_smart_buy)
 
     result = await trader._execute_buy_stock("AAPL", buy_amount=20.0, exchange="NASD")
 
@@ -477,16 +480,16 @@ async def test_async_buy_uses_lower_limit_for_affordability(monkeypatch):
     trader._stock_locks = {}
     trader._semaphore = asyncio.Semaphore(1)
     trader._global_lock = asyncio.Lock()
-    trader.get_current_price = lambda ticker, exchange=None: {"current_price": 110.0, "exchange": "NASD"}
+    trader.async_get_current_price = awaitable(lambda ticker, exchange=None: {"current_price": 110.0, "exchange": "NASD"})
     observed_prices = []
 
     def resolve_orderable(ticker, amount, price, exchange):
         observed_prices.append(price)
         return 100.0, {"usd_cash": 100.0, "auto_exchange_used": False}
 
-    trader._resolve_orderable_usd = resolve_orderable
+    trader._async_resolve_orderable_usd = awaitable(resolve_orderable)
     calls = []
-    trader.smart_buy = (
+    trader.async_smart_buy = awaitable(
         lambda ticker, buy_amount, exchange=None, limit_price=None: calls.append(
             (ticker, buy_amount, exchange, limit_price)
         )
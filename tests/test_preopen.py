@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from trading import kis_auth as ka
+from trading import preopen
+from trading import us as ust
+from trading.dispatch import TradeDispatcher, _account_id
+from trading.off_hours_queue import QUEUE_CONTEXT_KEY, QueuedSignal
+
+OPEN = (datetime.now(timezone.utc) + timedelta(minutes=5)).isoformat()
+
+
+def _item(ticker, market, **context):
+    return QueuedSignal(
+        signal={"type": "BUY", "ticker": ticker, "market": market, "price": 100},
+        execute_at=OPEN,
+        created_at=OPEN,
+        execution_context=context,
+    )
+
+
+class _Trader:
+    def __init__(self, market, kwargs):
+        self.market = market
+        self.kwargs = kwargs
+        self.quotes = []
+
+    async def async_get_current_price(self, ticker):
+        self.quotes.append(ticker)
+        if ticker == "GONE":
+            return None
+        return {"ticker": ticker, "exchange": "NYSE" if self.market == "US" else None}
+
+
+def test_staging_builds_each_account_once_and_quotes_each_ticker_once(monkeypatch):
+    built = []
+
+    def build(market):
+        def factory(**kwargs):
+            if kwargs.get("account_key") == "broken":
+                raise RuntimeError("token issue refused")
+            trader = _Trader(market, kwargs)
+            built.append(trader)
+            return trader
+
+        return factory
+
+    monkeypatch.setattr(preopen, "_trader_factory", build)
+    both_accounts = [{"mode": "demo", "account_key": "a"}, {"mode": "demo", "account_key": "b"}]
+
+    def kwargs_for(payload):
+        if payload["ticker"] == "BAD":
+            raise ValueError("invalid payload")
+        if payload["ticker"] == "005930":
+            return [{"mode": "demo", "account_key": "broken"}, {"mode": "demo", "account_key": "a"}]
+        return both_accounts
+
+    items = [
+        _item("IBM", "US"),
+        _item("IBM", "US"),
+        _item("GONE", "US"),
+        _item("005930", "KR"),
+        _item("BAD", "US"),
+    ]
+    report = asyncio.run(preopen.stage_queued_orders(items, kwargs_for))
+
+    assert report.items == 5
+    assert sorted((trader.market, trader.kwargs["account_key"]) for trader in built) == [
+        ("KR", "a"),
+        ("US", "a"),
+        ("US", "b"),
+    ]
+    assert report.accounts == 3
+    assert sum(len(trader.quotes) for trader in built) == 3
+    assert report.quotes == 2
+    assert report.exchanges == {"IBM": "NYSE"}
+    assert any("token issue refused" in error for error in report.errors)
+    assert any("GONE: no quote" in error for error in report.errors)
+    assert any("invalid payload" in error for error in report.errors)
+
+
+def test_resolved_exchange_is_probed_first():
+    assert ust.exchange_probe_order("LITE") == ("NASD", "NYSE", "AMEX")
+    ust.remember_exchange("lite", "NYSE")
+
+    assert ust.get_exchange_code("LITE") == "NYSE"
+    assert ust.exchange_probe_order("LITE") == ("NYSE", "NASD", "AMEX")
+    assert ust.exchange_probe_order("LITE", "AMS") == ("AMEX",)
+
+
+def test_queued_trader_kwargs_follow_the_queued_targets(tmp_path):
+    dispatcher = TradeDispatcher(trading_mode="demo", queue_path=tmp_path / "queue.json")
+    [account] = ka.get_configured_accounts(svr="vps", market="us")
+    single = {"type": "BUY", "ticker": "IBM", "market": "US", "price": 100}
+    multi = single | {
+        QUEUE_CONTEXT_KEY: {"multi_account": True, "account_ids": [_account_id(account["account_key"]), "missing"]}
+    }
+
+    assert dispatcher.queued_trader_kwargs(single) == [{"mode": "demo"}]
+    assert dispatcher.queued_trader_kwargs(multi) == [
+        {"mode": "demo", "account_key": account["account_key"], "product_code": account["product"]}
+    ]
+    assert dispatcher.queued_trader_kwargs(single | {QUEUE_CONTEXT_KEY: {"multi_account": True}}) == []
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("", timedelta(minutes=10)),
+        ("0", None),
+        ("2.5", timedelta(minutes=2.5)),
+        ("-1", timedelta(minutes=10)),
+        ("999", timedelta(minutes=120)),
+    ],
+)
+def test_stage_lead_from_env(monkeypatch, raw, expected):
+    monkeypatch.setenv("OFF_HOURS_STAGE_MINUTES", raw)
+    assert preopen.stage_lead_from_env() == expected
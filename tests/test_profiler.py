@@ -0,0 +1,113 @@
+import os
+import signal
+import threading
+import time
+import xml.etree.ElementTree as ET
+
+import pytest
+from fastapi.testclient import TestClient
+
+from trading import profiler
+from trading.profiler import ProfilerBusyError, SamplingProfiler
+from webui.app import WebUISettings, create_app
+
+
+def _spin_until(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(200))
+
+
+@pytest.fixture
+def busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=_spin_until, args=(stop,), name="off-hours-queue", daemon=True)
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+def test_sample_stacks_prefix_thread_names(busy_thread):
+    stacks = profiler.sample_stacks(exclude={threading.get_ident()})
+
+    [queue_stack] = [stack for stack in stacks if stack.startswith("off-hours-queue;")]
+    assert "_spin_until (tests/test_profiler.py)" in queue_stack.split(";")
+    assert not any(stack.startswith("MainThread;") for stack in stacks)
+
+
+def test_bounded_window_writes_collapsed_stacks_and_flamegraph(tmp_path, busy_thread):
+    sampler = SamplingProfiler(tmp_path, interval=0.002)
+
+    assert sampler.start(0.2, reason="test") == 0.2
+    with pytest.raises(ProfilerBusyError):
+        sampler.start(1)
+    deadline = time.monotonic() + 5
+    while sampler.running and time.monotonic() < deadline:
+        time.sleep(0.02)
+    result = sampler.last_result
+
+    assert result is not None and result.samples > 5
+    lines = result.collapsed_path.read_text().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any(line.startswith("off-hours-queue;") and "_spin_until" in line for line in lines)
+    assert not any(line.startswith("sampling-profiler;") for line in lines)
+    svg = ET.parse(result.flamegraph_path).getroot()
+    assert svg.tag.endswith("svg")
+    assert "_spin_until" in result.flamegraph_path.read_text()
+    assert sampler.status()["last_profile"]["flamegraph"] == result.flamegraph_path.name
+
+
+def test_stop_ends_the_window_early_and_keeps_samples(tmp_path, busy_thread):
+    sampler = SamplingProfiler(tmp_path, interval=0.002)
+    sampler.start(60)
+    time.sleep(0.05)
+    started = time.monotonic()
+
+    result = sampler.stop()
+
+    assert time.monotonic() - started < 2
+    assert result is not None and result.samples > 0 and result.seconds < 5
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="SIGUSR1 is POSIX-only")
+def test_sigusr1_starts_a_profile(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_SECONDS", "0.1")
+    sampler = SamplingProfiler(tmp_path, interval=0.005)
+    previous = profiler.install_signal_handler(sampler)
+    try:
+        os.kill(os.getpid(), signal.SIGUSR1)
+        deadline = time.monotonic() + 5
+        while sampler.last_result is None and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+
+    assert sampler.last_result is not None
+    assert sampler.last_result.reason == "SIGUSR1"
+
+
+def test_webui_starts_profiles_behind_csrf_and_serves_files(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path))
+    monkeypatch.setenv("PROFILE_INTERVAL_MS", "2")
+    client = TestClient(create_app(WebUISettings(csrf_token="local-webui")), base_url="http://127.0.0.1")
+
+    rejected = client.post("/profiles/start-form", data={"seconds": "0.1"})
+    started = client.post("/profiles/start-form", data={"seconds": "0.1", "x_webui_csrf": "local-webui"})
+    profiler.PROFILER.stop()
+    invalid = client.post("/profiles/start-form", data={"seconds": "nan", "x_webui_csrf": "local-webui"})
+    page = client.get("/profiles")
+    listing = client.get("/profiles/api").json()
+    name = listing["profiles"][0]["svg"]
+    flamegraph = client.get(f"/profiles/files/{name}")
+    collapsed = client.get(f"/profiles/files/{listing['profiles'][0]['collapsed']}")
+
+    assert rejected.status_code == 403
+    assert started.status_code == 202
+    assert invalid.status_code == 409 and not profiler.PROFILER.running
+    assert page.status_code == 200
+    assert f'src="/profiles/files/{name}"' in page.text
+    assert listing["status"]["last_profile"]["reason"] == "WebUI"
+    assert flamegraph.headers["content-type"] == "image/svg+xml"
+    assert collapsed.status_code == 200 and collapsed.text.strip()
+    assert client.get("/profiles/files/..%2F.env").status_code == 404
+    assert client.get("/profiles/files/notes.txt").status_code == 404
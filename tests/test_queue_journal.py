@@ -0,0 +1,297 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from trading import queue_journal
+from trading.dispatch import TradeDispatcher
+from trading.off_hours_queue import (
+    OffHoursOrderQueue,
+    QueueCapacityError,
+    QueueExecutionResult,
+    open_off_hours_queue,
+)
+from trading.queue_journal import JournaledOrderQueue, journal_path_for
+from trading.schema import parse_signal_payload
+from webui.services.queue_service import summarize_queue
+
+LATER = datetime.now(timezone.utc) + timedelta(days=30)
+
+
+def _signal(index: int, **extra):
+    payload = {"type": "BUY", "ticker": f"{index:06d}", "market": "KR", "price": 1000 + index}
+    return parse_signal_payload(payload | extra)
+
+
+@pytest.mark.parametrize("backend", ["json", "journal"])
+def test_backends_share_queue_semantics(tmp_path, backend):
+    queue = open_off_hours_queue(tmp_path / "queue.json", backend=backend)
+    first = queue.enqueue(_signal(0))
+    for index in range(1, 4):
+        queue.enqueue(_signal(index))
+    duplicate = queue.enqueue(_signal(0))
+    outcomes = iter(
+        [
+            QueueExecutionResult("processed"),
+            QueueExecutionResult("deferred"),
+            QueueExecutionResult("failed", 'boom "quoted"'),
+            None,
+        ]
+    )
+    seen = []
+
+    def executor(payload):
+        seen.append(payload["ticker"])
+        return next(outcomes)
+
+    processed = queue.drain_due(executor, now=LATER)
+
+    assert duplicate == first
+    assert seen == ["000000", "000001", "000002", "000003"]
+    assert processed == 2
+    assert queue.pending_count() == 1
+    assert queue.failed_count() == 1
+    failed = [item for item in queue.items() if item.status == "failed"]
+    assert failed[0].signal["ticker"] == "000002"
+    assert failed[0].failure_message == "boom ?quoted?"
+    # A quarantined signal may be queued again.
+    queue.enqueue(_signal(2))
+    assert queue.pending_count() == 2
+
+
+def test_journal_is_append_only_and_rebuilt_on_open(tmp_path):
+    queue = JournaledOrderQueue(tmp_path / "queue.json")
+    for index in range(50):
+        queue.enqueue(_signal(index))
+    size_after_enqueue = queue.journal_path.stat().st_size
+    queue.drain_due(lambda payload: None, now=LATER)
+
+    lines = [json.loads(line) for line in queue.journal_path.read_text().splitlines()]
+    assert [line["op"] for line in lines] == ["enqueue"] * 50 + ["processed"] * 50
+    # Each drained item adds one short record instead of rewriting the queue.
+    assert queue.journal_path.stat().st_size - size_after_enqueue < 50 * 40
+    assert not (tmp_path / "queue.json").exists()
+
+    reopened = JournaledOrderQueue(tmp_path / "queue.json")
+    assert reopened.pending_count() == 0
+    reopened.enqueue(_signal(99))
+    assert [line["seq"] for line in map(json.loads, queue.journal_path.read_text().splitlines())][-1] == 50
+
+
+def test_instances_catch_up_with_each_others_appends(tmp_path):
+    writer = JournaledOrderQueue(tmp_path / "queue.json")
+    reader = JournaledOrderQueue(tmp_path / "queue.json")
+    writer.enqueue(_signal(1))
+
+    assert reader.pending_count() == 1
+    reader.drain_due(lambda payload: None, now=LATER)
+    assert writer.pending_count() == 0
+    assert writer.enqueue(_signal(1)).status == "pending"
+    assert reader.pending_count() == 1
+
+
+def test_torn_tail_is_dropped_before_the_next_append(tmp_path):
+    queue = JournaledOrderQueue(tmp_path / "queue.json")
+    queue.enqueue(_signal(1))
+    with queue.journal_path.open("ab") as handle:
+        handle.write(b'{"op":"enqueue","seq":1,"item":{"sig')
+
+    reopened = JournaledOrderQueue(tmp_path / "queue.json")
+    reopened.enqueue(_signal(2))
+
+    assert reopened.pending_count() == 2
+    assert all(json.loads(line) for line in queue.journal_path.read_text().splitlines())
+
+
+def test_concurrent_enqueues_share_fsyncs(tmp_path, monkeypatch):
+    real_fsync = queue_journal.os.fsync
+
+    def slow_fsync(fd):
+        time.sleep(0.02)
+        real_fsync(fd)
+
+    monkeypatch.setattr(queue_journal.os, "fsync", slow_fsync)
+    queue = JournaledOrderQueue(tmp_path / "queue.json")
+    queue.enqueue(_signal(0))
+    start = threading.Barrier(16)
+
+    def submit(index):
+        start.wait()
+        queue.enqueue(_signal(index))
+
+    threads = [threading.Thread(target=submit, args=(index,)) for index in range(1, 17)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert queue.pending_count() == 17
+    assert queue.fsyncs < 17
+
+
+def test_background_compaction_keeps_live_items_and_sequence_numbers(tmp_path, monkeypatch):
+    monkeypatch.setattr(queue_journal, "COMPACT_MIN_DEAD_BYTES", 1)
+    queue = JournaledOrderQueue(tmp_path / "queue.json")
+    for index in range(30):
+        queue.enqueue(_signal(index))
+    failing = {"000005"}
+    keep = {"000007"}
+
+    def executor(payload):
+        if payload["ticker"] in failing:
+            return QueueExecutionResult("failed", "rejected")
+        if payload["ticker"] in keep:
+            return QueueExecutionResult("deferred")
+        return None
+
+    size_before = queue.journal_path.stat().st_size
+    queue.drain_due(executor, now=LATER)
+    queue.wait_for_compaction(5)
+
+    records = [json.loads(line) for line in queue.journal_path.read_text().splitlines()]
+    assert queue.compactions == 1
+    assert queue.journal_path.stat().st_size < size_before
+    assert [(record["op"], record["seq"]) for record in records] == [("enqueue", 5), ("enqueue", 7)]
+    assert records[0]["item"]["status"] == "failed"
+    assert (queue.pending_count(), queue.failed_count()) == (1, 1)
+    assert JournaledOrderQueue(tmp_path / "queue.json").pending_count() == 1
+
+
+def test_legacy_json_queue_is_migrated_once(tmp_path):
+    legacy = OffHoursOrderQueue(tmp_path / "queue.json")
+    legacy.enqueue(_signal(1))
+    legacy.enqueue(_signal(2))
+
+    queue = JournaledOrderQueue(tmp_path / "queue.json")
+
+    assert queue.pending_count() == 2
+    assert not (tmp_path / "queue.json").exists()
+    assert (tmp_path / "queue.json.migrated").exists()
+    assert summarize_queue(tmp_path / "queue.json")["pending_count"] == 2
+
+
+def test_capacity_limit_still_applies(tmp_path, monkeypatch):
+    monkeypatch.setattr(queue_journal, "MAX_QUEUE_BYTES", 4096)
+    queue = JournaledOrderQueue(tmp_path / "queue.json")
+
+    with pytest.raises(QueueCapacityError):
+        for index in range(100):
+            queue.enqueue(_signal(index, rationale="x" * 200))
+    assert 0 < queue.pending_count() < 100
+
+
+def test_webui_summary_and_dispatcher_follow_the_configured_backend(tmp_path, monkeypatch):
+    monkeypatch.setenv("OFF_HOURS_QUEUE_BACKEND", "journal")
+    dispatcher = TradeDispatcher(dry_run=True, trading_mode="demo", queue_path=tmp_path / "queue.json")
+    assert isinstance(dispatcher.queue, JournaledOrderQueue)
+
+    dispatcher.queue.enqueue(_signal(1, company_name="Samsung"))
+    summary = summarize_queue(tmp_path / "queue.json")
+
+    assert journal_path_for(tmp_path / "queue.json").exists()
+    assert summary["ok"] and summary["count"] == 1
+    assert summary["items"][0]["company_name"] == "Samsung"
+
+
+@pytest.mark.parametrize("backend", ["json", "journal"])
+def test_batch_drain_commits_each_batch_once(tmp_path, backend):
+    queue = open_off_hours_queue(tmp_path / "queue.json", backend=backend)
+    for index in range(6):
+        queue.enqueue(_signal(index))
+    commits = []
+    if backend == "json":
+        save = queue._save
+        queue._save = lambda items, **kwargs: (commits.append(1), save(items, **kwargs))[1]
+    else:
+        append = queue._append
+        queue._append = lambda records: (commits.append(len(records)), append(records))[1]
+    outcomes = {
+        "000001": QueueExecutionResult("deferred"),
+        "000003": QueueExecutionResult("failed", "rejected"),
+        "000004": False,
+    }
+    batches = []
+
+    def executor(payloads, record):
+        batches.append([payload["ticker"] for payload in payloads])
+        return [outcomes.get(payload["ticker"]) for payload in payloads]
+
+    processed = queue.drain_due_batch(executor, batch_size=4, now=LATER)
+
+    assert batches == [["000000", "000001", "000002", "000003"], ["000004", "000005"]]
+    assert processed == 3
+    assert len(commits) == 2
+    assert (queue.pending_count(), queue.failed_count()) == (2, 1)
+
+
+def test_json_batch_drain_rewrites_once_per_batch_even_when_outcomes_are_recorded(tmp_path):
+    queue = open_off_hours_queue(tmp_path / "queue.json", backend="json")
+    for index in range(6):
+        queue.enqueue(_signal(index))
+    saves = []
+    save = queue._save
+    queue._save = lambda items, **kwargs: (saves.append(1), save(items, **kwargs))[1]
+
+    def executor(payloads, record):
+        for index in range(len(payloads)):
+            record(index, None)
+        return [None] * len(payloads)
+
+    assert queue.drain_due_batch(executor, batch_size=3, now=LATER) == 6
+    assert len(saves) == 2
+    assert queue.pending_count() == 0
+
+
+@pytest.mark.parametrize("backend", ["json", "journal"])
+def test_batch_drain_leaves_the_batch_pending_when_the_executor_fails(tmp_path, backend):
+    queue = open_off_hours_queue(tmp_path / "queue.json", backend=backend)
+    for index in range(3):
+        queue.enqueue(_signal(index))
+
+    def executor(payloads, record):
+        raise RuntimeError("dispatch loop stopped")
+
+    with pytest.raises(RuntimeError):
+        queue.drain_due_batch(executor, batch_size=8, now=LATER)
+    with pytest.raises(ValueError, match="outcome"):
+        queue.drain_due_batch(lambda payloads, record: [None], batch_size=8, now=LATER)
+
+    assert (queue.pending_count(), queue.failed_count()) == (3, 0)
+
+
+def test_journal_batch_drain_keeps_recorded_outcomes_when_the_executor_fails(tmp_path):
+    queue = open_off_hours_queue(tmp_path / "queue.json", backend="journal")
+    for index in range(4):
+        queue.enqueue(_signal(index))
+
+    def executor(payloads, record):
+        record(0, None)
+        record(1, QueueExecutionResult("failed", "rejected"))
+        record(2, False)
+        raise RuntimeError("dispatch loop stopped")
+
+    with pytest.raises(RuntimeError):
+        queue.drain_due_batch(executor, batch_size=8, now=LATER)
+
+    assert (queue.pending_count(), queue.failed_count()) == (2, 1)
+    assert sorted(item.signal["ticker"] for item in queue.items()) == ["000001", "000002", "000003"]
+
+
+@pytest.mark.parametrize("backend", ["json", "journal"])
+def test_batch_drain_can_select_items_that_are_not_yet_due(tmp_path, backend):
+    queue = open_off_hours_queue(tmp_path / "queue.json", backend=backend)
+    for index in range(4):
+        queue.enqueue(_signal(index, market="US" if index % 2 else "KR"))
+    seen = []
+
+    def executor(payloads, record):
+        seen.extend(payload["ticker"] for payload in payloads)
+        return [None] * len(payloads)
+
+    assert queue.drain_due_batch(executor, batch_size=1) == 0
+    processed = queue.drain_due_batch(executor, batch_size=1, select=lambda item: item.signal["market"] == "US")
+
+    assert (processed, seen) == (2, ["000001", "000003"])
+    assert sorted(item.signal["ticker"] for item in queue.items()) == ["000000", "000002"]
@@ -0,0 +1,222 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import subscriber
+from trading import off_hours_queue
+from trading.off_hours_queue import QueueExecutionResult, open_off_hours_queue
+from trading.dispatch import WindowSubmission
+from trading.preopen import StagingReport
+from trading.schema import parse_signal_payload
+
+
+def _signal(index: int):
+    return parse_signal_payload({"type": "BUY", "ticker": f"{index:06d}", "market": "KR", "price": 1000 + index})
+
+
+def _queue_with_opens(tmp_path, monkeypatch, backend, opens):
+    instants = iter(opens)
+    monkeypatch.setattr(off_hours_queue, "next_market_open", lambda market: next(instants))
+    return open_off_hours_queue(tmp_path / "queue.json", backend=backend)
+
+
+class _Dispatcher:
+    dry_run = False
+    trading_mode = "demo"
+
+    def __init__(self, queue, outcome=None):
+        self.queue = queue
+        self.outcome = outcome
+        self.drains = []
+        self.executed = []
+        self.staged = []
+        self.windows = []
+
+    def submit_window_orders(self, market, window, opened_at, *, dispatch_loop=None):
+        self.windows.append((market, window, opened_at, time.monotonic()))
+        return WindowSubmission(market, window, opened_at, submitted=1, latencies=[0.01])
+
+    def stage_queued_orders(self, items, *, dispatch_loop=None):
+        self.staged.append(([item.signal["ticker"] for item in items], time.monotonic()))
+        return StagingReport(items=len(items))
+
+    def drain_due_orders(self, *, dispatch_loop=None):
+        self.drains.append(time.monotonic())
+
+        def executor(payload):
+            self.executed.append((payload["ticker"], time.monotonic()))
+            return self.outcome
+
+        return self.queue.drain_due(executor)
+
+
+@pytest.mark.parametrize("backend", ["json", "journal"])
+def test_next_due_at_tracks_the_earliest_pending_item(tmp_path, monkeypatch, backend):
+    now = datetime.now(timezone.utc)
+    opens = [now + timedelta(hours=3), now - timedelta(minutes=1), now + timedelta(hours=1)]
+    queue = _queue_with_opens(tmp_path, monkeypatch, backend, opens)
+    assert queue.next_due_at() is None
+    for index in range(3):
+        queue.enqueue(_signal(index))
+
+    assert queue.next_due_at() == opens[1]
+    seen = []
+    queue.drain_due(lambda payload: seen.append(payload["ticker"]), now=now)
+    assert seen == ["000001"]
+    assert queue.next_due_at() == opens[2]
+
+    queue.drain_due(lambda payload: QueueExecutionResult("failed", "rejected"), now=now + timedelta(hours=2))
+    assert queue.next_due_at() == opens[0]
+
+
+def test_journal_drains_due_items_earliest_first(tmp_path, monkeypatch):
+    now = datetime.now(timezone.utc)
+    opens = [now - timedelta(minutes=minutes) for minutes in (1, 5, 3)] + [now + timedelta(hours=1)]
+    queue = _queue_with_opens(tmp_path, monkeypatch, "journal", opens)
+    for index in range(4):
+        queue.enqueue(_signal(index))
+    seen = []
+
+    def executor(payload):
+        seen.append(payload["ticker"])
+        return QueueExecutionResult("deferred") if payload["ticker"] == "000002" else None
+
+    assert queue.drain_due(executor, now=now) == 2
+    assert seen == ["000001", "000002", "000000"]
+    # The deferred item is still the next one due after a reopen.
+    reopened = open_off_hours_queue(tmp_path / "queue.json", backend="journal")
+    assert reopened.next_due_at() == opens[2]
+
+
+@pytest.mark.parametrize("backend", ["json", "journal"])
+def test_worker_sleeps_until_the_due_instant_and_wakes_on_enqueue(tmp_path, monkeypatch, backend):
+    due = datetime.now(timezone.utc) + timedelta(seconds=0.5)
+    queue = _queue_with_opens(tmp_path, monkeypatch, backend, [due])
+    dispatcher = _Dispatcher(queue)
+    worker = subscriber.QueueWorker(
+        dispatcher, 60, subscriber.ActiveWorkTracker(), stage_lead=timedelta(milliseconds=1)
+    )
+    worker.start()
+    try:
+        time.sleep(0.1)
+        queue.enqueue(_signal(1))
+        deadline = time.monotonic() + 5
+        while not dispatcher.executed and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        worker.stop()
+
+    assert [ticker for ticker, _ in dispatcher.executed] == ["000001"]
+    # Executed at the due instant, not at the next 60-second poll, and no empty drains before it.
+    assert datetime.now(timezone.utc) - due < timedelta(seconds=2)
+    assert len(dispatcher.drains) == 1
+    assert queue.pending_count() == 0
+
+
+def test_worker_retries_deferred_items_on_the_poll_interval(tmp_path, monkeypatch):
+    queue = _queue_with_opens(tmp_path, monkeypatch, "journal", [datetime.now(timezone.utc) - timedelta(minutes=1)])
+    queue.enqueue(_signal(1))
+    dispatcher = _Dispatcher(queue, QueueExecutionResult("deferred"))
+    worker = subscriber.QueueWorker(dispatcher, 1, subscriber.ActiveWorkTracker())
+    worker.start()
+    try:
+        time.sleep(1.5)
+    finally:
+        worker.stop()
+
+    assert len(dispatcher.drains) == 2
+    assert dispatcher.drains[1] - dispatcher.drains[0] >= 0.9
+    assert queue.pending_count() == 1
+
+
+def test_worker_stop_interrupts_a_long_sleep(tmp_path):
+    queue = open_off_hours_queue(tmp_path / "queue.json", backend="journal")
+    worker = subscriber.QueueWorker(_Dispatcher(queue), 3600, subscriber.ActiveWorkTracker())
+    worker.start()
+    started = time.monotonic()
+    worker.stop()
+
+    assert time.monotonic() - started < 1
+    assert not any(thread.name == "off-hours-queue" and thread.is_alive() for thread in threading.enumerate())
+
+
+def test_worker_stages_orders_once_ahead_of_the_due_instant(tmp_path, monkeypatch):
+    now = datetime.now(timezone.utc)
+    due = now + timedelta(seconds=0.6)
+    queue = _queue_with_opens(tmp_path, monkeypatch, "journal", [due, due, due + timedelta(days=1)])
+    for index in range(3):
+        queue.enqueue(_signal(index))
+    dispatcher = _Dispatcher(queue)
+    worker = subscriber.QueueWorker(
+        dispatcher, 60, subscriber.ActiveWorkTracker(), stage_lead=timedelta(seconds=0.4)
+    )
+    started = time.monotonic()
+    worker.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(dispatcher.executed) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        worker.stop()
+
+    [(tickers, staged_at)] = dispatcher.staged
+    assert tickers == ["000000", "000001"]
+    assert 0.1 < staged_at - started < 0.5
+    assert staged_at < dispatcher.drains[0]
+    assert [ticker for ticker, _ in dispatcher.executed] == ["000000", "000001"]
+    assert queue.pending_count() == 1
+
+
+def test_worker_submits_queued_orders_the_moment_a_window_opens(tmp_path, monkeypatch):
+    now = datetime.now(timezone.utc)
+    openings = {
+        "KR": ("closing", now + timedelta(seconds=0.4)),
+        "US": ("reserved", now - timedelta(minutes=5)),
+    }
+    monkeypatch.setattr(subscriber.market_hours, "current_off_hours_window", lambda market: None)
+    monkeypatch.setattr(
+        subscriber.market_hours,
+        "next_off_hours_window",
+        lambda market, now=None: openings[market] if now is None else (openings[market][0], now + timedelta(days=1)),
+    )
+    queue = open_off_hours_queue(tmp_path / "queue.json", backend="journal")
+    dispatcher = _Dispatcher(queue)
+    dispatcher.trading_mode = "real"
+    worker = subscriber.QueueWorker(dispatcher, 60, subscriber.ActiveWorkTracker(), stage_lead=None)
+    started = time.monotonic()
+    worker.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(dispatcher.windows) < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        time.sleep(0.1)
+    finally:
+        worker.stop()
+
+    assert [window[:3] for window in dispatcher.windows] == [
+        ("US", "reserved", openings["US"][1]),
+        ("KR", "closing", openings["KR"][1]),
+    ]
+    assert dispatcher.windows[0][3] - started < 0.2
+    assert 0.3 < dispatcher.windows[1][3] - started < 1.5
+    assert dispatcher.drains == []
+
+
+def test_demo_worker_ignores_off_hours_windows(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        subscriber.market_hours,
+        "current_off_hours_window",
+        lambda market: ("reserved", datetime.now(timezone.utc) - timedelta(minutes=1)),
+    )
+    queue = open_off_hours_queue(tmp_path / "queue.json", backend="journal")
+    dispatcher = _Dispatcher(queue)
+    worker = subscriber.QueueWorker(dispatcher, 60, subscriber.ActiveWorkTracker(), stage_lead=None)
+    worker.start()
+    try:
+        time.sleep(0.2)
+    finally:
+        worker.stop()
+
+    assert dispatcher.windows == []
@@ -0,0 +1,219 @@
+import asyncio
+import threading
+
+import pytest
+
+from trading.file_lock import HeldFileLock
+from trading.rate_limit import (
+    KISRateLimiter,
+    RateLimit,
+    SharedTokenBucket,
+    TokenBucket,
+    rate_limits_from_env,
+)
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_bucket_allows_burst_then_paces_to_rate():
+    clock = _FakeClock()
+    bucket = TokenBucket(RateLimit(per_second=4.0, burst=2), clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(5)]
+
+    assert waits == [0.0, 0.0, 0.25, 0.25, 0.25]
+    assert clock.sleeps == [0.25, 0.25, 0.25]
+    stats = bucket.stats()
+    assert stats.acquisitions == 5
+    assert stats.delayed == 3
+    assert stats.max_wait_seconds == 0.25
+
+
+def test_bucket_refills_while_idle_but_never_beyond_burst():
+    clock = _FakeClock()
+    bucket = TokenBucket(RateLimit(per_second=2.0, burst=2), clock=clock, sleep=clock.sleep)
+
+    bucket.acquire()
+    clock.now = 10.0
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_backoff_holds_back_every_caller_on_the_bucket():
+    clock = _FakeClock()
+    bucket = TokenBucket(RateLimit(per_second=10.0), clock=clock, sleep=clock.sleep)
+
+    bucket.acquire()
+    bucket.backoff(1.0)
+
+    assert bucket.acquire() == pytest.approx(1.0)
+    assert bucket.acquire() == pytest.approx(0.1)
+    assert bucket.stats().backoffs == 1
+
+
+def test_concurrent_threads_are_spaced_without_double_booking():
+    clock = _FakeClock()
+    lock = threading.Lock()
+    waits = []
+    bucket = TokenBucket(RateLimit(per_second=10.0), clock=clock, sleep=lambda seconds: None)
+
+    def worker():
+        wait = bucket.acquire()
+        with lock:
+            waits.append(round(wait, 6))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(waits) == [0.0, 0.1, 0.2, 0.3, 0.4]
+
+
+@pytest.mark.asyncio
+async def test_async_acquire_paces_on_the_event_loop():
+    bucket = TokenBucket(RateLimit(per_second=50.0))
+    loop = asyncio.get_running_loop()
+
+    started = loop.time()
+    await asyncio.gather(*(bucket.acquire_async() for _ in range(4)))
+    elapsed = loop.time() - started
+
+    assert elapsed >= 0.05
+    assert bucket.stats().delayed == 3
+
+
+def test_limiter_keys_buckets_by_app_key_and_server():
+    clock = _FakeClock()
+    limiter = KISRateLimiter(
+        {"prod": RateLimit(per_second=20.0), "vps": RateLimit(per_second=2.0)},
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+    assert limiter.bucket("APP-A", "prod") is limiter.bucket("APP-A", "prod")
+    assert limiter.bucket("APP-A", "prod") is not limiter.bucket("APP-B", "prod")
+    assert limiter.bucket("APP-A", "vps").limit.per_second == 2.0
+
+    limiter.acquire("APP-A", "vps")
+    assert limiter.acquire("APP-A", "vps") == 0.5
+    assert limiter.acquire("APP-A", "prod") == 0.0
+
+    stats = limiter.stats()
+    assert all("APP-A" not in label for label, _server in stats)
+    assert sorted(item.acquisitions for item in stats.values()) == [0, 1, 2]
+
+
+def test_rate_limits_from_env(monkeypatch):
+    monkeypatch.setenv("KIS_RATE_LIMIT_PROD_PER_SECOND", "10")
+    monkeypatch.setenv("KIS_RATE_LIMIT_PROD_BURST", "3")
+    monkeypatch.setenv("KIS_RATE_LIMIT_VPS_PER_SECOND", "nope")
+    monkeypatch.setenv("KIS_RATE_LIMIT_VPS_BURST", "1.5")
+
+    limits = rate_limits_from_env()
+
+    assert limits["prod"] == RateLimit(per_second=10.0, burst=3)
+    assert limits["vps"] == RateLimit(per_second=1.5, burst=1)
+
+
+def test_shared_buckets_draw_from_one_budget_through_the_mapped_file(tmp_path):
+    clock = _FakeClock()
+    path = tmp_path / "bucket"
+    first = SharedTokenBucket(RateLimit(per_second=4.0), path, clock=clock, sleep=clock.sleep)
+    second = SharedTokenBucket(RateLimit(per_second=4.0), path, clock=clock, sleep=clock.sleep)
+
+    assert first.acquire() == 0.0
+    assert second.acquire() == 0.25
+    assert first.acquire() == 0.25
+    assert second.stats().delayed == 1
+
+    second.backoff(2.0)
+    assert first.acquire() == pytest.approx(2.0)
+
+
+def test_shared_bucket_ignores_slots_left_far_in_the_future(tmp_path):
+    clock = _FakeClock()
+    path = tmp_path / "bucket"
+    stale = SharedTokenBucket(RateLimit(per_second=1.0), path, clock=lambda: 10_000.0)
+    stale.acquire()
+    stale.acquire()
+
+    fresh = SharedTokenBucket(RateLimit(per_second=1.0), path, clock=clock, sleep=clock.sleep)
+    assert fresh.acquire() == 0.0
+
+
+def test_shared_bucket_waits_for_another_holder_on_one_open_lock_fd(tmp_path):
+    path = tmp_path / "bucket"
+    bucket = SharedTokenBucket(RateLimit(per_second=1000.0), path)
+    bucket.acquire()
+    handle = bucket._file_lock._handle
+    released = threading.Event()
+
+    def reserve():
+        bucket.acquire()
+        released.set()
+
+    with HeldFileLock(path.with_name(path.name + ".lock")):
+        worker = threading.Thread(target=reserve)
+        worker.start()
+        assert not released.wait(0.1)
+    worker.join(timeout=5)
+
+    assert released.is_set()
+    assert bucket._file_lock._handle is handle
+
+
+@pytest.mark.asyncio
+async def test_shared_bucket_async_acquire_yields_while_another_process_holds_the_lock(tmp_path):
+    path = tmp_path / "bucket"
+    bucket = SharedTokenBucket(RateLimit(per_second=1000.0), path)
+    other_process = HeldFileLock(path.with_name(path.name + ".lock"))
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    assert other_process.acquire()
+    ticker = asyncio.create_task(tick())
+    acquiring = asyncio.create_task(bucket.acquire_async())
+    await asyncio.sleep(0.05)
+    assert not acquiring.done()
+    other_process.release()
+
+    assert await asyncio.wait_for(acquiring, timeout=5) == 0.0
+    ticker.cancel()
+    assert ticks > 3
+
+
+def test_shared_limiter_keeps_app_keys_out_of_file_names(tmp_path):
+    limiter = KISRateLimiter({"prod": RateLimit(per_second=20.0), "vps": RateLimit(per_second=2.0)}, shared_dir=tmp_path)
+
+    bucket = limiter.bucket("APP-SECRET-KEY", "vps")
+    bucket.acquire()
+
+    assert isinstance(bucket, SharedTokenBucket)
+    assert [path.name for path in tmp_path.glob("*.bucket")] == [bucket.path.name]
+    assert "APP-SECRET-KEY" not in bucket.path.name
+    assert bucket.path.name.endswith("-vps.bucket")
+
+
+def test_shared_dir_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("KIS_RATE_LIMIT_SHARED_DIR", str(tmp_path))
+    assert KISRateLimiter.from_env().shared_dir == tmp_path
+    monkeypatch.setenv("KIS_RATE_LIMIT_SHARED_DIR", "")
+    assert KISRateLimiter.from_env().shared_dir is None
@@ -20,7 +20,7 @@ class FakeUSTrader:
         self.account_name = account_name
         self.account_index = account_index
 
-    def get_account_summary(self):
+    async def async_get_account_summary(self):
         return {
             "available_amount": self.available_amount,
             "account_key": "test-account",
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pytest
+from conftest import awaitable
 
 from trading.schema import parse_signal_payload
 from trading.strategies.limit_buffer import LimitBufferStrategy, LimitBufferStrategyConfig
@@ -387,8 +388,8 @@ async def test_domestic_partial_sell_uses_verified_fraction(monkeypatch):
     trader._global_lock = __import__("asyncio").Lock()
     monkeypatch.setattr(
         trader,
-        "get_portfolio",
-        lambda: [
+        "_async_inquire_portfolio",
+        awaitable(lambda: ([
             {
                 "stock_code": "005930",
                 "quantity": 7,
@@ -396,16 +397,16 @@ async def test_domestic_partial_sell_uses_verified_fraction(monkeypatch):
                 "profit_amount": 1000,
                 "profit_rate": 2,
             }
-        ],
+        ], None)),
     )
-    monkeypatch.setattr(trader, "get_current_price", lambda ticker: {"current_price": 80000})
+    monkeypatch.setattr(trader, "async_get_current_price", awaitable(lambda ticker: {"current_price": 80000}))
     captured = {}
 
     def sell(ticker, limit_price, holding_quantity):
         captured.update(ticker=ticker, quantity=holding_quantity)
         return {"success": True, "quantity": holding_quantity, "order_no": "1"}
 
-    monkeypatch.setattr(trader, "smart_sell_all", sell)
+    monkeypatch.setattr(trader, "async_smart_sell_all", awaitable(sell))
     result = await trader.async_sell_stock("005930", sell_fraction=0.5)
 
     assert result["success"] is True
@@ -420,8 +421,8 @@ async def test_us_partial_sell_reuses_verified_exchange_and_quantity(monkeypatch
     trader._global_lock = __import__("asyncio").Lock()
     monkeypatch.setattr(
         trader,
-        "get_portfolio",
-        lambda: [
+        "async_get_portfolio",
+        awaitable(lambda: [
             {
                 "ticker": "IBM",
                 "exchange": "NYSE",
@@ -430,12 +431,12 @@ async def test_us_partial_sell_reuses_verified_exchange_and_quantity(monkeypatch
                 "profit_amount": 10,
                 "profit_rate": 2,
             }
-        ],
+        ]),
     )
     monkeypatch.setattr(
         trader,
-        "get_current_price",
-        lambda ticker, exchange: {"current_price": 110},
+        "async_get_current_price",
+        awaitable(lambda ticker, exchange: {"current_price": 110}),
     )
     captured = {}
 
@@ -443,7 +444,7 @@ async def test_us_partial_sell_reuses_verified_exchange_and_quantity(monkeypatch
         captured.update(exchange=exchange, quantity=holding_quantity)
         return {"success": True, "quantity": holding_quantity, "order_no": "1"}
 
-    monkeypatch.setattr(trader, "smart_sell_all", sell)
+    monkeypatch.setattr(trader, "async_smart_sell_all", awaitable(sell))
     result = await trader.async_sell_stock("IBM", sell_fraction=0.5)
 
     assert result["success"] is True
@@ -46,6 +46,38 @@ def test_handle_message_acknowledges_valid_signal():
     assert dispatcher.signals[0].ticker == "005930"
 
 
+def test_handle_message_reuses_persistent_dispatch_loop():
+    import asyncio
+    import threading
+
+    from trading.dispatch_loop import DispatchLoop
+
+    loops = []
+    threads = []
+
+    class LoopRecordingDispatcher(FakeDispatcher):
+        async def dispatch(self, signal):
+            loops.append(asyncio.get_running_loop())
+            threads.append(threading.current_thread().name)
+            return await super().dispatch(signal)
+
+    dispatcher = LoopRecordingDispatcher()
+    dispatch_loop = DispatchLoop(name="test-dispatch-loop")
+    dispatch_loop.start()
+    try:
+        callback = subscriber.build_callback(dispatcher, dispatch_loop=dispatch_loop)
+        first = FakeMessage(b'{"type":"BUY","ticker":"005930","market":"KR","price":82000}')
+        second = FakeMessage(b'{"type":"SELL","ticker":"AAPL","market":"US","price":190}', "msg-2")
+        callback(first)
+        callback(second)
+    finally:
+        dispatch_loop.stop()
+
+    assert first.acked is True and second.acked is True
+    assert len(loops) == 2 and loops[0] is loops[1]
+    assert threads == ["test-dispatch-loop", "test-dispatch-loop"]
+
+
 def test_handle_message_acknowledges_invalid_signal():
     dispatcher = FakeDispatcher()
     message = FakeMessage(b"{bad json")
@@ -162,7 +194,7 @@ def test_web_ui_flag_runs_alongside_subscriber(monkeypatch):
             self.kwargs = kwargs
 
     class FakeQueueWorker:
-        def __init__(self, dispatcher, poll_seconds, work_tracker):
+        def __init__(self, dispatcher, poll_seconds, work_tracker, *, dispatch_loop=None):
             self.dispatcher = dispatcher
             self.poll_seconds = poll_seconds
 
@@ -392,7 +424,7 @@ def test_main_cancels_streaming_pull_on_sigint(monkeypatch):
             self.kwargs = kwargs
 
     class FakeQueueWorker:
-        def __init__(self, dispatcher, poll_seconds, work_tracker):
+        def __init__(self, dispatcher, poll_seconds, work_tracker, *, dispatch_loop=None):
             self.dispatcher = dispatcher
             self.poll_seconds = poll_seconds
 
@@ -479,3 +511,20 @@ def test_main_cancels_streaming_pull_on_sigint(monkeypatch):
         (signal.SIGINT, f"previous-{signal.SIGINT}"),
         (signal.SIGTERM, f"previous-{signal.SIGTERM}"),
     ]
+
+
+def test_kis_connection_warmup_targets_trading_server(monkeypatch):
+    warmed = []
+    monkeypatch.setattr(
+        subscriber.kis_auth,
+        "warm_kis_connections",
+        lambda svr: warmed.append(svr) or {"https://example.com": True},
+    )
+
+    thread = subscriber._start_kis_connection_warmup("demo")
+    thread.join(timeout=2)
+    assert warmed == ["vps"]
+
+    monkeypatch.setenv("KIS_HTTP_WARMUP", "false")
+    assert subscriber._start_kis_connection_warmup("real") is None
+    assert warmed == ["vps"]
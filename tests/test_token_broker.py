@@ -0,0 +1,101 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from trading.token_broker import TokenBroker, issue_lock_path
+from trading.token_cache import KIS_TOKEN_EXPIRY_TZ, TokenCache
+
+
+class _Disk:
+    """Token file stand-in shared by brokers that model separate processes."""
+
+    def __init__(self):
+        self.token = None
+        self.valid_until = None
+        self.issued = []
+        self.lock = threading.Lock()
+
+    def reader(self, cache, account_key):
+        def read_file():
+            with self.lock:
+                if self.token is None:
+                    return None
+                cache.put(account_key, self.token, self.valid_until)
+                return self.token
+
+        return read_file
+
+    def issuer(self, cache, account_key, *, hours=24):
+        def issue():
+            time.sleep(0.05)
+            with self.lock:
+                self.issued.append(account_key)
+                self.token = f"token-{len(self.issued)}"
+                self.valid_until = datetime.now(KIS_TOKEN_EXPIRY_TZ) + timedelta(hours=hours)
+                cache.put(account_key, self.token, self.valid_until)
+                return self.token
+
+        return issue
+
+
+def _get(broker, disk, lock_path, account_key="real:1:01", **kwargs):
+    return broker.get(
+        account_key,
+        read_file=disk.reader(broker.cache, account_key),
+        issue=disk.issuer(broker.cache, account_key),
+        lock_path=lock_path,
+        **kwargs,
+    )
+
+
+def test_broker_issues_once_then_serves_memory_and_file_hits(tmp_path):
+    disk = _Disk()
+    lock_path = issue_lock_path(tmp_path, "real:1:01")
+    first = TokenBroker(TokenCache())
+    second = TokenBroker(TokenCache())
+
+    assert _get(first, disk, lock_path) == "token-1"
+    assert _get(first, disk, lock_path) == "token-1"
+    assert _get(second, disk, lock_path) == "token-1"
+
+    assert disk.issued == ["real:1:01"]
+    assert (first.stats().issued, first.stats().memory_hits) == (1, 1)
+    assert (second.stats().file_hits, second.stats().misses) == (1, 0)
+
+
+def test_concurrent_cold_starts_share_one_issued_token(tmp_path):
+    disk = _Disk()
+    lock_path = issue_lock_path(tmp_path, "real:1:01")
+    brokers = [TokenBroker(TokenCache()) for _ in range(4)]
+    tokens = []
+
+    def start(broker):
+        tokens.append(_get(broker, disk, lock_path))
+
+    threads = [threading.Thread(target=start, args=(broker,)) for broker in brokers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert tokens == ["token-1"] * 4
+    assert disk.issued == ["real:1:01"]
+    assert sum(broker.stats().hits for broker in brokers) == 3
+
+
+def test_min_remaining_treats_expiring_token_as_missing(tmp_path):
+    disk = _Disk()
+    disk.token = "token-0"
+    disk.valid_until = datetime.now(KIS_TOKEN_EXPIRY_TZ) + timedelta(hours=1)
+    broker = TokenBroker(TokenCache())
+    lock_path = issue_lock_path(tmp_path, "real:1:01")
+
+    assert _get(broker, disk, lock_path) == "token-0"
+    assert _get(broker, disk, lock_path, min_remaining_seconds=3 * 60 * 60) == "token-1"
+    assert broker.stats().issued == 1
+
+
+def test_issue_lock_path_is_per_account(tmp_path):
+    assert issue_lock_path(tmp_path, None).name == ".token_issue_shared.lock"
+    assert issue_lock_path(tmp_path, "real:1:01") != issue_lock_path(tmp_path, "real:2:01")
+    assert "real" not in issue_lock_path(tmp_path, "real:1:01").name
@@ -0,0 +1,85 @@
+import threading
+from datetime import datetime, timedelta
+
+from trading.token_cache import KIS_TOKEN_EXPIRY_TZ, TokenCache, TokenRefresher
+
+NOW = datetime(2026, 6, 12, 9, 0, tzinfo=KIS_TOKEN_EXPIRY_TZ)
+
+
+def test_cache_returns_tokens_until_their_kst_expiry():
+    cache = TokenCache()
+    cache.put("real:1:01", "token-a", datetime(2026, 6, 12, 10, 0))
+
+    assert cache.get("real:1:01", now=NOW) == "token-a"
+    assert cache.get("real:2:01", now=NOW) is None
+    assert cache.get("real:1:01", now=NOW + timedelta(hours=1)) is None
+    assert len(cache) == 0
+
+
+def test_discarding_shared_token_drops_every_entry():
+    cache = TokenCache()
+    cache.put(None, "shared", NOW + timedelta(hours=5))
+    cache.put("real:1:01", "token-a", NOW + timedelta(hours=5))
+    cache.put("real:2:01", "token-b", NOW + timedelta(hours=5))
+
+    cache.discard("real:1:01")
+    assert cache.get("real:1:01", now=NOW) is None
+    assert cache.get("real:2:01", now=NOW) == "token-b"
+
+    cache.discard(None)
+    assert len(cache) == 0
+
+
+def test_refresher_reissues_only_tokens_inside_the_window():
+    cache = TokenCache()
+    cache.put("soon", "token-a", NOW + timedelta(hours=2))
+    cache.put("later", "token-b", NOW + timedelta(hours=20))
+    cache.put("unknown", "token-c", NOW + timedelta(minutes=5))
+    refreshed = []
+
+    def refresh(account_key):
+        refreshed.append(account_key)
+        if account_key == "soon":
+            cache.put("soon", "token-a2", NOW + timedelta(hours=24))
+            return True
+        return False
+
+    refresher = TokenRefresher(cache, refresh, ahead_seconds=3 * 60 * 60)
+
+    assert refresher.run_once(now=NOW) == 1
+    assert sorted(refreshed) == ["soon", "unknown"]
+    assert cache.get("soon", now=NOW) == "token-a2"
+
+
+def test_refresher_keeps_going_after_a_failed_reissue(caplog):
+    cache = TokenCache()
+    cache.put("a", "token-a", NOW + timedelta(minutes=1))
+    cache.put("b", "token-b", NOW + timedelta(minutes=1))
+
+    def refresh(account_key):
+        if account_key == "a":
+            raise RuntimeError("token endpoint down")
+        return True
+
+    refresher = TokenRefresher(cache, refresh, ahead_seconds=60 * 60)
+
+    assert refresher.run_once(now=NOW) == 1
+    assert "token endpoint down" in caplog.text
+
+
+def test_refresher_thread_runs_until_stopped():
+    cache = TokenCache()
+    cache.put(None, "shared", datetime.now(KIS_TOKEN_EXPIRY_TZ) + timedelta(minutes=1))
+    calls = []
+    called = threading.Event()
+
+    def refresh(account_key):
+        calls.append(account_key)
+        called.set()
+        return True
+
+    refresher = TokenRefresher(cache, refresh, ahead_seconds=3600, interval_seconds=0.01).start()
+    assert called.wait(2)
+    refresher.stop()
+
+    assert calls[0] is None
@@ -0,0 +1,159 @@
+import asyncio
+import json
+from collections import namedtuple
+
+import httpx
+from fastapi.testclient import TestClient
+
+import subscriber
+from trading import kis_auth as ka
+from trading import tracing
+from trading.dispatch import TradeDispatcher
+from trading.kis_simulator import KISSimulator, SimulatorConfig
+from trading.rate_limit import KISRateLimiter
+from webui.app import WebUISettings, create_app
+
+_Env = namedtuple("KISEnv", "my_url my_token my_app my_sec my_prod")
+
+
+class _Message:
+    def __init__(self, data: bytes, message_id: str):
+        self.data = data
+        self.message_id = message_id
+        self.acked = False
+
+    def ack(self):
+        self.acked = True
+
+    def nack(self):
+        pass
+
+
+def _records(directory):
+    return [json.loads(line) for path in sorted(directory.glob("traces-*.jsonl")) for line in path.read_text().splitlines()]
+
+
+def test_spans_are_noops_without_trace_dir(monkeypatch, tmp_path):
+    monkeypatch.delenv("TRACE_DIR", raising=False)
+
+    with tracing.start_trace("root") as root:
+        with tracing.span("child") as child:
+            tracing.set_attributes(ignored=True)
+
+    assert root is None and child is None
+    assert tracing.current_span() is None
+
+
+def test_spans_nest_across_tasks_and_threads(monkeypatch, tmp_path):
+    monkeypatch.setenv("TRACE_DIR", str(tmp_path))
+
+    @tracing.traced("worker.sync")
+    def blocking_call():
+        tracing.set_attributes(thread=True)
+
+    @tracing.traced("worker.async")
+    async def async_call():
+        await asyncio.to_thread(blocking_call)
+
+    async def run():
+        with tracing.start_trace("root", trace_id="t-1"):
+            await asyncio.gather(async_call(), async_call())
+            try:
+                with tracing.span("failing"):
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+
+    asyncio.run(run())
+
+    [record] = _records(tmp_path)
+    spans = {span["id"]: span for span in record["spans"]}
+    assert record["trace_id"] == "t-1"
+    assert record["name"] == "root"
+    by_name = {}
+    for span in record["spans"]:
+        by_name.setdefault(span["name"], []).append(span)
+    assert len(by_name["worker.async"]) == 2
+    for child in by_name["worker.sync"]:
+        assert spans[child["parent"]]["name"] == "worker.async"
+        assert child["attrs"] == {"thread": True}
+    assert by_name["failing"][0]["error"] == "RuntimeError: boom"
+    assert all(span["ms"] is not None for span in record["spans"])
+
+
+def test_handle_message_writes_one_trace_keyed_by_message_id(monkeypatch, tmp_path):
+    monkeypatch.setenv("TRACE_DIR", str(tmp_path / "traces"))
+    dispatcher = TradeDispatcher(dry_run=True, trading_mode="demo", queue_path=tmp_path / "queue.json")
+    message = _Message(b'{"type":"BUY","ticker":"005930","market":"KR","price":82000}', "msg-42")
+
+    subscriber._handle_message(message, dispatcher)
+
+    [record] = _records(tmp_path / "traces")
+    names = [span["name"] for span in record["spans"]]
+    assert message.acked
+    assert record["trace_id"] == "msg-42"
+    assert names[0] == "pubsub.message"
+    assert {"parse_signal_bytes", "dispatch", "ack"} <= set(names)
+    root_attrs = record["spans"][0]["attrs"]
+    assert root_attrs["ticker"] == "005930"
+    assert root_attrs["status"] == "dry-run"
+
+
+def test_kis_request_attempts_are_spans(monkeypatch, tmp_path):
+    monkeypatch.setenv("TRACE_DIR", str(tmp_path))
+    monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_BASE_SECONDS", 0.0)
+    monkeypatch.setattr(ka, "KIS_RATE_LIMIT_RETRY_ATTEMPTS", 2)
+    monkeypatch.setattr(ka, "KIS_RATE_LIMITER", KISRateLimiter())
+
+    with KISSimulator(SimulatorConfig(real_rate_limit=1, prices={"005930": 70000}, seed=3)) as simulator:
+        token = httpx.post(
+            f"{simulator.rest_url}/oauth2/tokenP",
+            json={"grant_type": "client_credentials", "appkey": "PSAPPKEY000", "appsecret": "secret"},
+        ).json()["access_token"]
+        context = ka.KISClientContext(
+            env=_Env(simulator.rest_url, token, "PSAPPKEY000", "secret", "01"),
+            svr="prod",
+            account_key="prod:12345678:01",
+        )
+
+        async def fetch_twice():
+            params = {"fid_cond_mrkt_div_code": "J", "fid_input_iscd": "005930"}
+            path = "/uapi/domestic-stock/v1/quotations/inquire-price"
+            with tracing.start_trace("kis", trace_id="kis-1"):
+                await ka._url_fetch_async(path, "FHKST01010100", "", params, context=context)
+                await ka._url_fetch_async(path, "FHKST01010100", "", params, context=context)
+            await ka.KIS_ASYNC_HTTP_POOL.aclose()
+
+        asyncio.run(fetch_twice())
+
+    [record] = _records(tmp_path)
+    attempts = [span for span in record["spans"] if span["name"] == "kis.request"]
+    assert [span["attrs"]["result"] for span in attempts] == ["ok", ka.KIS_RATE_LIMIT_ERROR_CODE, ka.KIS_RATE_LIMIT_ERROR_CODE]
+    assert all(span["attrs"]["tr_id"] == "FHKST01010100" for span in attempts)
+
+
+def test_webui_lists_traces_and_renders_waterfall(monkeypatch, tmp_path):
+    monkeypatch.setenv("TRACE_DIR", str(tmp_path))
+    with tracing.start_trace("pubsub.message", trace_id="msg-7", ticker="005930", type="BUY"):
+        with tracing.span("dispatch"):
+            with tracing.span("kis.request", tr_id="TTTC0802U"):
+                pass
+        tracing.set_attributes(status="executed")
+
+    client = TestClient(create_app(WebUISettings(csrf_token="local-webui")), base_url="http://127.0.0.1")
+    listing = client.get("/traces")
+    listing_api = client.get("/traces/api").json()
+    detail = client.get("/traces/msg-7")
+    detail_api = client.get("/traces/msg-7/api").json()
+    missing = client.get("/traces/unknown")
+
+    assert listing.status_code == 200
+    assert 'href="/traces/msg-7"' in listing.text
+    assert listing_api["traces"][0]["status"] == "executed"
+    assert detail.status_code == 200
+    assert '<div class="waterfall">' in detail.text
+    assert "tr_id=TTTC0802U" in detail.text
+    rows = detail_api["waterfall"]["rows"]
+    assert [row["label"] for row in rows] == ["pubsub.message", "dispatch", "kis.request"]
+    assert rows[0]["indent"] < rows[1]["indent"] < rows[2]["indent"]
+    assert missing.status_code == 404
@@ -0,0 +1,163 @@
+import asyncio
+import threading
+
+import pytest
+
+from trading.trader_pool import TraderPool, max_age_from_env
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Trader:
+    built = []
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.lock = None
+        _Trader.built.append(kwargs)
+
+    def _for_event_loop(self):
+        view = _Trader.__new__(_Trader)
+        view.kwargs = self.kwargs
+        view.lock = "fresh"
+        return view
+
+
+@pytest.fixture(autouse=True)
+def _reset_built():
+    _Trader.built = []
+
+
+def _pool(clock=None, fingerprint=("cfg", 1, 1)):
+    holder = {"value": fingerprint}
+    pool = TraderPool(
+        max_age_seconds=60,
+        clock=clock or _Clock(),
+        config_fingerprint=lambda: holder["value"],
+    )
+    return pool, holder
+
+
+def test_pool_reuses_trader_for_same_account_and_splits_on_arguments():
+    pool, _ = _pool()
+
+    first = pool.get(_Trader, mode="demo", account_key="vps:1:01")
+    again = pool.get(_Trader, account_key="vps:1:01", mode="demo")
+    other = pool.get(_Trader, mode="demo", account_key="vps:2:01")
+
+    assert first is again
+    assert other is not first
+    assert len(_Trader.built) == 2
+    stats = pool.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+
+
+def test_pool_rebuilds_after_max_age_and_config_change():
+    clock = _Clock()
+    pool, fingerprint = _pool(clock)
+
+    first = pool.get(_Trader, mode="demo")
+    clock.now = 59.0
+    assert pool.get(_Trader, mode="demo") is first
+
+    clock.now = 60.0
+    aged = pool.get(_Trader, mode="demo")
+    assert aged is not first
+
+    fingerprint["value"] = ("cfg", 2, 1)
+    assert pool.get(_Trader, mode="demo") is not aged
+    assert pool.stats().evictions == 2
+
+
+def test_pool_does_not_cache_failed_construction():
+    pool, _ = _pool()
+    attempts = []
+
+    def flaky(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) == 1:
+            raise RuntimeError("auth failed")
+        return _Trader(**kwargs)
+
+    with pytest.raises(RuntimeError):
+        pool.get(flaky, mode="real")
+    trader = pool.get(flaky, mode="real")
+
+    assert pool.get(flaky, mode="real") is trader
+    assert len(attempts) == 2
+
+
+def test_disabled_pool_builds_every_time():
+    pool = TraderPool(max_age_seconds=0)
+
+    assert pool.get(_Trader, mode="demo") is not pool.get(_Trader, mode="demo")
+    assert pool.stats().size == 0
+
+
+def test_pool_gives_each_event_loop_its_own_view():
+    pool, _ = _pool()
+
+    async def fetch():
+        return pool.get(_Trader, mode="demo")
+
+    first_loop = asyncio.new_event_loop()
+    try:
+        owner = first_loop.run_until_complete(fetch())
+        assert first_loop.run_until_complete(fetch()) is owner
+    finally:
+        first_loop.close()
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(asyncio.run(fetch())))
+    thread.start()
+    thread.join()
+
+    assert results[0] is not owner
+    assert results[0].lock == "fresh"
+    assert len(_Trader.built) == 1
+
+
+def test_async_get_builds_off_the_event_loop_and_reuses_the_trader():
+    pool, _ = _pool()
+    loop_thread = []
+    build_threads = []
+
+    def slow_build(**kwargs):
+        build_threads.append(threading.get_ident())
+        threading.Event().wait(0.1)
+        return _Trader(**kwargs)
+
+    async def fetch_while_ticking():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        loop_thread.append(threading.get_ident())
+        ticker = asyncio.create_task(tick())
+        trader = await pool.async_get(slow_build, mode="demo")
+        ticker.cancel()
+        return trader, ticks, await pool.async_get(slow_build, mode="demo")
+
+    trader, ticks, again = asyncio.run(fetch_while_ticking())
+
+    assert again is trader
+    assert ticks > 1
+    assert build_threads != loop_thread
+    assert (pool.stats().hits, pool.stats().misses) == (1, 1)
+
+
+def test_max_age_from_env(monkeypatch):
+    monkeypatch.setenv("TRADER_POOL_MAX_AGE_SECONDS", "0")
+    assert max_age_from_env() == 0.0
+    monkeypatch.setenv("TRADER_POOL_MAX_AGE_SECONDS", "-5")
+    assert max_age_from_env() == 1800.0
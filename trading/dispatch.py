@@ -5,20 +5,44 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import logging
-import threading
+import math
+import time
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from . import kis_auth as ka
+from . import metrics, tracing
 from . import yaml_compat as yaml
 from .config_paths import active_kis_config_path
+from .dispatch_lanes import (
+    PRIORITY_NORMAL,
+    PRIORITY_URGENT,
+    LaneReservation,
+    LaneScheduler,
+    LaneSnapshot,
+    LaneWaitStats,
+    lane_key,
+    max_concurrent_lanes_from_env,
+)
+from .dispatch_loop import DispatchLoop, run_dispatch_coroutine
 from .domestic import AsyncTradingContext
 from .execution_ledger import ExecutionLedger, execution_identity
 from .market_hours import get_trading_mode, is_market_open, is_off_hours_order_available
 from .modes import normalize_trading_mode
-from .off_hours_queue import QUEUE_CONTEXT_KEY, OffHoursOrderQueue, QueueExecutionResult
+from .off_hours_queue import (
+    QUEUE_CONTEXT_KEY,
+    OffHoursOrderQueue,
+    OutcomeRecorder,
+    QueuedSignal,
+    QueueExecutionResult,
+    _failed_outcome,
+    drain_batch_size_from_env,
+    open_off_hours_queue,
+)
+from .preopen import StagingReport, stage_queued_orders
 from .schema import SignalMessage, parse_signal_payload
 from .strategies import (
     BalanceSplitStrategy,
@@ -50,22 +74,91 @@ from .strategies import (
     StopLossSellStrategy,
     StopLossSellStrategyConfig,
 )
+from .trader_pool import async_pooled_trader
 from .us import USStockTrading
 
 logger = logging.getLogger(__name__)
 CONFIG_FILE = active_kis_config_path()
-_BROKER_EXECUTION_LOCK = threading.Lock()
+_BROKER_LANES = LaneScheduler(max_concurrent_lanes_from_env())
+
+
+def _reserve_broker_lane(signal: SignalMessage, account_scope: str) -> LaneReservation:
+    """Take ``signal``'s place in its lane before the caller's first await."""
+    return _BROKER_LANES.reserve(
+        lane_key(signal.market, signal.ticker, account_scope),
+        exclusive=signal.is_event,
+        priority=_signal_priority(signal),
+    )
 
 
 @asynccontextmanager
-async def _serialized_broker_workflow():
-    """Serialize in-process Pub/Sub, queue, and WebUI broker workflows."""
-    while not _BROKER_EXECUTION_LOCK.acquire(blocking=False):
-        await asyncio.sleep(0.01)
-    try:
+async def _serialized_broker_workflow(
+    signal: SignalMessage,
+    account_scope: str,
+    reservation: LaneReservation | None = None,
+):
+    """Order in-process Pub/Sub, queue, and WebUI broker workflows per lane.
+
+    Work for one market/ticker/account lane runs strictly in arrival order;
+    independent lanes share ``BROKER_MAX_CONCURRENT_LANES`` slots, granted to
+    exits ahead of buys and otherwise first-come-first-served.  EVENT signals
+    may act on every holding, so they run exclusively.  ``reservation`` (from
+    :func:`_reserve_broker_lane`) keeps the place taken before earlier awaits.
+    """
+    key = lane_key(signal.market, signal.ticker, account_scope)
+    priority = _signal_priority(signal)
+    waiting_since = time.perf_counter()
+    async with _BROKER_LANES.lane(
+        key, exclusive=signal.is_event, priority=priority, reservation=reservation
+    ):
+        waited = time.perf_counter() - waiting_since
+        metrics.BROKER_LANE_WAIT_SECONDS.observe(
+            waited, priority=_PRIORITY_NAMES.get(priority, str(priority))
+        )
+        tracing.set_attributes(lane_wait_ms=round(waited * 1000, 3))
         yield
+
+
+_PRIORITY_NAMES = {PRIORITY_URGENT: "urgent", PRIORITY_NORMAL: "normal"}
+
+
+def _signal_priority(signal: SignalMessage) -> int:
+    """SELL/stop-loss exits and risk-off events must not queue behind buys."""
+    if signal.signal_type == "SELL" or signal.is_event:
+        return PRIORITY_URGENT
+    return PRIORITY_NORMAL
+
+
+def broker_lane_snapshot() -> LaneSnapshot:
+    """Return current broker lane occupancy for shutdown diagnostics."""
+    return _BROKER_LANES.snapshot()
+
+
+def broker_lane_wait_stats() -> dict[str, LaneWaitStats]:
+    """Return broker lane admission wait statistics by priority class."""
+    return {
+        _PRIORITY_NAMES.get(priority, str(priority)): stats
+        for priority, stats in _BROKER_LANES.wait_stats().items()
+    }
+
+
+async def _measured_dispatch(
+    signal: SignalMessage, work: Awaitable[DispatchResult]
+) -> DispatchResult:
+    """Record end-to-end dispatch time under the final status (``error`` if it raised)."""
+    started = time.perf_counter()
+    status = "error"
+    try:
+        with tracing.span(
+            "dispatch", ticker=signal.ticker, type=signal.signal_type, market=signal.market
+        ) as current:
+            result = await work
+            status = result.status
+            if current is not None:
+                current.set(status=status)
+        return result
     finally:
-        _BROKER_EXECUTION_LOCK.release()
+        metrics.DISPATCH_SECONDS.observe(time.perf_counter() - started, status=status)
 
 
 def _account_id(account_key: str) -> str:
@@ -73,6 +166,20 @@ def _account_id(account_key: str) -> str:
     return hashlib.sha256(account_key.encode("utf-8")).hexdigest()[:24]
 
 
+def _as_positive_int(value: Any, default: int, *, setting: str) -> int:
+    if value is None or value == "":
+        return default
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        logger.warning("Ignoring invalid %s=%r; using %s", setting, value, default)
+        return default
+    if not math.isfinite(number) or not number.is_integer() or number < 1:
+        logger.warning("Ignoring invalid %s=%r; using %s", setting, value, default)
+        return default
+    return int(number)
+
+
 def _as_enabled(value: Any, default: bool = False) -> bool:
     if value is None:
         return default
@@ -102,17 +209,43 @@ class DispatchResult:
     accounts: list[AccountDispatchResult] = field(default_factory=list)
 
 
+@dataclass(slots=True)
+class WindowSubmission:
+    """Queued orders submitted when one off-hours order window opened."""
+
+    market: str
+    window: str
+    opened_at: datetime
+    submitted: int = 0
+    deferred: int = 0
+    failed: int = 0
+    # Seconds from ``opened_at`` until each submitted order's outcome was known.
+    latencies: list[float] = field(default_factory=list)
+
+
 class MultiAccountTradeDispatcher:
     """Resolve, execute, and aggregate one validated signal across eligible accounts.
 
-    Broker calls are intentionally serial.  KIS uses a shared mutable environment;
-    serial execution combined with the broker-layer environment lock prevents any
-    account's token or credential context from leaking into another account.
+    Each account's execution holds that account's ticker lane and claims its
+    own execution-ledger entry.  With ``max_concurrency`` above one, up to
+    that many accounts run at once so every account trades the same signal
+    at comparable prices; traders carry their own KIS client context, so no
+    account's token or credentials can leak into another.  Results keep the
+    configured account order either way.
     """
 
-    def __init__(self, dispatcher: "TradeDispatcher", ledger: ExecutionLedger | None = None):
+    def __init__(
+        self,
+        dispatcher: "TradeDispatcher",
+        ledger: ExecutionLedger | None = None,
+        *,
+        max_concurrency: int = 1,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
         self.dispatcher = dispatcher
         self.ledger = ledger or ExecutionLedger()
+        self.max_concurrency = max_concurrency
 
     def _eligible_accounts(
         self, signal: SignalMessage, requested_ids: list[str] | None = None
@@ -209,7 +342,29 @@ class MultiAccountTradeDispatcher:
                 )
             return self._aggregate(signal, results)
 
-        market_open = is_market_open(signal.market)
+        # Take every account's lane ticket before the first await, so queued
+        # items drained concurrently keep their per-lane arrival order.
+        reservations = [
+            _reserve_broker_lane(signal, _account_id(account["account_key"])) for account in accounts
+        ]
+        try:
+            return await self._dispatch_reserved(
+                signal, accounts, reservations, results, allow_queue=allow_queue
+            )
+        finally:
+            for reservation in reservations:
+                _BROKER_LANES.cancel(reservation)
+
+    async def _dispatch_reserved(
+        self,
+        signal: SignalMessage,
+        accounts: list[dict[str, Any]],
+        reservations: list[LaneReservation],
+        results: list[AccountDispatchResult],
+        *,
+        allow_queue: bool,
+    ) -> DispatchResult:
+        market_open = await asyncio.to_thread(is_market_open, signal.market)
         can_submit_off_hours = (
             self.dispatcher.trading_mode == "real"
             and is_off_hours_order_available(signal.market)
@@ -221,7 +376,7 @@ class MultiAccountTradeDispatcher:
                     "multi_account": True,
                     "account_ids": [_account_id(account["account_key"]) for account in accounts],
                 }
-                queued = self.dispatcher.queue.enqueue(signal, context)
+                queued = await asyncio.to_thread(self.dispatcher.queue.enqueue, signal, context)
                 for account in accounts:
                     results.append(
                         AccountDispatchResult(
@@ -247,60 +402,89 @@ class MultiAccountTradeDispatcher:
                 )
             return self._aggregate(signal, results)
 
-        for account in accounts:
-            account_id = _account_id(account["account_key"])
-            identity = execution_identity(signal.raw, account["account_key"])
-            claimed, previous_status = self.ledger.claim(identity)
-            if not claimed:
-                results.append(
-                    AccountDispatchResult(
-                        account=account["name"],
-                        account_id=account_id,
-                        status="skipped",
-                        message=f"Duplicate signal/account execution suppressed (previous status: {previous_status})",
-                    )
-                )
-                logger.warning(
-                    "[Account: %s] suppressed duplicate automatic %s %s(%s)",
-                    account["name"], signal.signal_type, signal.company_name, signal.ticker,
-                )
-                continue
-            try:
-                result = await self.dispatcher._dispatch_serialized(
-                    signal, allow_queue=False, account=account
-                )
-                self.ledger.finalize(identity, result.status)
-                results.append(
-                    AccountDispatchResult(
-                        account=account["name"],
-                        account_id=account_id,
-                        status=result.status,
-                        message=result.message,
-                    )
-                )
-                logger.info(
-                    "[Account: %s] automatic %s %s(%s) -> %s: %s",
-                    account["name"], signal.signal_type, signal.company_name, signal.ticker,
-                    result.status, result.message,
-                )
-            except Exception as exc:  # noqa: BLE001 - each account is an isolated boundary
-                error_message = f"{type(exc).__name__}: {str(exc)[:512]}"
-                self.ledger.finalize(identity, "failed")
-                results.append(
-                    AccountDispatchResult(
-                        account=account["name"],
-                        account_id=account_id,
-                        status="failed",
-                        message="Account execution failed",
-                        error=error_message,
-                    )
-                )
-                logger.exception(
-                    "[Account: %s] automatic %s %s(%s) failed",
-                    account["name"], signal.signal_type, signal.company_name, signal.ticker,
+        if self.max_concurrency == 1 or len(accounts) == 1:
+            for account, reservation in zip(accounts, reservations):
+                results.append(await self._dispatch_in_lane(signal, account, reservation))
+        else:
+            slots = asyncio.Semaphore(self.max_concurrency)
+
+            async def fan_out(
+                account: dict[str, Any], reservation: LaneReservation
+            ) -> AccountDispatchResult:
+                async with slots:
+                    return await self._dispatch_in_lane(signal, account, reservation)
+
+            results.extend(
+                await asyncio.gather(
+                    *(fan_out(account, reservation) for account, reservation in zip(accounts, reservations))
                 )
+            )
         return self._aggregate(signal, results)
 
+    async def _dispatch_in_lane(
+        self,
+        signal: SignalMessage,
+        account: dict[str, Any],
+        reservation: LaneReservation | None = None,
+    ) -> AccountDispatchResult:
+        account_id = _account_id(account["account_key"])
+        identity = execution_identity(signal.raw, account["account_key"])
+        with tracing.span("account", account_id=account_id):
+            async with _serialized_broker_workflow(signal, account_id, reservation):
+                return await self._dispatch_account(signal, account, account_id, identity)
+
+    async def _dispatch_account(
+        self,
+        signal: SignalMessage,
+        account: dict[str, Any],
+        account_id: str,
+        identity: str,
+    ) -> AccountDispatchResult:
+        with tracing.span("ledger.claim"):
+            claimed, previous_status = await asyncio.to_thread(self.ledger.claim, identity)
+        if not claimed:
+            logger.warning(
+                "[Account: %s] suppressed duplicate automatic %s %s(%s)",
+                account["name"], signal.signal_type, signal.company_name, signal.ticker,
+            )
+            return AccountDispatchResult(
+                account=account["name"],
+                account_id=account_id,
+                status="skipped",
+                message=f"Duplicate signal/account execution suppressed (previous status: {previous_status})",
+            )
+        try:
+            result = await self.dispatcher._dispatch_serialized(
+                signal, allow_queue=False, account=account
+            )
+            with tracing.span("ledger.finalize"):
+                await asyncio.to_thread(self.ledger.finalize, identity, result.status)
+            logger.info(
+                "[Account: %s] automatic %s %s(%s) -> %s: %s",
+                account["name"], signal.signal_type, signal.company_name, signal.ticker,
+                result.status, result.message,
+            )
+            return AccountDispatchResult(
+                account=account["name"],
+                account_id=account_id,
+                status=result.status,
+                message=result.message,
+            )
+        except Exception as exc:  # noqa: BLE001 - each account is an isolated boundary
+            error_message = f"{type(exc).__name__}: {str(exc)[:512]}"
+            await asyncio.to_thread(self.ledger.finalize, identity, "failed")
+            logger.exception(
+                "[Account: %s] automatic %s %s(%s) failed",
+                account["name"], signal.signal_type, signal.company_name, signal.ticker,
+            )
+            return AccountDispatchResult(
+                account=account["name"],
+                account_id=account_id,
+                status="failed",
+                message="Account execution failed",
+                error=error_message,
+            )
+
 
 class TradeDispatcher:
     def __init__(
@@ -318,7 +502,7 @@ class TradeDispatcher:
         self.dry_run = dry_run
         selected_mode = get_trading_mode() if trading_mode is None else trading_mode
         self.trading_mode = normalize_trading_mode(selected_mode)
-        self.queue = queue or OffHoursOrderQueue(queue_path)
+        self.queue = queue or open_off_hours_queue(queue_path)
         self._runtime_config = self._load_runtime_config()
         self.strategy_config = strategy_config if strategy_config is not None else (
             self._runtime_config.get("signal_strategy") or {}
@@ -349,21 +533,44 @@ class TradeDispatcher:
             and self.account_index is None
             and _as_enabled(setting.get("enabled") if isinstance(setting, dict) else setting)
         )
+        max_concurrency = _as_positive_int(
+            setting.get("max_concurrency") if isinstance(setting, dict) else None,
+            1,
+            setting="multi_account_trading.max_concurrency",
+        )
+        if self.multi_account_enabled and max_concurrency > _BROKER_LANES.max_concurrency:
+            logger.warning(
+                "multi_account_trading.max_concurrency=%s exceeds BROKER_MAX_CONCURRENT_LANES=%s; "
+                "accounts will overlap at most %s at a time",
+                max_concurrency,
+                _BROKER_LANES.max_concurrency,
+                _BROKER_LANES.max_concurrency,
+            )
         self.multi_account_dispatcher = MultiAccountTradeDispatcher(
-            self, ExecutionLedger(execution_ledger_path)
+            self, ExecutionLedger(execution_ledger_path), max_concurrency=max_concurrency
         )
 
     async def dispatch(self, signal: SignalMessage, *, allow_queue: bool = True) -> DispatchResult:
-        async with _serialized_broker_workflow():
-            if self.multi_account_enabled:
-                return await self.multi_account_dispatcher.dispatch(
-                    signal, allow_queue=allow_queue
-                )
-            if self.dry_run:
-                logger.info("[DRY-RUN] %s %s(%s)", signal.signal_type, signal.company_name, signal.ticker)
-                return DispatchResult("dry-run", "Dry-run mode; no trade executed", signal.signal_type, signal.market)
+        return await _measured_dispatch(signal, self._dispatch(signal, allow_queue=allow_queue))
+
+    async def _dispatch(self, signal: SignalMessage, *, allow_queue: bool) -> DispatchResult:
+        if self.multi_account_enabled:
+            return await self.multi_account_dispatcher.dispatch(
+                signal, allow_queue=allow_queue
+            )
+        if self.dry_run:
+            logger.info("[DRY-RUN] %s %s(%s)", signal.signal_type, signal.company_name, signal.ticker)
+            return DispatchResult("dry-run", "Dry-run mode; no trade executed", signal.signal_type, signal.market)
+        async with _serialized_broker_workflow(signal, self._lane_account_scope()):
             return await self._dispatch_serialized(signal, allow_queue=allow_queue)
 
+    def _lane_account_scope(self) -> str:
+        if self.account_name:
+            return f"name:{self.account_name}"
+        if self.account_index is not None:
+            return f"index:{self.account_index}"
+        return "default"
+
     async def _dispatch_serialized(
         self,
         signal: SignalMessage,
@@ -374,17 +581,15 @@ class TradeDispatcher:
         event_strategy = self._resolve_event_strategy(signal)
         if signal.is_event:
             if event_strategy is not None:
-                strategy_result = await event_strategy.execute(
-                    signal,
-                    trading_mode=self.trading_mode,
-                    trader_kwargs=self._strategy_trader_kwargs(account),
-                )
+                strategy_result = await self._run_strategy(event_strategy, signal, account)
                 return DispatchResult(strategy_result.status, strategy_result.message, signal.signal_type, signal.market)
             logger.info("Ignoring EVENT signal for %s(%s)", signal.company_name, signal.ticker)
             return DispatchResult("acknowledged", "Event signal acknowledged", signal.signal_type, signal.market)
 
         strategy = self._resolve_strategy(signal)
-        market_open = is_market_open(signal.market)
+        # The US calendar lookup and the queue's locked rewrite both block;
+        # keep them off the shared dispatch loop.
+        market_open = await asyncio.to_thread(is_market_open, signal.market)
         if not market_open:
             can_submit_off_hours = (
                 self.trading_mode == "real" and is_off_hours_order_available(signal.market)
@@ -395,7 +600,7 @@ class TradeDispatcher:
                     signal.signal_type, signal.company_name, signal.ticker, signal.market,
                 )
             elif allow_queue:
-                queued_signal = self.queue.enqueue(signal)
+                queued_signal = await asyncio.to_thread(self.queue.enqueue, signal)
                 logger.info(
                     "Queued %s-mode %s %s(%s) for %s",
                     self.trading_mode, signal.signal_type, signal.company_name,
@@ -415,43 +620,174 @@ class TradeDispatcher:
                 )
 
         if strategy is not None:
-            strategy_result = await strategy.execute(
-                signal,
-                trading_mode=self.trading_mode,
-                trader_kwargs=self._strategy_trader_kwargs(account),
-            )
+            strategy_result = await self._run_strategy(strategy, signal, account)
             return DispatchResult(strategy_result.status, strategy_result.message, signal.signal_type, signal.market)
         if account is None:
             return await self._execute_legacy_trade(signal)
         return await self._execute_legacy_trade(signal, account=account)
 
+    async def _run_strategy(
+        self, strategy: Any, signal: SignalMessage, account: dict[str, Any] | None
+    ) -> Any:
+        with tracing.span(f"strategy.{type(strategy).__name__}"):
+            return await strategy.execute(
+                signal,
+                trading_mode=self.trading_mode,
+                trader_kwargs=self._strategy_trader_kwargs(account),
+            )
+
     async def execute_queued_signal(self, payload: dict) -> DispatchResult:
         queue_context = payload.pop(QUEUE_CONTEXT_KEY, None)
         signal = parse_signal_payload(payload)
-        async with _serialized_broker_workflow():
-            if isinstance(queue_context, dict) and queue_context.get("multi_account"):
-                requested_ids = queue_context.get("account_ids")
-                if not isinstance(requested_ids, list) or not all(isinstance(item, str) for item in requested_ids):
-                    return DispatchResult("failed", "Queued multi-account targets are invalid", signal.signal_type, signal.market)
-                return await self.multi_account_dispatcher.dispatch(
+        if isinstance(queue_context, dict) and queue_context.get("multi_account"):
+            requested_ids = queue_context.get("account_ids")
+            if not isinstance(requested_ids, list) or not all(isinstance(item, str) for item in requested_ids):
+                return DispatchResult("failed", "Queued multi-account targets are invalid", signal.signal_type, signal.market)
+            return await _measured_dispatch(
+                signal,
+                self.multi_account_dispatcher.dispatch(
                     signal, allow_queue=False, requested_ids=requested_ids
                 )
+            )
         return await self.dispatch(signal, allow_queue=False)
 
-    def drain_due_orders(self) -> int:
-        def _executor(payload: dict) -> QueueExecutionResult:
-            result = asyncio.run(self.execute_queued_signal(payload))
-            if result.status == "deferred":
-                return QueueExecutionResult("deferred", result.message)
-            if result.status in {"failed", "skipped"}:
-                logger.error(
-                    "Quarantining failed queued %s order on %s: %s",
-                    result.signal_type, result.market, result.message,
+    def queued_trader_kwargs(self, payload: dict) -> list[dict[str, Any]]:
+        """Trader constructor arguments for every account a queued payload will execute on."""
+
+        queue_context = payload.get(QUEUE_CONTEXT_KEY)
+        signal = parse_signal_payload({key: value for key, value in payload.items() if key != QUEUE_CONTEXT_KEY})
+        if isinstance(queue_context, dict) and queue_context.get("multi_account"):
+            requested_ids = queue_context.get("account_ids")
+            if not isinstance(requested_ids, list) or not all(isinstance(item, str) for item in requested_ids):
+                return []
+            accounts, _ = self.multi_account_dispatcher._eligible_accounts(signal, requested_ids)
+        elif self.multi_account_enabled:
+            accounts, _ = self.multi_account_dispatcher._eligible_accounts(signal)
+        else:
+            return [self._trader_kwargs()]
+        return [self._trader_kwargs(account) for account in accounts]
+
+    def stage_queued_orders(
+        self,
+        items: list[QueuedSignal],
+        *,
+        dispatch_loop: DispatchLoop | None = None,
+    ) -> StagingReport:
+        """Authenticate accounts and warm quotes for queued orders ahead of the open."""
+
+        return run_dispatch_coroutine(
+            stage_queued_orders(items, self.queued_trader_kwargs), dispatch_loop
+        )
+
+    def drain_due_orders(
+        self,
+        *,
+        dispatch_loop: DispatchLoop | None = None,
+        batch_size: int | None = None,
+    ) -> int:
+        """Execute due queued orders, optionally on a shared persistent loop.
+
+        ``batch_size`` (default ``OFF_HOURS_QUEUE_DRAIN_BATCH``) above one runs
+        that many due orders concurrently in one coroutine - broker lanes still
+        serialize orders for the same ticker and account - and commits their
+        removals and quarantines to the queue together.
+        """
+        selected = drain_batch_size_from_env() if batch_size is None else batch_size
+        if selected > 1:
+            def _batch_executor(payloads: list[dict], record: OutcomeRecorder) -> list[QueueExecutionResult]:
+                return run_dispatch_coroutine(
+                    self._execute_queued_batch(payloads, record=record), dispatch_loop
                 )
-                return QueueExecutionResult("failed", result.message)
-            return QueueExecutionResult("processed", result.message)
+
+            return self.queue.drain_due_batch(_batch_executor, batch_size=selected)
+
+        def _executor(payload: dict) -> QueueExecutionResult:
+            result = run_dispatch_coroutine(self.execute_queued_signal(payload), dispatch_loop)
+            return self._queue_disposition(result)
         return self.queue.drain_due(_executor)
 
+    def submit_window_orders(
+        self,
+        market: str,
+        window: str,
+        opened_at: datetime,
+        *,
+        dispatch_loop: DispatchLoop | None = None,
+        batch_size: int | None = None,
+    ) -> WindowSubmission:
+        """Submit every pending queued order for ``market`` as its off-hours window opens.
+
+        Queued real-mode orders otherwise wait for the regular open.  Each one
+        goes through the normal dispatch path, which places a closing-price or
+        reserved order while the window is open and defers it when it is not.
+        Submission latency from ``opened_at`` is observed per order.
+        """
+        report = WindowSubmission(market, window, opened_at)
+        if self.trading_mode != "real":
+            return report
+        opened = opened_at.timestamp()
+
+        def observe(outcome: QueueExecutionResult) -> None:
+            if outcome.disposition == "deferred":
+                report.deferred += 1
+                return
+            if outcome.disposition == "failed":
+                report.failed += 1
+                return
+            elapsed = max(0.0, time.time() - opened)
+            report.latencies.append(elapsed)
+            metrics.OFF_HOURS_WINDOW_SUBMIT_SECONDS.observe(elapsed, market=market, window=window)
+
+        def _batch_executor(payloads: list[dict], record: OutcomeRecorder) -> list[QueueExecutionResult]:
+            return run_dispatch_coroutine(
+                self._execute_queued_batch(payloads, record=record, on_outcome=observe), dispatch_loop
+            )
+
+        selected = drain_batch_size_from_env() if batch_size is None else batch_size
+        report.submitted = self.queue.drain_due_batch(
+            _batch_executor,
+            batch_size=selected,
+            select=lambda item: str(item.signal.get("market", "")).upper() == market,
+        )
+        return report
+
+    async def _execute_queued_batch(
+        self,
+        payloads: list[dict],
+        *,
+        record: OutcomeRecorder | None = None,
+        on_outcome: Callable[[QueueExecutionResult], None] | None = None,
+    ) -> list[QueueExecutionResult]:
+        async def execute(index: int, payload: dict) -> QueueExecutionResult:
+            try:
+                result = await self.execute_queued_signal(payload)
+            except Exception as exc:  # noqa: BLE001 - isolate poison queue items
+                outcome = _failed_outcome(exc)
+            else:
+                outcome = self._queue_disposition(result)
+            if on_outcome is not None:
+                on_outcome(outcome)
+            if record is not None:
+                # The journal backend persists it now; the JSON backend waits for the batch.
+                await asyncio.to_thread(record, index, outcome)
+            return outcome
+
+        return list(
+            await asyncio.gather(*(execute(index, payload) for index, payload in enumerate(payloads)))
+        )
+
+    @staticmethod
+    def _queue_disposition(result: DispatchResult) -> QueueExecutionResult:
+        if result.status == "deferred":
+            return QueueExecutionResult("deferred", result.message)
+        if result.status in {"failed", "skipped"}:
+            logger.error(
+                "Quarantining failed queued %s order on %s: %s",
+                result.signal_type, result.market, result.message,
+            )
+            return QueueExecutionResult("failed", result.message)
+        return QueueExecutionResult("processed", result.message)
+
     @staticmethod
     def _load_runtime_config() -> dict[str, Any]:
         with open(active_kis_config_path(), encoding="utf-8") as fh:
@@ -515,12 +851,13 @@ class TradeDispatcher:
     def _trader_kwargs(self, account: dict[str, Any] | None = None) -> dict[str, Any]:
         return {"mode": self.trading_mode, **self._strategy_trader_kwargs(account)}
 
+    @tracing.traced("legacy_trade")
     async def _execute_legacy_trade(
         self, signal: SignalMessage, *, account: dict[str, Any] | None = None
     ) -> DispatchResult:
         limit_price = None if signal.price in (None, 0) else signal.price
         if signal.market == "US":
-            trader = USStockTrading(**self._trader_kwargs(account))
+            trader = await async_pooled_trader(USStockTrading, **self._trader_kwargs(account))
             if signal.signal_type == "BUY":
                 trade_result = await trader.async_buy_stock(ticker=signal.ticker, limit_price=limit_price)
             else:
@@ -0,0 +1,290 @@
+"""Per-ticker ordered broker lanes with bounded cross-lane concurrency."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_LANES = 1
+
+PRIORITY_NORMAL = 0
+PRIORITY_URGENT = 10
+
+
+def max_concurrent_lanes_from_env(
+    name: str = "BROKER_MAX_CONCURRENT_LANES",
+    default: int = DEFAULT_MAX_CONCURRENT_LANES,
+) -> int:
+    raw_value = os.environ.get(name)
+    if raw_value in (None, ""):
+        return default
+    try:
+        value = float(raw_value)
+    except (TypeError, ValueError):
+        logger.warning("Ignoring invalid %s=%r; using %s", name, raw_value, default)
+        return default
+    if not math.isfinite(value) or not value.is_integer() or value < 1:
+        logger.warning("Ignoring invalid %s=%r; using %s", name, raw_value, default)
+        return default
+    return int(value)
+
+
+LaneKey = tuple[str, str, str]
+
+
+def lane_key(market: str, ticker: str, account: str) -> LaneKey:
+    """Build the ordering key for one market/ticker/account combination."""
+
+    return (str(market or "").upper(), str(ticker or "").upper(), str(account or ""))
+
+
+@dataclass(slots=True)
+class _LaneState:
+    next_ticket: int = 0
+    serving: int = 0
+    abandoned: set[int] = field(default_factory=set)
+
+
+@dataclass(slots=True, eq=False)
+class _Waiter:
+    key: LaneKey
+    state: _LaneState
+    ticket: int
+    priority: int
+    sequence: int
+    exclusive: bool
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    enqueued_at: float
+    admitted: bool = False
+    entered: bool = False
+
+
+# A ticket taken with ``LaneScheduler.reserve`` and not yet used.
+LaneReservation = _Waiter
+
+
+@dataclass(frozen=True, slots=True)
+class LaneSnapshot:
+    """Point-in-time lane occupancy used for shutdown and diagnostics."""
+
+    active: int
+    waiting: int
+    lanes: int
+    exclusive: bool
+    max_concurrency: int
+
+
+@dataclass(slots=True)
+class LaneWaitStats:
+    """Accumulated admission wait times for one priority class."""
+
+    acquisitions: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    last_wait_seconds: float = 0.0
+
+    @property
+    def average_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.acquisitions if self.acquisitions else 0.0
+
+    def record(self, seconds: float) -> None:
+        self.acquisitions += 1
+        self.total_wait_seconds += seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+        self.last_wait_seconds = seconds
+
+    def copy(self) -> "LaneWaitStats":
+        return LaneWaitStats(
+            self.acquisitions,
+            self.total_wait_seconds,
+            self.max_wait_seconds,
+            self.last_wait_seconds,
+        )
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class LaneScheduler:
+    """Order broker work per lane while running independent lanes concurrently.
+
+    Work for the same lane key is admitted strictly in arrival order.  Work
+    for different lane keys shares ``max_concurrency`` execution slots, handed
+    out by priority and then first-come-first-served, so urgent exits are not
+    stuck behind a backlog of buys.  An exclusive lane (used for account-wide
+    risk-off events) waits for every active lane to finish and holds back
+    lower-ranked lanes until it completes.
+
+    The scheduler is shared by threads with their own event loops (Pub/Sub
+    dispatch loop, queue worker, WebUI).  State is guarded by a thread lock and
+    each waiter is woken on its own loop with ``call_soon_threadsafe``, so no
+    caller polls for a free slot.
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENT_LANES) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._lanes: dict[LaneKey, _LaneState] = {}
+        self._waiters: list[_Waiter] = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._exclusive_active = False
+        self._stats: dict[int, LaneWaitStats] = {}
+
+    def snapshot(self) -> LaneSnapshot:
+        with self._lock:
+            return LaneSnapshot(
+                active=self._active,
+                waiting=len(self._waiters),
+                lanes=len(self._lanes),
+                exclusive=self._exclusive_active,
+                max_concurrency=self.max_concurrency,
+            )
+
+    def wait_stats(self) -> dict[int, LaneWaitStats]:
+        """Return admission wait statistics keyed by priority."""
+
+        with self._lock:
+            return {priority: stats.copy() for priority, stats in self._stats.items()}
+
+    def _admit_waiters_locked(self) -> None:
+        if self._exclusive_active:
+            return
+        admitted_any = False
+        for waiter in sorted(self._waiters, key=lambda item: (-item.priority, item.sequence)):
+            if waiter.state.serving != waiter.ticket:
+                continue
+            if waiter.exclusive:
+                if self._active == 0 and not admitted_any:
+                    self._admit_locked(waiter)
+                    self._exclusive_active = True
+                # Lower-ranked lanes wait until the exclusive lane has run.
+                break
+            if self._active >= self.max_concurrency:
+                break
+            self._admit_locked(waiter)
+            admitted_any = True
+
+    def _admit_locked(self, waiter: _Waiter) -> None:
+        waiter.admitted = True
+        self._waiters.remove(waiter)
+        self._active += 1
+        self._stats.setdefault(waiter.priority, LaneWaitStats()).record(
+            time.monotonic() - waiter.enqueued_at
+        )
+        waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+
+    def _advance_locked(self, key: LaneKey, state: _LaneState, *, skip_current: bool = True) -> None:
+        if skip_current:
+            state.serving += 1
+        while state.serving in state.abandoned:
+            state.abandoned.discard(state.serving)
+            state.serving += 1
+        if state.serving == state.next_ticket and self._lanes.get(key) is state:
+            del self._lanes[key]
+
+    def _release_locked(self, waiter: _Waiter) -> None:
+        self._active -= 1
+        if waiter.exclusive:
+            self._exclusive_active = False
+        self._advance_locked(waiter.key, waiter.state)
+        self._admit_waiters_locked()
+
+    def _abandon_locked(self, waiter: _Waiter) -> None:
+        self._waiters.remove(waiter)
+        # A cancelled waiter still owns its ticket.  Skip it immediately when
+        # it is at the head of the lane, otherwise when the lane reaches it.
+        waiter.state.abandoned.add(waiter.ticket)
+        if waiter.state.serving == waiter.ticket:
+            self._advance_locked(waiter.key, waiter.state, skip_current=False)
+        self._admit_waiters_locked()
+
+    def reserve(
+        self,
+        key: LaneKey,
+        *,
+        exclusive: bool = False,
+        priority: int = PRIORITY_NORMAL,
+    ) -> LaneReservation:
+        """Take the next ticket for ``key`` now and enter the lane later.
+
+        A caller that must await before it can enter (for example to check the
+        market calendar) keeps its arrival order this way.  Pass the result to
+        :meth:`lane`, or to :meth:`cancel` if the work will not run.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            state = self._lanes.setdefault(key, _LaneState())
+            waiter = _Waiter(
+                key=key,
+                state=state,
+                ticket=state.next_ticket,
+                priority=priority,
+                sequence=next(self._sequence),
+                exclusive=exclusive,
+                loop=loop,
+                future=loop.create_future(),
+                enqueued_at=time.monotonic(),
+            )
+            state.next_ticket += 1
+            self._waiters.append(waiter)
+            self._admit_waiters_locked()
+        return waiter
+
+    def cancel(self, reservation: LaneReservation) -> None:
+        """Give up a reservation that never entered its lane."""
+
+        with self._lock:
+            if reservation.entered:
+                return
+            reservation.entered = True
+            if reservation.admitted:
+                self._release_locked(reservation)
+            else:
+                self._abandon_locked(reservation)
+
+    @asynccontextmanager
+    async def lane(
+        self,
+        key: LaneKey,
+        *,
+        exclusive: bool = False,
+        priority: int = PRIORITY_NORMAL,
+        reservation: LaneReservation | None = None,
+    ) -> AsyncIterator[None]:
+        waiter = reservation
+        if waiter is None:
+            waiter = self.reserve(key, exclusive=exclusive, priority=priority)
+        with self._lock:
+            if waiter.entered:
+                raise RuntimeError("lane reservation was already used or cancelled")
+            waiter.entered = True
+        try:
+            await waiter.future
+        except BaseException:
+            with self._lock:
+                if waiter.admitted:
+                    self._release_locked(waiter)
+                else:
+                    self._abandon_locked(waiter)
+            raise
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._release_locked(waiter)
@@ -0,0 +1,125 @@
+"""Long-lived asyncio loop shared by thread-based broker dispatch callers."""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Awaitable, Coroutine, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class DispatchLoopClosedError(RuntimeError):
+    """Raised when work is submitted to a dispatch loop that is not running."""
+
+
+class DispatchLoop:
+    """Run one event loop on a dedicated thread and accept coroutines from others.
+
+    Pub/Sub callbacks and the off-hours queue worker run on their own threads.
+    Submitting to one persistent loop avoids building a new event loop for each
+    signal and keeps loop-bound primitives, such as the per-ticker locks held by
+    trader objects, valid between signals.
+    """
+
+    def __init__(self, *, name: str = "dispatch-loop") -> None:
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self._state_lock = threading.Lock()
+        self._closed = False
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self._loop
+
+    @property
+    def is_running(self) -> bool:
+        thread = self._thread
+        return bool(thread is not None and thread.is_alive() and not self._closed)
+
+    def start(self) -> None:
+        with self._state_lock:
+            if self._closed:
+                raise DispatchLoopClosedError("Dispatch loop was already stopped")
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        self._ready.wait()
+        logger.info("Dispatch loop started (%s)", self.name)
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            try:
+                pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.run_until_complete(loop.shutdown_default_executor())
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> concurrent.futures.Future[T]:
+        """Schedule ``coro`` on the dispatch loop from any other thread."""
+
+        with self._state_lock:
+            loop = self._loop
+            if self._closed or loop is None or not self.is_running:
+                coro.close()
+                raise DispatchLoopClosedError("Dispatch loop is not running")
+            return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run(self, coro: Awaitable[T] | Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Block the calling thread until ``coro`` completes on the dispatch loop."""
+
+        if threading.current_thread() is self._thread:
+            if asyncio.iscoroutine(coro):
+                coro.close()
+            raise RuntimeError("DispatchLoop.run() cannot wait from the dispatch loop thread")
+        future = self.submit(coro)  # type: ignore[arg-type]
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        with self._state_lock:
+            if self._closed:
+                return
+            self._closed = True
+            loop = self._loop
+            thread = self._thread
+        if loop is None or thread is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=timeout)
+        if thread.is_alive():
+            logger.warning("Dispatch loop thread did not exit within %s seconds", timeout)
+        else:
+            logger.info("Dispatch loop stopped (%s)", self.name)
+
+
+def run_dispatch_coroutine(
+    coro: Coroutine[Any, Any, T], dispatch_loop: DispatchLoop | None = None
+) -> T:
+    """Run ``coro`` on ``dispatch_loop`` when provided, else on a fresh loop."""
+
+    if dispatch_loop is None:
+        return asyncio.run(coro)
+    return dispatch_loop.run(coro)
@@ -6,13 +6,16 @@ Domestic stock trading module
 """
 
 import asyncio
+import copy
 import datetime
 import logging
 import math
 import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Any, Callable, Dict, List, Optional
 
+from . import tracing
 from . import yaml_compat as yaml
 from .config_paths import active_kis_config_path
 
@@ -29,6 +32,8 @@ from .kis_auth import (
 )
 from .buy_sizing import build_buy_sizing, resolve_buy_amount
 from .market_hours import KST
+from .stock_locks import StockLockMap
+from .trader_pool import async_pooled_trader, pooled_trader
 
 # Logging setup
 def _kst_log_time(*args: Any) -> time.struct_time:
@@ -48,6 +53,17 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, slots=True)
+class _PreparedOrder:
+    """Order request plus result builders shared by the sync and async paths."""
+
+    api_url: str
+    tr_id: str
+    params: Dict[str, Any]
+    on_response: Callable[[Any], Dict[str, Any]]
+    on_error: Callable[[Exception], Dict[str, Any]]
+
+
 class PortfolioInquiryError(RuntimeError):
     """Raised when KIS cannot provide a domestic portfolio response."""
 
@@ -66,6 +82,10 @@ with open(CONFIG_FILE, encoding="UTF-8") as f:
     _cfg = yaml.safe_load(f)
 
 
+def _is_regular_session(now: datetime.datetime) -> bool:
+    return datetime.time(9, 0) <= now.time() <= datetime.time(15, 30)
+
+
 class DomesticStockTrading:
     """Domestic stock trading class"""
 
@@ -124,10 +144,12 @@ class DomesticStockTrading:
 
         # Authentication with improved error handling
         try:
-            self.trenv = ka.authenticate_and_get_env(
-                svr=self.env,
-                product=self.product_code,
-                account_key=self.account_key,
+            self._adopt_client_context(
+                ka.authenticate_client_context(
+                    svr=self.env,
+                    product=self.product_code,
+                    account_key=self.account_key,
+                )
             )
         except CredentialMismatchError as e:
             logger.error("=" * 60)
@@ -193,33 +215,77 @@ class DomesticStockTrading:
             raise RuntimeError(f"{self.mode} mode authentication failed") from e
 
         # Additional setup for asynchronous processing
-        self._global_lock = asyncio.Lock()  # Global account access control
-        self._semaphore = asyncio.Semaphore(3)  # Maximum 3 concurrent requests
-        self._stock_locks = {}  # Per-stock locks
+        self._reset_async_primitives()
 
         logger.info(f"✅ DomesticStockTrading initialized (Async Enabled)")
         logger.info(f"   Mode: {mode}, Buy Amount: {self.buy_amount:,} KRW")
         logger.info(f"   Account: {self.account_name} ({ka.mask_account_number(self.trenv.my_acct)}-{self.trenv.my_prod})")
 
-    def _activate_account(self):
-        """Ensure the shared KIS environment matches this trader's account."""
-        ka.changeTREnv(
-            self.trenv.my_token,
-            svr=self.env,
-            product=self.trenv.my_prod,
-            account_key=self.account_key,
-        )
+    def _reset_async_primitives(self):
+        self._global_lock = asyncio.Lock()  # Global account access control
+        self._semaphore = asyncio.Semaphore(3)  # Maximum 3 concurrent requests
+        self._stock_locks = StockLockMap()  # Per-stock locks, LRU-bounded
+
+    def _for_event_loop(self):
+        """Return a copy sharing this account's auth state with its own asyncio locks."""
+        view = copy.copy(self)
+        view._reset_async_primitives()
+        return view
 
     def _request(self, api_url: str, tr_id: str, params: Dict[str, Any], **kwargs):
-        with ka.get_trading_env_lock():
-            self._activate_account()
-            response = ka._url_fetch(api_url, tr_id, "", params, **kwargs)
-            try:
-                self.trenv = ka.getTREnv()
-            except RuntimeError:
-                logger.debug("KIS trading environment unavailable after request; keeping existing trader environment")
-            return response
+        return ka._url_fetch(
+            api_url,
+            tr_id,
+            "",
+            params,
+            context=self.kis_context,
+            on_token_refresh=self._adopt_client_context,
+            **kwargs,
+        )
+
+    async def _request_async(self, api_url: str, tr_id: str, params: Dict[str, Any], **kwargs):
+        return await ka._url_fetch_async(
+            api_url,
+            tr_id,
+            "",
+            params,
+            context=self.kis_context,
+            on_token_refresh=self._adopt_client_context,
+            **kwargs,
+        )
+
+    def _adopt_client_context(self, context: ka.KISClientContext) -> None:
+        """Use ``context`` (and its account environment) for later requests."""
+        self.kis_context = context
+        self.trenv = context.env
+
+    def _trading_disabled_result(self, stock_code: str, side: str, **extra: Any) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'order_no': None,
+            'stock_code': stock_code,
+            'quantity': 0,
+            **extra,
+            'message': f'Auto trading is disabled. Cannot execute {side} order. (AUTO_TRADING=False)'
+        }
+
+    @tracing.traced("domestic.submit_order")
+    def _submit_order(self, order: "_PreparedOrder") -> Dict[str, Any]:
+        try:
+            res = self._request(order.api_url, order.tr_id, order.params, postFlag=True)
+            return order.on_response(res)
+        except Exception as e:
+            return order.on_error(e)
+
+    @tracing.traced("domestic.async_submit_order")
+    async def _async_submit_order(self, order: "_PreparedOrder") -> Dict[str, Any]:
+        try:
+            res = await self._request_async(order.api_url, order.tr_id, order.params, postFlag=True)
+            return order.on_response(res)
+        except Exception as e:
+            return order.on_error(e)
 
+    @tracing.traced("domestic.get_current_price")
     def get_current_price(self, stock_code: str) -> Optional[Dict[str, Any]]:
         """
         Get current market price (also used for connectivity test)
@@ -236,6 +302,30 @@ class DomesticStockTrading:
                 'volume': trading volume
             }
         """
+        api_url, tr_id, params = self._current_price_request(stock_code)
+
+        try:
+            res = self._request(api_url, tr_id, params)
+            return self._parse_current_price(stock_code, res)
+
+        except Exception as e:
+            logger.error(f"Error getting current price: {str(e)}")
+            return None
+
+    @tracing.traced("domestic.async_get_current_price")
+    async def async_get_current_price(self, stock_code: str) -> Optional[Dict[str, Any]]:
+        """Awaitable :meth:`get_current_price` on the native async KIS transport."""
+        api_url, tr_id, params = self._current_price_request(stock_code)
+
+        try:
+            res = await self._request_async(api_url, tr_id, params)
+            return self._parse_current_price(stock_code, res)
+
+        except Exception as e:
+            logger.error(f"Error getting current price: {str(e)}")
+            return None
+
+    def _current_price_request(self, stock_code: str) -> tuple[str, str, Dict[str, Any]]:
         api_url = "/uapi/domestic-stock/v1/quotations/inquire-price"
         tr_id = "FHKST01010100"
 
@@ -243,30 +333,25 @@ class DomesticStockTrading:
             "fid_cond_mrkt_div_code": "J",
             "fid_input_iscd": stock_code
         }
+        return api_url, tr_id, params
 
-        try:
-            res = self._request(api_url, tr_id, params)
+    def _parse_current_price(self, stock_code: str, res) -> Optional[Dict[str, Any]]:
+        if res.isOK():
+            data = res.getBody().output
 
-            if res.isOK():
-                data = res.getBody().output
+            result = {
+                'stock_code': stock_code,
+                'stock_name': data.get('rprs_mrkt_kor_name', ''),
+                'current_price': int(data.get('stck_prpr', 0)),  # Current price
+                'change_rate': float(data.get('prdy_ctrt', 0)),  # Change rate from previous day
+                'volume': int(data.get('acml_vol', 0))  # Cumulative volume
+            }
 
-                result = {
-                    'stock_code': stock_code,
-                    'stock_name': data.get('rprs_mrkt_kor_name', ''),
-                    'current_price': int(data.get('stck_prpr', 0)),  # Current price
-                    'change_rate': float(data.get('prdy_ctrt', 0)),  # Change rate from previous day
-                    'volume': int(data.get('acml_vol', 0))  # Cumulative volume
-                }
+            logger.info(f"[{stock_code}] Current price: {result['current_price']:,} KRW ({result['change_rate']:+.2f}%)")
+            return result
 
-                logger.info(f"[{stock_code}] Current price: {result['current_price']:,} KRW ({result['change_rate']:+.2f}%)")
-                return result
-            else:
-                logger.error(f"Failed to get current price: {res.getErrorCode()} - {res.getErrorMessage()}")
-                return None
-
-        except Exception as e:
-            logger.error(f"Error getting current price: {str(e)}")
-            return None
+        logger.error(f"Failed to get current price: {res.getErrorCode()} - {res.getErrorMessage()}")
+        return None
 
     def _resolve_buy_amount(self, buy_amount: int | float | None = None) -> float:
         if buy_amount is not None:
@@ -281,6 +366,16 @@ class DomesticStockTrading:
             currency="KRW",
         )
 
+    async def _async_resolve_buy_amount(self, buy_amount: int | float | None = None) -> float:
+        if buy_amount is not None or not self.buy_sizing.uses_asset_percent:
+            return self._resolve_buy_amount(buy_amount)
+        return resolve_buy_amount(
+            self.buy_sizing,
+            account_summary=await self.async_get_account_summary(),
+            fallback_amount=float(self.buy_amount),
+            currency="KRW",
+        )
+
     def calculate_buy_quantity(self, stock_code: str, buy_amount: int = None) -> int:
         """
         Calculate buyable quantity
@@ -296,6 +391,15 @@ class DomesticStockTrading:
 
         # Get current price
         current_price_info = self.get_current_price(stock_code)
+        return self._buy_quantity_for_price(stock_code, amount, current_price_info)
+
+    async def async_calculate_buy_quantity(self, stock_code: str, buy_amount: int = None) -> int:
+        """Awaitable :meth:`calculate_buy_quantity`."""
+        amount = await self._async_resolve_buy_amount(buy_amount)
+        current_price_info = await self.async_get_current_price(stock_code)
+        return self._buy_quantity_for_price(stock_code, amount, current_price_info)
+
+    def _buy_quantity_for_price(self, stock_code: str, amount: float, current_price_info: Optional[Dict[str, Any]]) -> int:
         if not current_price_info:
             return 0
 
@@ -331,18 +435,23 @@ class DomesticStockTrading:
         """
 
         if not self.auto_trading:
-            return {
-                'success': False,
-                'order_no': None,
-                'stock_code': stock_code,
-                'quantity': 0,
-                'message': 'Auto trading is disabled. Cannot execute buy order. (AUTO_TRADING=False)'
-            }
-
+            return self._trading_disabled_result(stock_code, "buy")
 
         # Calculate buyable quantity
         buy_quantity = self.calculate_buy_quantity(stock_code, buy_amount)
+        order = self._market_buy_order(stock_code, buy_quantity)
+        return order if isinstance(order, dict) else self._submit_order(order)
+
+    async def async_buy_market_price(self, stock_code: str, buy_amount: int = None) -> Dict[str, Any]:
+        """Awaitable :meth:`buy_market_price` on the native async KIS transport."""
+        if not self.auto_trading:
+            return self._trading_disabled_result(stock_code, "buy")
 
+        buy_quantity = await self.async_calculate_buy_quantity(stock_code, buy_amount)
+        order = self._market_buy_order(stock_code, buy_quantity)
+        return order if isinstance(order, dict) else await self._async_submit_order(order)
+
+    def _market_buy_order(self, stock_code: str, buy_quantity: int) -> "_PreparedOrder | Dict[str, Any]":
         if buy_quantity <= 0:
             return {
                 'success': False,
@@ -373,9 +482,7 @@ class DomesticStockTrading:
             "CNDT_PRIC": ""
         }
 
-        try:
-            res = self._request(api_url, tr_id, params, postFlag=True)
-
+        def on_response(res) -> Dict[str, Any]:
             if res.isOK():
                 output = res.getBody().output
                 order_no = output.get('odno', '')
@@ -401,7 +508,7 @@ class DomesticStockTrading:
                     'message': f'Buy order failed: {error_msg}'
                 }
 
-        except Exception as e:
+        def on_error(e: Exception) -> Dict[str, Any]:
             logger.error(f"Error during buy order: {str(e)}")
             return {
                 'success': False,
@@ -411,6 +518,9 @@ class DomesticStockTrading:
                 'message': f'Error during buy order: {str(e)}'
             }
 
+        return _PreparedOrder(api_url, tr_id, params, on_response, on_error)
+
+    @tracing.traced("domestic.get_holding_quantity")
     def get_holding_quantity(self, stock_code: str) -> int:
         """
         Get holding quantity for a specific stock
@@ -429,6 +539,15 @@ class DomesticStockTrading:
 
         return 0
 
+    @tracing.traced("domestic.async_get_holding_quantity")
+    async def async_get_holding_quantity(self, stock_code: str) -> int:
+        """Awaitable :meth:`get_holding_quantity`."""
+        for current_stock in await self.async_get_portfolio():
+            if current_stock['stock_code'] == stock_code:
+                return current_stock['quantity']
+
+        return 0
+
     def buy_limit_price(self, stock_code: str, limit_price: int, buy_amount: int = None) -> Dict[str, Any]:
         """
         Buy at limit price
@@ -450,17 +569,22 @@ class DomesticStockTrading:
         """
 
         if not self.auto_trading:
-            return {
-                'success': False,
-                'order_no': None,
-                'stock_code': stock_code,
-                'quantity': 0,
-                'limit_price': limit_price,
-                'message': 'Auto trading is disabled. Cannot execute buy order. (AUTO_TRADING=False)'
-            }
+            return self._trading_disabled_result(stock_code, "buy", limit_price=limit_price)
 
         amount = self._resolve_buy_amount(buy_amount)
+        order = self._limit_buy_order(stock_code, limit_price, amount)
+        return order if isinstance(order, dict) else self._submit_order(order)
 
+    async def async_buy_limit_price(self, stock_code: str, limit_price: int, buy_amount: int = None) -> Dict[str, Any]:
+        """Awaitable :meth:`buy_limit_price` on the native async KIS transport."""
+        if not self.auto_trading:
+            return self._trading_disabled_result(stock_code, "buy", limit_price=limit_price)
+
+        amount = await self._async_resolve_buy_amount(buy_amount)
+        order = self._limit_buy_order(stock_code, limit_price, amount)
+        return order if isinstance(order, dict) else await self._async_submit_order(order)
+
+    def _limit_buy_order(self, stock_code: str, limit_price: int, amount: float) -> "_PreparedOrder | Dict[str, Any]":
         # Calculate buyable quantity (based on limit price)
         buy_quantity = math.floor(amount / limit_price)
 
@@ -494,9 +618,7 @@ class DomesticStockTrading:
             "CNDT_PRIC": ""
         }
 
-        try:
-            res = self._request(api_url, tr_id, params, postFlag=True)
-
+        def on_response(res) -> Dict[str, Any]:
             if res.isOK():
                 output = res.getBody().output
                 order_no = output.get('odno', '')
@@ -524,7 +646,7 @@ class DomesticStockTrading:
                     'message': f'Buy order failed: {error_msg}'
                 }
 
-        except Exception as e:
+        def on_error(e: Exception) -> Dict[str, Any]:
             logger.error(f"Error during limit buy order: {str(e)}")
             return {
                 'success': False,
@@ -535,6 +657,8 @@ class DomesticStockTrading:
                 'message': f'Error during buy order: {str(e)}'
             }
 
+        return _PreparedOrder(api_url, tr_id, params, on_response, on_error)
+
     def smart_buy(self, stock_code: str, buy_amount: int = None, limit_price: int = None) -> Dict[str, Any]:
         """
         Automatically buy using the optimal method based on time (excluding after-hours single price trading due to high unfilled probability)
@@ -589,6 +713,30 @@ class DomesticStockTrading:
                 logger.info(f"[{stock_code}] Outside trading hours - executing reserved order (market)")
             return self.buy_reserved_order(stock_code, buy_amount, limit_price=limit_price)
 
+    async def async_smart_buy(self, stock_code: str, buy_amount: int = None, limit_price: int = None) -> Dict[str, Any]:
+        """
+        Awaitable :meth:`smart_buy`
+
+        Regular-session orders run on the native async KIS transport. The
+        closing-price and reserved-order windows fall outside market hours and
+        keep the blocking implementation on a worker thread.
+        """
+
+        if not self.auto_trading:
+            return self._trading_disabled_result(stock_code, "buy")
+
+        if _is_regular_session(_now_kst()):
+            if limit_price and limit_price > 0:
+                logger.info(
+                    f"[{stock_code}] Regular trading hours - executing limit buy "
+                    f"@ {limit_price:,} KRW"
+                )
+                return await self.async_buy_limit_price(stock_code, int(limit_price), buy_amount)
+            logger.info(f"[{stock_code}] Regular trading hours - executing market buy")
+            return await self.async_buy_market_price(stock_code, buy_amount)
+
+        return await asyncio.to_thread(self.smart_buy, stock_code, buy_amount, limit_price)
+
     def buy_closing_price(self, stock_code: str, buy_amount: int = None) -> Dict[str, Any]:
         """
         Buy at after-hours closing price (15:40~16:00)
@@ -826,22 +974,42 @@ class DomesticStockTrading:
         """
 
         if not self.auto_trading:
-            return {
-                'success': False,
-                'order_no': None,
-                'stock_code': stock_code,
-                'quantity': 0,
-                'message': 'Auto trading is disabled. Cannot execute sell order. (AUTO_TRADING=False)'
-            }
+            return self._trading_disabled_result(stock_code, "sell")
 
         # Check holding quantity.  Async sell already confirms the holding from
         # the portfolio response; reuse that known quantity to avoid making a
         # second balance inquiry immediately before order placement, which can
         # hit KIS ledger rate limits (EGW00215) and incorrectly look like a
         # zero-position account.
-        buy_quantity = holding_quantity if holding_quantity is not None else self.get_holding_quantity(stock_code)
+        sell_quantity = holding_quantity if holding_quantity is not None else self.get_holding_quantity(stock_code)
+        order = self._sell_all_order(stock_code, sell_quantity, limit_price)
+        return order if isinstance(order, dict) else self._submit_order(order)
 
-        if buy_quantity <= 0:
+    async def async_sell_all_market_price(
+        self,
+        stock_code: str,
+        holding_quantity: Optional[int] = None,
+        limit_price: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Awaitable :meth:`sell_all_market_price` on the native async KIS transport."""
+        if not self.auto_trading:
+            return self._trading_disabled_result(stock_code, "sell")
+
+        sell_quantity = (
+            holding_quantity
+            if holding_quantity is not None
+            else await self.async_get_holding_quantity(stock_code)
+        )
+        order = self._sell_all_order(stock_code, sell_quantity, limit_price)
+        return order if isinstance(order, dict) else await self._async_submit_order(order)
+
+    def _sell_all_order(
+        self,
+        stock_code: str,
+        sell_quantity: int,
+        limit_price: Optional[int],
+    ) -> "_PreparedOrder | Dict[str, Any]":
+        if sell_quantity <= 0:
             return {
                 'success': False,
                 'order_no': None,
@@ -865,30 +1033,28 @@ class DomesticStockTrading:
             "ACNT_PRDT_CD": self.trenv.my_prod,
             "PDNO": stock_code,
             "ORD_DVSN": "00" if use_limit else "01",
-            "ORD_QTY": str(buy_quantity),
+            "ORD_QTY": str(sell_quantity),
             "ORD_UNPR": str(int(limit_price)) if use_limit else "0",
             "EXCG_ID_DVSN_CD": "KRX",
             "SLL_TYPE": "01",  # 01: Regular sell
             "CNDT_PRIC": ""
         }
 
-        try:
-            res = self._request(api_url, tr_id, params, postFlag=True)
-
+        def on_response(res) -> Dict[str, Any]:
             if res.isOK():
                 output = res.getBody().output
                 order_no = output.get('odno', '')
 
                 order_kind = "Limit" if use_limit else "Market"
-                logger.info(f"[{stock_code}] {order_kind} sell all order successful: {buy_quantity} shares, order no: {order_no}")
+                logger.info(f"[{stock_code}] {order_kind} sell all order successful: {sell_quantity} shares, order no: {order_no}")
 
                 return {
                     'success': True,
                     'order_no': order_no,
                     'stock_code': stock_code,
-                    'quantity': buy_quantity,
+                    'quantity': sell_quantity,
                     'limit_price': int(limit_price) if use_limit else None,
-                    'message': f'{order_kind} sell all order completed ({buy_quantity} shares)'
+                    'message': f'{order_kind} sell all order completed ({sell_quantity} shares)'
                 }
             else:
                 error_msg = f"{res.getErrorCode()} - {res.getErrorMessage()}"
@@ -898,20 +1064,22 @@ class DomesticStockTrading:
                     'success': False,
                     'order_no': None,
                     'stock_code': stock_code,
-                    'quantity': buy_quantity,
+                    'quantity': sell_quantity,
                     'message': f'Sell order failed: {error_msg}'
                 }
 
-        except Exception as e:
+        def on_error(e: Exception) -> Dict[str, Any]:
             logger.error(f"Error during sell order: {str(e)}")
             return {
                 'success': False,
                 'order_no': None,
                 'stock_code': stock_code,
-                'quantity': buy_quantity,
+                'quantity': sell_quantity,
                 'message': f'Error during sell order: {str(e)}'
             }
 
+        return _PreparedOrder(api_url, tr_id, params, on_response, on_error)
+
     def smart_sell_all(self, stock_code: str, limit_price: int = None, holding_quantity: Optional[int] = None) -> Dict[str, Any]:
         """
         Automatically sell all using the optimal method based on time (excluding after-hours single price trading due to high unfilled probability)
@@ -968,6 +1136,33 @@ class DomesticStockTrading:
                 logger.info(f"[{stock_code}] Outside trading hours - executing reserved order (market)")
             return self.sell_all_reserved_order(stock_code, limit_price=limit_price, holding_quantity=holding_quantity)
 
+    async def async_smart_sell_all(self, stock_code: str, limit_price: int = None, holding_quantity: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Awaitable :meth:`smart_sell_all`
+
+        Regular-session orders run on the native async KIS transport; the
+        off-hours windows keep the blocking implementation on a worker thread.
+        """
+
+        if not self.auto_trading:
+            return self._trading_disabled_result(stock_code, "sell")
+
+        if _is_regular_session(_now_kst()):
+            if limit_price and limit_price > 0:
+                logger.info(
+                    f"[{stock_code}] Regular trading hours - executing limit sell "
+                    f"@ {limit_price:,} KRW"
+                )
+            else:
+                logger.info(f"[{stock_code}] Regular trading hours - executing market sell")
+            return await self.async_sell_all_market_price(
+                stock_code,
+                holding_quantity=holding_quantity,
+                limit_price=limit_price,
+            )
+
+        return await asyncio.to_thread(self.smart_sell_all, stock_code, limit_price, holding_quantity)
+
     def sell_all_closing_price(self, stock_code: str, holding_quantity: Optional[int] = None) -> Dict[str, Any]:
         """
         Sell all at after-hours closing price (15:40~16:00)
@@ -1170,6 +1365,7 @@ class DomesticStockTrading:
             self._stock_locks[stock_code] = asyncio.Lock()
         return self._stock_locks[stock_code]
 
+    @tracing.traced("domestic.async_buy_stock")
     async def async_buy_stock(self, stock_code: str, buy_amount: Optional[int] = None, timeout: float = 30.0, limit_price: Optional[int] = None) -> Dict[str, Any]:
         """
         Async buy API (with timeout)
@@ -1193,14 +1389,13 @@ class DomesticStockTrading:
                 'timestamp': Execution time
             }
         """
-        # Keep awaiting the worker until the bounded HTTP transport returns.
-        # Cancelling an outer coroutine cannot stop an in-flight broker thread
-        # and can otherwise make the order outcome ambiguous.
+        # Keep awaiting until the bounded HTTP transport returns. Cancelling an
+        # in-flight order request would make the order outcome ambiguous.
         return await self._execute_buy_stock(stock_code, buy_amount, limit_price)
 
     async def _execute_buy_stock(self, stock_code: str, buy_amount: int = None, limit_price: int = None) -> Dict[str, Any]:
         # Use class default if buy_amount is None
-        amount = self._resolve_buy_amount(buy_amount)
+        amount = await self._async_resolve_buy_amount(buy_amount)
 
         result = {
             'success': False,
@@ -1223,11 +1418,7 @@ class DomesticStockTrading:
                         logger.info(f"[Async Buy API] {stock_code} buy process started (amount: {amount:,} KRW)")
 
                         # Step 1: Get current price
-                        current_price_info = await asyncio.to_thread(
-                            self.get_current_price, stock_code
-                        )
-                        # Prevent rate limit
-                        await asyncio.sleep(0.5)
+                        current_price_info = await self.async_get_current_price(stock_code)
 
                         if not current_price_info:
                             result['message'] = 'Failed to get current price'
@@ -1255,14 +1446,12 @@ class DomesticStockTrading:
                         result['total_amount'] = buy_quantity * effective_price
 
                         # Step 3: Execute buy (use amount, limit price if provided)
-                        # Prevent rate limit
-                        await asyncio.sleep(0.5)
                         if requested_limit_price:
                             logger.info(f"[Async Buy API] {stock_code} executing limit buy order: {buy_quantity} shares x {effective_price:,} KRW")
                         else:
                             logger.info(f"[Async Buy API] {stock_code} executing market/reserved-market buy for an estimated {buy_quantity} shares")
-                        buy_result = await asyncio.to_thread(
-                            self.smart_buy, stock_code, amount, requested_limit_price
+                        buy_result = await self.async_smart_buy(
+                            stock_code, amount, requested_limit_price
                         )
 
                         if buy_result['success']:
@@ -1282,11 +1471,9 @@ class DomesticStockTrading:
                         result['message'] = f'Error during async buy API execution: {str(e)}'
                         logger.error(f"[Async Buy API] {stock_code} error: {str(e)}")
 
-                    # Delay to prevent API overload
-                    await asyncio.sleep(0.1)
-
         return result
 
+    @tracing.traced("domestic.async_sell_stock")
     async def async_sell_stock(self, stock_code: str, timeout: float = 30.0, limit_price: Optional[int] = None,
                                sell_fraction: Optional[float] = None) -> Dict[str, Any]:
         """
@@ -1337,8 +1524,7 @@ class DomesticStockTrading:
 
                         # Defensive logic 1: Verify holding in portfolio
                         logger.info(f"[Async Sell API] {stock_code} checking portfolio...")
-                        current_portfolio = await asyncio.to_thread(self.get_portfolio)
-                        inquiry_error = getattr(self, "_last_portfolio_inquiry_error", None)
+                        current_portfolio, inquiry_error = await self._async_inquire_portfolio()
                         if inquiry_error:
                             result["message"] = f"Portfolio inquiry unavailable: {inquiry_error}"
                             logger.warning("[Async Sell API] %s %s", stock_code, result["message"])
@@ -1364,9 +1550,7 @@ class DomesticStockTrading:
                         logger.info(f"[Async Sell API] {stock_code} holding confirmed: {target_stock['quantity']} shares")
 
                         # Get current price (for estimated sell amount calculation)
-                        current_price_info = await asyncio.to_thread(
-                            self.get_current_price, stock_code
-                        )
+                        current_price_info = await self.async_get_current_price(stock_code)
 
                         if current_price_info:
                             result['current_price'] = current_price_info['current_price']
@@ -1401,8 +1585,8 @@ class DomesticStockTrading:
                             logger.info(f"[Async Sell API] {stock_code} executing sell all (holding: {holding_quantity} shares, limit: {effective_limit_price:,} KRW)")
                         else:
                             logger.info(f"[Async Sell API] {stock_code} executing sell all (holding: {holding_quantity} shares, market)")
-                        all_sell_result = await asyncio.to_thread(
-                            self.smart_sell_all, stock_code, effective_limit_price, holding_quantity
+                        all_sell_result = await self.async_smart_sell_all(
+                            stock_code, effective_limit_price, holding_quantity
                         )
 
                         if all_sell_result['success']:
@@ -1433,11 +1617,9 @@ class DomesticStockTrading:
                         result['message'] = f'Error during async sell API execution: {str(e)}'
                         logger.error(f"[Async Sell API] {stock_code} error: {str(e)}")
 
-                    # Delay to prevent API overload
-                    await asyncio.sleep(0.1)
-
         return result
 
+    @tracing.traced("domestic.get_portfolio")
     def get_portfolio(self, *, raise_on_error: bool = False) -> List[Dict[str, Any]]:
         """
         Get current account portfolio.
@@ -1457,6 +1639,48 @@ class DomesticStockTrading:
                 'profit_rate': return rate (%)
             }, ...]
         """
+        api_url, tr_id, params = self._balance_request()
+
+        try:
+            res = self._request(api_url, tr_id, params)
+            portfolio, _ = self._parse_portfolio(res, raise_on_error=raise_on_error)
+
+        except PortfolioInquiryError:
+            raise
+        except Exception as e:
+            portfolio, _ = self._portfolio_inquiry_failed(
+                f"Error during balance inquiry: {str(e)}", raise_on_error, cause=e
+            )
+        return portfolio
+
+    @tracing.traced("domestic.async_get_portfolio")
+    async def async_get_portfolio(self, *, raise_on_error: bool = False) -> List[Dict[str, Any]]:
+        """Awaitable :meth:`get_portfolio` on the native async KIS transport."""
+        portfolio, _ = await self._async_inquire_portfolio(raise_on_error=raise_on_error)
+        return portfolio
+
+    async def _async_inquire_portfolio(
+        self, *, raise_on_error: bool = False
+    ) -> tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return the portfolio and the inquiry error, if any, of this one call.
+
+        Pooled traders are shared by concurrent coroutines, so the error is
+        returned with the result rather than left on the instance.
+        """
+        api_url, tr_id, params = self._balance_request()
+
+        try:
+            res = await self._request_async(api_url, tr_id, params)
+            return self._parse_portfolio(res, raise_on_error=raise_on_error)
+
+        except PortfolioInquiryError:
+            raise
+        except Exception as e:
+            return self._portfolio_inquiry_failed(
+                f"Error during balance inquiry: {str(e)}", raise_on_error, cause=e
+            )
+
+    def _balance_request(self) -> tuple[str, str, Dict[str, Any]]:
         api_url = "/uapi/domestic-stock/v1/trading/inquire-balance"
 
         # Set TR ID (real/demo distinction)
@@ -1478,63 +1702,63 @@ class DomesticStockTrading:
             "CTX_AREA_FK100": "",
             "CTX_AREA_NK100": ""
         }
+        return api_url, tr_id, params
 
-        self._last_portfolio_inquiry_error = None
-        try:
-            res = self._request(api_url, tr_id, params)
+    def _portfolio_inquiry_failed(
+        self,
+        message: str,
+        raise_on_error: bool,
+        *,
+        cause: Optional[BaseException] = None,
+    ) -> tuple[List[Dict[str, Any]], str]:
+        logger.error(message)
+        if raise_on_error:
+            raise PortfolioInquiryError(message) from cause
+        return [], message
+
+    def _parse_portfolio(
+        self, res, *, raise_on_error: bool
+    ) -> tuple[List[Dict[str, Any]], Optional[str]]:
+        if not res.isOK():
+            return self._portfolio_inquiry_failed(
+                f"Balance inquiry failed: {res.getErrorCode()} - {res.getErrorMessage()}",
+                raise_on_error,
+            )
 
-            if res.isOK():
-                current_portfolio = []
-                output1 = res.getBody().output1  # Holdings list
-                output2 = res.getBody().output2[0]  # Account summary
-
-                # Handle case when output1 is not a list
-                if not isinstance(output1, list):
-                    output1 = [output1] if output1 else []
-
-                for item in output1:
-                    # Only add stocks with quantity > 0
-                    quantity = int(item.get('hldg_qty', 0))
-                    if quantity > 0:
-                        stock_info = {
-                            'stock_code': item.get('pdno', ''),
-                            'stock_name': item.get('prdt_name', ''),
-                            'quantity': quantity,
-                            'avg_price': float(item.get('pchs_avg_pric', 0)),
-                            'current_price': float(item.get('prpr', 0)),
-                            'eval_amount': float(item.get('evlu_amt', 0)),
-                            'profit_amount': float(item.get('evlu_pfls_amt', 0)),
-                            'profit_rate': float(item.get('evlu_pfls_rt', 0))
-                        }
-                        current_portfolio.append(stock_info)
-
-                # Log account summary
-                if output2:
-                    total_eval = float(output2.get('tot_evlu_amt', 0))
-                    total_profit = float(output2.get('evlu_pfls_smtl_amt', 0))
-                    logger.info(f"Account total evaluation: {total_eval:,.0f} KRW, total profit/loss: {total_profit:+,.0f} KRW")
-
-                logger.info(f"Portfolio: {len(current_portfolio)} holdings")
-                return current_portfolio
+        current_portfolio = []
+        output1 = res.getBody().output1  # Holdings list
+        output2 = res.getBody().output2[0]  # Account summary
+
+        # Handle case when output1 is not a list
+        if not isinstance(output1, list):
+            output1 = [output1] if output1 else []
+
+        for item in output1:
+            # Only add stocks with quantity > 0
+            quantity = int(item.get('hldg_qty', 0))
+            if quantity > 0:
+                stock_info = {
+                    'stock_code': item.get('pdno', ''),
+                    'stock_name': item.get('prdt_name', ''),
+                    'quantity': quantity,
+                    'avg_price': float(item.get('pchs_avg_pric', 0)),
+                    'current_price': float(item.get('prpr', 0)),
+                    'eval_amount': float(item.get('evlu_amt', 0)),
+                    'profit_amount': float(item.get('evlu_pfls_amt', 0)),
+                    'profit_rate': float(item.get('evlu_pfls_rt', 0))
+                }
+                current_portfolio.append(stock_info)
 
-            else:
-                message = f"Balance inquiry failed: {res.getErrorCode()} - {res.getErrorMessage()}"
-                logger.error(message)
-                self._last_portfolio_inquiry_error = message
-                if raise_on_error:
-                    raise PortfolioInquiryError(message)
-                return []
+        # Log account summary
+        if output2:
+            total_eval = float(output2.get('tot_evlu_amt', 0))
+            total_profit = float(output2.get('evlu_pfls_smtl_amt', 0))
+            logger.info(f"Account total evaluation: {total_eval:,.0f} KRW, total profit/loss: {total_profit:+,.0f} KRW")
 
-        except PortfolioInquiryError:
-            raise
-        except Exception as e:
-            message = f"Error during balance inquiry: {str(e)}"
-            logger.error(message)
-            self._last_portfolio_inquiry_error = message
-            if raise_on_error:
-                raise PortfolioInquiryError(message) from e
-            return []
+        logger.info(f"Portfolio: {len(current_portfolio)} holdings")
+        return current_portfolio, None
 
+    @tracing.traced("domestic.get_account_summary")
     def get_account_summary(self) -> None | dict[Any, Any] | dict[str, float]:
         """
         Get account summary information
@@ -1548,73 +1772,70 @@ class DomesticStockTrading:
                 'available_amount': available order amount
             }
         """
-        api_url = "/uapi/domestic-stock/v1/trading/inquire-balance"
-
-        # Set TR ID (real/demo distinction)
-        if self.mode == "real":
-            tr_id = "TTTC8434R"
-        else:
-            tr_id = "VTTC8434R"
-
-        params = {
-            "CANO": self.trenv.my_acct,
-            "ACNT_PRDT_CD": self.trenv.my_prod,
-            "AFHR_FLPR_YN": "N",
-            "OFL_YN": "",
-            "INQR_DVSN": "02",
-            "UNPR_DVSN": "01",
-            "FUND_STTL_ICLD_YN": "N",
-            "FNCG_AMT_AUTO_RDPT_YN": "N",
-            "PRCS_DVSN": "00",
-            "CTX_AREA_FK100": "",
-            "CTX_AREA_NK100": ""
-        }
+        api_url, tr_id, params = self._balance_request()
 
         try:
             res = self._request(api_url, tr_id, params)
+            return self._parse_account_summary(res)
 
-            if res.isOK():
-                output2 = res.getBody().output2[0]  # Account summary
-
-                if output2:
-                    pchs_amt = float(output2.get('pchs_amt_smtl_amt', 0)) or 1  # Replace 0 with 1
-
-                    # Total evaluation amount and securities evaluation amount
-                    tot_evlu_amt = float(output2.get('tot_evlu_amt', 0))
-                    scts_evlu_amt = float(output2.get('scts_evlu_amt', 0))
-                    dnca_tot_amt = float(output2.get('dnca_tot_amt', 0))
-
-                    # Total cash (including D+2) = Total evaluation amount - Securities evaluation amount
-                    # This includes deposit (D+0) + D+1 + D+2 receivables
-                    total_cash = tot_evlu_amt - scts_evlu_amt
-
-                    account_summary = {
-                        'total_eval_amount': tot_evlu_amt,
-                        'total_profit_amount': float(output2.get('evlu_pfls_smtl_amt', 0)),
-                        'total_profit_rate': round(float(output2.get('evlu_pfls_smtl_amt', 0)) / pchs_amt * 100, 2),
-                        'deposit': dnca_tot_amt,  # Deposit (D+0, same-day withdrawal available)
-                        'cash_balance': total_cash,  # Cash balance after excluding current stock holdings
-                        'total_cash': total_cash,  # Backward-compatible alias (including D+2)
-                        'available_amount': float(output2.get('ord_psbl_cash', 0)),
-                        'account_key': self.account_key,
-                        'account_product': self.trenv.my_prod
-                    }
-
-                    logger.info(f"Account summary: Total eval {account_summary['total_eval_amount']:,.0f} KRW, "
-                                f"profit/loss {account_summary['total_profit_amount']:+,.0f} KRW "
-                                f"({account_summary['total_profit_rate']:+.2f}%), "
-                                f"deposit {account_summary['deposit']:,.0f} KRW, "
-                                f"cash balance(excl holdings) {account_summary['cash_balance']:,.0f} KRW, "
-                                f"orderable cash {account_summary['available_amount']:,.0f} KRW")
-
-                    return account_summary
-
-                return {}
+        except Exception as e:
+            logger.error(f"Error during account summary inquiry: {str(e)}")
+            return {}
+
+    @tracing.traced("domestic.async_get_account_summary")
+    async def async_get_account_summary(self) -> None | dict[Any, Any] | dict[str, float]:
+        """Awaitable :meth:`get_account_summary` on the native async KIS transport."""
+        api_url, tr_id, params = self._balance_request()
+
+        try:
+            res = await self._request_async(api_url, tr_id, params)
+            return self._parse_account_summary(res)
 
         except Exception as e:
             logger.error(f"Error during account summary inquiry: {str(e)}")
             return {}
 
+    def _parse_account_summary(self, res) -> None | dict[Any, Any] | dict[str, float]:
+        if not res.isOK():
+            return None
+
+        output2 = res.getBody().output2[0]  # Account summary
+
+        if output2:
+            pchs_amt = float(output2.get('pchs_amt_smtl_amt', 0)) or 1  # Replace 0 with 1
+
+            # Total evaluation amount and securities evaluation amount
+            tot_evlu_amt = float(output2.get('tot_evlu_amt', 0))
+            scts_evlu_amt = float(output2.get('scts_evlu_amt', 0))
+            dnca_tot_amt = float(output2.get('dnca_tot_amt', 0))
+
+            # Total cash (including D+2) = Total evaluation amount - Securities evaluation amount
+            # This includes deposit (D+0) + D+1 + D+2 receivables
+            total_cash = tot_evlu_amt - scts_evlu_amt
+
+            account_summary = {
+                'total_eval_amount': tot_evlu_amt,
+                'total_profit_amount': float(output2.get('evlu_pfls_smtl_amt', 0)),
+                'total_profit_rate': round(float(output2.get('evlu_pfls_smtl_amt', 0)) / pchs_amt * 100, 2),
+                'deposit': dnca_tot_amt,  # Deposit (D+0, same-day withdrawal available)
+                'cash_balance': total_cash,  # Cash balance after excluding current stock holdings
+                'total_cash': total_cash,  # Backward-compatible alias (including D+2)
+                'available_amount': float(output2.get('ord_psbl_cash', 0)),
+                'account_key': self.account_key,
+                'account_product': self.trenv.my_prod
+            }
+
+            logger.info(f"Account summary: Total eval {account_summary['total_eval_amount']:,.0f} KRW, "
+                        f"profit/loss {account_summary['total_profit_amount']:+,.0f} KRW "
+                        f"({account_summary['total_profit_rate']:+.2f}%), "
+                        f"deposit {account_summary['deposit']:,.0f} KRW, "
+                        f"cash balance(excl holdings) {account_summary['cash_balance']:,.0f} KRW, "
+                        f"orderable cash {account_summary['available_amount']:,.0f} KRW")
+
+            return account_summary
+
+        return {}
+
 
 class MultiAccountDomesticStockTrading:
     """Fan out trading orders to all configured domestic accounts for the current mode."""
@@ -1812,6 +2033,14 @@ class AsyncTradingContext:
         self.trader = None
 
     async def __aenter__(self):
+        self.trader = await async_pooled_trader(DomesticStockTrading, **self._trader_kwargs())
+        return self.trader
+
+    def build(self) -> "DomesticStockTrading":
+        """Return the pooled trader this context hands out, without entering it."""
+        return pooled_trader(DomesticStockTrading, **self._trader_kwargs())
+
+    def _trader_kwargs(self) -> dict[str, Any]:
         trader_kwargs = {
             "mode": self.mode,
             "buy_amount": self.buy_amount,
@@ -1822,8 +2051,7 @@ class AsyncTradingContext:
         }
         if self.account_key is not None:
             trader_kwargs["account_key"] = self.account_key
-        self.trader = DomesticStockTrading(**trader_kwargs)
-        return self.trader
+        return trader_kwargs
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if exc_type:
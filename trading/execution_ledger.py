@@ -17,6 +17,7 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from . import metrics
 from .file_lock import FileLock
 
 DEFAULT_LEDGER_PATH = Path("runtime") / "multi_account_execution_ledger.json"
@@ -86,6 +87,7 @@ class ExecutionLedger:
         finally:
             if temporary_path is not None and temporary_path.exists():
                 temporary_path.unlink()
+        metrics.LEDGER_ENTRIES.set(len(entries))
 
     @staticmethod
     def _prune(entries: dict[str, dict[str, Any]], now: datetime) -> dict[str, dict[str, Any]]:
@@ -19,6 +19,7 @@ import warnings
 from base64 import b64decode
 from collections import namedtuple
 from collections.abc import Callable
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from io import StringIO
@@ -31,6 +32,18 @@ from typing import Any, Optional, Tuple
 
 from .buy_sizing import normalize_amount, normalize_percent
 from .config_paths import active_kis_config_path
+from .kis_http import KISAsyncHttpPool, KISHttpPool
+from . import memory, metrics, tracing
+from .kis_response import ResponseView, decode_json_body, loads as json_loads
+from .rate_limit import SERVER_PROD, SERVER_VPS, KISRateLimiter
+from .token_broker import TokenBroker, issue_lock_path
+from .token_cache import (
+    DEFAULT_REFRESH_AHEAD_SECONDS,
+    DEFAULT_REFRESH_INTERVAL_SECONDS,
+    KIS_TOKEN_EXPIRY_TZ,
+    TokenCache,
+    TokenRefresher,
+)
 
 pd_spec = importlib.util.find_spec("pandas")
 if pd_spec is not None:
@@ -178,7 +191,6 @@ KIS_RATE_LIMIT_ERROR_CODES = frozenset(
     {KIS_RATE_LIMIT_ERROR_CODE, KIS_LEDGER_RATE_LIMIT_ERROR_CODE}
 )
 KIS_EXPIRED_TOKEN_ERROR_CODE = "EGW00123"
-KIS_TOKEN_EXPIRY_TZ = ZoneInfo("Asia/Seoul")
 
 
 def _nonnegative_int_env(name: str, default: int) -> int:
@@ -218,6 +230,32 @@ KIS_HTTP_READ_TIMEOUT_SECONDS = _finite_float_env(
     "KIS_HTTP_READ_TIMEOUT_SECONDS", 30.0, positive=True
 )
 KIS_HTTP_TIMEOUT = (KIS_HTTP_CONNECT_TIMEOUT_SECONDS, KIS_HTTP_READ_TIMEOUT_SECONDS)
+KIS_HTTP_POOL = KISHttpPool.from_env()
+KIS_ASYNC_HTTP_POOL = KISAsyncHttpPool.from_env(timeout=KIS_HTTP_TIMEOUT)
+KIS_RATE_LIMITER = KISRateLimiter.from_env()
+KIS_TOKEN_CACHE = TokenCache()
+KIS_TOKEN_BROKER = TokenBroker(KIS_TOKEN_CACHE)
+# Reissue cached tokens this long before expiry; 0 disables the background refresher.
+KIS_TOKEN_REFRESH_AHEAD_SECONDS = _finite_float_env(
+    "KIS_TOKEN_REFRESH_AHEAD_SECONDS", DEFAULT_REFRESH_AHEAD_SECONDS, positive=False
+)
+KIS_TOKEN_REFRESH_INTERVAL_SECONDS = _finite_float_env(
+    "KIS_TOKEN_REFRESH_INTERVAL_SECONDS", DEFAULT_REFRESH_INTERVAL_SECONDS, positive=True
+)
+
+
+def _http_post(url: str, **kwargs):
+    """POST through the shared keep-alive session for the URL's origin."""
+    if requests_spec is None:  # pragma: no cover - minimal test environment fallback
+        return requests.post(url, **kwargs)
+    return KIS_HTTP_POOL.session_for(url).post(url, **kwargs)
+
+
+def _http_get(url: str, **kwargs):
+    """GET through the shared keep-alive session for the URL's origin."""
+    if requests_spec is None:  # pragma: no cover - minimal test environment fallback
+        return requests.get(url, **kwargs)
+    return KIS_HTTP_POOL.session_for(url).get(url, **kwargs)
 
 
 key_bytes = 32
@@ -569,8 +607,10 @@ _last_auth_time = datetime.now()
 _autoReAuth = False
 _DEBUG = False
 _isPaper = False
-_smartSleep = 0.1
 _CURRENT_AUTH_CONTEXT: dict[str, Any] = {}
+# auth() arguments per cached token, so the background refresher can reissue it.
+_TOKEN_REFRESH_PARAMS: dict[str | None, dict[str, Any]] = {}
+_TOKEN_REFRESHER: TokenRefresher | None = None
 
 
 def _mask_account_key(account_key: str | None) -> str:
@@ -692,6 +732,8 @@ def save_token(my_token: str, my_expired: str, account_key: Optional[str] = None
     except Exception as e:
         raise TokenFileError(f"Failed to save token: {e}") from e
 
+    KIS_TOKEN_CACHE.put(account_key or None, my_token, valid_date)
+
 
 
 # Check token (token value, token validity 1 day, same token value if applied within 6 hours, notification sent when issued)
@@ -713,6 +755,14 @@ def read_token(account_key: Optional[str] = None) -> Optional[str]:
     Returns:
         Valid token string or None if no valid token found
     """
+    cached_token = KIS_TOKEN_CACHE.get(account_key or None)
+    if cached_token is not None:
+        return cached_token
+    return _read_token_file(account_key)
+
+
+def _read_token_file(account_key: Optional[str] = None) -> Optional[str]:
+    """Scan token files as described in ``read_token`` and cache the token found."""
     try:
         if account_key:
             # Per-account mode: only look for the specific account's token file
@@ -819,6 +869,7 @@ def read_token(account_key: Optional[str] = None) -> Optional[str]:
 
                 if not _is_token_expired(valid_date):
                     logging.info(f"✅ Valid token found (expires: {valid_date})")
+                    KIS_TOKEN_CACHE.put(account_key or None, token, valid_date)
                     return token
                 else:
                     # AUTO-RECOVERY: Delete expired tokens
@@ -1043,7 +1094,7 @@ def _request_token_with_retry(url: str, params: dict, headers: dict) -> dict:
     - Raises TokenRequestError on failure
     """
     try:
-        res = requests.post(
+        res = _http_post(
             url,
             data=json.dumps(params),
             headers=headers,
@@ -1104,6 +1155,7 @@ def _token_file_for_account(account_key: str | None) -> Path | None:
 
 def _discard_saved_token(account_key: str | None = None) -> None:
     """Delete saved token files so the next auth call must request a new token."""
+    KIS_TOKEN_CACHE.discard(account_key or None)
     if account_key:
         token_file = _token_file_for_account(account_key)
         if token_file and token_file.exists():
@@ -1198,12 +1250,107 @@ def authenticate_and_get_env(**kwargs):
         return getTREnv()
 
 
+_CREDENTIAL_HEADERS = frozenset({"authorization", "appkey", "appsecret"})
+
+
+@dataclass(frozen=True, slots=True)
+class KISClientContext:
+    """One account's KIS environment, passed explicitly to ``_url_fetch``.
+
+    The context carries the account's token, credentials, base URL and paper
+    flag, so requests for different accounts can be built and sent
+    concurrently without switching the module-level ``_TRENV``.  It is
+    immutable; a token reissue produces a new context.
+    """
+
+    env: Any
+    svr: str = "prod"
+    product: str = DEFAULT_PRODUCT_CODE
+    account_name: str | None = None
+    account_index: int | None = None
+    account_key: str | None = None
+    _headers: dict[str, Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        headers = {
+            name: value
+            for name, value in _base_headers.items()
+            if name not in _CREDENTIAL_HEADERS
+        }
+        headers["authorization"] = f"Bearer {self.env.my_token}"
+        headers["appkey"] = self.env.my_app
+        headers["appsecret"] = self.env.my_sec
+        object.__setattr__(self, "_headers", headers)
+
+    @property
+    def is_paper(self) -> bool:
+        return self.svr == "vps"
+
+    @property
+    def base_url(self) -> str:
+        return self.env.my_url
+
+    @property
+    def rate_limit_key(self) -> tuple[str, str]:
+        return self.env.my_app or "", SERVER_VPS if self.is_paper else SERVER_PROD
+
+    def headers(self) -> dict[str, Any]:
+        """Return a fresh copy of the base request headers for this account."""
+
+        return dict(self._headers)
+
+    def with_env(self, env) -> "KISClientContext":
+        return replace(self, env=env)
+
+
+def authenticate_client_context(
+    svr="prod",
+    product=DEFAULT_PRODUCT_CODE,
+    account_name=None,
+    account_index=None,
+    account_key=None,
+) -> KISClientContext:
+    """Authenticate one account and return its immutable client context."""
+
+    env = authenticate_and_get_env(
+        svr=svr,
+        product=product,
+        account_name=account_name,
+        account_index=account_index,
+        account_key=account_key,
+    )
+    return KISClientContext(
+        env=env,
+        svr=svr,
+        product=str(getattr(env, "my_prod", "") or product),
+        account_name=account_name,
+        account_index=account_index,
+        account_key=account_key,
+    )
+
+
+def refresh_client_context(context: KISClientContext) -> KISClientContext:
+    """Force a token reissue for ``context``'s account after EGW00123."""
+
+    with _TRENV_LOCK:
+        _discard_saved_token(account_key=context.account_key)
+        return authenticate_client_context(
+            svr=context.svr,
+            product=context.product,
+            account_name=context.account_name,
+            account_index=context.account_index,
+            account_key=context.account_key,
+        )
+
+
 # Get: App key, App secret, Account number (8 digits), Account product code (2 digits), Token, Domain
+KISEnv = namedtuple(
+    "KISEnv",
+    ["my_app", "my_sec", "my_acct", "my_prod", "my_htsid", "my_token", "my_url", "my_url_ws"],
+)
+
+
 def _setTRENV(cfg):
-    nt1 = namedtuple(
-        "KISEnv",
-        ["my_app", "my_sec", "my_acct", "my_prod", "my_htsid", "my_token", "my_url", "my_url_ws"],
-    )
     d = {
         "my_app": cfg["my_app"],  # App key
         "my_sec": cfg["my_sec"],  # App secret
@@ -1219,7 +1366,7 @@ def _setTRENV(cfg):
 
     # print(cfg['my_app'])
     global _TRENV
-    _TRENV = nt1(**d)
+    _TRENV = KISEnv(**d)
 
 
 def isPaperTrading():  # Paper trading
@@ -1237,17 +1384,15 @@ def changeTREnv(
 ):
     cfg = dict()
 
-    global _isPaper, _smartSleep, _CURRENT_AUTH_CONTEXT
+    global _isPaper, _CURRENT_AUTH_CONTEXT
     if svr == "prod":  # Live trading
         ak1 = "my_app"  # App key for live trading
         ak2 = "my_sec"  # App secret for live trading
         _isPaper = False
-        _smartSleep = 0.05
     elif svr == "vps":  # Paper trading
         ak1 = "paper_app"  # App key for paper trading
         ak2 = "paper_sec"  # App secret for paper trading
         _isPaper = True
-        _smartSleep = 0.5
 
     account = resolve_account(
         svr=svr,
@@ -1286,43 +1431,18 @@ def changeTREnv(
 
 
 def _getResultObject(json_data):
-    _tc_ = namedtuple("res", json_data.keys())
+    return ResponseView(json_data)
 
-    return _tc_(**json_data)
 
-
-# Token issuance, validity 1 day, maintains existing token if issued within 6 hours, notification sent on issuance
-# For paper trading use svr='vps', if not investment account(01) change product='XX' (last 2 digits of account number)
-def auth(
-    svr="prod",
+def _resolve_app_credentials(
+    svr,
     product=DEFAULT_PRODUCT_CODE,
-    url=None,
+    *,
     account_name=None,
     account_index=None,
     account_key=None,
-):
-    """
-    Authenticate with KIS API and obtain access token.
-
-    Improvements in this version:
-    - Credential validation (detects demo/real key mismatch)
-    - Retry logic for transient network failures
-    - Raises exceptions instead of silent failure
-    - Auto-cleanup of empty/corrupted token files
-
-    Args:
-        svr: 'prod' for real trading, 'vps' for paper trading
-        product: Account product code (default from config)
-        url: API URL (optional, auto-generated from svr)
-
-    Raises:
-        CredentialMismatchError: App key doesn't match trading mode
-        TokenRequestError: Failed to obtain token from KIS API
-        TokenFileError: Failed to save token to file
-    """
-    p = {
-        "grant_type": "client_credentials",
-    }
+) -> tuple[str, str]:
+    """Return the app key/secret ``auth`` uses for an account, validated for ``svr``."""
 
     # Determine global fallback keys based on server type
     if svr == "prod":  # Live trading
@@ -1349,7 +1469,6 @@ def auth(
         # Fallback to global keys if account resolution fails at this stage
         app_key = _cfg.get(ak1)
         app_secret = _cfg.get(ak2)
-        _auth_account = None
 
     if not app_key or not app_secret:
         raise CredentialMismatchError(
@@ -1362,49 +1481,120 @@ def auth(
         logging.error(f"❌ {error_msg}")
         raise CredentialMismatchError(error_msg)
 
-    p["appkey"] = app_key
-    p["appsecret"] = app_secret
+    return app_key, app_secret
 
-    # Check for existing valid token (per-account if account_key provided)
-    saved_token = read_token(account_key=account_key)
 
-    if saved_token is None:
-        # No valid token - request new one
-        token_url = f"{_cfg[svr]}/oauth2/tokenP"
-        logging.info(f"Requesting new token from KIS API ({svr} mode)...")
+def _obtain_token(
+    svr,
+    app_key,
+    app_secret,
+    headers: Callable[[], dict[str, Any]],
+    *,
+    account_key=None,
+    min_remaining_seconds: float = 0.0,
+) -> str:
+    """Return a valid token for the account, issuing one only if no local process has."""
+
+    return KIS_TOKEN_BROKER.get(
+        account_key,
+        read_file=lambda: _read_token_file(account_key=account_key),
+        issue=lambda: _issue_token(svr, app_key, app_secret, headers(), account_key=account_key),
+        lock_path=issue_lock_path(config_root, account_key),
+        min_remaining_seconds=min_remaining_seconds,
+    )
 
-        try:
-            # Use retry logic for transient failures
-            result = _request_token_with_retry(token_url, p, _getBaseHeader())
 
-            my_token = result.get("access_token")
-            my_expired = result.get("access_token_token_expired")
+def _issue_token(svr, app_key, app_secret, headers, *, account_key=None) -> str:
+    """Request a new token from KIS and save it (file and in-memory cache)."""
 
-            if not my_token or not my_expired:
-                raise TokenRequestError(
-                    "Invalid response from KIS API: missing token or expiry",
-                    status_code=200,
-                    response_text=str(result)
-                )
+    p = {
+        "grant_type": "client_credentials",
+        "appkey": app_key,
+        "appsecret": app_secret,
+    }
+    token_url = f"{_cfg[svr]}/oauth2/tokenP"
+    logging.info(f"Requesting new token from KIS API ({svr} mode)...")
 
-            # Save the new token (per-account if account_key provided)
-            save_token(my_token, my_expired, account_key=account_key)
-            logging.info(f"✅ New token obtained and saved (expires: {my_expired})")
+    try:
+        # Use retry logic for transient failures
+        result = _request_token_with_retry(token_url, p, headers)
 
-        except TokenRequestError as e:
-            logging.error(f"❌ Token request failed: {e}")
-            logging.error(f"   Status Code: {e.status_code}")
-            logging.error(f"   Response: {e.response_text}")
-            # Re-raise with clear error message
-            raise
+        my_token = result.get("access_token")
+        my_expired = result.get("access_token_token_expired")
 
-        except Exception as e:
-            logging.error(f"❌ Unexpected error during token request: {e}")
-            raise TokenRequestError(f"Unexpected error: {e}")
+        if not my_token or not my_expired:
+            raise TokenRequestError(
+                "Invalid response from KIS API: missing token or expiry",
+                status_code=200,
+                response_text=str(result)
+            )
 
-    else:
-        my_token = saved_token
-        logging.info("✅ Using existing valid token")
+        # Save the new token (per-account if account_key provided)
+        save_token(my_token, my_expired, account_key=account_key)
+        logging.info(f"✅ New token obtained and saved (expires: {my_expired})")
+        return my_token
+
+    except TokenRequestError as e:
+        logging.error(f"❌ Token request failed: {e}")
+        logging.error(f"   Status Code: {e.status_code}")
+        logging.error(f"   Response: {e.response_text}")
+        # Re-raise with clear error message
+        raise
+
+    except Exception as e:
+        logging.error(f"❌ Unexpected error during token request: {e}")
+        raise TokenRequestError(f"Unexpected error: {e}")
+
+
+# Token issuance, validity 1 day, maintains existing token if issued within 6 hours, notification sent on issuance
+# For paper trading use svr='vps', if not investment account(01) change product='XX' (last 2 digits of account number)
+def auth(
+    svr="prod",
+    product=DEFAULT_PRODUCT_CODE,
+    url=None,
+    account_name=None,
+    account_index=None,
+    account_key=None,
+):
+    """
+    Authenticate with KIS API and obtain access token.
+
+    Improvements in this version:
+    - Credential validation (detects demo/real key mismatch)
+    - Retry logic for transient network failures
+    - Raises exceptions instead of silent failure
+    - Auto-cleanup of empty/corrupted token files
+
+    Args:
+        svr: 'prod' for real trading, 'vps' for paper trading
+        product: Account product code (default from config)
+        url: API URL (optional, auto-generated from svr)
+
+    Raises:
+        CredentialMismatchError: App key doesn't match trading mode
+        TokenRequestError: Failed to obtain token from KIS API
+        TokenFileError: Failed to save token to file
+    """
+    app_key, app_secret = _resolve_app_credentials(
+        svr,
+        product,
+        account_name=account_name,
+        account_index=account_index,
+        account_key=account_key,
+    )
+
+    # Reuse a valid token from memory or disk; otherwise issue one host-wide
+    my_token = _obtain_token(
+        svr, app_key, app_secret, _getBaseHeader, account_key=account_key
+    )
+
+    _TOKEN_REFRESH_PARAMS[account_key or None] = {
+        "svr": svr,
+        "product": product,
+        "account_name": account_name,
+        "account_index": account_index,
+        "account_key": account_key,
+    }
 
     # Set up environment with token
     changeTREnv(
@@ -1442,15 +1632,82 @@ def reAuth(svr="prod", product=DEFAULT_PRODUCT_CODE, account_name=None, account_
         auth(svr, product, account_name=account_name, account_index=account_index, account_key=account_key)
 
 
+def _reissue_cached_token(account_key: str | None) -> bool:
+    """Reissue one cached token ahead of expiry without switching ``_TRENV``."""
+
+    params = _TOKEN_REFRESH_PARAMS.get(account_key)
+    if params is None:
+        return False
+    svr = params["svr"]
+    app_key, app_secret = _resolve_app_credentials(
+        svr,
+        params["product"],
+        account_name=params["account_name"],
+        account_index=params["account_index"],
+        account_key=params["account_key"],
+    )
+    _obtain_token(
+        svr,
+        app_key,
+        app_secret,
+        lambda: {name: value for name, value in _base_headers.items() if name not in _CREDENTIAL_HEADERS},
+        account_key=params["account_key"],
+        min_remaining_seconds=KIS_TOKEN_REFRESH_AHEAD_SECONDS,
+    )
+    logging.info("Renewed KIS token ahead of expiry for %s", _mask_account_key(account_key) or "shared token")
+    return True
+
+
+def start_token_refresher() -> TokenRefresher | None:
+    """Start the background token refresher unless it is disabled or running."""
+
+    global _TOKEN_REFRESHER
+    if KIS_TOKEN_REFRESH_AHEAD_SECONDS <= 0:
+        return None
+    if _TOKEN_REFRESHER is None:
+        _TOKEN_REFRESHER = TokenRefresher(
+            KIS_TOKEN_CACHE,
+            _reissue_cached_token,
+            ahead_seconds=KIS_TOKEN_REFRESH_AHEAD_SECONDS,
+            interval_seconds=KIS_TOKEN_REFRESH_INTERVAL_SECONDS,
+        ).start()
+    return _TOKEN_REFRESHER
+
+
+def stop_token_refresher() -> None:
+    global _TOKEN_REFRESHER
+    if _TOKEN_REFRESHER is not None:
+        _TOKEN_REFRESHER.stop()
+        _TOKEN_REFRESHER = None
+
+
 def getEnv():
     return _cfg
 
 
+def warm_kis_connections(svr: str = "prod") -> dict[str, bool]:
+    """Pre-open keep-alive connections to the configured KIS REST server."""
+    if svr not in {"prod", "vps"}:
+        raise ValueError(f"Invalid server type: {svr}. Must be 'prod' or 'vps'")
+    base_url = _cfg.get(svr)
+    if not base_url:
+        return {}
+    return KIS_HTTP_POOL.warm_up([base_url])
+
+
+def _rate_limit_key() -> tuple[str, str]:
+    """Return the (app key, server) bucket the active environment draws from."""
+
+    app_key = getattr(getTREnv(), "my_app", "") or ""
+    return app_key, SERVER_VPS if isPaperTrading() else SERVER_PROD
+
+
 def smart_sleep():
-    if _DEBUG:
-        print(f"[RateLimit] Sleeping {_smartSleep}s ")
+    """Wait for the active app key's rate-limit bucket to admit one call."""
 
-    time.sleep(_smartSleep)
+    waited = KIS_RATE_LIMITER.acquire(*_rate_limit_key())
+    if _DEBUG and waited:
+        print(f"[RateLimit] Waited {waited:.3f}s ")
 
 
 def getTREnv():
@@ -1466,7 +1723,7 @@ def getTREnv():
 def set_order_hash_key(h, p):
     url = f"{getTREnv().my_url}/uapi/hashkey"  # hashkey issuance API URL
 
-    res = requests.post(url, data=json.dumps(p), headers=h, timeout=KIS_HTTP_TIMEOUT)
+    res = _http_post(url, data=json.dumps(p), headers=h, timeout=KIS_HTTP_TIMEOUT)
     rescode = res.status_code
     if rescode == 200:
         h["hashkey"] = _getResultObject(res.json()).HASH
@@ -1488,18 +1745,11 @@ class APIResp:
         return self._rescode
 
     def _setHeader(self):
-        fld = dict()
-        for x in self._resp.headers.keys():
-            if x.islower():
-                fld[x] = self._resp.headers.get(x)
-        _th_ = namedtuple("header", fld.keys())
-
-        return _th_(**fld)
+        headers = self._resp.headers
+        return ResponseView({x: headers.get(x) for x in headers.keys() if x.islower()})
 
     def _setBody(self):
-        _tb_ = namedtuple("body", self._resp.json().keys())
-
-        return _tb_(**self._resp.json())
+        return ResponseView(decode_json_body(self._resp))
 
     def getHeader(self):
         return self._header
@@ -1645,40 +1895,259 @@ def _kis_retry_delay_seconds(attempt_index: int) -> float:
 
 def _request_once(url: str, headers: dict[str, Any], params: dict[str, Any], *, postFlag: bool):
     if postFlag:
-        return requests.post(
+        return _http_post(
             url,
             headers=headers,
             data=json.dumps(params),
             timeout=KIS_HTTP_TIMEOUT,
         )
-    return requests.get(url, headers=headers, params=params, timeout=KIS_HTTP_TIMEOUT)
+    return _http_get(url, headers=headers, params=params, timeout=KIS_HTTP_TIMEOUT)
 
 
+class _AsyncHttpResponse:
+    """httpx response exposed with the header-name casing ``APIResp`` expects.
 
-########### API call wrapping : Common API call
+    httpx lower-cases header names, while ``APIResp`` keeps only the headers
+    KIS itself sends in lower case (``tr_id``, ``tr_cont``, ``gt_uid``).
+    """
+
+    def __init__(self, response) -> None:
+        self._response = response
+        self.status_code = response.status_code
+        self.content = response.content
+        self.text = response.text
+        self.headers = {
+            name.decode("latin-1"): value.decode("latin-1")
+            for name, value in response.headers.raw
+        }
 
+    def json(self):
+        return json_loads(self.content)
 
-def _url_fetch(
-        api_url, ptr_id, tr_cont, params, appendHeaders=None, postFlag=False, hashFlag=True
+
+async def _request_once_async(
+    url: str, headers: dict[str, Any], params: dict[str, Any], *, postFlag: bool
 ):
-    url = f"{getTREnv().my_url}{api_url}"
+    if not KIS_ASYNC_HTTP_POOL.available:  # pragma: no cover - httpx not installed
+        return await asyncio.to_thread(_request_once, url, headers, params, postFlag=postFlag)
+    client = KIS_ASYNC_HTTP_POOL.client_for(url)
+    if postFlag:
+        response = await client.post(url, headers=headers, content=json.dumps(params))
+    else:
+        response = await client.get(url, headers=headers, params=params)
+    return _AsyncHttpResponse(response)
 
-    headers = _getBaseHeader()  # Organize basic header values
 
-    # Set additional Headers
-    tr_id = ptr_id
+def _resolve_tr_id(ptr_id: str, context: KISClientContext | None = None) -> str:
     if ptr_id[0] in ("T", "J", "C"):  # Check TR id for live trading
-        if isPaperTrading():  # Identify TR id for paper trading
-            tr_id = "V" + ptr_id[1:]
+        paper = context.is_paper if context is not None else isPaperTrading()
+        if paper:  # Identify TR id for paper trading
+            return "V" + ptr_id[1:]
+    return ptr_id
 
+
+def _request_headers(
+    tr_id: str, tr_cont: str, appendHeaders=None, context: KISClientContext | None = None
+) -> dict[str, Any]:
+    # Organize basic header values
+    headers = context.headers() if context is not None else _getBaseHeader()
     headers["tr_id"] = tr_id  # Transaction TR id
     headers["custtype"] = "P"  # General (individual/corporate customer) "P", affiliate "B"
     headers["tr_cont"] = tr_cont  # Transaction TR id
-
     if appendHeaders is not None:
-        if len(appendHeaders) > 0:
-            for x in appendHeaders.keys():
-                headers[x] = appendHeaders.get(x)
+        for x in appendHeaders.keys():
+            headers[x] = appendHeaders.get(x)
+    return headers
+
+
+def _request_target(
+    api_url: str, ptr_id: str, tr_cont: str, appendHeaders, context: KISClientContext | None
+) -> tuple[str, str, dict[str, Any], tuple[str, str]]:
+    """Resolve URL, TR id, headers and rate-limit bucket for one request.
+
+    Without a context the module-level environment is used, which callers
+    must hold ``_TRENV_LOCK`` around when several accounts are active.
+    """
+
+    tr_id = _resolve_tr_id(ptr_id, context)
+    headers = _request_headers(tr_id, tr_cont, appendHeaders, context)
+    if context is not None:
+        return f"{context.base_url}{api_url}", tr_id, headers, context.rate_limit_key
+    return f"{getTREnv().my_url}{api_url}", tr_id, headers, _rate_limit_key()
+
+
+def _current_client_context(
+    context: KISClientContext,
+    on_token_refresh: Callable[[KISClientContext], None] | None,
+) -> KISClientContext:
+    """Swap in a token the background refresher reissued since ``context`` was built."""
+
+    token = KIS_TOKEN_CACHE.get(context.account_key or None)
+    if token is None or token == context.env.my_token:
+        return context
+    context = context.with_env(context.env._replace(my_token=token))
+    if on_token_refresh is not None:
+        on_token_refresh(context)
+    return context
+
+
+def _api_response(res):
+    return APIResp(res) if res.status_code == 200 else APIRespError(res.status_code, res.text)
+
+
+def _observe_kis_request(tr_id: str, started: float, response=None) -> None:
+    if response is None:
+        result = "exception"
+    elif response.isOK():
+        result = "ok"
+    else:
+        result = str(response.getErrorCode() or "error")
+    metrics.KIS_REQUEST_SECONDS.observe(
+        time.perf_counter() - started, tr_id=tr_id, result=result
+    )
+    tracing.set_attributes(result=result)
+
+
+def _measured_request(
+    url: str,
+    tr_id: str,
+    headers: dict[str, Any],
+    params: dict[str, Any],
+    rate_limit_key: tuple[str, str],
+    *,
+    postFlag: bool,
+):
+    """Wait for the rate limiter, then send one attempt and record its latency."""
+    with tracing.span("kis.request", tr_id=tr_id):
+        waiting_since = time.perf_counter()
+        KIS_RATE_LIMITER.acquire(*rate_limit_key)
+        started = time.perf_counter()
+        tracing.set_attributes(rate_wait_ms=round((started - waiting_since) * 1000, 3))
+        try:
+            res = _request_once(url, headers, params, postFlag=postFlag)
+        except Exception:
+            _observe_kis_request(tr_id, started)
+            raise
+        response = _api_response(res)
+        _observe_kis_request(tr_id, started, response)
+        return res, response
+
+
+async def _measured_request_async(
+    url: str,
+    tr_id: str,
+    headers: dict[str, Any],
+    params: dict[str, Any],
+    rate_limit_key: tuple[str, str],
+    *,
+    postFlag: bool,
+):
+    with tracing.span("kis.request", tr_id=tr_id):
+        waiting_since = time.perf_counter()
+        await KIS_RATE_LIMITER.acquire_async(*rate_limit_key)
+        started = time.perf_counter()
+        tracing.set_attributes(rate_wait_ms=round((started - waiting_since) * 1000, 3))
+        try:
+            res = await _request_once_async(url, headers, params, postFlag=postFlag)
+        except Exception:
+            _observe_kis_request(tr_id, started)
+            raise
+        response = _api_response(res)
+        _observe_kis_request(tr_id, started, response)
+        return res, response
+
+
+def _call_with_trenv_lock(func: Callable[[], Any]) -> Any:
+    with _TRENV_LOCK:
+        return func()
+
+
+async def _call_with_trenv_lock_async(func: Callable[[], Any]) -> Any:
+    """Run a short critical section on the shared KIS environment from a coroutine.
+
+    The uncontended case runs inline on the event loop.  When a blocking caller
+    holds the lock, wait for it on a worker thread instead of stalling the loop.
+    """
+    if _TRENV_LOCK.acquire(blocking=False):
+        try:
+            return func()
+        finally:
+            _TRENV_LOCK.release()
+    return await asyncio.to_thread(_call_with_trenv_lock, func)
+
+
+def _log_expired_token_retry(api_url: str, tr_id: str) -> None:
+    logging.warning(
+        "KIS API reported expired token %s from %s (TR %s); refreshing token and retrying once",
+        KIS_EXPIRED_TOKEN_ERROR_CODE,
+        api_url,
+        tr_id,
+    )
+
+
+def _log_token_refresh_failure(api_url: str, tr_id: str, refresh_error: Exception) -> None:
+    logging.error(
+        "Failed to refresh KIS token after %s for %s (TR %s): %s",
+        KIS_EXPIRED_TOKEN_ERROR_CODE,
+        api_url,
+        tr_id,
+        refresh_error,
+    )
+
+
+def _log_request_failure(api_url: str, tr_id: str, status_code: int, response) -> None:
+    logging.error(
+        "KIS API request failed for %s (TR %s, HTTP %s, KIS %s): %s",
+        api_url,
+        tr_id,
+        status_code,
+        response.getErrorCode(),
+        response.getErrorMessage(),
+    )
+
+
+def _log_rate_limit_retry(
+    api_url: str, tr_id: str, response, next_attempt: int, attempts: int, delay_seconds: float
+) -> None:
+    logging.warning(
+        "KIS API rate limit %s from %s (TR %s); retrying attempt %s/%s after %.2fs",
+        response.getErrorCode(),
+        api_url,
+        tr_id,
+        next_attempt,
+        attempts,
+        delay_seconds,
+    )
+
+
+
+########### API call wrapping : Common API call
+
+
+def _url_fetch(
+        api_url,
+        ptr_id,
+        tr_cont,
+        params,
+        appendHeaders=None,
+        postFlag=False,
+        hashFlag=True,
+        *,
+        context: KISClientContext | None = None,
+        on_token_refresh: Callable[[KISClientContext], None] | None = None,
+):
+    """Call one KIS REST endpoint with rate-limit and expired-token retries.
+
+    Pass the account's ``context`` to call KIS without touching the shared
+    environment; ``on_token_refresh`` then receives the replacement context
+    after an EGW00123 reissue.  Without a context the module-level
+    environment selected by ``auth``/``changeTREnv`` is used.
+    """
+    if context is not None:
+        context = _current_client_context(context, on_token_refresh)
+    url, tr_id, headers, rate_limit_key = _request_target(
+        api_url, ptr_id, tr_cont, appendHeaders, context
+    )
 
     if _DEBUG:
         print("< Sending Info >")
@@ -1690,8 +2159,9 @@ def _url_fetch(
     expired_token_retry_used = False
     rate_limit_attempt = 1
     while rate_limit_attempt <= attempts:
-        res = _request_once(url, headers, params, postFlag=postFlag)
-        response = APIResp(res) if res.status_code == 200 else APIRespError(res.status_code, res.text)
+        res, response = _measured_request(
+            url, tr_id, headers, params, rate_limit_key, postFlag=postFlag
+        )
 
         if response.isOK():
             if _DEBUG:
@@ -1702,56 +2172,108 @@ def _url_fetch(
         # them consistently whether the HTTP transport returned 200 or an error.
         if _is_kis_expired_token_response(response) and not expired_token_retry_used:
             expired_token_retry_used = True
-            logging.warning(
-                "KIS API reported expired token %s from %s (TR %s); refreshing token and retrying once",
-                KIS_EXPIRED_TOKEN_ERROR_CODE,
-                api_url,
-                tr_id,
-            )
+            _log_expired_token_retry(api_url, tr_id)
+            metrics.KIS_RETRIES.inc(code=KIS_EXPIRED_TOKEN_ERROR_CODE)
             try:
-                _refresh_after_expired_token_response()
+                if context is not None:
+                    context = refresh_client_context(context)
+                else:
+                    _refresh_after_expired_token_response()
             except Exception as refresh_error:
-                logging.error(
-                    "Failed to refresh KIS token after %s for %s (TR %s): %s",
-                    KIS_EXPIRED_TOKEN_ERROR_CODE,
-                    api_url,
-                    tr_id,
-                    refresh_error,
-                )
+                _log_token_refresh_failure(api_url, tr_id, refresh_error)
                 return response
-            headers = _getBaseHeader()
-            headers["tr_id"] = tr_id
-            headers["custtype"] = "P"
-            headers["tr_cont"] = tr_cont
-            if appendHeaders is not None:
-                for x in appendHeaders.keys():
-                    headers[x] = appendHeaders.get(x)
+            if context is not None and on_token_refresh is not None:
+                on_token_refresh(context)
+            headers = _request_headers(tr_id, tr_cont, appendHeaders, context)
             continue
 
         if not _is_kis_rate_limit_response(response) or rate_limit_attempt >= attempts:
-            logging.error(
-                "KIS API request failed for %s (TR %s, HTTP %s, KIS %s): %s",
-                api_url,
-                tr_id,
-                res.status_code,
-                response.getErrorCode(),
-                response.getErrorMessage(),
-            )
+            _log_request_failure(api_url, tr_id, res.status_code, response)
             return response
 
         delay_seconds = _kis_retry_delay_seconds(rate_limit_attempt)
-        logging.warning(
-            "KIS API rate limit %s from %s (TR %s); retrying attempt %s/%s after %.2fs",
-            response.getErrorCode(),
-            api_url,
-            tr_id,
-            rate_limit_attempt + 1,
-            attempts,
-            delay_seconds,
-        )
+        _log_rate_limit_retry(api_url, tr_id, response, rate_limit_attempt + 1, attempts, delay_seconds)
+        metrics.KIS_RETRIES.inc(code=str(response.getErrorCode()))
         rate_limit_attempt += 1
-        time.sleep(delay_seconds)
+        # Push the shared bucket back so every caller on this app key pauses,
+        # then wait for it at the top of the loop.
+        KIS_RATE_LIMITER.backoff(*rate_limit_key, delay_seconds)
+
+
+    return APIRespError(599, "KIS API retry loop exhausted unexpectedly")
+
+
+async def _url_fetch_async(
+        api_url,
+        ptr_id,
+        tr_cont,
+        params,
+        appendHeaders=None,
+        postFlag=False,
+        hashFlag=True,
+        *,
+        context: KISClientContext | None = None,
+        on_token_refresh: Callable[[KISClientContext], None] | None = None,
+):
+    """Awaitable ``_url_fetch`` with the same retry and token-refresh behaviour.
+
+    With a ``context`` nothing shared is locked, so one event loop can keep
+    requests for many accounts in flight.  Without one, the shared
+    environment is locked only while the URL and headers are captured.
+    """
 
+    def refresh_shared():
+        _refresh_after_expired_token_response()
+        return _request_headers(tr_id, tr_cont, appendHeaders)
+
+    if context is not None:
+        context = _current_client_context(context, on_token_refresh)
+        url, tr_id, headers, rate_limit_key = _request_target(
+            api_url, ptr_id, tr_cont, appendHeaders, context
+        )
+    else:
+        url, tr_id, headers, rate_limit_key = await _call_with_trenv_lock_async(
+            lambda: _request_target(api_url, ptr_id, tr_cont, appendHeaders, None)
+        )
+
+    attempts = max(1, KIS_RATE_LIMIT_RETRY_ATTEMPTS)
+    expired_token_retry_used = False
+    rate_limit_attempt = 1
+    while rate_limit_attempt <= attempts:
+        res, response = await _measured_request_async(
+            url, tr_id, headers, params, rate_limit_key, postFlag=postFlag
+        )
+
+        if response.isOK():
+            return response
+
+        if _is_kis_expired_token_response(response) and not expired_token_retry_used:
+            expired_token_retry_used = True
+            _log_expired_token_retry(api_url, tr_id)
+            metrics.KIS_RETRIES.inc(code=KIS_EXPIRED_TOKEN_ERROR_CODE)
+            try:
+                # Token reissue performs blocking HTTP and file I/O.
+                if context is not None:
+                    context = await asyncio.to_thread(refresh_client_context, context)
+                    headers = _request_headers(tr_id, tr_cont, appendHeaders, context)
+                else:
+                    headers = await asyncio.to_thread(_call_with_trenv_lock, refresh_shared)
+            except Exception as refresh_error:
+                _log_token_refresh_failure(api_url, tr_id, refresh_error)
+                return response
+            if context is not None and on_token_refresh is not None:
+                on_token_refresh(context)
+            continue
+
+        if not _is_kis_rate_limit_response(response) or rate_limit_attempt >= attempts:
+            _log_request_failure(api_url, tr_id, res.status_code, response)
+            return response
+
+        delay_seconds = _kis_retry_delay_seconds(rate_limit_attempt)
+        _log_rate_limit_retry(api_url, tr_id, response, rate_limit_attempt + 1, attempts, delay_seconds)
+        metrics.KIS_RETRIES.inc(code=str(response.getErrorCode()))
+        rate_limit_attempt += 1
+        KIS_RATE_LIMITER.backoff(*rate_limit_key, delay_seconds)
 
     return APIRespError(599, "KIS API retry loop exhausted unexpectedly")
 
@@ -1787,7 +2309,7 @@ def auth_ws(svr="prod", product=DEFAULT_PRODUCT_CODE, account_name=None, account
     p["secretkey"] = _cfg[ak2]
 
     url = f"{_cfg[svr]}/oauth2/Approval"
-    res = requests.post(
+    res = _http_post(
         url,
         data=json.dumps(p),
         headers=_getBaseHeader(),
@@ -1842,6 +2364,12 @@ def data_fetch(tr_id, tr_type, params, appendHeaders=None) -> dict:
 
 
 # Return iv, ekey, encrypt in dict so they can be saved to each function method file
+SystemMessage = namedtuple(
+    "SysMsg",
+    ["isOk", "tr_id", "tr_key", "isUnSub", "isPingPong", "tr_msg", "iv", "ekey", "encrypt"],
+)
+
+
 def system_resp(data):
     isPingPong = False
     isUnSub = False
@@ -1850,7 +2378,7 @@ def system_resp(data):
     tr_key = None
     encrypt, iv, ekey = None, None, None
 
-    rdic = json.loads(data)
+    rdic = json_loads(data)
 
     tr_id = rdic["header"]["tr_id"]
     if tr_id != "PINGPONG":
@@ -1867,33 +2395,17 @@ def system_resp(data):
     else:
         isPingPong = True if tr_id == "PINGPONG" else False
 
-    nt2 = namedtuple(
-        "SysMsg",
-        [
-            "isOk",
-            "tr_id",
-            "tr_key",
-            "isUnSub",
-            "isPingPong",
-            "tr_msg",
-            "iv",
-            "ekey",
-            "encrypt",
-        ],
+    return SystemMessage(
+        isOk=isOk,
+        tr_id=tr_id,
+        tr_key=tr_key,
+        isUnSub=isUnSub,
+        isPingPong=isPingPong,
+        tr_msg=tr_msg,
+        iv=iv,
+        ekey=ekey,
+        encrypt=encrypt,
     )
-    d = {
-        "isOk": isOk,
-        "tr_id": tr_id,
-        "tr_key": tr_key,
-        "tr_msg": tr_msg,
-        "isUnSub": isUnSub,
-        "isPingPong": isPingPong,
-        "iv": iv,
-        "ekey": ekey,
-        "encrypt": encrypt,
-    }
-
-    return nt2(**d)
 
 
 def aes_cbc_base64_dec(key, iv, cipher_text):
@@ -1953,6 +2465,10 @@ def add_data_map(
         data_map[tr_id]["iv"] = iv
 
 
+memory.register_cache("kis_auth.open_map", lambda: sum(len(entry["items"]) for entry in open_map.values()))
+memory.register_cache("kis_auth.data_map", lambda: len(data_map))
+
+
 class KISWebSocket:
     api_url: str = ""
     on_result: Callable[
@@ -2054,8 +2570,8 @@ class KISWebSocket:
 
         logging.info("send message >> %s" % json.dumps(msg))
 
+        await KIS_RATE_LIMITER.acquire_async(*_rate_limit_key())
         await ws.send(json.dumps(msg))
-        smart_sleep()
 
     async def send_multiple(
             self,
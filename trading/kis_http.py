@@ -0,0 +1,220 @@
+"""Pooled keep-alive HTTP sessions and async clients for KIS REST calls."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import logging
+import math
+import os
+import threading
+import weakref
+from typing import Any, Iterable
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+requests_spec = importlib.util.find_spec("requests")
+if requests_spec is not None:
+    requests = importlib.import_module("requests")
+    HTTPAdapter = importlib.import_module("requests.adapters").HTTPAdapter
+else:  # pragma: no cover - minimal test environment fallback
+    requests = None
+    HTTPAdapter = None
+
+httpx_spec = importlib.util.find_spec("httpx")
+if httpx_spec is not None:
+    httpx = importlib.import_module("httpx")
+else:  # pragma: no cover - async transport falls back to worker threads
+    httpx = None
+
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_WARMUP_TIMEOUT_SECONDS = 5.0
+
+
+def _positive_int_env(name: str, default: int) -> int:
+    raw_value = os.environ.get(name)
+    if raw_value in (None, ""):
+        return default
+    try:
+        value = float(raw_value)
+    except (TypeError, ValueError):
+        logger.warning("Ignoring invalid %s=%r; using %s", name, raw_value, default)
+        return default
+    if not math.isfinite(value) or not value.is_integer() or value < 1:
+        logger.warning("Ignoring invalid %s=%r; using %s", name, raw_value, default)
+        return default
+    return int(value)
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        raise ValueError(f"KIS URL must be absolute: {url!r}")
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+class KISHttpPool:
+    """Share one keep-alive ``requests.Session`` per KIS origin.
+
+    KIS live and paper servers are separate origins, and every account on the
+    same server talks to the same origin, so sessions are keyed by
+    ``scheme://host:port`` rather than by account.  Credentials travel in
+    per-request headers and never in session state, which keeps a pooled
+    connection safe to reuse across accounts.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    ) -> None:
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._sessions: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "KISHttpPool":
+        return cls(
+            pool_connections=_positive_int_env(
+                "KIS_HTTP_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS
+            ),
+            pool_maxsize=_positive_int_env("KIS_HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE),
+        )
+
+    def _new_session(self):
+        if requests is None:
+            raise ModuleNotFoundError("requests is required for KIS HTTP calls")
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=False,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def session_for(self, url: str):
+        origin = _origin(url)
+        with self._lock:
+            session = self._sessions.get(origin)
+            if session is None:
+                session = self._new_session()
+                self._sessions[origin] = session
+            return session
+
+    def origins(self) -> list[str]:
+        with self._lock:
+            return sorted(self._sessions)
+
+    def warm_up(
+        self,
+        base_urls: Iterable[str],
+        *,
+        timeout: float = DEFAULT_WARMUP_TIMEOUT_SECONDS,
+    ) -> dict[str, bool]:
+        """Open a keep-alive connection to each origin before the first order.
+
+        Any HTTP status counts as success; only the TCP/TLS handshake matters.
+        """
+
+        results: dict[str, bool] = {}
+        for base_url in base_urls:
+            if not base_url:
+                continue
+            origin = _origin(base_url)
+            if origin in results:
+                continue
+            try:
+                response = self.session_for(origin).head(
+                    origin, timeout=timeout, allow_redirects=False
+                )
+                response.close()
+                results[origin] = True
+            except Exception as exc:  # noqa: BLE001 - warm-up is best effort
+                logger.warning("KIS connection warm-up failed for %s: %s", origin, exc)
+                results[origin] = False
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+class KISAsyncHttpPool:
+    """Share one keep-alive ``httpx.AsyncClient`` per KIS origin and event loop.
+
+    An ``AsyncClient`` is bound to the loop that first used it, so clients are
+    keyed by the running loop as well as the origin.  Clients owned by a loop
+    that has been garbage collected are dropped with it.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = DEFAULT_POOL_MAXSIZE,
+        timeout: tuple[float, float] = (5.0, 30.0),
+    ) -> None:
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, Any]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, *, timeout: tuple[float, float] = (5.0, 30.0)) -> "KISAsyncHttpPool":
+        return cls(
+            max_connections=_positive_int_env("KIS_HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE),
+            timeout=timeout,
+        )
+
+    @property
+    def available(self) -> bool:
+        return httpx is not None
+
+    def _new_client(self):
+        if httpx is None:
+            raise ModuleNotFoundError("httpx is required for native async KIS HTTP calls")
+        connect_timeout, read_timeout = self.timeout
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+
+    def client_for(self, url: str):
+        """Return the client for ``url`` owned by the running event loop."""
+
+        origin = _origin(url)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.setdefault(loop, {})
+            client = clients.get(origin)
+            if client is None:
+                client = self._new_client()
+                clients[origin] = client
+            return client
+
+    def origins(self) -> list[str]:
+        with self._lock:
+            return sorted({origin for clients in self._clients.values() for origin in clients})
+
+    async def aclose(self) -> None:
+        """Close the clients owned by the running event loop."""
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.pop(loop, {})
+        for client in clients.values():
+            await client.aclose()
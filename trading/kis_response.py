@@ -0,0 +1,78 @@
+"""Lightweight attribute views over decoded KIS JSON responses."""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import json
+from typing import Any, Iterator, Mapping
+
+orjson_spec = importlib.util.find_spec("orjson")
+if orjson_spec is not None:
+    orjson = importlib.import_module("orjson")
+else:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def loads(data: str | bytes | bytearray) -> Any:
+    """Decode JSON with orjson when installed, otherwise the standard library."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def decode_json_body(response) -> Any:
+    """Decode an HTTP response body once, preferring its raw bytes for orjson."""
+
+    content = getattr(response, "content", None)
+    if orjson is not None and isinstance(content, (bytes, bytearray)):
+        return orjson.loads(content)
+    return response.json()
+
+
+class ResponseView:
+    """Read-only attribute access over a decoded JSON object.
+
+    Replaces the namedtuple class KIS sample code built for every header and
+    body.  Fields resolve straight from the decoded dict, so large
+    ``output1`` lists are shared rather than copied, and ``_fields`` /
+    ``_asdict`` keep the namedtuple-style introspection callers rely on.
+    Missing fields raise ``AttributeError`` so ``hasattr``/``getattr``
+    defaults keep working.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        object.__setattr__(self, "_data", data)
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    @property
+    def _fields(self) -> tuple[str, ...]:
+        return tuple(self._data)
+
+    def _asdict(self) -> dict[str, Any]:
+        return dict(self._data)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._data.values())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ResponseView):
+            return self._data == other._data
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in self._data.items())
+        return f"{type(self).__name__}({fields})"
@@ -0,0 +1,785 @@
+"""Local stand-in for the KIS Open API used for offline load and latency tests.
+
+The simulator serves the REST TR ids ``domestic.py`` and ``us.py`` call
+(token, quotations, balances, buyable amount and orders) and a websocket
+quote stream, with configurable latency and injected EGW00201 rate-limit and
+EGW00123 expired-token failures.  Point the ``prod``/``vps`` and
+``ops``/``vops`` URLs in ``kis_devlp.yaml`` at it to run the subscriber
+without touching the real broker::
+
+    python -m trading.kis_simulator --port 9443 --ws-port 9444 --latency lognormal:40:15
+
+Fills are immediate and prices follow a seeded random walk; the goal is
+realistic request shapes and timing, not market realism.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import secrets
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Sequence
+from urllib.parse import parse_qsl, urlsplit
+
+from .token_cache import KIS_TOKEN_EXPIRY_TZ
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ERROR_CODE = "EGW00201"
+EXPIRED_TOKEN_ERROR_CODE = "EGW00123"
+TOKEN_EXPIRY_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# KIS documents 20 requests per second for real accounts and 2 for paper.
+DEFAULT_REAL_RATE_LIMIT = 20.0
+DEFAULT_PAPER_RATE_LIMIT = 2.0
+DEFAULT_TOKEN_TTL_SECONDS = 24 * 60 * 60
+
+LATENCY_KINDS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+
+@dataclass(frozen=True, slots=True)
+class LatencyModel:
+    """Per-request server delay in milliseconds.
+
+    ``spread_ms`` is the half-width for ``uniform``, the standard deviation
+    for ``normal``/``lognormal`` and is ignored for ``fixed`` and
+    ``exponential``.
+    """
+
+    kind: str = "fixed"
+    mean_ms: float = 0.0
+    spread_ms: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.kind not in LATENCY_KINDS:
+            raise ValueError(f"latency kind must be one of {', '.join(LATENCY_KINDS)}")
+        if not math.isfinite(self.mean_ms) or self.mean_ms < 0:
+            raise ValueError("latency mean must be a finite non-negative number")
+        if not math.isfinite(self.spread_ms) or self.spread_ms < 0:
+            raise ValueError("latency spread must be a finite non-negative number")
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyModel":
+        """Parse ``kind[:mean_ms[:spread_ms]]``, e.g. ``lognormal:40:15``."""
+
+        parts = [part.strip() for part in spec.split(":")]
+        kind = parts[0] or "fixed"
+        try:
+            mean_ms = float(parts[1]) if len(parts) > 1 else 0.0
+            spread_ms = float(parts[2]) if len(parts) > 2 else 0.0
+        except ValueError:
+            raise ValueError(f"invalid latency spec {spec!r}") from None
+        return cls(kind, mean_ms, spread_ms)
+
+    def sample_seconds(self, rng: random.Random) -> float:
+        mean, spread = self.mean_ms, self.spread_ms
+        if self.kind == "fixed" or mean == 0:
+            value = mean
+        elif self.kind == "uniform":
+            value = rng.uniform(mean - spread, mean + spread)
+        elif self.kind == "normal":
+            value = rng.gauss(mean, spread)
+        elif self.kind == "exponential":
+            value = rng.expovariate(1.0 / mean)
+        else:
+            # Parameterize the underlying normal so the samples have the
+            # requested mean and standard deviation.
+            sigma2 = math.log1p((spread / mean) ** 2)
+            value = rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+        return max(0.0, value) / 1000.0
+
+
+@dataclass(slots=True)
+class SimulatorConfig:
+    latency: LatencyModel = field(default_factory=LatencyModel)
+    # Requests per rolling second per app key; 0 disables the limit.
+    real_rate_limit: float = DEFAULT_REAL_RATE_LIMIT
+    paper_rate_limit: float = DEFAULT_PAPER_RATE_LIMIT
+    # Probability of answering an otherwise valid request with EGW00201/EGW00123.
+    rate_limit_error_rate: float = 0.0
+    token_expiry_rate: float = 0.0
+    token_ttl_seconds: float = DEFAULT_TOKEN_TTL_SECONDS
+    krw_cash: float = 100_000_000.0
+    usd_cash: float = 100_000.0
+    usd_krw_rate: float = 1380.0
+    # Seed quotes by symbol; unknown symbols start at a price derived from the code.
+    prices: dict[str, float] = field(default_factory=dict)
+    quote_interval_seconds: float = 1.0
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        for name in ("rate_limit_error_rate", "token_expiry_rate"):
+            value = getattr(self, name)
+            if not 0.0 <= value <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+
+
+@dataclass(frozen=True, slots=True)
+class SimulatedResponse:
+    status: int
+    payload: dict[str, Any]
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _Token:
+    app_key: str
+    expires_at: float
+
+
+@dataclass(slots=True)
+class _Account:
+    krw_cash: float
+    usd_cash: float
+    # symbol -> [quantity, average price]
+    holdings: dict[str, list[float]] = field(default_factory=dict)
+
+
+def _ok(msg: str = "정상처리 되었습니다.", **body: Any) -> dict[str, Any]:
+    return {"rt_cd": "0", "msg_cd": "MCA00000", "msg1": msg, **body}
+
+
+def _fail(msg_cd: str, msg: str) -> dict[str, Any]:
+    return {"rt_cd": "1", "msg_cd": msg_cd, "msg1": msg}
+
+
+def _number(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _money(value: float, digits: int = 0) -> str:
+    return f"{value:.{digits}f}"
+
+
+class SimulatedBroker:
+    """Transport-independent KIS state: tokens, accounts, quotes and request stats.
+
+    ``handle`` takes an already parsed request so the same broker backs the
+    HTTP server and in-process tests.  Accounts are created on first use with
+    the configured cash, which lets any ``kis_devlp.yaml`` account trade.
+    """
+
+    def __init__(
+        self,
+        config: SimulatorConfig | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.config = config or SimulatorConfig()
+        self._clock = clock
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._tokens: dict[str, _Token] = {}
+        self._accounts: dict[tuple[str, str], _Account] = {}
+        self._prices = {symbol.upper(): float(price) for symbol, price in self.config.prices.items()}
+        self._windows: dict[str, deque[float]] = {}
+        self._order_seq = 0
+        self._stats: Counter[str] = Counter()
+        self._routes: dict[tuple[str, str], Callable[[dict[str, Any], str], dict[str, Any]]] = {
+            ("GET", "/uapi/domestic-stock/v1/quotations/inquire-price"): self._domestic_price,
+            ("POST", "/uapi/domestic-stock/v1/trading/order-cash"): self._domestic_order,
+            ("POST", "/uapi/domestic-stock/v1/trading/order-resv"): self._reserved_order,
+            ("GET", "/uapi/domestic-stock/v1/trading/inquire-balance"): self._domestic_balance,
+            ("GET", "/uapi/overseas-price/v1/quotations/price"): self._us_price,
+            ("GET", "/uapi/overseas-stock/v1/trading/inquire-psamount"): self._us_buyable,
+            ("POST", "/uapi/overseas-stock/v1/trading/order"): self._us_order,
+            ("POST", "/uapi/overseas-stock/v1/trading/order-resv"): self._reserved_order,
+            ("GET", "/uapi/overseas-stock/v1/trading/inquire-balance"): self._us_balance,
+            ("GET", "/uapi/overseas-stock/v1/trading/inquire-present-balance"): self._us_present_balance,
+        }
+
+    # -- public helpers -------------------------------------------------
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def expire_tokens(self) -> int:
+        """Expire every issued token now; the next request answers EGW00123."""
+
+        with self._lock:
+            now = self._clock()
+            for token in self._tokens.values():
+                token.expires_at = min(token.expires_at, now)
+            return len(self._tokens)
+
+    def latency_seconds(self) -> float:
+        with self._lock:
+            return self.config.latency.sample_seconds(self._rng)
+
+    def quote(self, symbol: str) -> float:
+        """Advance ``symbol``'s random walk one step and return the new price."""
+
+        with self._lock:
+            return self._step_price_locked(symbol)
+
+    # -- request handling -------------------------------------------------
+
+    def handle(
+        self,
+        method: str,
+        path: str,
+        headers: dict[str, str],
+        params: dict[str, Any],
+    ) -> SimulatedResponse:
+        method = method.upper()
+        headers = {name.lower(): value for name, value in headers.items()}
+        tr_id = headers.get("tr_id", "")
+        with self._lock:
+            self._stats["requests"] += 1
+            if tr_id:
+                self._stats[f"tr:{tr_id}"] += 1
+            if path == "/oauth2/tokenP" and method == "POST":
+                return self._issue_token_locked(params)
+            if path == "/oauth2/Approval" and method == "POST":
+                return SimulatedResponse(200, {"approval_key": secrets.token_hex(16)})
+            if path == "/oauth2/revokeP" and method == "POST":
+                self._tokens.pop(str(params.get("token", "")), None)
+                return SimulatedResponse(200, {"code": 200, "message": "접근토큰 폐기에 성공하였습니다"})
+            if path == "/uapi/hashkey" and method == "POST":
+                digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+                return SimulatedResponse(200, {"BODY": params, "HASH": digest})
+
+            route = self._routes.get((method, path))
+            if route is None:
+                self._stats["not_found"] += 1
+                return SimulatedResponse(404, _fail("OPSQ0002", f"unknown endpoint {method} {path}"))
+
+            rejection = self._check_request_locked(headers)
+            if rejection is not None:
+                return rejection
+            try:
+                payload = route(params, tr_id)
+            except (KeyError, ValueError) as exc:
+                payload = _fail("OPSQ2001", f"invalid request: {exc}")
+        response_headers = {"tr_id": tr_id, "tr_cont": "D", "gt_uid": secrets.token_hex(16)}
+        return SimulatedResponse(200, payload, response_headers)
+
+    def _issue_token_locked(self, params: dict[str, Any]) -> SimulatedResponse:
+        app_key = str(params.get("appkey") or "")
+        if not app_key or not params.get("appsecret"):
+            return SimulatedResponse(403, {"error_code": "EGW00103", "error_description": "유효하지 않은 AppKey입니다."})
+        token = secrets.token_urlsafe(32)
+        ttl = self.config.token_ttl_seconds
+        self._tokens[token] = _Token(app_key, self._clock() + ttl)
+        self._stats["tokens_issued"] += 1
+        expires = datetime.now(KIS_TOKEN_EXPIRY_TZ) + timedelta(seconds=ttl)
+        return SimulatedResponse(
+            200,
+            {
+                "access_token": token,
+                "access_token_token_expired": expires.strftime(TOKEN_EXPIRY_FORMAT),
+                "token_type": "Bearer",
+                "expires_in": int(ttl),
+            },
+        )
+
+    def _check_request_locked(self, headers: dict[str, str]) -> SimulatedResponse | None:
+        authorization = headers.get("authorization", "")
+        token = self._tokens.get(authorization.removeprefix("Bearer ").strip())
+        now = self._clock()
+        if token is None or token.expires_at <= now or (
+            self.config.token_expiry_rate and self._rng.random() < self.config.token_expiry_rate
+        ):
+            self._stats["expired_token"] += 1
+            return SimulatedResponse(500, _fail(EXPIRED_TOKEN_ERROR_CODE, "기간이 만료된 token 입니다."))
+
+        app_key = headers.get("appkey") or token.app_key
+        limit = self.config.paper_rate_limit if app_key.startswith("PSVT") else self.config.real_rate_limit
+        window = self._windows.setdefault(app_key, deque())
+        while window and window[0] <= now - 1.0:
+            window.popleft()
+        over_limit = limit > 0 and len(window) >= limit
+        if over_limit or (
+            self.config.rate_limit_error_rate and self._rng.random() < self.config.rate_limit_error_rate
+        ):
+            self._stats["rate_limited"] += 1
+            return SimulatedResponse(500, _fail(RATE_LIMIT_ERROR_CODE, "초당 거래건수를 초과하였습니다."))
+        window.append(now)
+        return None
+
+    # -- state ------------------------------------------------------------
+
+    def _account_locked(self, params: dict[str, Any]) -> _Account:
+        key = (str(params["CANO"]), str(params.get("ACNT_PRDT_CD") or "01"))
+        account = self._accounts.get(key)
+        if account is None:
+            account = _Account(self.config.krw_cash, self.config.usd_cash)
+            self._accounts[key] = account
+        return account
+
+    def _price_locked(self, symbol: str) -> float:
+        symbol = symbol.upper()
+        price = self._prices.get(symbol)
+        if price is None:
+            seed = int(hashlib.sha256(symbol.encode()).hexdigest()[:6], 16)
+            price = float(10_000 + seed % 90_000) if symbol.isdigit() else 20.0 + seed % 480
+            self._prices[symbol] = price
+        return price
+
+    def _step_price_locked(self, symbol: str) -> float:
+        price = self._price_locked(symbol) * (1.0 + self._rng.gauss(0.0, 0.002))
+        price = round(price) if symbol.isdigit() else round(price, 2)
+        self._prices[symbol.upper()] = max(price, 1.0 if symbol.isdigit() else 0.01)
+        return self._prices[symbol.upper()]
+
+    def _next_order_no_locked(self) -> str:
+        self._order_seq += 1
+        return f"{self._order_seq:010d}"
+
+    def _fill_locked(self, account: _Account, symbol: str, qty: int, price: float, *, buy: bool, usd: bool) -> dict[str, Any] | None:
+        """Apply an immediate fill; return a failure payload if the account cannot cover it."""
+
+        if qty <= 0:
+            return _fail("APBK0918", "주문수량을 확인하세요.")
+        amount = qty * price
+        holding = account.holdings.get(symbol)
+        if buy:
+            cash = account.usd_cash if usd else account.krw_cash
+            if amount > cash:
+                return _fail("APBK0952", "주문가능금액을 초과 했습니다.")
+            if usd:
+                account.usd_cash -= amount
+            else:
+                account.krw_cash -= amount
+            if holding is None:
+                account.holdings[symbol] = [qty, price]
+            else:
+                held_qty, avg = holding
+                holding[0] = held_qty + qty
+                holding[1] = (held_qty * avg + amount) / holding[0]
+            return None
+        if holding is None or holding[0] < qty:
+            return _fail("APBK0400", "주문가능수량을 초과했습니다.")
+        holding[0] -= qty
+        if holding[0] == 0:
+            del account.holdings[symbol]
+        if usd:
+            account.usd_cash += amount
+        else:
+            account.krw_cash += amount
+        return None
+
+    def _holdings_value_locked(self, account: _Account, *, usd: bool) -> tuple[float, float]:
+        value = cost = 0.0
+        for symbol, (qty, avg) in account.holdings.items():
+            if symbol.isdigit() == usd:
+                continue
+            value += qty * self._price_locked(symbol)
+            cost += qty * avg
+        return value, cost
+
+    # -- routes (called with the lock held) -------------------------------
+
+    def _domestic_price(self, params: dict[str, Any], tr_id: str) -> dict[str, Any]:
+        symbol = str(params["fid_input_iscd"])
+        price = self._step_price_locked(symbol)
+        base = self._price_locked(symbol)
+        return _ok(
+            output={
+                "stck_prpr": _money(price),
+                "prdy_ctrt": "0.00",
+                "prdy_vrss": "0",
+                "acml_vol": str(self._stats[f"tr:{tr_id}"] * 100),
+                "stck_oprc": _money(base),
+                "rprs_mrkt_kor_name": "KOSPI",
+            }
+        )
+
+    def _domestic_order(self, params: dict[str, Any], tr_id: str) -> dict[str, Any]:
+        symbol = str(params["PDNO"])
+        qty = int(_number(params.get("ORD_QTY")))
+        price = _number(params.get("ORD_UNPR")) or self._price_locked(symbol)
+        failure = self._fill_locked(
+            self._account_locked(params), symbol, qty, price, buy=tr_id.endswith("0012U"), usd=False
+        )
+        if failure is not None:
+            return failure
+        self._stats["orders"] += 1
+        return _ok(
+            "주문 전송 완료 되었습니다.",
+            output={"KRX_FWDG_ORD_ORGNO": "91252", "odno": self._next_order_no_locked(), "ORD_TMD": time.strftime("%H%M%S")},
+        )
+
+    def _reserved_order(self, params: dict[str, Any], tr_id: str) -> dict[str, Any]:
+        self._account_locked(params)
+        self._stats["reserved_orders"] += 1
+        order_no = self._next_order_no_locked()
+        return _ok("정상처리 되었습니다.", output={"RSVN_ORD_SEQ": order_no, "ODNO": order_no})
+
+    def _domestic_balance(self, params: dict[str, Any], tr_id: str) -> dict[str, Any]:
+        account = self._account_locked(params)
+        rows = []
+        for symbol, (qty, avg) in account.holdings.items():
+            if not symbol.isdigit():
+                continue
+            price = self._price_locked(symbol)
+            value, cost = qty * price, qty * avg
+            rows.append(
+                {
+                    "pdno": symbol,
+                    "prdt_name": f"SIM{symbol}",
+                    "hldg_qty": str(int(qty)),
+                    "ord_psbl_qty": str(int(qty)),
+                    "pchs_avg_pric": _money(avg, 4),
+                    "prpr": _money(price),
+                    "evlu_amt": _money(value),
+                    "evlu_pfls_amt": _money(value - cost),
+                    "evlu_pfls_rt": _money((value - cost) / cost * 100 if cost else 0.0, 2),
+                }
+            )
+        value, cost = self._holdings_value_locked(account, usd=False)
+        summary = {
+            "dnca_tot_amt": _money(account.krw_cash),
+            "ord_psbl_cash": _money(account.krw_cash),
+            "scts_evlu_amt": _money(value),
+            "tot_evlu_amt": _money(account.krw_cash + value),
+            "pchs_amt_smtl_amt": _money(cost),
+            "evlu_pfls_smtl_amt": _money(value - cost),
+        }
+        return _ok(output1=rows, output2=[summary])
+
+    def _us_price(self, params: dict[str, Any], tr_id: str) -> dict[str, Any]:
+        symbol = str(params["SYMB"]).upper()
+        base = self._price_locked(symbol)
+        price = self._step_price_locked(symbol)
+        return _ok(
+            output={
+                "rsym": f"D{params.get('EXCD', 'NAS')}{symbol}",
+                "last": _money(price, 4),
+                "base": _money(base, 4),
+                "rate": _money((price - base) / base * 100 if base else 0.0, 2),
+                "tvol": str(self._stats[f"tr:{tr_id}"] * 100),
+                "name": f"SIM {symbol}",
+            }
+        )
+
+    def _us_buyable(self, params: dict[str, Any], tr_id: str) -> dict[str, Any]:
+        account = self._account_locked(params)
+        price = _number(params.get("OVRS_ORD_UNPR")) or self._price_locked(str(params["ITEM_CD"]))
+        cash = account.usd_cash
+        exchangeable = account.krw_cash / self.config.usd_krw_rate
+        return _ok(
+            output={
+                "tr_crcy_cd": "USD",
+                "ord_psbl_frcr_amt": _money(cash, 2),
+                "frcr_ord_psbl_amt1": _money(cash, 2),
+                "ovrs_ord_psbl_amt": _money(cash, 2),
+                "echm_af_ord_psbl_amt": _money(cash + exchangeable, 2),
+                "ovrs_max_ord_psbl_qty": str(int(cash // price) if price else 0),
+                "exrt": _money(self.config.usd_krw_rate, 4),
+            }
+        )
+
+    def _us_order(self, params: dict[str, Any], tr_id: str) -> dict[str, Any]:
+        symbol = str(params["PDNO"]).upper()
+        qty = int(_number(params.get("ORD_QTY")))
+        price = _number(params.get("OVRS_ORD_UNPR")) or self._price_locked(symbol)
+        failure = self._fill_locked(
+            self._account_locked(params), symbol, qty, price, buy=tr_id.endswith("1002U"), usd=True
+        )
+        if failure is not None:
+            return failure
+        self._stats["orders"] += 1
+        return _ok(
+            "주문 전송 완료 되었습니다.",
+            output={"KRX_FWDG_ORD_ORGNO": "01790", "ODNO": self._next_order_no_locked(), "ORD_TMD": time.strftime("%H%M%S")},
+        )
+
+    def _us_balance(self, params: dict[str, Any], tr_id: str) -> dict[str, Any]:
+        account = self._account_locked(params)
+        rows = []
+        for symbol, (qty, avg) in account.holdings.items():
+            if symbol.isdigit():
+                continue
+            price = self._price_locked(symbol)
+            value, cost = qty * price, qty * avg
+            rows.append(
+                {
+                    "ovrs_pdno": symbol,
+                    "ovrs_item_name": f"SIM {symbol}",
+                    "ovrs_cblc_qty": str(int(qty)),
+                    "ord_psbl_qty": str(int(qty)),
+                    "pchs_avg_pric": _money(avg, 4),
+                    "now_pric2": _money(price, 4),
+                    "ovrs_stck_evlu_amt": _money(value, 2),
+                    "frcr_evlu_pfls_amt": _money(value - cost, 2),
+                    "evlu_pfls_rt": _money((value - cost) / cost * 100 if cost else 0.0, 2),
+                    "ovrs_excg_cd": str(params.get("OVRS_EXCG_CD") or "NASD"),
+                }
+            )
+        value, cost = self._holdings_value_locked(account, usd=True)
+        summary = {
+            "frcr_pchs_amt1": _money(cost, 2),
+            "ovrs_tot_pfls": _money(value - cost, 2),
+            "tot_evlu_pfls_amt": _money(value - cost, 2),
+            "tot_pftrt": _money((value - cost) / cost * 100 if cost else 0.0, 2),
+        }
+        return _ok(output1=rows, output2=summary)
+
+    def _us_present_balance(self, params: dict[str, Any], tr_id: str) -> dict[str, Any]:
+        account = self._account_locked(params)
+        currency = {
+            "crcy_cd": "USD",
+            "frcr_dncl_amt_2": _money(account.usd_cash, 2),
+            "frcr_drwg_psbl_amt_1": _money(account.usd_cash, 2),
+            "frst_bltn_exrt": _money(self.config.usd_krw_rate, 4),
+        }
+        return _ok(output1=[], output2=[currency], output3={"tot_asst_amt": _money(account.krw_cash)})
+
+
+class _RestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    broker: SimulatedBroker
+
+    def _dispatch(self) -> None:
+        parts = urlsplit(self.path)
+        params: dict[str, Any] = dict(parse_qsl(parts.query, keep_blank_values=True))
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                body = {}
+            if isinstance(body, dict):
+                params.update(body)
+
+        delay = self.broker.latency_seconds()
+        if delay:
+            time.sleep(delay)
+        response = self.broker.handle(self.command, parts.path, dict(self.headers.items()), params)
+
+        data = json.dumps(response.payload, ensure_ascii=False).encode()
+        self.send_response(response.status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = _dispatch  # noqa: N815 - http.server API
+    do_POST = _dispatch  # noqa: N815 - http.server API
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+def _quote_record(tr_id: str, symbol: str, price: float) -> str:
+    """Build one ``^``-separated realtime record in KIS field order."""
+
+    now = datetime.now(KIS_TOKEN_EXPIRY_TZ)
+    if tr_id.startswith("H0"):
+        # H0STCNT0: code, time, price, sign, change, rate, wavg, open, high, low, ask, bid, qty, acml_vol
+        fields = [symbol, now.strftime("%H%M%S"), _money(price), "3", "0", "0.00",
+                  _money(price, 2), _money(price), _money(price), _money(price),
+                  _money(price), _money(price), "1", "0"]
+    else:
+        # HDFSCNT0: rsym, symb, zdiv, tymd, xymd, xhms, kymd, khms, open, high, low, last
+        fields = [f"DNAS{symbol}", symbol, "4", now.strftime("%Y%m%d"), now.strftime("%Y%m%d"),
+                  now.strftime("%H%M%S"), now.strftime("%Y%m%d"), now.strftime("%H%M%S"),
+                  _money(price, 4), _money(price, 4), _money(price, 4), _money(price, 4)]
+    return "^".join(fields)
+
+
+class _QuoteStreamServer:
+    """Websocket endpoint speaking the KIS realtime subscribe protocol."""
+
+    def __init__(self, broker: SimulatedBroker, host: str, port: int) -> None:
+        self.broker = broker
+        self.host = host
+        self.port = port
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopped: asyncio.Event | None = None
+        self._ready = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._error: BaseException | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="kis-simulator-ws", daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        if self._error is not None:
+            raise self._error
+
+    def stop(self) -> None:
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join(5)
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        except BaseException as exc:  # pragma: no cover - surfaced through start()
+            self._error = exc
+            self._ready.set()
+
+    async def _serve(self) -> None:
+        from websockets.asyncio.server import serve
+
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        async with serve(self._connection, self.host, self.port) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stopped.wait()
+
+    async def _connection(self, ws) -> None:
+        subscriptions: set[tuple[str, str]] = set()
+        pusher = asyncio.create_task(self._push_quotes(ws, subscriptions))
+        try:
+            async for raw in ws:
+                try:
+                    message = json.loads(raw)
+                    header, request = message["header"], message["body"]["input"]
+                    tr_id, tr_key = request["tr_id"], request["tr_key"]
+                except (ValueError, KeyError, TypeError):
+                    await ws.send(json.dumps({"header": {"tr_id": "", "tr_key": "", "encrypt": "N"},
+                                              "body": {"rt_cd": "1", "msg_cd": "OPSP9999", "msg1": "JSON PARSING ERROR"}}))
+                    continue
+                if header.get("tr_type") == "2":
+                    subscriptions.discard((tr_id, tr_key))
+                    msg = "UNSUBSCRIBE SUCCESS"
+                else:
+                    subscriptions.add((tr_id, tr_key))
+                    msg = "SUBSCRIBE SUCCESS"
+                await ws.send(json.dumps({
+                    "header": {"tr_id": tr_id, "tr_key": tr_key, "encrypt": "N"},
+                    "body": {"rt_cd": "0", "msg_cd": "OPSP0000", "msg1": msg,
+                             "output": {"iv": secrets.token_hex(8), "key": secrets.token_hex(16)}},
+                }))
+        except Exception:  # connection closed by the client
+            pass
+        finally:
+            pusher.cancel()
+
+    async def _push_quotes(self, ws, subscriptions: set[tuple[str, str]]) -> None:
+        interval = max(self.broker.config.quote_interval_seconds, 0.01)
+        ticks = 0
+        while True:
+            await asyncio.sleep(interval)
+            ticks += 1
+            for tr_id, tr_key in list(subscriptions):
+                price = self.broker.quote(tr_key)
+                await ws.send(f"0|{tr_id}|001|{_quote_record(tr_id, tr_key, price)}")
+            if ticks % max(1, int(10 / interval)) == 0:
+                await ws.send(json.dumps({"header": {"tr_id": "PINGPONG", "datetime": time.strftime("%Y%m%d%H%M%S")}}))
+
+
+class KISSimulator:
+    """Run a ``SimulatedBroker`` behind local REST and websocket servers.
+
+    Port 0 picks free ports; read ``rest_url``/``ws_url`` after ``start``.
+    Use as a context manager in tests and benchmarks.
+    """
+
+    def __init__(
+        self,
+        config: SimulatorConfig | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        ws_port: int | None = 0,
+    ) -> None:
+        self.broker = SimulatedBroker(config)
+        self.host = host
+        handler = type("SimulatorHandler", (_RestHandler,), {"broker": self.broker})
+        self._http = ThreadingHTTPServer((host, port), handler)
+        self._http.daemon_threads = True
+        self._http_thread: threading.Thread | None = None
+        self._ws = _QuoteStreamServer(self.broker, host, ws_port) if ws_port is not None else None
+
+    @property
+    def rest_url(self) -> str:
+        return f"http://{self.host}:{self._http.server_address[1]}"
+
+    @property
+    def ws_url(self) -> str | None:
+        return None if self._ws is None else f"ws://{self.host}:{self._ws.port}"
+
+    def start(self) -> "KISSimulator":
+        self._http_thread = threading.Thread(
+            target=self._http.serve_forever, name="kis-simulator-rest", daemon=True
+        )
+        self._http_thread.start()
+        if self._ws is not None:
+            self._ws.start()
+        logger.info("KIS simulator listening on %s (websocket %s)", self.rest_url, self.ws_url)
+        return self
+
+    def stop(self) -> None:
+        if self._ws is not None:
+            self._ws.stop()
+        self._http.shutdown()
+        self._http.server_close()
+
+    def expire_tokens(self) -> int:
+        return self.broker.expire_tokens()
+
+    def stats(self) -> dict[str, int]:
+        return self.broker.stats()
+
+    def __enter__(self) -> "KISSimulator":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run a local KIS Open API simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument("--ws-port", type=int, default=9444)
+    parser.add_argument("--latency", type=LatencyModel.parse, default=LatencyModel(),
+                        help="kind[:mean_ms[:spread_ms]], kind in " + ", ".join(LATENCY_KINDS))
+    parser.add_argument("--real-rate-limit", type=float, default=DEFAULT_REAL_RATE_LIMIT)
+    parser.add_argument("--paper-rate-limit", type=float, default=DEFAULT_PAPER_RATE_LIMIT)
+    parser.add_argument("--rate-limit-error-rate", type=float, default=0.0)
+    parser.add_argument("--token-expiry-rate", type=float, default=0.0)
+    parser.add_argument("--token-ttl", type=float, default=DEFAULT_TOKEN_TTL_SECONDS)
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    config = SimulatorConfig(
+        latency=args.latency,
+        real_rate_limit=args.real_rate_limit,
+        paper_rate_limit=args.paper_rate_limit,
+        rate_limit_error_rate=args.rate_limit_error_rate,
+        token_expiry_rate=args.token_expiry_rate,
+        token_ttl_seconds=args.token_ttl,
+        seed=args.seed,
+    )
+    simulator = KISSimulator(config, host=args.host, port=args.port, ws_port=args.ws_port).start()
+    stop = threading.Event()
+    try:
+        stop.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+        logger.info("KIS simulator stats: %s", simulator.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
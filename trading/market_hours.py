@@ -89,6 +89,14 @@ US_RESERVED_ORDER_END = time(23, 20)
 US_RESERVED_MAINTENANCE_START = time(16, 30)
 US_RESERVED_MAINTENANCE_END = time(16, 45)
 
+# Instants at which an off-hours window opens after being closed, by window
+# kind.  KR reserved orders from 16:00 continue the closing-price window, and
+# the US window reopens after the maintenance break.
+OFF_HOURS_WINDOW_OPENINGS: dict[str, tuple[tuple[str, time], ...]] = {
+    "KR": (("closing", KR_CLOSING_ORDER_START), ("reserved", KR_RESERVED_MORNING_START)),
+    "US": (("reserved", US_RESERVED_ORDER_START), ("reserved", US_RESERVED_MAINTENANCE_END)),
+}
+
 
 def _config_path() -> Path:
     return active_kis_config_path()
@@ -185,6 +193,44 @@ def is_off_hours_order_available(market: str, *, now: datetime | None = None) ->
     raise ValueError(f"Unsupported market '{market}'")
 
 
+def _window_openings(market: str, current: datetime, days: tuple[int, ...]) -> list[tuple[datetime, str]]:
+    market = market.upper()
+    if market not in OFF_HOURS_WINDOW_OPENINGS:
+        raise ValueError(f"Unsupported market '{market}'")
+    openings = []
+    for offset in days:
+        day = current.date() + timedelta(days=offset)
+        for kind, start in OFF_HOURS_WINDOW_OPENINGS[market]:
+            opening = KST.localize(datetime.combine(day, start))
+            if not is_off_hours_order_available(market, now=opening):
+                # The window boundary itself is exclusive (e.g. the end of maintenance).
+                opening += timedelta(seconds=1)
+            openings.append((opening, kind))
+    return openings
+
+
+def next_off_hours_window(market: str, *, now: datetime | None = None) -> tuple[str, datetime]:
+    """Return the kind and UTC instant of the next off-hours window opening after ``now``.
+
+    The instant is the first whole second at which
+    :func:`is_off_hours_order_available` turns true again.
+    """
+
+    current = _coerce_now(now, KST)
+    opening, kind = min(item for item in _window_openings(market, current, (0, 1)) if item[0] > current)
+    return kind, opening.astimezone(timezone.utc)
+
+
+def current_off_hours_window(market: str, *, now: datetime | None = None) -> tuple[str, datetime] | None:
+    """Return the kind and UTC opening instant of the window open at ``now``, if any."""
+
+    current = _coerce_now(now, KST)
+    if not is_off_hours_order_available(market, now=current):
+        return None
+    opening, kind = max(item for item in _window_openings(market, current, (-1, 0)) if item[0] <= current)
+    return kind, opening.astimezone(timezone.utc)
+
+
 def next_market_open(market: str, *, now: datetime | None = None) -> datetime:
     market = market.upper()
     if market == "KR":
@@ -0,0 +1,264 @@
+"""Memory accounting for long-running subscriber processes.
+
+Two layers, both cheap to read:
+
+* ``cache_sizes()`` reports the entry counts of structures that live for the
+  whole process (per-stock lock maps, the KIS websocket ``open_map`` /
+  ``data_map``, pooled traders, the last loaded ledger and queue).  Modules
+  add their caches with ``register_cache``.
+* ``MemoryWatch`` is opt-in (``MEMORY_SNAPSHOT_SECONDS``).  It starts
+  ``tracemalloc`` and takes a snapshot every interval, keeping the first one
+  as a baseline so the WebUI can show the top allocation growth since start
+  and since the previous snapshot.
+
+``tracemalloc`` slows allocation-heavy code noticeably, so leave it off
+unless you are chasing RSS creep.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACEMALLOC_FRAMES = 1
+DEFAULT_TOP_ALLOCATIONS = 15
+
+_CACHES: dict[str, Callable[[], int]] = {}
+_CACHES_LOCK = threading.Lock()
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def register_cache(name: str, size: Callable[[], int]) -> None:
+    """Report ``size()`` as the entry count of a long-lived cache called ``name``."""
+
+    with _CACHES_LOCK:
+        _CACHES[name] = size
+
+
+def cache_sizes() -> dict[str, int]:
+    with _CACHES_LOCK:
+        caches = sorted(_CACHES.items())
+    sizes = {}
+    for name, size in caches:
+        try:
+            sizes[name] = int(size())
+        except Exception as exc:  # noqa: BLE001 - one broken probe must not hide the rest
+            logger.debug("Could not size cache %s: %s", name, exc)
+    return sizes
+
+
+def rss_bytes() -> int | None:
+    """Current resident set size, or ``None`` where ``/proc`` is unavailable."""
+
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            resident_pages = int(handle.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def peak_rss_bytes() -> int | None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass(slots=True)
+class AllocationDiff:
+    location: str
+    size_diff: int
+    size: int
+    count_diff: int
+
+
+@dataclass(slots=True)
+class MemoryReport:
+    taken_at: str
+    rss_bytes: int | None
+    peak_rss_bytes: int | None
+    caches: dict[str, int]
+    tracemalloc: bool = False
+    traced_bytes: int | None = None
+    traced_peak_bytes: int | None = None
+    snapshots: int = 0
+    since_start: list[AllocationDiff] = field(default_factory=list)
+    since_previous: list[AllocationDiff] = field(default_factory=list)
+
+
+def _top_diffs(
+    current: tracemalloc.Snapshot, reference: tracemalloc.Snapshot | None, limit: int
+) -> list[AllocationDiff]:
+    if reference is None:
+        return []
+    diffs = []
+    for stat in current.compare_to(reference, "lineno")[:limit]:
+        frame = stat.traceback[0]
+        diffs.append(AllocationDiff(f"{frame.filename}:{frame.lineno}", stat.size_diff, stat.size, stat.count_diff))
+    return diffs
+
+
+def _publish(report: MemoryReport) -> None:
+    if report.rss_bytes is not None:
+        metrics.PROCESS_RSS_BYTES.set(report.rss_bytes)
+    if report.traced_bytes is not None:
+        metrics.TRACEMALLOC_BYTES.set(report.traced_bytes)
+    for name, size in report.caches.items():
+        metrics.CACHE_ENTRIES.set(size, cache=name)
+
+
+class MemoryWatch:
+    """Periodic ``tracemalloc`` snapshots plus cache and RSS accounting."""
+
+    def __init__(
+        self,
+        interval: float,
+        *,
+        frames: int = DEFAULT_TRACEMALLOC_FRAMES,
+        top: int = DEFAULT_TOP_ALLOCATIONS,
+    ) -> None:
+        self.interval = interval
+        self.frames = frames
+        self.top = top
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._baseline: tracemalloc.Snapshot | None = None
+        self._previous: tracemalloc.Snapshot | None = None
+        self._snapshots = 0
+        self._started_tracemalloc = False
+        self.last_report: MemoryReport | None = None
+
+    @property
+    def running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def start(self) -> "MemoryWatch":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracemalloc = True
+        self.snapshot()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="memory-watch", daemon=True)
+        self._thread.start()
+        logger.info("Memory watch started: tracemalloc snapshot every %.0fs", self.interval)
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.snapshot()
+            except Exception as exc:  # noqa: BLE001 - accounting must never stop trading
+                logger.warning("Memory snapshot failed: %s", exc)
+
+    def snapshot(self) -> MemoryReport:
+        """Take one snapshot now, compare it with the baseline and previous one, and publish."""
+
+        with self._lock:
+            report = MemoryReport(
+                taken_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                rss_bytes=rss_bytes(),
+                peak_rss_bytes=peak_rss_bytes(),
+                caches=cache_sizes(),
+            )
+            if tracemalloc.is_tracing():
+                current = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+                report.tracemalloc = True
+                report.traced_bytes, report.traced_peak_bytes = tracemalloc.get_traced_memory()
+                report.since_start = _top_diffs(current, self._baseline, self.top)
+                report.since_previous = _top_diffs(current, self._previous, self.top)
+                if self._baseline is None:
+                    self._baseline = current
+                self._previous = current
+                self._snapshots += 1
+                report.snapshots = self._snapshots
+            self.last_report = report
+        _publish(report)
+        if report.since_previous:
+            growth = report.since_previous[0]
+            logger.info(
+                "Memory: rss=%s traced=%s top growth %s %+d B",
+                report.rss_bytes,
+                report.traced_bytes,
+                growth.location,
+                growth.size_diff,
+            )
+        return report
+
+
+MEMORY_WATCH: MemoryWatch | None = None
+
+
+def memory_report() -> dict[str, Any]:
+    """Latest watch report, or a fresh cache/RSS-only report when the watch is off."""
+
+    watch = MEMORY_WATCH
+    if watch is not None and watch.last_report is not None:
+        report = watch.last_report
+    else:
+        report = MemoryReport(
+            taken_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            rss_bytes=rss_bytes(),
+            peak_rss_bytes=peak_rss_bytes(),
+            caches=cache_sizes(),
+        )
+        _publish(report)
+    return asdict(report) | {"watch_running": bool(watch and watch.running)}
+
+
+def start_memory_watch(interval: float | None = None) -> MemoryWatch | None:
+    """Start the global watch from ``MEMORY_SNAPSHOT_SECONDS``; disabled when unset or 0."""
+
+    global MEMORY_WATCH
+    raw_interval = os.environ.get("MEMORY_SNAPSHOT_SECONDS") if interval is None else interval
+    try:
+        selected = float(raw_interval or 0)
+    except (TypeError, ValueError):
+        logger.warning("Ignoring invalid MEMORY_SNAPSHOT_SECONDS=%r; memory watch disabled", raw_interval)
+        return None
+    if selected <= 0:
+        return None
+    raw_frames = os.environ.get("MEMORY_TRACEMALLOC_FRAMES", "")
+    try:
+        frames = max(1, int(raw_frames)) if raw_frames else DEFAULT_TRACEMALLOC_FRAMES
+    except ValueError:
+        logger.warning("Ignoring invalid MEMORY_TRACEMALLOC_FRAMES=%r", raw_frames)
+        frames = DEFAULT_TRACEMALLOC_FRAMES
+    MEMORY_WATCH = MemoryWatch(selected, frames=frames).start()
+    return MEMORY_WATCH
+
+
+def _queue_items() -> int:
+    return int(sum(metrics.QUEUE_DEPTH.value(status=status) or 0 for status in ("pending", "failed")))
+
+
+register_cache("execution_ledger.entries", lambda: int(metrics.LEDGER_ENTRIES.value() or 0))
+register_cache("off_hours_queue.items", _queue_items)
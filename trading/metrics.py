@@ -0,0 +1,355 @@
+"""In-process counters, gauges and histograms exposed in Prometheus text format.
+
+The subscriber, queue worker and WebUI share one process-wide ``REGISTRY``.
+Scrape it through the WebUI ``/metrics`` route or, for headless runs, the
+listener started by ``start_metrics_server`` (``METRICS_PORT``).
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; chosen to split sub-millisecond local work from KIS round trips.
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("counters only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: object) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def value(self, **labels: object) -> float | None:
+        with self._lock:
+            return self._values.get(self._key(labels))
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values
+        ]
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * (buckets + 1)
+        self.total = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, seconds: float, **labels: object) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.buckets))
+            series.counts[index] += 1
+            series.total += seconds
+            series.count += 1
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: object) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return series.count if series else 0
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            snapshot = [
+                (key, list(series.counts), series.total, series.count)
+                for key, series in sorted(self._series.items())
+            ]
+        lines = []
+        for key, counts, total, count in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in registration order."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"metric {metric.name!r} is already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(  # type: ignore[return-value]
+            Histogram(name, documentation, labelnames, buckets=buckets)
+        )
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+PUBSUB_MESSAGES = REGISTRY.counter(
+    "prism_pubsub_messages_total",
+    "Pub/Sub messages by outcome (received, acked, nacked).",
+    ("outcome",),
+)
+DISPATCH_SECONDS = REGISTRY.histogram(
+    "prism_dispatch_seconds",
+    "Time to dispatch one signal, by final dispatch status.",
+    ("status",),
+)
+BROKER_LANE_WAIT_SECONDS = REGISTRY.histogram(
+    "prism_broker_lane_wait_seconds",
+    "Time spent waiting for a broker lane before executing, by priority class.",
+    ("priority",),
+)
+KIS_REQUEST_SECONDS = REGISTRY.histogram(
+    "prism_kis_request_seconds",
+    "Latency of one KIS REST attempt, by TR id and result (ok or the KIS error code).",
+    ("tr_id", "result"),
+)
+KIS_RETRIES = REGISTRY.counter(
+    "prism_kis_retries_total",
+    "KIS requests retried after EGW00201 (rate limit) or EGW00123 (expired token).",
+    ("code",),
+)
+OFF_HOURS_WINDOW_SUBMIT_SECONDS = REGISTRY.histogram(
+    "prism_off_hours_window_submit_seconds",
+    "Time from an off-hours order window opening to each queued order submitted in it, by market and window.",
+    ("market", "window"),
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "prism_off_hours_queue_depth",
+    "Off-hours queue items by status, as of the last queue read or write.",
+    ("status",),
+)
+LEDGER_ENTRIES = REGISTRY.gauge(
+    "prism_execution_ledger_entries",
+    "Execution-ledger entries retained after the last ledger write.",
+)
+PROCESS_RSS_BYTES = REGISTRY.gauge(
+    "prism_process_resident_memory_bytes",
+    "Resident set size at the last memory report.",
+)
+TRACEMALLOC_BYTES = REGISTRY.gauge(
+    "prism_tracemalloc_traced_bytes",
+    "Python heap traced by tracemalloc at the last memory snapshot (memory watch only).",
+)
+CACHE_ENTRIES = REGISTRY.gauge(
+    "prism_cache_entries",
+    "Entries held by long-lived in-process caches at the last memory report.",
+    ("cache",),
+)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - http.server API
+        logger.debug("metrics %s - %s", self.address_string(), format % args)
+
+
+class MetricsServer:
+    """Minimal ``GET /metrics`` listener for runs without the WebUI."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, registry: MetricsRegistry = REGISTRY) -> None:
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="metrics-http", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+def start_metrics_server(port: int | None = None, host: str | None = None) -> MetricsServer | None:
+    """Start the headless listener on ``METRICS_PORT``; disabled when unset or 0."""
+
+    raw_port = os.environ.get("METRICS_PORT") if port is None else port
+    try:
+        selected_port = int(raw_port or 0)
+    except (TypeError, ValueError):
+        logger.warning("Ignoring invalid METRICS_PORT=%r; metrics listener disabled", raw_port)
+        return None
+    if selected_port <= 0:
+        return None
+    selected_host = host or os.environ.get("METRICS_HOST") or "127.0.0.1"
+    server = MetricsServer(selected_host, selected_port).start()
+    logger.info("Metrics listener on http://%s:%s/metrics", *server.address)
+    return server
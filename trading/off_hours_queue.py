@@ -1,23 +1,32 @@
-"""Tiny persisted queue for demo-mode off-hours orders."""
+"""Tiny persisted queue for off-hours orders in demo and real mode."""
 
 from __future__ import annotations
 
 import hashlib
 import json
+import threading
+import logging
 import os
 import tempfile
 from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Callable, Iterable
 
+from . import metrics
 from .file_lock import FileLock
 from .market_hours import next_market_open
 from .schema import SignalMessage
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = Path("runtime") / "off_hours_queue.json"
 MAX_QUEUE_BYTES = 16 * 1024 * 1024
 FAILURE_METADATA_RESERVE_BYTES = 512
 QUEUE_CONTEXT_KEY = "__prism_queue_context"
+DEFAULT_DRAIN_BATCH_SIZE = 1
+MAX_DRAIN_BATCH_SIZE = 256
 
 
 def _safe_failure_message(message: object) -> str:
@@ -46,6 +55,27 @@ def _queue_identity(signal: dict[str, Any], execution_context: dict[str, Any]) -
     return hashlib.sha256(material.encode("utf-8")).hexdigest()
 
 
+@lru_cache(maxsize=1024)
+def parse_execute_at(value: str) -> datetime:
+    """Parse an ``execute_at`` stamp; items share a handful of market-open instants."""
+    return datetime.fromisoformat(value)
+
+
+def _publish_counts(pending: int, failed: int) -> None:
+    metrics.QUEUE_DEPTH.set(pending, status="pending")
+    metrics.QUEUE_DEPTH.set(failed, status="failed")
+
+
+def _publish_depth(statuses: Iterable[str]) -> None:
+    pending = failed = 0
+    for status in statuses:
+        if status == "failed":
+            failed += 1
+        else:
+            pending += 1
+    _publish_counts(pending, failed)
+
+
 class QueueCapacityError(RuntimeError):
     """The durable queue cannot admit more data without losing readability."""
 
@@ -86,17 +116,185 @@ class QueueExecutionResult:
             raise ValueError(f"Unsupported queue disposition '{self.disposition}'")
 
 
-class OffHoursOrderQueue:
+QueueOutcome = bool | None | QueueExecutionResult
+
+
+def resolve_outcome(outcome: QueueOutcome) -> QueueExecutionResult:
+    """Normalise an executor return value: ``False`` defers, ``None``/``True`` mean processed."""
+    if isinstance(outcome, QueueExecutionResult):
+        return outcome
+    if outcome is False:
+        return QueueExecutionResult("deferred")
+    return QueueExecutionResult("processed")
+
+
+def _failed_outcome(exc: Exception) -> QueueExecutionResult:
+    return QueueExecutionResult("failed", f"{type(exc).__name__}: {str(exc)[:1024]}")
+
+
+def queue_payload(item: QueuedSignal) -> dict:
+    """Build the executor payload for an item, carrying its execution context."""
+    payload = dict(item.signal)
+    if item.execution_context:
+        payload[QUEUE_CONTEXT_KEY] = dict(item.execution_context)
+    return payload
+
+
+def drain_batch_size_from_env(default: int = DEFAULT_DRAIN_BATCH_SIZE) -> int:
+    raw_value = os.environ.get("OFF_HOURS_QUEUE_DRAIN_BATCH", "").strip()
+    if not raw_value:
+        return default
+    try:
+        size = int(raw_value)
+    except ValueError:
+        logger.warning("Ignoring invalid OFF_HOURS_QUEUE_DRAIN_BATCH=%r; using %s", raw_value, default)
+        return default
+    if size < 1:
+        logger.warning("Ignoring invalid OFF_HOURS_QUEUE_DRAIN_BATCH=%r; using %s", raw_value, default)
+        return default
+    return min(size, MAX_DRAIN_BATCH_SIZE)
+
+
+OutcomeRecorder = Callable[[int, QueueOutcome], None]
+BatchExecutor = Callable[[list[dict], OutcomeRecorder], list[QueueOutcome]]
+
+
+class BatchOutcomes:
+    """Persist a drain batch's outcomes as they resolve, each at most once.
+
+    ``commit`` applies ``(batch index, outcome)`` pairs to the queue storage and
+    returns how many items it newly marked processed; applying an outcome
+    twice must be a no-op.  :meth:`record` may be called from any thread.
+    """
+
+    def __init__(self, commit: Callable[[list[tuple[int, QueueExecutionResult]]], int]):
+        self._commit = commit
+        self._lock = threading.Lock()
+        self._committed: set[int] = set()
+        self.processed = 0
+
+    def record(self, index: int, outcome: QueueOutcome) -> None:
+        resolved = resolve_outcome(outcome)
+        if resolved.disposition == "deferred":
+            return
+        with self._lock:
+            if index in self._committed:
+                return
+        processed = self._commit([(index, resolved)])
+        with self._lock:
+            self._committed.add(index)
+            self.processed += processed
+
+    def commit_remaining(self, outcomes: list[QueueExecutionResult]) -> None:
+        with self._lock:
+            remaining = [
+                (index, outcome)
+                for index, outcome in enumerate(outcomes)
+                if outcome.disposition != "deferred" and index not in self._committed
+            ]
+        if not remaining:
+            return
+        processed = self._commit(remaining)
+        with self._lock:
+            self._committed.update(index for index, _ in remaining)
+            self.processed += processed
+
+
+def _defer_to_batch_commit(index: int, outcome: QueueOutcome) -> None:
+    """Recorder for backends that commit a whole batch at once."""
+
+
+def run_batch_executor(
+    executor: BatchExecutor,
+    items: list[QueuedSignal],
+    commit: Callable[[list[tuple[int, QueueExecutionResult]]], int],
+    *,
+    per_outcome: bool = True,
+) -> int:
+    """Execute one drain batch and return how many items it processed.
+
+    ``executor`` receives the batch payloads and a recorder it should call
+    with ``(index, outcome)`` as each order resolves.  With ``per_outcome``
+    each recorded outcome is committed at once, so a crash or an executor
+    error later in the batch replays only orders still in flight, as for the
+    per-item drain; outcomes returned without being recorded are committed
+    together once the executor returns.  Without it the recorder is a no-op
+    and the whole batch is one commit.  An exception from the executor
+    propagates after the outcomes committed so far.
+    """
+    outcomes = BatchOutcomes(commit)
+    record = outcomes.record if per_outcome else _defer_to_batch_commit
+    returned = executor([queue_payload(item) for item in items], record)
+    if len(returned) != len(items):
+        raise ValueError(
+            f"Batch executor returned {len(returned)} outcome(s) for {len(items)} queued item(s)"
+        )
+    outcomes.commit_remaining([resolve_outcome(outcome) for outcome in returned])
+    return outcomes.processed
+
+
+def serialize_queued_signal(item: QueuedSignal) -> dict[str, Any]:
+    """Render an item in the persisted form shared by both queue backends."""
+    record: dict[str, Any] = {
+        "signal": item.signal,
+        "execute_at": item.execute_at,
+        "created_at": item.created_at,
+    }
+    if item.execution_context:
+        record["execution_context"] = item.execution_context
+    if item.status != "pending":
+        record["status"] = item.status
+    if item.failure_message:
+        record["failure_message"] = item.failure_message
+    if item.failed_at is not None:
+        record["failed_at"] = item.failed_at
+    return record
+
+
+def prepare_queue_directory(storage_path: Path) -> None:
+    try:
+        storage_path.parent.mkdir(parents=True, exist_ok=False)
+    except FileExistsError:
+        if not storage_path.parent.is_dir():
+            raise
+    else:
+        if os.name != "nt":
+            os.chmod(storage_path.parent, 0o700)
+
+
+class EnqueueNotifier:
+    """Call registered listeners with every newly admitted queue item."""
+
+    def __init__(self) -> None:
+        self._listeners: list[Callable[[QueuedSignal], None]] = []
+        self._listeners_lock = threading.Lock()
+
+    def add_enqueue_listener(self, listener: Callable[[QueuedSignal], None]) -> None:
+        with self._listeners_lock:
+            self._listeners.append(listener)
+
+    def remove_enqueue_listener(self, listener: Callable[[QueuedSignal], None]) -> None:
+        with self._listeners_lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify_enqueued(self, item: QueuedSignal) -> None:
+        with self._listeners_lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(item)
+            except Exception as exc:  # noqa: BLE001 - a listener must not fail the enqueue
+                logger.warning("Off-hours queue enqueue listener failed: %s", exc)
+
+
+class OffHoursOrderQueue(EnqueueNotifier):
+    backend = "json"
+
     def __init__(self, storage_path: Path | None = None):
-        self.storage_path = storage_path or Path("runtime") / "off_hours_queue.json"
-        try:
-            self.storage_path.parent.mkdir(parents=True, exist_ok=False)
-        except FileExistsError:
-            if not self.storage_path.parent.is_dir():
-                raise
-        else:
-            if os.name != "nt":
-                os.chmod(self.storage_path.parent, 0o700)
+        super().__init__()
+        self.storage_path = storage_path or DEFAULT_QUEUE_PATH
+        prepare_queue_directory(self.storage_path)
         self.lock_path = self.storage_path.with_suffix(self.storage_path.suffix + ".lock")
         self.drain_lock_path = self.storage_path.with_suffix(self.storage_path.suffix + ".drain.lock")
 
@@ -112,7 +310,9 @@ class OffHoursOrderQueue:
         data = json.loads(raw.decode("utf-8"))
         if not isinstance(data, list):
             raise ValueError("Off-hours queue must contain a JSON list")
-        return [QueuedSignal(**item) for item in data]
+        items = [QueuedSignal(**item) for item in data]
+        _publish_depth(item.status for item in items)
+        return items
 
     def _save(
         self,
@@ -120,22 +320,7 @@ class OffHoursOrderQueue:
         *,
         reserve_failure_metadata: bool = False,
     ) -> None:
-        payload = []
-        for item in items:
-            record = {
-                "signal": item.signal,
-                "execute_at": item.execute_at,
-                "created_at": item.created_at,
-            }
-            if item.execution_context:
-                record["execution_context"] = item.execution_context
-            if item.status != "pending":
-                record["status"] = item.status
-            if item.failure_message:
-                record["failure_message"] = item.failure_message
-            if item.failed_at is not None:
-                record["failed_at"] = item.failed_at
-            payload.append(record)
+        payload = [serialize_queued_signal(item) for item in items]
         rendered = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
         pending_reserve = 0
         if reserve_failure_metadata:
@@ -170,6 +355,7 @@ class OffHoursOrderQueue:
         finally:
             if temporary_path is not None and temporary_path.exists():
                 temporary_path.unlink()
+        _publish_depth(record.get("status", "pending") for record in payload)
 
     def enqueue(
         self, signal: SignalMessage, execution_context: dict[str, Any] | None = None
@@ -187,11 +373,12 @@ class OffHoursOrderQueue:
                     return item
             items.append(queued_signal)
             self._save(items, reserve_failure_metadata=True)
+        self._notify_enqueued(queued_signal)
         return queued_signal
 
     def drain_due(
         self,
-        executor: Callable[[dict], bool | None | QueueExecutionResult],
+        executor: Callable[[dict], QueueOutcome],
         *,
         now: datetime | None = None,
     ) -> int:
@@ -202,51 +389,117 @@ class OffHoursOrderQueue:
                     item
                     for item in self._load()
                     if item.status == "pending"
-                    and datetime.fromisoformat(item.execute_at) <= current
+                    and parse_execute_at(item.execute_at) <= current
                 ]
 
             processed = 0
             for item in due:
-                payload = dict(item.signal)
-                if item.execution_context:
-                    payload[QUEUE_CONTEXT_KEY] = dict(item.execution_context)
                 try:
-                    outcome = executor(payload)
+                    outcome = resolve_outcome(executor(queue_payload(item)))
                 except Exception as exc:  # noqa: BLE001 - isolate poison queue items
-                    outcome = QueueExecutionResult(
-                        "failed",
-                        f"{type(exc).__name__}: {str(exc)[:1024]}",
-                    )
-                if outcome is False:
+                    outcome = _failed_outcome(exc)
+                if outcome.disposition == "deferred":
                     continue
-                if isinstance(outcome, QueueExecutionResult):
-                    if outcome.disposition == "deferred":
-                        continue
-                    if outcome.disposition == "failed":
-                        with FileLock(self.lock_path):
-                            current_items = self._load()
-                            try:
-                                item_index = current_items.index(item)
-                            except ValueError:
-                                continue
-                            current_items[item_index] = replace(
-                                item,
-                                status="failed",
-                                failure_message=_safe_failure_message(outcome.message),
-                                failed_at=current.isoformat(),
-                            )
-                            self._save(current_items)
-                        continue
                 with FileLock(self.lock_path):
                     current_items = self._load()
-                    try:
-                        current_items.remove(item)
-                    except ValueError:
+                    applied = self._apply_outcome(current_items, item, outcome, current)
+                    if not applied:
                         continue
                     self._save(current_items)
-                processed += 1
+                if outcome.disposition == "processed":
+                    processed += 1
             return processed
 
+    def drain_due_batch(
+        self,
+        executor: BatchExecutor,
+        *,
+        batch_size: int = MAX_DRAIN_BATCH_SIZE,
+        now: datetime | None = None,
+        select: Callable[[QueuedSignal], bool] | None = None,
+    ) -> int:
+        """Execute due items ``batch_size`` at a time, committing each batch with one rewrite.
+
+        ``executor`` receives the payloads of one batch plus an outcome
+        recorder (see :func:`run_batch_executor`) and returns one outcome per
+        payload, in order.  This backend ignores the recorder: persisting each
+        outcome would cost a full rewrite per item, so batches trade crash
+        safety for fewer writes - a crash, or an executor error, after some
+        orders of a batch were sent leaves the whole batch pending and replays
+        it.  The journal backend persists each outcome as it resolves.
+        ``select`` replaces the due check: every pending item it accepts is
+        executed, due or not.
+        """
+        with FileLock(self.drain_lock_path):
+            current = now or datetime.now(timezone.utc)
+            with FileLock(self.lock_path):
+                due = [
+                    item
+                    for item in self._load()
+                    if item.status == "pending"
+                    and (
+                        parse_execute_at(item.execute_at) <= current
+                        if select is None
+                        else select(item)
+                    )
+                ]
+
+            processed = 0
+            for start in range(0, len(due), max(1, batch_size)):
+                batch = due[start : start + max(1, batch_size)]
+
+                def commit(resolved: list[tuple[int, QueueExecutionResult]]) -> int:
+                    with FileLock(self.lock_path):
+                        current_items = self._load()
+                        applied = 0
+                        newly_processed = 0
+                        for index, outcome in resolved:
+                            if self._apply_outcome(current_items, batch[index], outcome, current):
+                                applied += 1
+                                if outcome.disposition == "processed":
+                                    newly_processed += 1
+                        if applied:
+                            self._save(current_items)
+                    return newly_processed
+
+                processed += run_batch_executor(executor, batch, commit, per_outcome=False)
+            return processed
+
+    @staticmethod
+    def _apply_outcome(
+        items: list[QueuedSignal],
+        item: QueuedSignal,
+        outcome: QueueExecutionResult,
+        current: datetime,
+    ) -> bool:
+        """Remove or quarantine ``item`` in ``items``; ``False`` if it is already gone."""
+        try:
+            item_index = items.index(item)
+        except ValueError:
+            return False
+        if outcome.disposition == "failed":
+            items[item_index] = replace(
+                item,
+                status="failed",
+                failure_message=_safe_failure_message(outcome.message),
+                failed_at=current.isoformat(),
+            )
+        else:
+            del items[item_index]
+        return True
+
+    def items(self) -> list[QueuedSignal]:
+        with FileLock(self.lock_path):
+            return self._load()
+
+    def next_due_at(self) -> datetime | None:
+        """Earliest ``execute_at`` among pending items, or ``None`` when none are pending."""
+        with FileLock(self.lock_path):
+            return min(
+                (parse_execute_at(item.execute_at) for item in self._load() if item.status == "pending"),
+                default=None,
+            )
+
     def pending_count(self) -> int:
         with FileLock(self.lock_path):
             return sum(item.status == "pending" for item in self._load())
@@ -257,3 +510,31 @@ class OffHoursOrderQueue:
 
 
 OffHoursQueue = OffHoursOrderQueue
+
+QUEUE_BACKENDS = ("json", "journal")
+
+
+def queue_backend_from_env(default: str = "json") -> str:
+    raw_value = os.environ.get("OFF_HOURS_QUEUE_BACKEND", "").strip().lower()
+    if not raw_value:
+        return default
+    if raw_value not in QUEUE_BACKENDS:
+        logger.warning("Ignoring invalid OFF_HOURS_QUEUE_BACKEND=%r; using %s", raw_value, default)
+        return default
+    return raw_value
+
+
+def open_off_hours_queue(storage_path: Path | None = None, *, backend: str | None = None):
+    """Open the queue at ``storage_path`` with the configured persistence backend.
+
+    ``json`` rewrites one JSON document per change; ``journal`` appends to
+    ``<storage_path stem>.journal`` (see ``trading.queue_journal``).
+    """
+    selected = backend or queue_backend_from_env()
+    if selected == "journal":
+        from .queue_journal import JournaledOrderQueue
+
+        return JournaledOrderQueue(storage_path)
+    if selected != "json":
+        raise ValueError(f"Unsupported off-hours queue backend '{selected}'")
+    return OffHoursOrderQueue(storage_path)
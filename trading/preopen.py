@@ -0,0 +1,138 @@
+"""Pre-open staging for queued off-hours orders.
+
+Every queued order for a market becomes due at the same instant
+(``next_market_open``), so the first drain would otherwise authenticate each
+account, probe US exchanges and open KIS connections while racing the rate
+limiter.  ``OFF_HOURS_STAGE_MINUTES`` before that instant the queue worker
+stages the orders instead:
+
+* builds the pooled trader for every account the queued orders will run on,
+  which loads or issues its token;
+* fetches one quote per queued ticker, which resolves and remembers the US
+  exchange (see ``trading.us.remember_exchange``) and opens the keep-alive
+  connections the drain will reuse.
+
+Staging never submits, sizes or caches anything an order depends on at the
+open: prices and balances are still read when the order executes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Callable, Iterable
+
+from .domestic import AsyncTradingContext
+from .off_hours_queue import QueuedSignal, queue_payload
+from .schema import parse_signal_payload
+from .trader_pool import TRADER_POOL, pooled_trader
+from .us import USStockTrading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STAGE_MINUTES = 10.0
+MAX_STAGE_MINUTES = 120.0
+
+
+@dataclass(slots=True)
+class StagingReport:
+    items: int = 0
+    accounts: int = 0
+    quotes: int = 0
+    exchanges: dict[str, str] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)
+
+
+def stage_lead_from_env() -> timedelta | None:
+    """Lead time from ``OFF_HOURS_STAGE_MINUTES`` (default 10); ``None`` when set to 0."""
+
+    raw_value = os.environ.get("OFF_HOURS_STAGE_MINUTES", "").strip()
+    minutes = DEFAULT_STAGE_MINUTES
+    if raw_value:
+        try:
+            minutes = float(raw_value)
+        except ValueError:
+            minutes = -1.0
+        if not math.isfinite(minutes) or minutes < 0:
+            logger.warning(
+                "Ignoring invalid OFF_HOURS_STAGE_MINUTES=%r; using %s", raw_value, DEFAULT_STAGE_MINUTES
+            )
+            minutes = DEFAULT_STAGE_MINUTES
+    if minutes == 0:
+        return None
+    minutes = min(minutes, MAX_STAGE_MINUTES)
+    if TRADER_POOL.enabled and minutes * 60 >= TRADER_POOL.max_age_seconds:
+        logger.warning(
+            "OFF_HOURS_STAGE_MINUTES=%s is not shorter than TRADER_POOL_MAX_AGE_SECONDS=%s; "
+            "staged traders will be rebuilt at the open",
+            minutes,
+            TRADER_POOL.max_age_seconds,
+        )
+    return timedelta(minutes=minutes)
+
+
+def _trader_factory(market: str) -> Callable[..., Any]:
+    if market == "US":
+        return lambda **kwargs: pooled_trader(USStockTrading, **kwargs)
+    return lambda **kwargs: AsyncTradingContext(**kwargs).build()
+
+
+async def stage_queued_orders(
+    items: Iterable[QueuedSignal],
+    trader_kwargs_for: Callable[[dict], list[dict[str, Any]]],
+) -> StagingReport:
+    """Warm traders and quotes for ``items``; errors are reported, never raised.
+
+    ``trader_kwargs_for(payload)`` returns the trader constructor arguments of
+    every account the queued payload will execute on (see
+    ``TradeDispatcher.queued_trader_kwargs``).
+    """
+
+    report = StagingReport()
+    accounts: dict[tuple[str, tuple[tuple[str, Any], ...]], dict[str, Any]] = {}
+    tickers: dict[tuple[str, str], list[tuple[str, tuple[tuple[str, Any], ...]]]] = {}
+    for item in items:
+        report.items += 1
+        payload = queue_payload(item)
+        try:
+            signal = parse_signal_payload(dict(item.signal))
+            targets = trader_kwargs_for(payload)
+        except Exception as exc:  # noqa: BLE001 - the drain quarantines invalid items
+            report.errors.append(f"{item.signal.get('ticker')}: {type(exc).__name__}: {exc}")
+            continue
+        for kwargs in targets:
+            key = (signal.market, tuple(sorted(kwargs.items())))
+            accounts.setdefault(key, kwargs)
+            tickers.setdefault((signal.market, signal.ticker), []).append(key)
+
+    traders: dict[tuple[str, tuple[tuple[str, Any], ...]], Any] = {}
+    for key, kwargs in accounts.items():
+        market = key[0]
+        try:
+            # Authentication is blocking I/O; keep it off the dispatch loop.
+            traders[key] = await asyncio.to_thread(_trader_factory(market), **kwargs)
+        except Exception as exc:  # noqa: BLE001 - one account must not stop the rest
+            report.errors.append(f"{market} account: {type(exc).__name__}: {exc}")
+    report.accounts = len(traders)
+
+    for (market, ticker), keys in tickers.items():
+        # One quote per ticker is enough; use the first account that authenticated.
+        trader = next((traders[key] for key in keys if key in traders), None)
+        if trader is None:
+            continue
+        try:
+            quote = await trader.async_get_current_price(ticker)
+        except Exception as exc:  # noqa: BLE001 - a failed warm-up only costs latency
+            report.errors.append(f"{market}:{ticker}: {type(exc).__name__}: {exc}")
+            continue
+        if not quote:
+            report.errors.append(f"{market}:{ticker}: no quote")
+            continue
+        report.quotes += 1
+        if market == "US" and quote.get("exchange"):
+            report.exchanges[ticker] = quote["exchange"]
+    return report
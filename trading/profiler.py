@@ -0,0 +1,315 @@
+"""On-demand sampling profiler for the running subscriber.
+
+Nothing runs until an operator asks for a profile (``SIGUSR1``, the WebUI
+``/profiles`` action or ``PROFILE_ON_START_SECONDS``).  A daemon thread then
+samples every thread's Python stack via ``sys._current_frames`` for a bounded
+window and writes two files under ``PROFILE_DIR`` (default
+``runtime/profiles``):
+
+* ``profile-<UTC timestamp>.collapsed`` - one ``thread;frame;...;frame count``
+  line per distinct stack, the input format of ``flamegraph.pl`` and
+  speedscope;
+* ``profile-<UTC timestamp>.svg`` - a self-contained flamegraph of the same
+  samples.
+
+Each stack starts with the thread name, so Pub/Sub callback threads,
+``off-hours-queue``, ``dispatch-loop`` and ``web-ui`` stay separate.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import signal
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from html import escape
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_DIR = Path("runtime") / "profiles"
+DEFAULT_PROFILE_SECONDS = 30.0
+MAX_PROFILE_SECONDS = 300.0
+DEFAULT_INTERVAL_MS = 10.0
+MAX_STACK_DEPTH = 128
+PROFILE_FILE_PREFIX = "profile-"
+
+_FLAME_WIDTH = 1200
+_FLAME_ROW = 17
+_FLAME_MIN_WIDTH = 0.5
+_FLAME_CHAR_WIDTH = 7.0
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is still sampling."""
+
+
+@dataclass(slots=True)
+class ProfileResult:
+    collapsed_path: Path
+    flamegraph_path: Path
+    samples: int
+    seconds: float
+    threads: int
+    reason: str
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r; using %s", name, raw, default)
+        return default
+    return value if value > 0 else default
+
+
+def profile_directory() -> Path:
+    configured = os.environ.get("PROFILE_DIR", "").strip()
+    return Path(configured) if configured else DEFAULT_PROFILE_DIR
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    path = Path(code.co_filename)
+    location = "/".join(path.parts[-2:]) if len(path.parts) > 1 else path.name
+    # ``;`` separates frames; the count follows the last space of the line.
+    return f"{code.co_qualname} ({location})".replace(";", ":")
+
+
+def _collapse(frame: FrameType | None) -> list[str]:
+    stack: list[str] = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+def sample_stacks(exclude: set[int] | None = None) -> list[str]:
+    """Return one collapsed stack (``thread;outer;...;inner``) per live thread."""
+
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    stacks = []
+    for ident, frame in sys._current_frames().items():
+        if exclude and ident in exclude:
+            continue
+        thread = names.get(ident, f"thread-{ident}").replace(";", ":")
+        stacks.append(";".join([thread, *_collapse(frame)]))
+    return stacks
+
+
+def _flame_colour(name: str) -> str:
+    seed = zlib.crc32(name.encode("utf-8"))
+    return f"rgb({205 + seed % 50},{80 + (seed >> 8) % 120},{40 + (seed >> 16) % 40})"
+
+
+def render_flamegraph(stacks: Counter[str], *, title: str) -> str:
+    """Render collapsed stacks as a static SVG flamegraph (root row at the bottom)."""
+
+    root: dict[str, Any] = {"value": 0, "children": {}}
+    depth = 0
+    for stack, count in stacks.items():
+        node = root
+        node["value"] += count
+        frames = stack.split(";")
+        depth = max(depth, len(frames))
+        for name in frames:
+            node = node["children"].setdefault(name, {"value": 0, "children": {}})
+            node["value"] += count
+    total = max(1, root["value"])
+    height = (depth + 2) * _FLAME_ROW
+    scale = _FLAME_WIDTH / total
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_FLAME_WIDTH}" height="{height}" '
+        f'viewBox="0 0 {_FLAME_WIDTH} {height}" font-family="monospace" font-size="11">',
+        f'<rect width="{_FLAME_WIDTH}" height="{height}" fill="#fdf8ef"/>',
+        f'<text x="6" y="13" fill="#333">{escape(title)} - {total} samples</text>',
+    ]
+    pending = [(name, child, 0.0, 0) for name, child in sorted(root["children"].items())]
+    while pending:
+        name, node, x, level = pending.pop()
+        width = node["value"] * scale
+        if width < _FLAME_MIN_WIDTH:
+            continue
+        y = height - (level + 1) * _FLAME_ROW
+        share = 100.0 * node["value"] / total
+        label = escape(name)
+        parts.append(
+            f'<g><title>{label} ({node["value"]} samples, {share:.2f}%)</title>'
+            f'<rect x="{x:.2f}" y="{y}" width="{width:.2f}" height="{_FLAME_ROW - 1}" '
+            f'fill="{_flame_colour(name)}"/>'
+        )
+        visible = int(width / _FLAME_CHAR_WIDTH)
+        if visible >= 3:
+            text = name if len(name) <= visible else name[: visible - 2] + ".."
+            parts.append(f'<text x="{x + 3:.2f}" y="{y + 12}" fill="#000">{escape(text)}</text>')
+        parts.append("</g>")
+        offset = x
+        for child_name, child in sorted(node["children"].items()):
+            pending.append((child_name, child, offset, level + 1))
+            offset += child["value"] * scale
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+class SamplingProfiler:
+    """Sample all thread stacks for a bounded window on request."""
+
+    def __init__(self, directory: Path | None = None, *, interval: float | None = None) -> None:
+        self._directory = directory
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._started_at: datetime | None = None
+        self._deadline: float | None = None
+        self._reason = ""
+        self.last_result: ProfileResult | None = None
+        self.last_error: str | None = None
+
+    @property
+    def running(self) -> bool:
+        thread = self._thread
+        return thread is not None and thread.is_alive()
+
+    def start(self, seconds: float | None = None, *, reason: str = "manual") -> float:
+        """Start sampling in the background and return the window length in seconds."""
+
+        if seconds is None:
+            seconds = _env_float("PROFILE_SECONDS", DEFAULT_PROFILE_SECONDS)
+        if not math.isfinite(float(seconds)):
+            raise ValueError(f"profile length must be finite, got {seconds!r}")
+        window = min(max(float(seconds), 0.1), MAX_PROFILE_SECONDS)
+        interval = self._interval or _env_float("PROFILE_INTERVAL_MS", DEFAULT_INTERVAL_MS) / 1000.0
+        directory = self._directory or profile_directory()
+        with self._lock:
+            if self.running:
+                raise ProfilerBusyError("a profile is already being sampled")
+            self._stop.clear()
+            self._started_at = datetime.now(timezone.utc)
+            self._deadline = time.monotonic() + window
+            self._reason = reason
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(window, interval, directory, reason),
+                name="sampling-profiler",
+                daemon=True,
+            )
+            self._thread.start()
+        logger.info("Sampling profiler started for %.1fs every %.1fms (%s)", window, interval * 1000, reason)
+        return window
+
+    def stop(self, timeout: float | None = 5.0) -> ProfileResult | None:
+        """End the current window early; the samples taken so far are still written."""
+
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.last_result
+
+    def status(self) -> dict[str, Any]:
+        result = self.last_result
+        remaining = None
+        if self.running and self._deadline is not None:
+            remaining = max(0.0, self._deadline - time.monotonic())
+        return {
+            "running": self.running,
+            "reason": self._reason if self.running else None,
+            "started_at": self._started_at.isoformat(timespec="seconds") if self._started_at else None,
+            "remaining_seconds": None if remaining is None else round(remaining, 1),
+            "last_profile": None
+            if result is None
+            else {
+                "collapsed": result.collapsed_path.name,
+                "flamegraph": result.flamegraph_path.name,
+                "samples": result.samples,
+                "seconds": round(result.seconds, 2),
+                "threads": result.threads,
+                "reason": result.reason,
+            },
+            "last_error": self.last_error,
+        }
+
+    def _run(self, window: float, interval: float, directory: Path, reason: str) -> None:
+        own = {threading.get_ident()}
+        stacks: Counter[str] = Counter()
+        threads: set[str] = set()
+        samples = 0
+        started = time.monotonic()
+        deadline = started + window
+        try:
+            while not self._stop.is_set():
+                for stack in sample_stacks(exclude=own):
+                    stacks[stack] += 1
+                    threads.add(stack.split(";", 1)[0])
+                samples += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._stop.wait(min(interval, remaining))
+            result = self._write(stacks, directory, samples, time.monotonic() - started, len(threads), reason)
+        except Exception as exc:  # noqa: BLE001 - profiling must never take down the subscriber
+            self.last_error = f"{type(exc).__name__}: {exc}"
+            logger.warning("Sampling profiler failed: %s", self.last_error)
+            return
+        self.last_result = result
+        self.last_error = None
+        logger.info(
+            "Sampling profiler wrote %s (%s samples over %.1fs, %s threads)",
+            result.flamegraph_path,
+            result.samples,
+            result.seconds,
+            result.threads,
+        )
+
+    def _write(
+        self,
+        stacks: Counter[str],
+        directory: Path,
+        samples: int,
+        seconds: float,
+        threads: int,
+        reason: str,
+    ) -> ProfileResult:
+        stamp = (self._started_at or datetime.now(timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+        directory.mkdir(parents=True, exist_ok=True)
+        collapsed_path = directory / f"{PROFILE_FILE_PREFIX}{stamp}.collapsed"
+        flamegraph_path = directory / f"{PROFILE_FILE_PREFIX}{stamp}.svg"
+        lines = [f"{stack} {count}" for stack, count in sorted(stacks.items())]
+        collapsed_path.write_text("\n".join(lines) + ("\n" if lines else ""), encoding="utf-8")
+        flamegraph_path.write_text(
+            render_flamegraph(stacks, title=f"prism subscriber {stamp} ({reason})"), encoding="utf-8"
+        )
+        return ProfileResult(collapsed_path, flamegraph_path, samples, seconds, threads, reason)
+
+
+PROFILER = SamplingProfiler()
+
+
+def install_signal_handler(profiler: SamplingProfiler = PROFILER) -> Any:
+    """Start a profile on ``SIGUSR1``; returns the previous handler (``None`` if unsupported)."""
+
+    signum = getattr(signal, "SIGUSR1", None)
+    if signum is None:
+        return None
+
+    def handle(_signum: int, _frame) -> None:  # noqa: ANN001 - signal frames are runtime-provided
+        try:
+            profiler.start(reason="SIGUSR1")
+        except ProfilerBusyError:
+            logger.info("Ignoring SIGUSR1: a profile is already being sampled")
+
+    return signal.signal(signum, handle)
@@ -0,0 +1,554 @@
+"""Append-only journal backend for the off-hours order queue.
+
+The JSON backend rewrites the whole queue document for every enqueue and for
+every drained item, so an overnight backlog costs O(n^2) bytes written.  This
+backend appends one compact JSON line per change to
+``<storage_path stem>.journal`` instead:
+
+* ``{"op":"enqueue","seq":N,"item":{...}}`` - a new item (the ``item`` body is
+  the same record the JSON backend stores);
+* ``{"op":"processed","seq":N}`` - the item left the queue;
+* ``{"op":"failed","seq":N,"message":"...","failed_at":"..."}`` - the item was
+  quarantined.
+
+Every process keeps an in-memory index rebuilt from the journal on open and
+caught up from the file tail under the queue lock, so several processes can
+share one journal.  Writers append under the lock but fsync outside it; one
+writer fsyncs on behalf of every record appended before it started
+(group commit).  Once dead records outweigh live ones the journal is
+compacted in the background into one ``enqueue`` record per live item and
+atomically replaced.
+
+The index also keeps a min-heap of pending items keyed by their parsed
+``execute_at``, so ``drain_due`` and ``next_due_at`` only look at items that
+are actually due instead of parsing every timestamp on every poll.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, IO
+
+from .file_lock import FileLock
+from .off_hours_queue import (
+    DEFAULT_QUEUE_PATH,
+    FAILURE_METADATA_RESERVE_BYTES,
+    MAX_DRAIN_BATCH_SIZE,
+    MAX_QUEUE_BYTES,
+    BatchExecutor,
+    EnqueueNotifier,
+    OffHoursOrderQueue,
+    QueueCapacityError,
+    QueuedSignal,
+    QueueExecutionResult,
+    QueueOutcome,
+    _failed_outcome,
+    _publish_counts,
+    _queue_identity,
+    _safe_failure_message,
+    parse_execute_at,
+    prepare_queue_directory,
+    queue_payload,
+    resolve_outcome,
+    run_batch_executor,
+    serialize_queued_signal,
+)
+from .schema import SignalMessage
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".journal"
+# Live records are capped at MAX_QUEUE_BYTES; the rest is room for dead
+# records between compactions.
+MAX_JOURNAL_BYTES = 4 * MAX_QUEUE_BYTES
+COMPACT_MIN_DEAD_BYTES = 1024 * 1024
+
+
+def journal_path_for(storage_path: Path) -> Path:
+    return storage_path.with_suffix(JOURNAL_SUFFIX)
+
+
+def _encode(record: dict[str, Any]) -> bytes:
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+@dataclass(slots=True)
+class _JournalIndex:
+    """Live items keyed by journal sequence number, in enqueue order."""
+
+    items: dict[int, QueuedSignal] = field(default_factory=dict)
+    sizes: dict[int, int] = field(default_factory=dict)
+    pending_ids: dict[str, int] = field(default_factory=dict)
+    # (execute_at, seq) for pending items; entries for items that have since
+    # been processed or quarantined are dropped lazily when they surface.
+    due: list[tuple[datetime, int]] = field(default_factory=list)
+    next_seq: int = 0
+    pending: int = 0
+    live_bytes: int = 0
+    offset: int = 0
+
+    def _forget_pending(self, seq: int, item: QueuedSignal) -> None:
+        if item.status != "pending":
+            return
+        self.pending -= 1
+        queue_id = item.execution_context.get("queue_id")
+        if queue_id and self.pending_ids.get(queue_id) == seq:
+            del self.pending_ids[queue_id]
+
+    def apply(self, line: bytes) -> None:
+        record = json.loads(line)
+        op = record.get("op")
+        seq = int(record["seq"])
+        if op == "enqueue":
+            item = QueuedSignal(**record["item"])
+            self.items[seq] = item
+            self.sizes[seq] = len(line)
+            self.live_bytes += len(line)
+            if item.status == "pending":
+                self.pending += 1
+                heapq.heappush(self.due, (parse_execute_at(item.execute_at), seq))
+                queue_id = item.execution_context.get("queue_id")
+                if queue_id:
+                    self.pending_ids[queue_id] = seq
+            self.next_seq = max(self.next_seq, seq + 1)
+        elif op == "processed":
+            item = self.items.pop(seq, None)
+            if item is not None:
+                self.live_bytes -= self.sizes.pop(seq)
+                self._forget_pending(seq, item)
+        elif op == "failed":
+            item = self.items.get(seq)
+            if item is not None and item.status == "pending":
+                self.items[seq] = replace(
+                    item,
+                    status="failed",
+                    failure_message=str(record.get("message", "")),
+                    failed_at=record.get("failed_at"),
+                )
+                self.sizes[seq] += len(line)
+                self.live_bytes += len(line)
+                self._forget_pending(seq, item)
+        else:
+            raise ValueError(f"Unknown off-hours journal record type {op!r}")
+
+    def apply_chunk(self, data: bytes) -> int:
+        """Apply every complete line in ``data``; return the bytes consumed."""
+
+        consumed = 0
+        while True:
+            newline = data.find(b"\n", consumed)
+            if newline < 0:
+                return consumed
+            line = data[consumed : newline + 1]
+            if line.strip():
+                self.apply(line)
+            consumed = newline + 1
+
+    def _is_pending(self, seq: int) -> bool:
+        item = self.items.get(seq)
+        return item is not None and item.status == "pending"
+
+    def next_due(self) -> datetime | None:
+        while self.due and not self._is_pending(self.due[0][1]):
+            heapq.heappop(self.due)
+        return self.due[0][0] if self.due else None
+
+    def take_due(self, current: datetime) -> list[tuple[int, QueuedSignal]]:
+        """Pending items due at ``current``, earliest first; they stay in the heap until resolved."""
+
+        taken = []
+        while self.due and self.due[0][0] <= current:
+            entry = heapq.heappop(self.due)
+            if self._is_pending(entry[1]):
+                taken.append(entry)
+        for entry in taken:
+            heapq.heappush(self.due, entry)
+        return [(seq, self.items[seq]) for _, seq in taken]
+
+    @property
+    def dead_bytes(self) -> int:
+        return max(0, self.offset - self.live_bytes)
+
+    @property
+    def failed(self) -> int:
+        return len(self.items) - self.pending
+
+    def publish(self) -> None:
+        _publish_counts(self.pending, self.failed)
+
+
+def _read_limited(path: Path, offset: int = 0) -> bytes:
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        data = handle.read(MAX_JOURNAL_BYTES - offset + 1)
+    if offset + len(data) > MAX_JOURNAL_BYTES:
+        raise ValueError(f"Off-hours queue journal exceeds the {MAX_JOURNAL_BYTES}-byte safety limit")
+    return data
+
+
+def load_journal(storage_path: Path) -> list[QueuedSignal]:
+    """Read the live items of a journal without locking or writing (for read-only views)."""
+
+    path = journal_path_for(storage_path)
+    index = _JournalIndex()
+    if path.exists():
+        index.apply_chunk(_read_limited(path))
+    return list(index.items.values())
+
+
+class JournaledOrderQueue(EnqueueNotifier):
+    """``OffHoursOrderQueue`` API backed by an append-only journal."""
+
+    backend = "journal"
+
+    def __init__(self, storage_path: Path | None = None, *, background_compaction: bool = True):
+        super().__init__()
+        self.storage_path = storage_path or DEFAULT_QUEUE_PATH
+        prepare_queue_directory(self.storage_path)
+        self.journal_path = journal_path_for(self.storage_path)
+        self.lock_path = self.storage_path.with_suffix(self.storage_path.suffix + ".lock")
+        self.drain_lock_path = self.storage_path.with_suffix(self.storage_path.suffix + ".drain.lock")
+        self.background_compaction = background_compaction
+        self._index = _JournalIndex()
+        self._inode: int | None = None
+        self._handle: IO[bytes] | None = None
+        self._commit = threading.Condition()
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+        self._compactor: threading.Thread | None = None
+        self.fsyncs = 0
+        self.compactions = 0
+
+    # -- index maintenance (callers hold the queue file lock) -----------------
+
+    def _migrate_legacy_json(self) -> None:
+        if not self.storage_path.exists():
+            return
+        legacy = OffHoursOrderQueue(self.storage_path)._load()
+        self._write_compacted(list(enumerate(legacy)))
+        migrated = self.storage_path.with_suffix(self.storage_path.suffix + ".migrated")
+        os.replace(self.storage_path, migrated)
+        logger.info(
+            "Migrated %s off-hours queue item(s) from %s to %s", len(legacy), self.storage_path, self.journal_path
+        )
+
+    def _rebuild(self, stat: os.stat_result) -> None:
+        data = _read_limited(self.journal_path)
+        index = _JournalIndex()
+        consumed = index.apply_chunk(data)
+        if consumed < len(data):
+            # A crash mid-append leaves a torn last line; drop it before appending.
+            logger.warning("Dropping %s torn byte(s) at the end of %s", len(data) - consumed, self.journal_path)
+            with self.journal_path.open("r+b") as handle:
+                handle.truncate(consumed)
+                os.fsync(handle.fileno())
+        index.offset = consumed
+        self._index = index
+        self._inode = stat.st_ino
+        self._reopen()
+
+    def _refresh(self) -> None:
+        """Bring the in-memory index up to date with the journal on disk."""
+
+        if not self.journal_path.exists():
+            self._migrate_legacy_json()
+        try:
+            stat = self.journal_path.stat()
+        except FileNotFoundError:
+            self._index = _JournalIndex()
+            self._inode = None
+            self._close_handle()
+            self._index.publish()
+            return
+        if stat.st_ino != self._inode or stat.st_size < self._index.offset:
+            self._rebuild(stat)
+        elif stat.st_size > self._index.offset:
+            # Another process appended since we last looked.
+            data = _read_limited(self.journal_path, self._index.offset)
+            self._index.offset += self._index.apply_chunk(data)
+            if self._index.offset < stat.st_size:
+                self._rebuild(stat)
+        self._index.publish()
+
+    def _close_handle(self) -> None:
+        with self._commit:
+            while self._syncing:
+                self._commit.wait()
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def _reopen(self) -> None:
+        self._close_handle()
+        self._handle = self.journal_path.open("ab")
+        if os.name != "nt":
+            os.chmod(self.journal_path, 0o600)
+
+    def _append(self, records: list[dict[str, Any]]) -> int:
+        """Append and apply records; return the commit ticket to pass to ``_sync_through``."""
+
+        if self._handle is None:
+            self._handle = self.journal_path.open("ab")
+            if os.name != "nt":
+                os.chmod(self.journal_path, 0o600)
+            self._inode = self.journal_path.stat().st_ino
+        data = b"".join(_encode(record) for record in records)
+        self._handle.write(data)
+        self._handle.flush()
+        self._index.apply_chunk(data)
+        self._index.offset += len(data)
+        self._index.publish()
+        with self._commit:
+            self._written += 1
+            return self._written
+
+    # -- group commit -----------------------------------------------------------
+
+    def _sync_through(self, ticket: int) -> None:
+        """Return once everything up to ``ticket`` is on disk, fsyncing at most once per group."""
+
+        while True:
+            with self._commit:
+                while self._synced < ticket and self._syncing:
+                    self._commit.wait()
+                if self._synced >= ticket:
+                    return
+                self._syncing = True
+                target = self._written
+                handle = self._handle
+            synced = False
+            try:
+                if handle is not None:
+                    os.fsync(handle.fileno())
+                    self.fsyncs += 1
+                synced = True
+            finally:
+                with self._commit:
+                    self._syncing = False
+                    if synced:
+                        self._synced = max(self._synced, target)
+                    self._commit.notify_all()
+
+    # -- compaction -------------------------------------------------------------
+
+    def _write_compacted(self, items: list[tuple[int, QueuedSignal]]) -> None:
+        # Sequence numbers survive compaction so in-flight drains still match their items.
+        temporary_path: Path | None = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                mode="wb",
+                dir=self.journal_path.parent,
+                prefix=f".{self.journal_path.name}.",
+                suffix=".tmp",
+                delete=False,
+            ) as handle:
+                temporary_path = Path(handle.name)
+                if os.name != "nt":
+                    os.chmod(temporary_path, 0o600)
+                for seq, item in items:
+                    handle.write(_encode({"op": "enqueue", "seq": seq, "item": serialize_queued_signal(item)}))
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary_path, self.journal_path)
+        finally:
+            if temporary_path is not None and temporary_path.exists():
+                temporary_path.unlink()
+
+    def compact(self) -> None:
+        """Rewrite the journal as one ``enqueue`` record per live item."""
+
+        with FileLock(self.lock_path):
+            self._refresh()
+            before = self._index.offset
+            self._write_compacted(list(self._index.items.items()))
+            with self._commit:
+                # The compacted file is already fsynced and holds every record written so far.
+                self._synced = self._written
+            self._rebuild(self.journal_path.stat())
+            self.compactions += 1
+        logger.info("Compacted %s from %s to %s bytes", self.journal_path, before, self._index.offset)
+
+    def _needs_compaction(self) -> bool:
+        dead = self._index.dead_bytes
+        return dead >= COMPACT_MIN_DEAD_BYTES and dead > self._index.live_bytes
+
+    def _maybe_compact(self) -> None:
+        if not self.background_compaction or not self._needs_compaction():
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+
+        def run() -> None:
+            try:
+                self.compact()
+            except Exception as exc:  # noqa: BLE001 - the journal stays valid uncompacted
+                logger.warning("Off-hours queue compaction failed: %s", exc)
+
+        self._compactor = threading.Thread(target=run, name="off-hours-queue-compact", daemon=True)
+        self._compactor.start()
+
+    def wait_for_compaction(self, timeout: float | None = None) -> None:
+        if self._compactor is not None:
+            self._compactor.join(timeout)
+
+    # -- queue API --------------------------------------------------------------
+
+    def enqueue(
+        self, signal: SignalMessage, execution_context: dict[str, Any] | None = None
+    ) -> QueuedSignal:
+        context = dict(execution_context or {})
+        context["queue_id"] = _queue_identity(signal.raw, context)
+        queued_signal = QueuedSignal.from_signal(signal, context)
+        with FileLock(self.lock_path):
+            self._refresh()
+            existing = self._index.pending_ids.get(context["queue_id"])
+            if existing is not None:
+                return self._index.items[existing]
+            record = {"op": "enqueue", "seq": self._index.next_seq, "item": serialize_queued_signal(queued_signal)}
+            encoded = len(_encode(record))
+            pending = self._index.pending + 1
+            if self._index.live_bytes + encoded + pending * FAILURE_METADATA_RESERVE_BYTES > MAX_QUEUE_BYTES:
+                raise QueueCapacityError(
+                    "Off-hours queue would exceed the safety limit after reserving "
+                    "failure-quarantine metadata"
+                )
+            ticket = self._append([record])
+        self._sync_through(ticket)
+        self._notify_enqueued(queued_signal)
+        return queued_signal
+
+    def drain_due(
+        self,
+        executor: Callable[[dict], QueueOutcome],
+        *,
+        now: datetime | None = None,
+    ) -> int:
+        with FileLock(self.drain_lock_path):
+            current = now or datetime.now(timezone.utc)
+            with FileLock(self.lock_path):
+                self._refresh()
+                due = self._index.take_due(current)
+
+            processed = 0
+            for seq, item in due:
+                try:
+                    outcome = resolve_outcome(executor(queue_payload(item)))
+                except Exception as exc:  # noqa: BLE001 - isolate poison queue items
+                    outcome = _failed_outcome(exc)
+                if outcome.disposition == "deferred":
+                    continue
+                with FileLock(self.lock_path):
+                    self._refresh()
+                    records = self._outcome_records([(seq, item, outcome)], current)
+                    if not records:
+                        continue
+                    ticket = self._append(records)
+                self._sync_through(ticket)
+                if outcome.disposition == "processed":
+                    processed += 1
+        self._maybe_compact()
+        return processed
+
+    def drain_due_batch(
+        self,
+        executor: BatchExecutor,
+        *,
+        batch_size: int = MAX_DRAIN_BATCH_SIZE,
+        now: datetime | None = None,
+        select: Callable[[QueuedSignal], bool] | None = None,
+    ) -> int:
+        """Execute due items ``batch_size`` at a time, journaling outcomes as they resolve.
+
+        Outcomes recorded concurrently share fsyncs through group commit.
+        ``select`` replaces the due check, as for the JSON backend.
+        """
+
+        with FileLock(self.drain_lock_path):
+            current = now or datetime.now(timezone.utc)
+            with FileLock(self.lock_path):
+                self._refresh()
+                if select is None:
+                    due = self._index.take_due(current)
+                else:
+                    due = [
+                        (seq, item)
+                        for seq, item in self._index.items.items()
+                        if item.status == "pending" and select(item)
+                    ]
+
+            processed = 0
+            for start in range(0, len(due), max(1, batch_size)):
+                batch = due[start : start + max(1, batch_size)]
+
+                def commit(resolved: list[tuple[int, QueueExecutionResult]]) -> int:
+                    with FileLock(self.lock_path):
+                        self._refresh()
+                        records = self._outcome_records(
+                            [(*batch[index], outcome) for index, outcome in resolved], current
+                        )
+                        if not records:
+                            return 0
+                        ticket = self._append(records)
+                    self._sync_through(ticket)
+                    return sum(record["op"] == "processed" for record in records)
+
+                processed += run_batch_executor(executor, [item for _, item in batch], commit)
+        self._maybe_compact()
+        return processed
+
+    def _outcome_records(
+        self, resolved: list[tuple[int, QueuedSignal, QueueExecutionResult]], current: datetime
+    ) -> list[dict[str, Any]]:
+        """Journal records for outcomes whose item is still live (callers hold the lock)."""
+
+        records = []
+        for seq, item, outcome in resolved:
+            if self._index.items.get(seq) != item:
+                continue
+            if outcome.disposition == "failed":
+                records.append(
+                    {
+                        "op": "failed",
+                        "seq": seq,
+                        "message": _safe_failure_message(outcome.message),
+                        "failed_at": current.isoformat(),
+                    }
+                )
+            else:
+                records.append({"op": "processed", "seq": seq})
+        return records
+
+    def items(self) -> list[QueuedSignal]:
+        with FileLock(self.lock_path):
+            self._refresh()
+            return list(self._index.items.values())
+
+    def next_due_at(self) -> datetime | None:
+        """Earliest ``execute_at`` among pending items, or ``None`` when none are pending."""
+
+        with FileLock(self.lock_path):
+            self._refresh()
+            return self._index.next_due()
+
+    def pending_count(self) -> int:
+        with FileLock(self.lock_path):
+            self._refresh()
+            return self._index.pending
+
+    def failed_count(self) -> int:
+        with FileLock(self.lock_path):
+            self._refresh()
+            return self._index.failed
+
+    def close(self) -> None:
+        self.wait_for_compaction()
+        self._close_handle()
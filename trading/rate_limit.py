@@ -0,0 +1,348 @@
+"""Token-bucket request pacing per KIS app key and server."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .file_lock import HeldFileLock
+
+logger = logging.getLogger(__name__)
+
+SERVER_PROD = "prod"
+SERVER_VPS = "vps"
+
+# KIS documents roughly 20 REST calls per second per app key on the live
+# server and 2 per second on the paper server.  ``rate + burst`` is the most a
+# bucket lets through in any one-second window, so the defaults stay at the cap.
+DEFAULT_PROD_PER_SECOND = 18.0
+DEFAULT_PROD_BURST = 2
+DEFAULT_VPS_PER_SECOND = 1.5
+DEFAULT_VPS_BURST = 1
+DEFAULT_SHARED_DIR = "runtime/kis_rate_limit"
+
+
+def _positive_float_env(name: str, default: float) -> float:
+    raw_value = os.environ.get(name)
+    if raw_value in (None, ""):
+        return default
+    try:
+        value = float(raw_value)
+    except (TypeError, ValueError):
+        logger.warning("Ignoring invalid %s=%r; using %s", name, raw_value, default)
+        return default
+    if not math.isfinite(value) or value <= 0:
+        logger.warning("Ignoring invalid %s=%r; using %s", name, raw_value, default)
+        return default
+    return value
+
+
+def _positive_int_env(name: str, default: int) -> int:
+    value = _positive_float_env(name, float(default))
+    if not value.is_integer():
+        logger.warning("Ignoring invalid %s=%r; using %s", name, os.environ.get(name), default)
+        return default
+    return int(value)
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    """Sustained requests per second plus how many may go out back to back."""
+
+    per_second: float
+    burst: int = 1
+
+    def __post_init__(self) -> None:
+        if not math.isfinite(self.per_second) or self.per_second <= 0:
+            raise ValueError("per_second must be a finite positive number")
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+
+
+def rate_limits_from_env() -> dict[str, RateLimit]:
+    return {
+        SERVER_PROD: RateLimit(
+            _positive_float_env("KIS_RATE_LIMIT_PROD_PER_SECOND", DEFAULT_PROD_PER_SECOND),
+            _positive_int_env("KIS_RATE_LIMIT_PROD_BURST", DEFAULT_PROD_BURST),
+        ),
+        SERVER_VPS: RateLimit(
+            _positive_float_env("KIS_RATE_LIMIT_VPS_PER_SECOND", DEFAULT_VPS_PER_SECOND),
+            _positive_int_env("KIS_RATE_LIMIT_VPS_BURST", DEFAULT_VPS_BURST),
+        ),
+    }
+
+
+@dataclass(slots=True)
+class RateLimitStats:
+    """Accumulated pacing waits for one bucket."""
+
+    acquisitions: int = 0
+    delayed: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    backoffs: int = 0
+
+    @property
+    def average_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.acquisitions if self.acquisitions else 0.0
+
+    def record(self, seconds: float) -> None:
+        self.acquisitions += 1
+        if seconds > 0:
+            self.delayed += 1
+            self.total_wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def copy(self) -> "RateLimitStats":
+        return RateLimitStats(
+            self.acquisitions,
+            self.delayed,
+            self.total_wait_seconds,
+            self.max_wait_seconds,
+            self.backoffs,
+        )
+
+
+class TokenBucket:
+    """Pace callers to ``limit`` using reservations instead of polling.
+
+    Each acquisition books the next free slot under a thread lock and then
+    sleeps only for its own deficit, so concurrent callers queue in arrival
+    order across threads and event loops.  ``backoff`` pushes the next free
+    slot out after the server reports a rate-limit error, which holds back
+    every caller sharing the bucket rather than only the one that was refused.
+    """
+
+    def __init__(
+        self,
+        limit: RateLimit,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.limit = limit
+        self._interval = 1.0 / limit.per_second
+        self._tolerance = (limit.burst - 1) * self._interval
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_free = clock()
+        self._stats = RateLimitStats()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock:
+            yield
+
+    def _load_next_free(self, now: float) -> float:
+        return self._next_free
+
+    def _store_next_free(self, value: float) -> None:
+        self._next_free = value
+
+    def _reserve(self) -> float:
+        with self._locked():
+            return self._reserve_locked()
+
+    def _reserve_locked(self) -> float:
+        now = self._clock()
+        slot = max(self._load_next_free(now), now)
+        self._store_next_free(slot + self._interval)
+        wait = max(0.0, slot - self._tolerance - now)
+        self._stats.record(wait)
+        return wait
+
+    def acquire(self) -> float:
+        """Block the calling thread until a request may be sent."""
+
+        wait = self._reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Wait on the running loop until a request may be sent."""
+
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def backoff(self, seconds: float) -> None:
+        """Delay the next acquisition by at least ``seconds`` from now."""
+
+        with self._locked():
+            now = self._clock()
+            self._store_next_free(max(self._load_next_free(now), now + seconds + self._tolerance))
+            self._stats.backoffs += 1
+
+    def stats(self) -> RateLimitStats:
+        with self._lock:
+            return self._stats.copy()
+
+
+class SharedTokenBucket(TokenBucket):
+    """Token bucket whose next free slot lives in a memory-mapped file.
+
+    Every process on the host that maps the same file draws from one budget,
+    so the subscriber, the WebUI and ad-hoc sessions using one app key no
+    longer trip KIS rate limits on each other.  Read-modify-write of the
+    slot is serialized with a ``HeldFileLock`` next to the mapped file, so
+    each reservation is one ``flock`` on an already open fd; coroutines take
+    it without blocking and yield to the loop while it is contended.  The
+    slot is stored on the system-wide monotonic clock; a value too far in the
+    future (for example left over from before a reboot) is ignored.
+    """
+
+    _STATE = struct.Struct("d")
+    _MAX_AHEAD_SECONDS = 300.0
+    _CONTENDED_RETRY_SECONDS = 0.0005
+    _MAX_CONTENDED_RETRY_SECONDS = 0.01
+
+    def __init__(
+        self,
+        limit: RateLimit,
+        path: str | Path,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        super().__init__(limit, clock=clock, sleep=sleep)
+        self.path = Path(path)
+        self._file_lock = HeldFileLock(self.path.with_name(self.path.name + ".lock"))
+        self._map: mmap.mmap | None = None
+
+    def _mapped(self) -> mmap.mmap:
+        if self._map is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a+b") as handle:
+                if handle.seek(0, os.SEEK_END) < self._STATE.size:
+                    handle.write(b"\0" * (self._STATE.size - handle.tell()))
+                    handle.flush()
+                self._map = mmap.mmap(handle.fileno(), self._STATE.size)
+        return self._map
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._lock, self._file_lock:
+            yield
+
+    def _try_reserve(self) -> float | None:
+        """Reserve a slot without waiting for the locks; ``None`` while another holder has them."""
+
+        if not self._lock.acquire(blocking=False):
+            return None
+        try:
+            if not self._file_lock.acquire(blocking=False):
+                return None
+            try:
+                return self._reserve_locked()
+            finally:
+                self._file_lock.release()
+        finally:
+            self._lock.release()
+
+    async def acquire_async(self) -> float:
+        """Wait on the running loop until a request may be sent.
+
+        Another thread or process may hold the bucket locks; rather than
+        block the loop on them, yield and retry with a short backoff.
+        """
+
+        retry = self._CONTENDED_RETRY_SECONDS
+        while (wait := self._try_reserve()) is None:
+            await asyncio.sleep(retry)
+            retry = min(retry * 2, self._MAX_CONTENDED_RETRY_SECONDS)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _load_next_free(self, now: float) -> float:
+        (value,) = self._STATE.unpack_from(self._mapped(), 0)
+        if not math.isfinite(value) or value > now + self._MAX_AHEAD_SECONDS:
+            return now
+        return value
+
+    def _store_next_free(self, value: float) -> None:
+        self._STATE.pack_into(self._mapped(), 0, value)
+
+
+def _key_label(app_key: str) -> str:
+    if not app_key:
+        return "-"
+    return hashlib.sha256(app_key.encode()).hexdigest()[:8]
+
+
+class KISRateLimiter:
+    """Hold one token bucket per (app key, server) pair.
+
+    KIS counts calls against the app key, so accounts sharing an app key share
+    a bucket while accounts with their own keys are paced independently.
+    With ``shared_dir`` the buckets are ``SharedTokenBucket`` files there, so
+    the budget is also shared with other processes on the host.
+    """
+
+    def __init__(
+        self,
+        limits: dict[str, RateLimit] | None = None,
+        *,
+        shared_dir: str | Path | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.limits = dict(limits or rate_limits_from_env())
+        self.shared_dir = None if shared_dir is None else Path(shared_dir)
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: dict[tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "KISRateLimiter":
+        shared_dir = os.environ.get("KIS_RATE_LIMIT_SHARED_DIR", DEFAULT_SHARED_DIR).strip()
+        return cls(rate_limits_from_env(), shared_dir=shared_dir or None)
+
+    def _new_bucket(self, app_key: str, server: str) -> TokenBucket:
+        limit = self.limits[server]
+        if self.shared_dir is None:
+            return TokenBucket(limit, clock=self._clock, sleep=self._sleep)
+        # The file name carries a hash of the app key, never the key itself.
+        path = self.shared_dir / f"{_key_label(app_key)}-{server}.bucket"
+        return SharedTokenBucket(limit, path, clock=self._clock, sleep=self._sleep)
+
+    def bucket(self, app_key: str, server: str) -> TokenBucket:
+        server = SERVER_VPS if server == SERVER_VPS else SERVER_PROD
+        key = (app_key or "", server)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._new_bucket(app_key or "", server)
+                self._buckets[key] = bucket
+            return bucket
+
+    def acquire(self, app_key: str, server: str) -> float:
+        return self.bucket(app_key, server).acquire()
+
+    async def acquire_async(self, app_key: str, server: str) -> float:
+        return await self.bucket(app_key, server).acquire_async()
+
+    def backoff(self, app_key: str, server: str, seconds: float) -> None:
+        self.bucket(app_key, server).backoff(seconds)
+
+    def stats(self) -> dict[tuple[str, str], RateLimitStats]:
+        """Return per-bucket stats keyed by (app key fingerprint, server)."""
+
+        with self._lock:
+            buckets = list(self._buckets.items())
+        return {(_key_label(app_key), server): bucket.stats() for (app_key, server), bucket in buckets}
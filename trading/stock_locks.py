@@ -0,0 +1,87 @@
+"""Per-stock ``asyncio.Lock`` map that stays bounded over a long session.
+
+Traders keep one lock per ticker they have traded.  A KR+US session can touch
+hundreds of tickers, so the map keeps at most ``STOCK_LOCK_CACHE_SIZE``
+entries and evicts the least recently used *idle* locks beyond that.  A lock
+that is held or has waiters is never evicted, so two coroutines can never end
+up holding different locks for the same ticker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import weakref
+from collections import OrderedDict
+
+from . import memory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_STOCK_LOCKS = 256
+
+_LIVE_MAPS: "weakref.WeakSet[StockLockMap]" = weakref.WeakSet()
+
+
+def max_stock_locks_from_env(default: int = DEFAULT_MAX_STOCK_LOCKS) -> int:
+    raw_value = os.environ.get("STOCK_LOCK_CACHE_SIZE")
+    if raw_value in (None, ""):
+        return default
+    try:
+        value = int(raw_value)
+    except ValueError:
+        logger.warning("Ignoring invalid STOCK_LOCK_CACHE_SIZE=%r; using %s", raw_value, default)
+        return default
+    if value < 1:
+        logger.warning("Ignoring invalid STOCK_LOCK_CACHE_SIZE=%r; using %s", raw_value, default)
+        return default
+    return value
+
+
+def _idle(lock: asyncio.Lock) -> bool:
+    return not lock.locked() and not getattr(lock, "_waiters", None)
+
+
+class StockLockMap(OrderedDict):
+    """``dict`` of ticker -> lock with LRU eviction of idle locks."""
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        super().__init__()
+        self.max_entries = max_entries or max_stock_locks_from_env()
+        self.evictions = 0
+        _LIVE_MAPS.add(self)
+
+    # OrderedDict subclasses are unhashable; WeakSet needs identity hashing.
+    __hash__ = object.__hash__
+
+    def __getitem__(self, key: str) -> asyncio.Lock:
+        lock = super().__getitem__(key)
+        self.move_to_end(key)
+        return lock
+
+    def __setitem__(self, key: str, lock: asyncio.Lock) -> None:
+        super().__setitem__(key, lock)
+        self.move_to_end(key)
+        if len(self) > self.max_entries:
+            self._evict_idle()
+
+    def _evict_idle(self) -> None:
+        excess = len(self) - self.max_entries
+        for key in list(self.keys())[:-1]:
+            if excess <= 0:
+                break
+            if _idle(super().__getitem__(key)):
+                del self[key]
+                self.evictions += 1
+                excess -= 1
+
+
+def stock_lock_totals() -> tuple[int, int]:
+    """Return ``(entries, evictions)`` summed over every live trader's lock map."""
+
+    maps = list(_LIVE_MAPS)
+    return sum(len(item) for item in maps), sum(item.evictions for item in maps)
+
+
+memory.register_cache("trader.stock_locks", lambda: stock_lock_totals()[0])
@@ -14,6 +14,7 @@ from typing import Any, Protocol
 from ..domestic import AsyncTradingContext
 from ..file_lock import FileLock
 from ..schema import SignalMessage
+from ..trader_pool import async_pooled_trader
 from ..us import USStockTrading
 from .common import acquire_file_lock, integer_value
 
@@ -56,7 +57,7 @@ class BalanceSplitExecution:
 
 
 class _BuyTrader(Protocol):
-    def get_account_summary(self) -> dict[str, Any] | None: ...
+    async def async_get_account_summary(self) -> dict[str, Any] | None: ...
 
 
 class BalanceSplitStrategy:
@@ -89,7 +90,7 @@ class BalanceSplitStrategy:
             )
 
         if signal.market == "US":
-            trader = USStockTrading(mode=trading_mode, **(trader_kwargs or {}))
+            trader = await async_pooled_trader(USStockTrading, mode=trading_mode, **(trader_kwargs or {}))
             return await self._execute_us(signal, trader=trader)
 
         async with AsyncTradingContext(mode=trading_mode, **(trader_kwargs or {})) as trader:
@@ -98,9 +99,9 @@ class BalanceSplitStrategy:
     async def _execute_us(self, signal: SignalMessage, *, trader: _BuyTrader) -> BalanceSplitExecution:
         execution_lock = await acquire_file_lock(self.execution_lock_path)
         try:
-            available_amount, cash_source, summary = self._available_amount(trader, market="US")
+            available_amount, cash_source, summary = await self._available_amount(trader, market="US")
             if available_amount <= 0:
-                available_amount, cash_source = self._after_exchange_buying_power(
+                available_amount, cash_source = await self._after_exchange_buying_power(
                     signal, trader=trader, summary=summary
                 )
             buy_amount = self._buy_amount(available_amount)
@@ -131,7 +132,7 @@ class BalanceSplitStrategy:
         finally:
             execution_lock.__exit__(None, None, None)
 
-    def _after_exchange_buying_power(
+    async def _after_exchange_buying_power(
         self,
         signal: SignalMessage,
         *,
@@ -158,11 +159,11 @@ class BalanceSplitStrategy:
         if price <= 0:
             return 0.0, "available_amount"
 
-        inquiry = getattr(trader, "get_overseas_buyable_amount", None)
+        inquiry = getattr(trader, "async_get_overseas_buyable_amount", None)
         if not callable(inquiry):
             return 0.0, "available_amount"
         try:
-            buyable = inquiry(signal.ticker, price)
+            buyable = await inquiry(signal.ticker, price)
         except Exception as exc:
             logger.warning(
                 "[%s] Balance split after-exchange buying-power inquiry failed: %s",
@@ -238,7 +239,7 @@ class BalanceSplitStrategy:
     async def _execute_kr(self, signal: SignalMessage, *, trader: _BuyTrader) -> BalanceSplitExecution:
         execution_lock = await acquire_file_lock(self.execution_lock_path)
         try:
-            available_amount, cash_source, summary = self._available_amount(trader, market="KR")
+            available_amount, cash_source, summary = await self._available_amount(trader, market="KR")
             buy_amount = self._buy_amount(available_amount)
             buy_amount, cash_source = self._cap_buy_amount_for_orderability(
                 buy_amount=buy_amount,
@@ -275,8 +276,8 @@ class BalanceSplitStrategy:
     def _buy_amount(self, available_amount: float) -> float:
         return available_amount / self.config.split_count
 
-    def _available_amount(self, trader: _BuyTrader, *, market: str) -> tuple[float, str, dict[str, Any]]:
-        summary = trader.get_account_summary() or {}
+    async def _available_amount(self, trader: _BuyTrader, *, market: str) -> tuple[float, str, dict[str, Any]]:
+        summary = await trader.async_get_account_summary() or {}
         available_amount = float(summary.get("available_amount", 0) or 0)
         cash_balance = float(summary.get("cash_balance", summary.get("total_cash", 0)) or 0)
         account_key = self._reservation_account_key(summary)
@@ -13,9 +13,11 @@ from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Callable, Protocol
 
+from .. import tracing
 from ..domestic import AsyncTradingContext
 from ..file_lock import FileLock
 from ..schema import SignalMessage
+from ..trader_pool import async_pooled_trader
 from ..us import USStockTrading
 
 logger = logging.getLogger(__name__)
@@ -32,7 +34,7 @@ class StrategyExecution:
 
 
 class StrategyTrader(Protocol):
-    def get_account_summary(self) -> dict[str, Any] | None: ...
+    async def async_get_account_summary(self) -> dict[str, Any] | None: ...
 
 
 def strategy_name(payload: dict[str, Any] | None) -> str:
@@ -116,15 +118,15 @@ def market_base_amount(signal: SignalMessage, *, krw: float, usd: float) -> floa
     return usd if signal.market == "US" else krw
 
 
-def available_cash(trader: StrategyTrader) -> float:
-    summary = trader.get_account_summary() or {}
+async def available_cash(trader: StrategyTrader) -> float:
+    summary = await trader.async_get_account_summary() or {}
     return float(summary.get("available_amount", summary.get("cash_balance", summary.get("total_cash", 0))) or 0)
 
 
 async def execute_order(signal: SignalMessage, *, trading_mode: str, buy_amount: float | None = None, limit_price: float | None = None, sell_fraction: float | None = None, trader_kwargs: dict[str, Any] | None = None) -> dict[str, Any]:
     kwargs = {"mode": trading_mode, **(trader_kwargs or {})}
     if signal.market == "US":
-        trader = USStockTrading(**kwargs)
+        trader = await async_pooled_trader(USStockTrading, **kwargs)
         if signal.signal_type == "BUY":
             return await trader.async_buy_stock(ticker=signal.ticker, buy_amount=buy_amount, limit_price=limit_price)
         return await trader.async_sell_stock(
@@ -215,6 +217,7 @@ def update_json_list(
         save_json(path, update(load_json_list(path)))
 
 
+@tracing.traced("strategy.acquire_file_lock")
 async def acquire_file_lock(path: Path, *, poll_seconds: float = 0.05) -> FileLock:
     """Acquire a cross-process lock without blocking the current event loop."""
 
@@ -0,0 +1,126 @@
+"""Host-wide KIS token issuance shared by every local process."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from .file_lock import FileLock
+from .token_cache import TokenCache
+
+logger = logging.getLogger(__name__)
+
+# KIS allows about one token issuance per minute per app key and the token
+# request retries with backoff, so a waiter may sit behind a slow issuer.
+DEFAULT_ISSUE_LOCK_TIMEOUT_SECONDS = 120.0
+
+
+def issue_lock_path(lock_dir: str | Path, account_key: str | None) -> Path:
+    """Return the lock file that serializes token issuance for one account."""
+
+    if account_key:
+        label = hashlib.sha256(account_key.encode()).hexdigest()[:8]
+    else:
+        label = "shared"
+    return Path(lock_dir) / f".token_issue_{label}.lock"
+
+
+@dataclass(slots=True)
+class TokenBrokerStats:
+    memory_hits: int = 0
+    file_hits: int = 0
+    shared_issues: int = 0
+    issued: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.file_hits + self.shared_issues
+
+    @property
+    def misses(self) -> int:
+        return self.issued
+
+    def copy(self) -> "TokenBrokerStats":
+        return TokenBrokerStats(self.memory_hits, self.file_hits, self.shared_issues, self.issued)
+
+
+class TokenBroker:
+    """Hand out a valid token per account, issuing it at most once per host.
+
+    Lookups try the in-process cache, then the encrypted token file.  Only on
+    a miss does a process take the account's issuance lock (an OS file lock,
+    released automatically if the holder dies) and read the file again, so
+    when the subscriber, a cron run and the WebUI start together one of them
+    requests the token and the others pick it up from disk.
+    ``min_remaining_seconds`` treats tokens that expire sooner as missing,
+    which lets the background refresher reuse a token another process has
+    already renewed.
+    """
+
+    def __init__(
+        self,
+        cache: TokenCache,
+        *,
+        lock_timeout: float = DEFAULT_ISSUE_LOCK_TIMEOUT_SECONDS,
+    ) -> None:
+        self.cache = cache
+        self.lock_timeout = lock_timeout
+        self._stats = TokenBrokerStats()
+        self._stats_lock = threading.Lock()
+
+    def _usable(self, account_key: str | None, min_remaining_seconds: float) -> str | None:
+        entry = self.cache.entry(account_key)
+        if entry is None or entry.remaining_seconds() <= min_remaining_seconds:
+            return None
+        return entry.token
+
+    def _count(self, field_name: str) -> None:
+        with self._stats_lock:
+            setattr(self._stats, field_name, getattr(self._stats, field_name) + 1)
+
+    def get(
+        self,
+        account_key: str | None,
+        *,
+        read_file: Callable[[], str | None],
+        issue: Callable[[], str],
+        lock_path: Path,
+        min_remaining_seconds: float = 0.0,
+    ) -> str:
+        """Return a token for ``account_key``, calling ``issue`` only if no process has one.
+
+        ``read_file`` must load a valid token from disk into the cache and
+        ``issue`` must request, save and cache a new one.
+        """
+
+        account_key = account_key or None
+        token = self._usable(account_key, min_remaining_seconds)
+        if token is not None:
+            self._count("memory_hits")
+            return token
+
+        if read_file() is not None:
+            token = self._usable(account_key, min_remaining_seconds)
+            if token is not None:
+                self._count("file_hits")
+                return token
+
+        with FileLock(lock_path, timeout=self.lock_timeout):
+            # Another process may have issued while this one waited.
+            if read_file() is not None:
+                token = self._usable(account_key, min_remaining_seconds)
+                if token is not None:
+                    logger.info("Using KIS token issued by another process")
+                    self._count("shared_issues")
+                    return token
+            token = issue()
+        self._count("issued")
+        return token
+
+    def stats(self) -> TokenBrokerStats:
+        with self._stats_lock:
+            return self._stats.copy()
@@ -0,0 +1,159 @@
+"""In-process KIS access token cache with background reissue."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+KIS_TOKEN_EXPIRY_TZ = ZoneInfo("Asia/Seoul")
+
+# KIS tokens live 24 hours and a reissue within 6 hours of issuance returns
+# the same token, so reissuing 3 hours before expiry always yields a new one
+# well ahead of the 23-hour ``reAuth`` horizon.
+DEFAULT_REFRESH_AHEAD_SECONDS = 3 * 60 * 60
+DEFAULT_REFRESH_INTERVAL_SECONDS = 5 * 60
+
+
+def _aware(value: datetime) -> datetime:
+    """Interpret naive KIS expiry timestamps as Korean local time."""
+
+    if value.tzinfo is None:
+        return value.replace(tzinfo=KIS_TOKEN_EXPIRY_TZ)
+    return value
+
+
+def _now(now: datetime | None) -> datetime:
+    return datetime.now(KIS_TOKEN_EXPIRY_TZ) if now is None else _aware(now)
+
+
+@dataclass(frozen=True, slots=True)
+class CachedToken:
+    token: str
+    valid_until: datetime
+
+    def remaining_seconds(self, now: datetime | None = None) -> float:
+        return (self.valid_until - _now(now)).total_seconds()
+
+
+class TokenCache:
+    """Map account keys to decrypted tokens with their parsed expiry.
+
+    ``None`` is the shared token used by accounts without per-account token
+    files.  Token files stay the durable copy; the cache only spares
+    ``read_token`` the glob, decrypt and parse on every authentication.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str | None, CachedToken] = {}
+        self._lock = threading.Lock()
+
+    def entry(self, account_key: str | None, *, now: datetime | None = None) -> CachedToken | None:
+        with self._lock:
+            entry = self._entries.get(account_key)
+            if entry is None:
+                return None
+            if entry.remaining_seconds(now) <= 0:
+                del self._entries[account_key]
+                return None
+            return entry
+
+    def get(self, account_key: str | None, *, now: datetime | None = None) -> str | None:
+        entry = self.entry(account_key, now=now)
+        return None if entry is None else entry.token
+
+    def put(self, account_key: str | None, token: str, valid_until: datetime) -> None:
+        with self._lock:
+            self._entries[account_key] = CachedToken(token, _aware(valid_until))
+
+    def discard(self, account_key: str | None = None) -> None:
+        """Forget one account's token, or every token when ``account_key`` is None.
+
+        Discarding the shared token also drops per-account entries, matching
+        ``_discard_saved_token`` which deletes every token file in that case.
+        """
+
+        with self._lock:
+            if account_key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(account_key, None)
+
+    def expiring(self, within_seconds: float, *, now: datetime | None = None) -> list[str | None]:
+        """Return account keys whose token expires within ``within_seconds``."""
+
+        with self._lock:
+            return [
+                account_key
+                for account_key, entry in self._entries.items()
+                if entry.remaining_seconds(now) <= within_seconds
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class TokenRefresher:
+    """Daemon thread that reissues cached tokens before they expire.
+
+    Every ``interval_seconds`` it calls ``refresh(account_key)`` for each
+    cached token with less than ``ahead_seconds`` left, so orders keep using
+    a valid token instead of hitting EGW00123 and retrying.  ``refresh``
+    returns False when it does not know how to reissue that token.  Failures
+    are logged and retried on the next pass; the request-time refresh path
+    stays in place as the fallback.
+    """
+
+    def __init__(
+        self,
+        cache: TokenCache,
+        refresh: Callable[[str | None], bool],
+        *,
+        ahead_seconds: float = DEFAULT_REFRESH_AHEAD_SECONDS,
+        interval_seconds: float = DEFAULT_REFRESH_INTERVAL_SECONDS,
+    ) -> None:
+        self.cache = cache
+        self.ahead_seconds = ahead_seconds
+        self.interval_seconds = interval_seconds
+        self._refresh = refresh
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> "TokenRefresher":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="kis-token-refresher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_once(self, *, now: datetime | None = None) -> int:
+        """Reissue every token inside the refresh window; return how many succeeded."""
+
+        refreshed = 0
+        for account_key in self.cache.expiring(self.ahead_seconds, now=now):
+            try:
+                if self._refresh(account_key):
+                    refreshed += 1
+            except Exception as exc:
+                logger.warning("Background KIS token refresh failed: %s", exc)
+        return refreshed
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.run_once()
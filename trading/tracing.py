@@ -0,0 +1,252 @@
+"""Per-signal trace spans propagated through context variables.
+
+A trace starts at the Pub/Sub callback (``start_trace``) and follows the
+signal through dispatch, strategies, trader methods and each KIS request via a
+``ContextVar``.  ``asyncio`` tasks, ``asyncio.to_thread`` and the dispatch
+loop all copy the caller's context, so nested ``span`` calls attach to the
+right parent without passing anything around.  When no trace is active,
+``span`` is a no-op.
+
+Finished traces are appended as one compact JSON line per signal to
+``<TRACE_DIR>/traces-YYYY-MM-DD.jsonl``.  Tracing is disabled unless
+``TRACE_DIR`` is set.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+TRACE_FILE_PREFIX = "traces-"
+DEFAULT_RETENTION_DAYS = 7
+
+
+@dataclass(slots=True, eq=False)
+class Span:
+    span_id: int
+    parent_id: int | None
+    name: str
+    started: float
+    attributes: dict[str, Any] = field(default_factory=dict)
+    duration: float | None = None
+    error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+
+@dataclass(slots=True, eq=False)
+class _Trace:
+    trace_id: str
+    started_at: datetime
+    started: float
+    spans: list[Span] = field(default_factory=list)
+    ids: Iterator[int] = field(default_factory=itertools.count)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def open_span(self, name: str, parent: Span | None, attributes: dict[str, Any]) -> Span:
+        with self.lock:
+            span = Span(
+                next(self.ids),
+                parent.span_id if parent is not None else None,
+                name,
+                time.perf_counter(),
+                dict(attributes),
+            )
+            self.spans.append(span)
+        return span
+
+    def to_record(self) -> dict[str, Any]:
+        with self.lock:
+            spans = list(self.spans)
+        root = spans[0]
+        rendered = []
+        for span in spans:
+            item: dict[str, Any] = {
+                "id": span.span_id,
+                "name": span.name,
+                "start_ms": round((span.started - self.started) * 1000, 3),
+                "ms": None if span.duration is None else round(span.duration * 1000, 3),
+            }
+            if span.parent_id is not None:
+                item["parent"] = span.parent_id
+            if span.attributes:
+                item["attrs"] = span.attributes
+            if span.error:
+                item["error"] = span.error
+            rendered.append(item)
+        return {
+            "trace_id": self.trace_id,
+            "name": root.name,
+            "ts": self.started_at.isoformat(timespec="milliseconds"),
+            "ms": rendered[0]["ms"],
+            "spans": rendered,
+        }
+
+
+_CURRENT: ContextVar[tuple[_Trace, Span] | None] = ContextVar("prism_trace_span", default=None)
+
+
+class TraceWriter:
+    """Append finished traces to daily JSONL files and prune old ones."""
+
+    def __init__(self, directory: Path, *, retention_days: int = DEFAULT_RETENTION_DAYS) -> None:
+        self.directory = directory
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._pruned_for: date | None = None
+
+    def path_for(self, day: date) -> Path:
+        return self.directory / f"{TRACE_FILE_PREFIX}{day.isoformat()}.jsonl"
+
+    def write(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+        today = datetime.now(timezone.utc).date()
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self.path_for(today).open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+            if self._pruned_for != today:
+                self._pruned_for = today
+                self._prune(today)
+
+    def _prune(self, today: date) -> None:
+        cutoff = self.path_for(today - timedelta(days=self.retention_days)).name
+        for path in self.directory.glob(f"{TRACE_FILE_PREFIX}*.jsonl"):
+            if path.name < cutoff:
+                try:
+                    path.unlink()
+                except OSError as exc:
+                    logger.debug("Could not prune trace file %s: %s", path, exc)
+
+
+_WRITER_LOCK = threading.Lock()
+_WRITER: TraceWriter | None = None
+_WRITER_SOURCE: str | None = None
+
+
+def trace_writer() -> TraceWriter | None:
+    """Return the writer for the current ``TRACE_DIR`` (``None`` when tracing is off)."""
+
+    global _WRITER, _WRITER_SOURCE
+    directory = os.environ.get("TRACE_DIR", "").strip()
+    if directory == _WRITER_SOURCE:
+        return _WRITER
+    with _WRITER_LOCK:
+        _WRITER_SOURCE = directory
+        _WRITER = TraceWriter(Path(directory)) if directory else None
+        return _WRITER
+
+
+def current_span() -> Span | None:
+    active = _CURRENT.get()
+    return active[1] if active is not None else None
+
+
+def set_attributes(**attributes: Any) -> None:
+    """Attach attributes to the innermost active span, if any."""
+
+    active = _CURRENT.get()
+    if active is not None:
+        active[1].set(**attributes)
+
+
+@contextmanager
+def _enter(trace: _Trace, span: Span) -> Iterator[Span]:
+    token = _CURRENT.set((trace, span))
+    try:
+        yield span
+    except BaseException as exc:
+        span.error = f"{type(exc).__name__}: {str(exc)[:200]}"
+        raise
+    finally:
+        span.duration = time.perf_counter() - span.started
+        _CURRENT.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """Record a child span of the active span; does nothing outside a trace."""
+
+    active = _CURRENT.get()
+    if active is None:
+        yield None
+        return
+    trace, parent = active
+    with _enter(trace, trace.open_span(name, parent, attributes)) as child:
+        yield child
+
+
+@contextmanager
+def start_trace(name: str, trace_id: str | None = None, **attributes: Any) -> Iterator[Span | None]:
+    """Open a root span and write the finished trace when it closes.
+
+    Inside an existing trace this behaves like ``span``.
+    """
+
+    if _CURRENT.get() is not None:
+        with span(name, **attributes) as child:
+            yield child
+        return
+    writer = trace_writer()
+    if writer is None:
+        yield None
+        return
+    trace = _Trace(
+        trace_id=str(trace_id or uuid.uuid4().hex[:16]),
+        started_at=datetime.now(timezone.utc),
+        started=time.perf_counter(),
+    )
+    try:
+        with _enter(trace, trace.open_span(name, None, attributes)) as root:
+            yield root
+    finally:
+        try:
+            writer.write(trace.to_record())
+        except Exception as exc:  # noqa: BLE001 - tracing must never break trading
+            logger.warning("Could not write trace %s: %s", trace.trace_id, exc)
+
+
+def traced(name: str | None = None) -> Callable[[F], F]:
+    """Wrap a sync or async function in a span named ``name`` (default: qualname)."""
+
+    def decorate(func: F) -> F:
+        span_name = name or func.__qualname__
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _CURRENT.get() is None:
+                    return await func(*args, **kwargs)
+                with span(span_name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _CURRENT.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
@@ -0,0 +1,231 @@
+"""Reuse authenticated broker trader instances across signals."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Callable, TypeVar
+
+from . import memory
+from .config_paths import active_kis_config_path
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_AGE_SECONDS = 1800.0
+
+_MISS = object()
+
+
+def max_age_from_env(
+    name: str = "TRADER_POOL_MAX_AGE_SECONDS",
+    default: float = DEFAULT_MAX_AGE_SECONDS,
+) -> float:
+    raw_value = os.environ.get(name)
+    if raw_value in (None, ""):
+        return default
+    try:
+        value = float(raw_value)
+    except (TypeError, ValueError):
+        logger.warning("Ignoring invalid %s=%r; using %s", name, raw_value, default)
+        return default
+    if not math.isfinite(value) or value < 0:
+        logger.warning("Ignoring invalid %s=%r; using %s", name, raw_value, default)
+        return default
+    return value
+
+
+def _config_fingerprint() -> tuple[Any, ...]:
+    """Identify the KIS config on disk so edits retire traders built from it."""
+
+    path = active_kis_config_path()
+    try:
+        stat = path.stat()
+    except OSError:
+        return (str(path), None, None)
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+@dataclass(slots=True)
+class TraderPoolStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+
+@dataclass(slots=True, eq=False)
+class _PoolEntry:
+    trader: Any
+    fingerprint: tuple[Any, ...]
+    created_at: float
+    loop: asyncio.AbstractEventLoop | None
+    views: weakref.WeakKeyDictionary = field(default_factory=weakref.WeakKeyDictionary)
+
+
+class TraderPool:
+    """Hand out warm, authenticated traders keyed by factory and constructor arguments.
+
+    Building a trader resolves the account, reads and decrypts the cached
+    token and authenticates, so the pool keeps one instance per
+    (trader class, mode, account, product, sizing overrides) and rebuilds it
+    once it is older than ``max_age_seconds`` or the KIS config file changes.
+    Expired tokens met in between are reissued in place by the trader itself.
+
+    Traders hold asyncio locks that must not be shared between event loops.
+    A caller on a different loop than the one that built the trader gets a
+    per-loop view from ``trader._for_event_loop()`` that shares the
+    authenticated state but owns fresh locks.  ``max_age_seconds=0`` turns
+    pooling off.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        config_fingerprint: Callable[[], tuple[Any, ...]] = _config_fingerprint,
+    ) -> None:
+        self.max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._config_fingerprint = config_fingerprint
+        self._entries: dict[tuple[Any, ...], _PoolEntry] = {}
+        self._lock = threading.Lock()
+        self._stats = TraderPoolStats()
+
+    @classmethod
+    def from_env(cls) -> "TraderPool":
+        return cls(max_age_seconds=max_age_from_env())
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age_seconds > 0
+
+    def get(self, factory: Callable[..., T], /, **kwargs: Any) -> T:
+        """Return a warm trader built by ``factory(**kwargs)``."""
+
+        if not self.enabled:
+            return factory(**kwargs)
+        key = (factory, tuple(sorted(kwargs.items())))
+        fingerprint = self._config_fingerprint()
+        loop = _running_loop()
+        trader = self._lookup(key, fingerprint, loop)
+        if trader is not _MISS:
+            return trader
+        # Authentication performs blocking I/O; never hold the pool lock for it.
+        return self._store(key, fingerprint, loop, factory(**kwargs))
+
+    async def async_get(self, factory: Callable[..., T], /, **kwargs: Any) -> T:
+        """Awaitable :meth:`get` that builds a missing trader in a worker thread.
+
+        Building authenticates under the token file lock and may issue a token
+        over HTTP, which must not stall the caller's event loop.
+        """
+
+        if not self.enabled:
+            return await asyncio.to_thread(factory, **kwargs)
+        key = (factory, tuple(sorted(kwargs.items())))
+        fingerprint = self._config_fingerprint()
+        loop = _running_loop()
+        trader = self._lookup(key, fingerprint, loop)
+        if trader is not _MISS:
+            return trader
+        built = await asyncio.to_thread(factory, **kwargs)
+        return self._store(key, fingerprint, loop, built)
+
+    def _lookup(
+        self,
+        key: tuple[Any, ...],
+        fingerprint: tuple[Any, ...],
+        loop: asyncio.AbstractEventLoop | None,
+    ) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_stale(entry, fingerprint):
+                del self._entries[key]
+                self._stats.evictions += 1
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return _MISS
+            self._stats.hits += 1
+            return self._view_locked(entry, loop)
+
+    def _store(
+        self,
+        key: tuple[Any, ...],
+        fingerprint: tuple[Any, ...],
+        loop: asyncio.AbstractEventLoop | None,
+        trader: Any,
+    ) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._is_stale(entry, fingerprint):
+                entry = _PoolEntry(trader, fingerprint, self._clock(), loop)
+                self._entries[key] = entry
+            return self._view_locked(entry, loop)
+
+    def _is_stale(self, entry: _PoolEntry, fingerprint: tuple[Any, ...]) -> bool:
+        return (
+            entry.fingerprint != fingerprint
+            or self._clock() - entry.created_at >= self.max_age_seconds
+        )
+
+    @staticmethod
+    def _view_locked(entry: _PoolEntry, loop: asyncio.AbstractEventLoop | None) -> Any:
+        if loop is None or loop is entry.loop:
+            return entry.trader
+        if entry.loop is None:
+            # Built outside a loop; the first loop to use it adopts it.
+            entry.loop = loop
+            return entry.trader
+        view = entry.views.get(loop)
+        if view is None:
+            for_loop = getattr(entry.trader, "_for_event_loop", None)
+            view = for_loop() if for_loop is not None else entry.trader
+            entry.views[loop] = view
+        return view
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stats.evictions += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> TraderPoolStats:
+        with self._lock:
+            return TraderPoolStats(
+                self._stats.hits,
+                self._stats.misses,
+                self._stats.evictions,
+                len(self._entries),
+            )
+
+
+TRADER_POOL = TraderPool.from_env()
+memory.register_cache("trader_pool.traders", lambda: TRADER_POOL.stats().size)
+
+
+def pooled_trader(factory: Callable[..., T], /, **kwargs: Any) -> T:
+    """Return a warm trader from the process-wide pool."""
+
+    return TRADER_POOL.get(factory, **kwargs)
+
+
+async def async_pooled_trader(factory: Callable[..., T], /, **kwargs: Any) -> T:
+    """Awaitable :func:`pooled_trader` that builds off the running event loop."""
+
+    return await TRADER_POOL.async_get(factory, **kwargs)
@@ -16,16 +16,17 @@ Key differences from Korean domestic trading:
 """
 
 import asyncio
+import copy
 import datetime
 import importlib
 import importlib.util
 import logging
 import math
-import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Any, Callable, Dict, List, Optional
 
+from . import memory, tracing
 from . import yaml_compat as yaml
 from .config_paths import active_kis_config_path
 pytz_spec = importlib.util.find_spec("pytz")
@@ -63,6 +64,8 @@ PROJECT_ROOT = TRADING_DIR.parent
 
 from . import kis_auth as ka
 from .buy_sizing import build_buy_sizing, resolve_buy_amount
+from .stock_locks import StockLockMap
+from .trader_pool import async_pooled_trader
 
 # Logging setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -78,6 +81,17 @@ US_EASTERN = pytz.timezone('US/Eastern')
 KST = pytz.timezone('Asia/Seoul')
 
 
+@dataclass(frozen=True, slots=True)
+class _PreparedOrder:
+    """Order request plus result builders shared by the sync and async paths."""
+
+    api_url: str
+    tr_id: str
+    params: Dict[str, Any]
+    on_response: Callable[[Any], Dict[str, Any]]
+    on_error: Callable[[Exception], Dict[str, Any]]
+
+
 # =============================================================================
 # Safe Type Conversion Helpers (handle empty strings from KIS API)
 # =============================================================================
@@ -227,8 +241,30 @@ def normalize_exchange_code(exchange: str | None) -> str | None:
     return EXCHANGE_CODES.get(exchange.strip().upper())
 
 
+# Exchanges KIS has validated for a ticker, probed first on the next lookup.
+MAX_RESOLVED_EXCHANGES = 4096
+_RESOLVED_EXCHANGES: dict[str, str] = {}
+memory.register_cache("us.resolved_exchanges", lambda: len(_RESOLVED_EXCHANGES))
+
+
+def remember_exchange(ticker: str, exchange: str) -> None:
+    """Record the exchange on which KIS returned a valid quote for ``ticker``."""
+    key = ticker.upper()
+    _RESOLVED_EXCHANGES.pop(key, None)
+    if len(_RESOLVED_EXCHANGES) >= MAX_RESOLVED_EXCHANGES:
+        _RESOLVED_EXCHANGES.pop(next(iter(_RESOLVED_EXCHANGES)), None)
+    _RESOLVED_EXCHANGES[key] = exchange
+
+
+def clear_resolved_exchanges() -> None:
+    _RESOLVED_EXCHANGES.clear()
+
+
 def get_exchange_code(ticker: str) -> str | None:
     """Return only a preferred exchange probe; never infer NYSE for unknown symbols."""
+    resolved = _RESOLVED_EXCHANGES.get(ticker.upper())
+    if resolved is not None:
+        return resolved
     return "NASD" if ticker.upper() in NASDAQ_TICKERS else None
 
 
@@ -299,10 +335,12 @@ class USStockTrading:
 
         # Authentication
         try:
-            self.trenv = ka.authenticate_and_get_env(
-                svr=self.env,
-                product=self.product_code,
-                account_key=self.account_key,
+            self._adopt_client_context(
+                ka.authenticate_client_context(
+                    svr=self.env,
+                    product=self.product_code,
+                    account_key=self.account_key,
+                )
             )
         except RuntimeError as e:
             print("❌ KIS API authentication failed!")
@@ -311,42 +349,100 @@ class USStockTrading:
             raise RuntimeError(f"{self.mode} mode authentication failed") from e
 
         # Async setup
-        self._global_lock = asyncio.Lock()
-        self._semaphore = asyncio.Semaphore(3)
-        self._stock_locks = {}
+        self._reset_async_primitives()
 
         logger.info(f"USStockTrading initialized (Async Enabled)")
         logger.info(f"Mode: {mode}, Buy Amount: ${self.buy_amount:,.2f} USD")
         logger.info(f"Account: {self.account_name} ({ka.mask_account_number(self.trenv.my_acct)}-{self.trenv.my_prod})")
 
-    def _activate_account(self):
-        """Ensure the shared KIS environment matches this trader's account."""
-        ka.changeTREnv(
-            self.trenv.my_token,
-            svr=self.env,
-            product=self.trenv.my_prod,
-            account_key=self.account_key,
-        )
+    def _reset_async_primitives(self):
+        self._global_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(3)
+        self._stock_locks = StockLockMap()
+
+    def _for_event_loop(self):
+        """Return a copy sharing this account's auth state with its own asyncio locks."""
+        view = copy.copy(self)
+        view._reset_async_primitives()
+        return view
 
     def _request(self, api_url: str, tr_id: str, params: Dict[str, Any], **kwargs):
-        with ka.get_trading_env_lock():
-            self._activate_account()
-            response = ka._url_fetch(api_url, tr_id, "", params, **kwargs)
-            try:
-                self.trenv = ka.getTREnv()
-            except RuntimeError:
-                logger.debug("KIS trading environment unavailable after request; keeping existing trader environment")
-            return response
+        return ka._url_fetch(
+            api_url,
+            tr_id,
+            "",
+            params,
+            context=self.kis_context,
+            on_token_refresh=self._adopt_client_context,
+            **kwargs,
+        )
+
+    async def _request_async(self, api_url: str, tr_id: str, params: Dict[str, Any], **kwargs):
+        return await ka._url_fetch_async(
+            api_url,
+            tr_id,
+            "",
+            params,
+            context=self.kis_context,
+            on_token_refresh=self._adopt_client_context,
+            **kwargs,
+        )
+
+    def _adopt_client_context(self, context: ka.KISClientContext) -> None:
+        """Use ``context`` (and its account environment) for later requests."""
+        self.kis_context = context
+        self.trenv = context.env
+
+    def _trading_disabled_result(self, ticker: str, **extra: Any) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'order_no': None,
+            'ticker': ticker,
+            'quantity': 0,
+            **extra,
+            'message': 'Auto trading is disabled (AUTO_TRADING=False)'
+        }
+
+    @tracing.traced("us.submit_order")
+    def _submit_order(self, order: _PreparedOrder) -> Dict[str, Any]:
+        try:
+            res = self._request(order.api_url, order.tr_id, order.params, postFlag=True)
+            return order.on_response(res)
+        except Exception as e:
+            return order.on_error(e)
+
+    @tracing.traced("us.async_submit_order")
+    async def _async_submit_order(self, order: _PreparedOrder) -> Dict[str, Any]:
+        try:
+            res = await self._request_async(order.api_url, order.tr_id, order.params, postFlag=True)
+            return order.on_response(res)
+        except Exception as e:
+            return order.on_error(e)
 
     def _resolve_exchange_code(self, ticker: str, exchange: str | None = None) -> str | None:
         """Resolve a supported trading exchange, validating inferred values with KIS."""
-        normalized_exchange = normalize_exchange_code(exchange)
         if exchange is not None:
-            if normalized_exchange is None:
-                logger.warning("[%s] Unsupported explicit exchange: %r", ticker, exchange)
-            return normalized_exchange
+            return self._explicit_exchange_code(ticker, exchange)
 
         quote = self.get_current_price(ticker)
+        return self._exchange_from_quote(ticker, quote)
+
+    async def _async_resolve_exchange_code(self, ticker: str, exchange: str | None = None) -> str | None:
+        if exchange is not None:
+            return self._explicit_exchange_code(ticker, exchange)
+
+        quote = await self.async_get_current_price(ticker)
+        return self._exchange_from_quote(ticker, quote)
+
+    @staticmethod
+    def _explicit_exchange_code(ticker: str, exchange: str) -> str | None:
+        normalized_exchange = normalize_exchange_code(exchange)
+        if normalized_exchange is None:
+            logger.warning("[%s] Unsupported explicit exchange: %r", ticker, exchange)
+        return normalized_exchange
+
+    @staticmethod
+    def _exchange_from_quote(ticker: str, quote: Optional[Dict[str, Any]]) -> str | None:
         resolved_exchange = normalize_exchange_code(quote.get("exchange")) if quote else None
         if resolved_exchange is None:
             logger.warning("[%s] Refusing orderable inquiry/order: KIS could not validate exchange", ticker)
@@ -361,6 +457,7 @@ class USStockTrading:
             "message": "KIS could not validate a supported US exchange for this ticker",
         }
 
+    @tracing.traced("us.get_current_price")
     def get_current_price(self, ticker: str, exchange: str = None) -> Optional[Dict[str, Any]]:
         """Return a KIS-validated US quote and its corresponding trading exchange.
 
@@ -374,62 +471,106 @@ class USStockTrading:
             logger.warning("[%s] Unsupported explicit exchange: %r", ticker, exchange)
             return None
 
-        api_url = "/uapi/overseas-price/v1/quotations/price"
-        tr_id = "HHDFS00000300"
         last_error = None
-
         for candidate_exchange in exchanges:
-            params = {
-                "AUTH": "",
-                "EXCD": PRICE_EXCHANGE_CODES[candidate_exchange],
-                "SYMB": ticker.upper(),
-            }
+            api_url, tr_id, params = self._price_request(ticker, candidate_exchange)
             try:
-                res = self._request(api_url, tr_id, params)
+                with tracing.span("us.price_probe", exchange=candidate_exchange):
+                    res = self._request(api_url, tr_id, params)
             except Exception as exc:
                 last_error = str(exc)
                 logger.warning("[%s] Price lookup on %s raised: %s", ticker, candidate_exchange, exc)
                 continue
 
-            if not res.isOK():
-                last_error = f"{res.getErrorCode()} - {res.getErrorMessage()}"
-                logger.debug("[%s] No valid %s price result: %s", ticker, candidate_exchange, last_error)
+            result, last_error = self._parse_price(ticker, candidate_exchange, res, last_error)
+            if result is not None:
+                return result
+
+        return self._price_not_found(ticker, last_error)
+
+    @tracing.traced("us.async_get_current_price")
+    async def async_get_current_price(self, ticker: str, exchange: str = None) -> Optional[Dict[str, Any]]:
+        """Awaitable :meth:`get_current_price` on the native async KIS transport."""
+        exchanges = exchange_probe_order(ticker, exchange)
+        if not exchanges:
+            logger.warning("[%s] Unsupported explicit exchange: %r", ticker, exchange)
+            return None
+
+        last_error = None
+        for candidate_exchange in exchanges:
+            api_url, tr_id, params = self._price_request(ticker, candidate_exchange)
+            try:
+                with tracing.span("us.price_probe", exchange=candidate_exchange):
+                    res = await self._request_async(api_url, tr_id, params)
+            except Exception as exc:
+                last_error = str(exc)
+                logger.warning("[%s] Price lookup on %s raised: %s", ticker, candidate_exchange, exc)
                 continue
 
-            data = res.getBody().output or {}
-            current_price = _safe_float(data.get("last"))
-            if current_price <= 0:
-                base_price = _safe_float(data.get("base"))
-                if base_price > 0:
-                    logger.info(
-                        "[%s] Market closed on %s - 'last' empty, using base price $%.2f",
-                        ticker,
-                        candidate_exchange,
-                        base_price,
-                    )
-                    current_price = base_price
-                else:
-                    last_error = f"invalid price last={data.get('last')!r}, base={data.get('base')!r}"
-                    logger.debug("[%s] %s", ticker, last_error)
-                    continue
-
-            result = {
-                "ticker": ticker.upper(),
-                "stock_name": data.get("name", ""),
-                "current_price": current_price,
-                "change_rate": _safe_float(data.get("rate")),
-                "volume": _safe_int(data.get("tvol")),
-                "exchange": candidate_exchange,
-            }
-            logger.info(
-                "[%s] Current price: $%.2f (%+.2f%%) on %s",
-                ticker,
-                result["current_price"],
-                result["change_rate"],
-                candidate_exchange,
-            )
-            return result
+            result, last_error = self._parse_price(ticker, candidate_exchange, res, last_error)
+            if result is not None:
+                return result
+
+        return self._price_not_found(ticker, last_error)
 
+    @staticmethod
+    def _price_request(ticker: str, candidate_exchange: str) -> tuple[str, str, Dict[str, Any]]:
+        api_url = "/uapi/overseas-price/v1/quotations/price"
+        tr_id = "HHDFS00000300"
+        params = {
+            "AUTH": "",
+            "EXCD": PRICE_EXCHANGE_CODES[candidate_exchange],
+            "SYMB": ticker.upper(),
+        }
+        return api_url, tr_id, params
+
+    @staticmethod
+    def _parse_price(
+        ticker: str, candidate_exchange: str, res, last_error: str | None
+    ) -> tuple[Optional[Dict[str, Any]], str | None]:
+        """Return ``(quote, last_error)`` for one exchange probe."""
+        if not res.isOK():
+            last_error = f"{res.getErrorCode()} - {res.getErrorMessage()}"
+            logger.debug("[%s] No valid %s price result: %s", ticker, candidate_exchange, last_error)
+            return None, last_error
+
+        data = res.getBody().output or {}
+        current_price = _safe_float(data.get("last"))
+        if current_price <= 0:
+            base_price = _safe_float(data.get("base"))
+            if base_price > 0:
+                logger.info(
+                    "[%s] Market closed on %s - 'last' empty, using base price $%.2f",
+                    ticker,
+                    candidate_exchange,
+                    base_price,
+                )
+                current_price = base_price
+            else:
+                last_error = f"invalid price last={data.get('last')!r}, base={data.get('base')!r}"
+                logger.debug("[%s] %s", ticker, last_error)
+                return None, last_error
+
+        result = {
+            "ticker": ticker.upper(),
+            "stock_name": data.get("name", ""),
+            "current_price": current_price,
+            "change_rate": _safe_float(data.get("rate")),
+            "volume": _safe_int(data.get("tvol")),
+            "exchange": candidate_exchange,
+        }
+        remember_exchange(ticker, candidate_exchange)
+        logger.info(
+            "[%s] Current price: $%.2f (%+.2f%%) on %s",
+            ticker,
+            result["current_price"],
+            result["change_rate"],
+            candidate_exchange,
+        )
+        return result, last_error
+
+    @staticmethod
+    def _price_not_found(ticker: str, last_error: str | None) -> None:
         logger.warning(
             "[%s] KIS could not validate a supported US exchange%s",
             ticker,
@@ -450,6 +591,16 @@ class USStockTrading:
             currency="USD",
         )
 
+    async def _async_resolve_buy_amount(self, buy_amount: float | None = None) -> float:
+        if buy_amount is not None or not self.buy_sizing.uses_asset_percent:
+            return self._resolve_buy_amount(buy_amount)
+        return resolve_buy_amount(
+            self.buy_sizing,
+            account_summary=await self.async_get_account_summary(),
+            fallback_amount=float(self.buy_amount),
+            currency="USD",
+        )
+
     def get_overseas_buyable_amount(self, ticker: str, price: float, exchange: str = None) -> Dict[str, Any]:
         """Return KIS overseas buyability fields, including after-exchange amount.
 
@@ -463,6 +614,21 @@ class USStockTrading:
         if not exchange:
             return {}
 
+        api_url, tr_id, params = self._buyable_amount_request(ticker, price, exchange)
+        res = self._request(api_url, tr_id, params)
+        return self._parse_buyable_amount(ticker, res)
+
+    async def async_get_overseas_buyable_amount(self, ticker: str, price: float, exchange: str = None) -> Dict[str, Any]:
+        """Awaitable :meth:`get_overseas_buyable_amount`."""
+        exchange = await self._async_resolve_exchange_code(ticker, exchange)
+        if not exchange:
+            return {}
+
+        api_url, tr_id, params = self._buyable_amount_request(ticker, price, exchange)
+        res = await self._request_async(api_url, tr_id, params)
+        return self._parse_buyable_amount(ticker, res)
+
+    def _buyable_amount_request(self, ticker: str, price: float, exchange: str) -> tuple[str, str, Dict[str, Any]]:
         api_url = "/uapi/overseas-stock/v1/trading/inquire-psamount"
         tr_id = "TTTS3007R" if self.mode == "real" else "VTTS3007R"
         params = {
@@ -472,8 +638,10 @@ class USStockTrading:
             "OVRS_ORD_UNPR": f"{price:.8f}".rstrip("0").rstrip("."),
             "ITEM_CD": ticker.upper(),
         }
+        return api_url, tr_id, params
 
-        res = self._request(api_url, tr_id, params)
+    @staticmethod
+    def _parse_buyable_amount(ticker: str, res) -> Dict[str, Any]:
         if not res.isOK():
             error_msg = f"{res.getErrorCode()} - {res.getErrorMessage()}"
             logger.warning("[%s] Overseas buyable amount inquiry failed: %s", ticker, error_msg)
@@ -484,23 +652,51 @@ class USStockTrading:
             output = output[0] if output else {}
         return output or {}
 
+    @tracing.traced("us.resolve_orderable_usd")
     def _resolve_orderable_usd(self, ticker: str, requested_amount: float, price: float, exchange: str) -> tuple[float, Dict[str, Any]]:
         """Resolve USD that may be submitted, optionally including KIS auto-exchange buying power."""
         summary = self.get_account_summary() or {}
-        usd_cash = _safe_float(summary.get("available_amount"), _safe_float(summary.get("usd_cash")))
-        info = {"usd_cash": usd_cash, "auto_exchange_used": False}
-        auto_exchange = getattr(self, "auto_exchange", AutoExchangeConfig())
-
-        should_query_buyable = hasattr(self, "trenv") and (
-            auto_exchange.enabled or requested_amount <= usd_cash
-        )
         buyable = {}
-        if should_query_buyable:
+        if self._should_query_buyable(requested_amount, summary):
             try:
                 buyable = self.get_overseas_buyable_amount(ticker, price, exchange)
             except Exception as exc:
                 logger.warning("[%s] Overseas buyable amount inquiry raised; falling back to account cash: %s", ticker, exc)
                 buyable = {}
+        return self._orderable_usd_from(ticker, requested_amount, price, summary, buyable)
+
+    @tracing.traced("us.async_resolve_orderable_usd")
+    async def _async_resolve_orderable_usd(self, ticker: str, requested_amount: float, price: float, exchange: str) -> tuple[float, Dict[str, Any]]:
+        """Awaitable :meth:`_resolve_orderable_usd`."""
+        summary = await self.async_get_account_summary() or {}
+        buyable = {}
+        if self._should_query_buyable(requested_amount, summary):
+            try:
+                buyable = await self.async_get_overseas_buyable_amount(ticker, price, exchange)
+            except Exception as exc:
+                logger.warning("[%s] Overseas buyable amount inquiry raised; falling back to account cash: %s", ticker, exc)
+                buyable = {}
+        return self._orderable_usd_from(ticker, requested_amount, price, summary, buyable)
+
+    def _should_query_buyable(self, requested_amount: float, summary: Dict[str, Any]) -> bool:
+        usd_cash = _safe_float(summary.get("available_amount"), _safe_float(summary.get("usd_cash")))
+        auto_exchange = getattr(self, "auto_exchange", AutoExchangeConfig())
+        return hasattr(self, "trenv") and (
+            auto_exchange.enabled or requested_amount <= usd_cash
+        )
+
+    def _orderable_usd_from(
+        self,
+        ticker: str,
+        requested_amount: float,
+        price: float,
+        summary: Dict[str, Any],
+        buyable: Dict[str, Any],
+    ) -> tuple[float, Dict[str, Any]]:
+        usd_cash = _safe_float(summary.get("available_amount"), _safe_float(summary.get("usd_cash")))
+        info = {"usd_cash": usd_cash, "auto_exchange_used": False}
+        auto_exchange = getattr(self, "auto_exchange", AutoExchangeConfig())
+
         has_current_orderable = bool(buyable) and buyable.get("ord_psbl_frcr_amt") not in (None, "")
         current_orderable = _safe_float(buyable.get("ord_psbl_frcr_amt")) if has_current_orderable else 0.0
         after_exchange_orderable = (
@@ -786,14 +982,7 @@ class USStockTrading:
             Order result dict
         """
         if not self.auto_trading:
-            return {
-                'success': False,
-                'order_no': None,
-                'ticker': ticker,
-                'quantity': 0,
-                'limit_price': limit_price,
-                'message': 'Auto trading is disabled (AUTO_TRADING=False)'
-            }
+            return self._trading_disabled_result(ticker, limit_price=limit_price)
 
         exchange = self._resolve_exchange_code(ticker, exchange)
         if not exchange:
@@ -801,7 +990,26 @@ class USStockTrading:
 
         amount = self._resolve_buy_amount(buy_amount)
         amount, buy_info = self._resolve_orderable_usd(ticker, amount, limit_price, exchange)
+        order = self._limit_buy_order(ticker, limit_price, amount, exchange, buy_info)
+        return order if isinstance(order, dict) else self._submit_order(order)
+
+    async def async_buy_limit_price(self, ticker: str, limit_price: float, buy_amount: float = None,
+                                    exchange: str = None) -> Dict[str, Any]:
+        """Awaitable :meth:`buy_limit_price` on the native async KIS transport."""
+        if not self.auto_trading:
+            return self._trading_disabled_result(ticker, limit_price=limit_price)
 
+        exchange = await self._async_resolve_exchange_code(ticker, exchange)
+        if not exchange:
+            return self._exchange_resolution_failure(ticker)
+
+        amount = await self._async_resolve_buy_amount(buy_amount)
+        amount, buy_info = await self._async_resolve_orderable_usd(ticker, amount, limit_price, exchange)
+        order = self._limit_buy_order(ticker, limit_price, amount, exchange, buy_info)
+        return order if isinstance(order, dict) else await self._async_submit_order(order)
+
+    def _limit_buy_order(self, ticker: str, limit_price: float, amount: float, exchange: str,
+                         buy_info: Dict[str, Any]) -> _PreparedOrder | Dict[str, Any]:
         # Calculate quantity based on limit price
         buy_quantity = math.floor(amount / limit_price)
 
@@ -834,9 +1042,7 @@ class USStockTrading:
             "ORD_DVSN": "00"  # Limit order
         }
 
-        try:
-            res = self._request(api_url, tr_id, params, postFlag=True)
-
+        def on_response(res) -> Dict[str, Any]:
             if res.isOK():
                 output = res.getBody().output
                 order_no = output.get('ODNO', '')
@@ -866,7 +1072,7 @@ class USStockTrading:
                     'message': f'Buy order failed: {error_msg}'
                 }
 
-        except Exception as e:
+        def on_error(e: Exception) -> Dict[str, Any]:
             logger.error(f"Error during limit buy: {str(e)}")
             return {
                 'success': False,
@@ -877,6 +1083,9 @@ class USStockTrading:
                 'message': f'Buy order error: {str(e)}'
             }
 
+        return _PreparedOrder(api_url, tr_id, params, on_response, on_error)
+
+    @tracing.traced("us.get_holding_quantity")
     def get_holding_quantity(self, ticker: str) -> int:
         """
         Get holding quantity for a specific ticker
@@ -895,6 +1104,15 @@ class USStockTrading:
 
         return 0
 
+    @tracing.traced("us.async_get_holding_quantity")
+    async def async_get_holding_quantity(self, ticker: str) -> int:
+        """Awaitable :meth:`get_holding_quantity`."""
+        for stock in await self.async_get_portfolio():
+            if stock['ticker'].upper() == ticker.upper():
+                return stock['quantity']
+
+        return 0
+
     def sell_all_market_price(self, ticker: str, exchange: str = None,
                               limit_price: float = None,
                               holding_quantity: Optional[int] = None) -> Dict[str, Any]:
@@ -916,13 +1134,7 @@ class USStockTrading:
             Order result dict
         """
         if not self.auto_trading:
-            return {
-                'success': False,
-                'order_no': None,
-                'ticker': ticker,
-                'quantity': 0,
-                'message': 'Auto trading is disabled (AUTO_TRADING=False)'
-            }
+            return self._trading_disabled_result(ticker)
 
         exchange = self._resolve_exchange_code(ticker, exchange)
         if not exchange:
@@ -930,29 +1142,64 @@ class USStockTrading:
 
         # Check holding quantity
         quantity = holding_quantity if holding_quantity is not None else self.get_holding_quantity(ticker)
+        if quantity == 0:
+            return self._no_holdings_result(ticker)
 
+        # Fetch current price if not provided
+        if not limit_price or limit_price <= 0:
+            price_info = self.get_current_price(ticker, exchange)
+            limit_price = price_info['current_price'] if price_info else 0.0
+
+        order = self._sell_all_order(ticker, exchange, quantity, limit_price)
+        return order if isinstance(order, dict) else self._submit_order(order)
+
+    async def async_sell_all_market_price(self, ticker: str, exchange: str = None,
+                                          limit_price: float = None,
+                                          holding_quantity: Optional[int] = None) -> Dict[str, Any]:
+        """Awaitable :meth:`sell_all_market_price` on the native async KIS transport."""
+        if not self.auto_trading:
+            return self._trading_disabled_result(ticker)
+
+        exchange = await self._async_resolve_exchange_code(ticker, exchange)
+        if not exchange:
+            return self._exchange_resolution_failure(ticker)
+
+        quantity = (
+            holding_quantity
+            if holding_quantity is not None
+            else await self.async_get_holding_quantity(ticker)
+        )
         if quantity == 0:
+            return self._no_holdings_result(ticker)
+
+        if not limit_price or limit_price <= 0:
+            price_info = await self.async_get_current_price(ticker, exchange)
+            limit_price = price_info['current_price'] if price_info else 0.0
+
+        order = self._sell_all_order(ticker, exchange, quantity, limit_price)
+        return order if isinstance(order, dict) else await self._async_submit_order(order)
+
+    @staticmethod
+    def _no_holdings_result(ticker: str) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'order_no': None,
+            'ticker': ticker,
+            'quantity': 0,
+            'message': 'No holdings to sell'
+        }
+
+    def _sell_all_order(self, ticker: str, exchange: str, quantity: int,
+                        limit_price: float) -> _PreparedOrder | Dict[str, Any]:
+        if limit_price <= 0:
             return {
                 'success': False,
                 'order_no': None,
                 'ticker': ticker,
                 'quantity': 0,
-                'message': 'No holdings to sell'
+                'message': 'Failed to fetch current price for sell order'
             }
 
-        # Fetch current price if not provided
-        if not limit_price or limit_price <= 0:
-            price_info = self.get_current_price(ticker, exchange)
-            limit_price = price_info['current_price'] if price_info else 0.0
-            if limit_price <= 0:
-                return {
-                    'success': False,
-                    'order_no': None,
-                    'ticker': ticker,
-                    'quantity': 0,
-                    'message': 'Failed to fetch current price for sell order'
-                }
-
         # Execute sell order
         api_url = "/uapi/overseas-stock/v1/trading/order"
 
@@ -973,9 +1220,7 @@ class USStockTrading:
             "ORD_DVSN": "00"   # Limit order (지정가) — TTTT1006U does not support "01"
         }
 
-        try:
-            res = self._request(api_url, tr_id, params, postFlag=True)
-
+        def on_response(res) -> Dict[str, Any]:
             if res.isOK():
                 output = res.getBody().output
                 order_no = output.get('ODNO', '')
@@ -1001,7 +1246,7 @@ class USStockTrading:
                     'message': f'Sell order failed: {error_msg}'
                 }
 
-        except Exception as e:
+        def on_error(e: Exception) -> Dict[str, Any]:
             logger.error(f"Error during sell order: {str(e)}")
             return {
                 'success': False,
@@ -1011,6 +1256,8 @@ class USStockTrading:
                 'message': f'Sell order error: {str(e)}'
             }
 
+        return _PreparedOrder(api_url, tr_id, params, on_response, on_error)
+
     def is_market_open(self) -> bool:
         """
         Check if US market is currently open
@@ -1375,6 +1622,24 @@ class USStockTrading:
                     'message': 'US market is closed. Provide limit_price for reserved order.'
                 }
 
+    async def async_smart_buy(self, ticker: str, buy_amount: float = None,
+                              exchange: str = None, limit_price: float = None) -> Dict[str, Any]:
+        """
+        Awaitable :meth:`smart_buy`
+
+        Regular-session limit buys run on the native async KIS transport.
+        Reserved orders and rejections keep the blocking implementation on a
+        worker thread.
+        """
+        if not self.auto_trading:
+            return self._trading_disabled_result(ticker)
+
+        if limit_price and limit_price > 0 and self.is_market_open():
+            logger.info(f"[{ticker}] Market is open - executing limit buy @ ${limit_price:.2f}")
+            return await self.async_buy_limit_price(ticker, limit_price, buy_amount, exchange)
+
+        return await asyncio.to_thread(self.smart_buy, ticker, buy_amount, exchange, limit_price)
+
     def smart_sell_all(self, ticker: str, exchange: str = None,
                        limit_price: float = None, use_moo: bool = False,
                        holding_quantity: Optional[int] = None) -> Dict[str, Any]:
@@ -1442,12 +1707,38 @@ class USStockTrading:
                     'message': 'US market is closed. Provide limit_price or use_moo=True for reserved order.'
                 }
 
+    async def async_smart_sell_all(self, ticker: str, exchange: str = None,
+                                   limit_price: float = None, use_moo: bool = False,
+                                   holding_quantity: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Awaitable :meth:`smart_sell_all`
+
+        Regular-session sells run on the native async KIS transport; reserved
+        orders keep the blocking implementation on a worker thread.
+        """
+        if not self.auto_trading:
+            return self._trading_disabled_result(ticker)
+
+        if self.is_market_open():
+            logger.info(f"[{ticker}] Market is open - executing market sell")
+            return await self.async_sell_all_market_price(
+                ticker,
+                exchange,
+                limit_price=limit_price,
+                holding_quantity=holding_quantity,
+            )
+
+        return await asyncio.to_thread(
+            self.smart_sell_all, ticker, exchange, limit_price, use_moo, holding_quantity
+        )
+
     async def _get_stock_lock(self, ticker: str) -> asyncio.Lock:
         """Get per-stock lock (prevent concurrent trades on same stock)"""
         if ticker not in self._stock_locks:
             self._stock_locks[ticker] = asyncio.Lock()
         return self._stock_locks[ticker]
 
+    @tracing.traced("us.async_buy_stock")
     async def async_buy_stock(self, ticker: str, buy_amount: Optional[float] = None,
                               exchange: str = None, timeout: float = 30.0,
                               limit_price: Optional[float] = None) -> Dict[str, Any]:
@@ -1464,14 +1755,14 @@ class USStockTrading:
         Returns:
             Order result dict
         """
-        # Await bounded transport completion so no broker thread remains active
-        # after this method returns with an ambiguous timeout result.
+        # Await bounded transport completion so no broker request remains in
+        # flight after this method returns with an ambiguous timeout result.
         return await self._execute_buy_stock(ticker, buy_amount, exchange, limit_price)
 
     async def _execute_buy_stock(self, ticker: str, buy_amount: float = None,
                                  exchange: str = None, limit_price: float = None) -> Dict[str, Any]:
         """Execute buy stock logic"""
-        amount = self._resolve_buy_amount(buy_amount)
+        amount = await self._async_resolve_buy_amount(buy_amount)
 
         result = {
             'success': False,
@@ -1493,10 +1784,7 @@ class USStockTrading:
                         logger.info(f"[Async Buy] {ticker} starting (amount: ${amount:.2f})")
 
                         # Get current price
-                        price_info = await asyncio.to_thread(
-                            self.get_current_price, ticker, exchange
-                        )
-                        await asyncio.sleep(0.5)
+                        price_info = await self.async_get_current_price(ticker, exchange)
 
                         if not price_info:
                             if limit_price and limit_price > 0:
@@ -1531,8 +1819,7 @@ class USStockTrading:
                         if not resolved_exchange:
                             result["message"] = "KIS could not validate a supported US exchange for this ticker"
                             return result
-                        resolved_amount, buy_info = await asyncio.to_thread(
-                            self._resolve_orderable_usd,
+                        resolved_amount, buy_info = await self._async_resolve_orderable_usd(
                             ticker,
                             amount,
                             effective_limit_price,
@@ -1554,14 +1841,12 @@ class USStockTrading:
                         result['total_amount'] = buy_quantity * effective_limit_price
 
                         # Execute buy
-                        await asyncio.sleep(0.5)
-
                         # Use current_price as limit_price if not provided or invalid
                         # This is important for reserved orders when market is closed
                         logger.info(f"[Async Buy] {ticker} limit_price: ${effective_limit_price:.2f} (provided: {limit_price})")
 
-                        buy_result = await asyncio.to_thread(
-                            self.smart_buy, ticker, resolved_amount, resolved_exchange, effective_limit_price
+                        buy_result = await self.async_smart_buy(
+                            ticker, resolved_amount, resolved_exchange, effective_limit_price
                         )
 
                         if buy_result['success']:
@@ -1577,10 +1862,9 @@ class USStockTrading:
                         result['message'] = f'Async buy error: {str(e)}'
                         logger.error(f"[Async Buy] {ticker} error: {str(e)}")
 
-                    await asyncio.sleep(0.1)
-
         return result
 
+    @tracing.traced("us.async_sell_stock")
     async def async_sell_stock(self, ticker: str, exchange: str = None,
                                timeout: float = 30.0, limit_price: Optional[float] = None,
                                use_moo: bool = False,
@@ -1626,7 +1910,7 @@ class USStockTrading:
                         logger.info(f"[Async Sell] {ticker} starting")
 
                         # Verify portfolio holdings
-                        portfolio = await asyncio.to_thread(self.get_portfolio)
+                        portfolio = await self.async_get_portfolio()
 
                         target_stock = None
                         for stock in portfolio:
@@ -1657,9 +1941,7 @@ class USStockTrading:
                         logger.info(f"[Async Sell] {ticker} holdings verified: {target_stock['quantity']} shares")
 
                         # Get current price for estimate
-                        price_info = await asyncio.to_thread(
-                            self.get_current_price, ticker, resolved_exchange
-                        )
+                        price_info = await self.async_get_current_price(ticker, resolved_exchange)
 
                         current_price = 0.0
                         if price_info:
@@ -1679,8 +1961,7 @@ class USStockTrading:
                         logger.info(f"[Async Sell] {ticker} limit_price: ${effective_limit_price:.2f}, use_moo: {effective_use_moo}")
 
                         # Execute sell
-                        sell_result = await asyncio.to_thread(
-                            self.smart_sell_all,
+                        sell_result = await self.async_smart_sell_all(
                             ticker,
                             resolved_exchange,
                             effective_limit_price if effective_limit_price > 0 else None,
@@ -1711,10 +1992,9 @@ class USStockTrading:
                         result['message'] = f'Async sell error: {str(e)}'
                         logger.error(f"[Async Sell] {ticker} error: {str(e)}")
 
-                    await asyncio.sleep(0.1)
-
         return result
 
+    @tracing.traced("us.get_portfolio")
     def get_portfolio(self) -> List[Dict[str, Any]]:
         """
         Get current US stock portfolio
@@ -1732,6 +2012,39 @@ class USStockTrading:
                 'exchange': 'NASD'
             }, ...]
         """
+        portfolio = []
+
+        # Query each exchange
+        for exchange in ["NASD", "NYSE", "AMEX"]:
+            api_url, tr_id, params = self._balance_request(exchange)
+            try:
+                res = self._request(api_url, tr_id, params)
+                portfolio.extend(self._parse_portfolio_items(res, exchange))
+
+            except Exception as e:
+                logger.error(f"Error getting portfolio for {exchange}: {str(e)}")
+                continue
+
+        return self._dedupe_portfolio(portfolio)
+
+    @tracing.traced("us.async_get_portfolio")
+    async def async_get_portfolio(self) -> List[Dict[str, Any]]:
+        """Awaitable :meth:`get_portfolio` on the native async KIS transport."""
+        portfolio = []
+
+        for exchange in ["NASD", "NYSE", "AMEX"]:
+            api_url, tr_id, params = self._balance_request(exchange)
+            try:
+                res = await self._request_async(api_url, tr_id, params)
+                portfolio.extend(self._parse_portfolio_items(res, exchange))
+
+            except Exception as e:
+                logger.error(f"Error getting portfolio for {exchange}: {str(e)}")
+                continue
+
+        return self._dedupe_portfolio(portfolio)
+
+    def _balance_request(self, exchange: str) -> tuple[str, str, Dict[str, Any]]:
         api_url = "/uapi/overseas-stock/v1/trading/inquire-balance"
 
         if self.mode == "real":
@@ -1742,50 +2055,43 @@ class USStockTrading:
         params = {
             "CANO": self.trenv.my_acct,
             "ACNT_PRDT_CD": self.trenv.my_prod,
-            "OVRS_EXCG_CD": "NASD",  # Default to NASDAQ, loop through others
+            "OVRS_EXCG_CD": exchange,
             "TR_CRCY_CD": "USD",
             "CTX_AREA_FK200": "",
             "CTX_AREA_NK200": ""
         }
+        return api_url, tr_id, params
 
-        portfolio = []
-
-        # Query each exchange
-        for exchange in ["NASD", "NYSE", "AMEX"]:
-            params["OVRS_EXCG_CD"] = exchange
-
-            try:
-                res = self._request(api_url, tr_id, params)
+    @staticmethod
+    def _parse_portfolio_items(res, exchange: str) -> List[Dict[str, Any]]:
+        if not res.isOK():
+            return []
 
-                if res.isOK():
-                    output1 = res.getBody().output1
-
-                    if not isinstance(output1, list):
-                        output1 = [output1] if output1 else []
-
-                    for item in output1:
-                        # Use safe conversion to handle empty strings
-                        quantity = _safe_int(item.get('ovrs_cblc_qty'))
-                        if quantity > 0:
-                            stock_info = {
-                                'ticker': item.get('ovrs_pdno', ''),
-                                'stock_name': item.get('ovrs_item_name', ''),
-                                'quantity': quantity,
-                                'avg_price': _safe_float(item.get('pchs_avg_pric')),
-                                'current_price': _safe_float(item.get('now_pric2')),
-                                'eval_amount': _safe_float(item.get('ovrs_stck_evlu_amt')),
-                                'profit_amount': _safe_float(item.get('frcr_evlu_pfls_amt')),
-                                'profit_rate': _safe_float(item.get('evlu_pfls_rt')),
-                                'exchange': exchange
-                            }
-                            portfolio.append(stock_info)
-
-                time.sleep(0.1)  # Rate limit
+        output1 = res.getBody().output1
 
-            except Exception as e:
-                logger.error(f"Error getting portfolio for {exchange}: {str(e)}")
-                continue
+        if not isinstance(output1, list):
+            output1 = [output1] if output1 else []
 
+        items = []
+        for item in output1:
+            # Use safe conversion to handle empty strings
+            quantity = _safe_int(item.get('ovrs_cblc_qty'))
+            if quantity > 0:
+                items.append({
+                    'ticker': item.get('ovrs_pdno', ''),
+                    'stock_name': item.get('ovrs_item_name', ''),
+                    'quantity': quantity,
+                    'avg_price': _safe_float(item.get('pchs_avg_pric')),
+                    'current_price': _safe_float(item.get('now_pric2')),
+                    'eval_amount': _safe_float(item.get('ovrs_stck_evlu_amt')),
+                    'profit_amount': _safe_float(item.get('frcr_evlu_pfls_amt')),
+                    'profit_rate': _safe_float(item.get('evlu_pfls_rt')),
+                    'exchange': exchange
+                })
+        return items
+
+    @staticmethod
+    def _dedupe_portfolio(portfolio: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         # Deduplicate by ticker (KIS API may return same stock from multiple exchanges)
         seen_tickers = set()
         unique_portfolio = []
@@ -1798,6 +2104,7 @@ class USStockTrading:
         logger.info(f"Portfolio: {len(unique_portfolio)} US stocks held")
         return unique_portfolio
 
+    @tracing.traced("us.get_account_summary")
     def get_account_summary(self) -> Optional[Dict[str, Any]]:
         """
         Get account summary for US stocks including USD cash balance
@@ -1812,61 +2119,34 @@ class USStockTrading:
                 'exchange_rate': USD/KRW exchange rate
             }
         """
-        # Use inquire-present-balance API for accurate USD cash info
-        api_url = "/uapi/overseas-stock/v1/trading/inquire-present-balance"
-        tr_id = "CTRP6504R"  # Overseas stock settlement-based current balance
-
-        params = {
-            "CANO": self.trenv.my_acct,
-            "ACNT_PRDT_CD": self.trenv.my_prod,
-            "WCRC_FRCR_DVSN_CD": "02",  # 02: Foreign currency
-            "NATN_CD": "840",  # USA
-            "TR_MKET_CD": "00",  # All
-            "INQR_DVSN_CD": "00"  # All
-        }
+        api_url, tr_id, params = self._present_balance_request()
 
         try:
             res = self._request(api_url, tr_id, params)
 
             if res.isOK():
-                body = res.getBody()
-                output2 = body.output2 if hasattr(body, 'output2') else []
+                usd_cash, exchange_rate = self._parse_usd_cash(res)
+                # Calculate from portfolio for stock totals
+                return self._build_account_summary(usd_cash, exchange_rate, self.get_portfolio())
 
-                # Extract USD info from output2
-                usd_cash = 0.0
-                exchange_rate = 0.0
+            logger.error(f"Account summary API failed: {res.getErrorCode()} - {res.getErrorMessage()}")
+            return None
 
-                if output2 and isinstance(output2, list):
-                    for item in output2:
-                        if item.get('crcy_cd') == 'USD':
-                            usd_cash = _safe_float(item.get('frcr_dncl_amt_2'))
-                            exchange_rate = _safe_float(item.get('frst_bltn_exrt'))
-                            break
+        except Exception as e:
+            logger.error(f"Error getting account summary: {str(e)}")
+            return None
 
-                # Calculate from portfolio for stock totals
-                portfolio = self.get_portfolio()
-                stock_eval = sum(s['eval_amount'] for s in portfolio)
-                total_eval = stock_eval + usd_cash
-                total_profit = sum(s['profit_amount'] for s in portfolio)
-                total_cost = sum(s['avg_price'] * s['quantity'] for s in portfolio)
-
-                summary = {
-                    'total_eval_amount': total_eval,
-                    'total_profit_amount': total_profit,
-                    'total_profit_rate': (total_profit / total_cost * 100) if total_cost > 0 else 0,
-                    'available_amount': usd_cash,  # USD cash available for trading
-                    'usd_cash': usd_cash,
-                    'exchange_rate': exchange_rate,
-                    'account_key': self.account_key,
-                    'account_product': self.trenv.my_prod,
-                }
+    @tracing.traced("us.async_get_account_summary")
+    async def async_get_account_summary(self) -> Optional[Dict[str, Any]]:
+        """Awaitable :meth:`get_account_summary` on the native async KIS transport."""
+        api_url, tr_id, params = self._present_balance_request()
 
-                logger.info(f"Account Summary: Total Assets ${summary['total_eval_amount']:.2f}, "
-                           f"P/L ${summary['total_profit_amount']:+.2f} "
-                           f"({summary['total_profit_rate']:+.2f}%), "
-                           f"USD Cash ${summary['usd_cash']:.2f}")
+        try:
+            res = await self._request_async(api_url, tr_id, params)
 
-                return summary
+            if res.isOK():
+                usd_cash, exchange_rate = self._parse_usd_cash(res)
+                return self._build_account_summary(usd_cash, exchange_rate, await self.async_get_portfolio())
 
             logger.error(f"Account summary API failed: {res.getErrorCode()} - {res.getErrorMessage()}")
             return None
@@ -1875,6 +2155,64 @@ class USStockTrading:
             logger.error(f"Error getting account summary: {str(e)}")
             return None
 
+    def _present_balance_request(self) -> tuple[str, str, Dict[str, Any]]:
+        # Use inquire-present-balance API for accurate USD cash info
+        api_url = "/uapi/overseas-stock/v1/trading/inquire-present-balance"
+        tr_id = "CTRP6504R"  # Overseas stock settlement-based current balance
+
+        params = {
+            "CANO": self.trenv.my_acct,
+            "ACNT_PRDT_CD": self.trenv.my_prod,
+            "WCRC_FRCR_DVSN_CD": "02",  # 02: Foreign currency
+            "NATN_CD": "840",  # USA
+            "TR_MKET_CD": "00",  # All
+            "INQR_DVSN_CD": "00"  # All
+        }
+        return api_url, tr_id, params
+
+    @staticmethod
+    def _parse_usd_cash(res) -> tuple[float, float]:
+        body = res.getBody()
+        output2 = body.output2 if hasattr(body, 'output2') else []
+
+        # Extract USD info from output2
+        usd_cash = 0.0
+        exchange_rate = 0.0
+
+        if output2 and isinstance(output2, list):
+            for item in output2:
+                if item.get('crcy_cd') == 'USD':
+                    usd_cash = _safe_float(item.get('frcr_dncl_amt_2'))
+                    exchange_rate = _safe_float(item.get('frst_bltn_exrt'))
+                    break
+
+        return usd_cash, exchange_rate
+
+    def _build_account_summary(self, usd_cash: float, exchange_rate: float,
+                               portfolio: List[Dict[str, Any]]) -> Dict[str, Any]:
+        stock_eval = sum(s['eval_amount'] for s in portfolio)
+        total_eval = stock_eval + usd_cash
+        total_profit = sum(s['profit_amount'] for s in portfolio)
+        total_cost = sum(s['avg_price'] * s['quantity'] for s in portfolio)
+
+        summary = {
+            'total_eval_amount': total_eval,
+            'total_profit_amount': total_profit,
+            'total_profit_rate': (total_profit / total_cost * 100) if total_cost > 0 else 0,
+            'available_amount': usd_cash,  # USD cash available for trading
+            'usd_cash': usd_cash,
+            'exchange_rate': exchange_rate,
+            'account_key': self.account_key,
+            'account_product': self.trenv.my_prod,
+        }
+
+        logger.info(f"Account Summary: Total Assets ${summary['total_eval_amount']:.2f}, "
+                   f"P/L ${summary['total_profit_amount']:+.2f} "
+                   f"({summary['total_profit_rate']:+.2f}%), "
+                   f"USD Cash ${summary['usd_cash']:.2f}")
+
+        return summary
+
 
 class MultiAccountUSStockTrading:
     """Fan out trading orders to all configured US accounts for the current mode."""
@@ -2074,7 +2412,8 @@ class AsyncUSTradingContext:
         self.trader = None
 
     async def __aenter__(self):
-        self.trader = USStockTrading(
+        self.trader = await async_pooled_trader(
+            USStockTrading,
             mode=self.mode,
             buy_amount=self.buy_amount,
             auto_trading=self.auto_trading,
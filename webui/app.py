@@ -246,10 +246,14 @@ def create_app(settings: WebUISettings | None = None, *, work_tracker=None) -> F
         dashboard,
         dry_run,
         logs,
+        memory,
+        metrics,
+        profiles,
         queue,
         readiness,
         signals,
         telegram,
+        traces,
         trading,
     )
 
@@ -261,4 +265,8 @@ def create_app(settings: WebUISettings | None = None, *, work_tracker=None) -> F
     app.include_router(trading.router)
     app.include_router(logs.router)
     app.include_router(queue.router)
+    app.include_router(metrics.router)
+    app.include_router(traces.router)
+    app.include_router(profiles.router)
+    app.include_router(memory.router)
     return app
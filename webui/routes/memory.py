@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Request
+
+from webui.services.memory_service import get_memory_summary
+
+router = APIRouter(prefix="/memory")
+
+
+@router.get("")
+def memory_page(request: Request):
+    templates = request.app.state.templates
+    return templates.TemplateResponse(request, "memory.html", {"request": request, "memory": get_memory_summary()})
+
+
+@router.get("/api")
+def memory_api():
+    return get_memory_summary()
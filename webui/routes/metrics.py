@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from trading.metrics import CONTENT_TYPE, REGISTRY
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def metrics_text():
+    """Expose the process metrics registry in Prometheus text format."""
+
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
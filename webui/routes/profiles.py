@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse
+
+from webui.routes.guards import get_urlencoded_form, require_csrf_token
+from webui.services.profile_service import list_profiles, profile_file, start_profile
+
+router = APIRouter(prefix="/profiles")
+
+
+def _page_context(request: Request, *, start_result: dict | None = None) -> dict:
+    return {
+        "request": request,
+        "listing": list_profiles(),
+        "start_result": start_result,
+        "csrf_token": request.app.state.settings.csrf_token,
+    }
+
+
+@router.get("")
+def profiles_page(request: Request):
+    templates = request.app.state.templates
+    return templates.TemplateResponse(request, "profiles.html", _page_context(request))
+
+
+@router.post("/start-form", dependencies=[Depends(require_csrf_token)])
+async def start_profile_form(request: Request):
+    """Start one bounded sampling window in this process and render its status."""
+
+    templates = request.app.state.templates
+    form = await get_urlencoded_form(request)
+    result = start_profile(form.get("seconds"))
+    return templates.TemplateResponse(
+        request,
+        "profiles.html",
+        _page_context(request, start_result=result),
+        status_code=status.HTTP_202_ACCEPTED if result["ok"] else status.HTTP_409_CONFLICT,
+    )
+
+
+@router.get("/api")
+def profiles_api():
+    return list_profiles()
+
+
+@router.post("/start", dependencies=[Depends(require_csrf_token)])
+def start_profile_api(seconds: float | None = None):
+    return start_profile(seconds)
+
+
+@router.get("/files/{name}")
+def profile_download(name: str):
+    resolved = profile_file(name)
+    if resolved is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown profile file")
+    path, media_type = resolved
+    disposition = "inline" if media_type.startswith("image/") else "attachment"
+    return FileResponse(path, media_type=media_type, filename=name, content_disposition_type=disposition)
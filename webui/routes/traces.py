@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Request
+
+from webui.services.trace_service import get_trace, list_traces
+
+router = APIRouter(prefix="/traces")
+
+
+@router.get("")
+def traces_page(request: Request):
+    templates = request.app.state.templates
+    return templates.TemplateResponse(
+        request, "traces.html", {"request": request, "listing": list_traces(), "detail": None}
+    )
+
+
+@router.get("/api")
+def traces_api():
+    return list_traces()
+
+
+@router.get("/{trace_id}")
+def trace_page(request: Request, trace_id: str):
+    templates = request.app.state.templates
+    detail = get_trace(trace_id)
+    return templates.TemplateResponse(
+        request,
+        "traces.html",
+        {"request": request, "listing": None, "detail": detail},
+        status_code=200 if detail["ok"] else 404,
+    )
+
+
+@router.get("/{trace_id}/api")
+def trace_api(trace_id: str):
+    return get_trace(trace_id)
@@ -0,0 +1,21 @@
+"""Masked memory accounting for the System pages."""
+
+from __future__ import annotations
+
+import os
+from typing import Any
+
+from trading.memory import memory_report
+
+from .masking import mask_text
+
+
+def get_memory_summary() -> dict[str, Any]:
+    try:
+        report = memory_report()
+    except Exception as exc:  # noqa: BLE001 - safe UI diagnostic
+        return {"ok": False, "report": None, "error": mask_text(str(exc), os.environ)}
+    for key in ("since_start", "since_previous"):
+        for diff in report[key]:
+            diff["location"] = mask_text(diff["location"], os.environ)
+    return {"ok": True, "report": report, "error": None}
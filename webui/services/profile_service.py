@@ -0,0 +1,67 @@
+"""Operator-triggered sampling profiles and the files they produced."""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+from trading.profiler import (
+    MAX_PROFILE_SECONDS,
+    PROFILE_FILE_PREFIX,
+    PROFILER,
+    ProfilerBusyError,
+    profile_directory,
+)
+
+from .masking import mask_text
+
+MAX_LISTED_PROFILES = 20
+_PROFILE_NAME = re.compile(rf"^{re.escape(PROFILE_FILE_PREFIX)}\d{{8}}T\d{{6}}Z\.(collapsed|svg)$")
+MEDIA_TYPES = {"svg": "image/svg+xml", "collapsed": "text/plain; charset=utf-8"}
+
+
+def list_profiles(*, directory: Path | None = None, limit: int = MAX_LISTED_PROFILES) -> dict[str, Any]:
+    selected = directory or profile_directory()
+    profiles: dict[str, dict[str, Any]] = {}
+    try:
+        paths = sorted(selected.glob(f"{PROFILE_FILE_PREFIX}*"), reverse=True) if selected.is_dir() else []
+        for path in paths:
+            if not _PROFILE_NAME.match(path.name):
+                continue
+            entry = profiles.setdefault(path.stem, {"name": path.stem, "svg": None, "collapsed": None, "bytes": 0})
+            entry[path.suffix.lstrip(".")] = path.name
+            entry["bytes"] += path.stat().st_size
+    except OSError as exc:
+        return {"ok": False, "status": PROFILER.status(), "profiles": [], "error": mask_text(str(exc), os.environ)}
+    return {
+        "ok": True,
+        "status": PROFILER.status(),
+        "profiles": list(profiles.values())[:limit],
+        "max_seconds": MAX_PROFILE_SECONDS,
+        "error": None,
+    }
+
+
+def start_profile(seconds: str | float | None) -> dict[str, Any]:
+    try:
+        window = None if seconds in (None, "") else float(seconds)
+        started = PROFILER.start(window, reason="WebUI")
+    except ProfilerBusyError as exc:
+        return {"ok": False, "error": str(exc).capitalize()}
+    except (TypeError, ValueError):
+        return {"ok": False, "error": "Profile length must be a number of seconds"}
+    return {"ok": True, "seconds": started, "error": None}
+
+
+def profile_file(name: str, *, directory: Path | None = None) -> tuple[Path, str] | None:
+    """Resolve a profile file by exact name; anything else (including paths) is rejected."""
+
+    match = _PROFILE_NAME.match(name)
+    if match is None:
+        return None
+    path = (directory or profile_directory()) / name
+    if not path.is_file():
+        return None
+    return path, MEDIA_TYPES[match.group(1)]
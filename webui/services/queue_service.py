@@ -6,6 +6,9 @@ import json
 from pathlib import Path
 from typing import Any
 
+from trading.off_hours_queue import serialize_queued_signal
+from trading.queue_journal import journal_path_for, load_journal
+
 from .masking import mask_text
 
 DEFAULT_QUEUE_PATH = Path("runtime") / "off_hours_queue.json"
@@ -27,19 +30,30 @@ def _empty_summary(path: Path, *, ok: bool, error: str | None = None) -> dict[st
     }
 
 
-def summarize_queue(path: Path = DEFAULT_QUEUE_PATH) -> dict[str, Any]:
+def _load_queue_records(path: Path) -> list[Any] | None:
+    """Return the persisted queue records from the journal or JSON backend."""
+    journal = journal_path_for(path)
+    if journal.exists():
+        return [serialize_queued_signal(item) for item in load_journal(path)]
     if not path.exists():
-        return _empty_summary(path, ok=True)
+        return None
+    with path.open("rb") as queue_file:
+        raw = queue_file.read(MAX_QUEUE_BYTES + 1)
+    if len(raw) > MAX_QUEUE_BYTES:
+        raise ValueError(
+            f"Queue file exceeds the {MAX_QUEUE_BYTES}-byte display limit"
+        )
+    data = json.loads(raw.decode("utf-8"))
+    if not isinstance(data, list):
+        raise ValueError("Queue file must contain a list")
+    return data
+
+
+def summarize_queue(path: Path = DEFAULT_QUEUE_PATH) -> dict[str, Any]:
     try:
-        with path.open("rb") as queue_file:
-            raw = queue_file.read(MAX_QUEUE_BYTES + 1)
-        if len(raw) > MAX_QUEUE_BYTES:
-            raise ValueError(
-                f"Queue file exceeds the {MAX_QUEUE_BYTES}-byte display limit"
-            )
-        data = json.loads(raw.decode("utf-8"))
-        if not isinstance(data, list):
-            raise ValueError("Queue file must contain a list")
+        data = _load_queue_records(path)
+        if data is None:
+            return _empty_summary(path, ok=True)
         items: list[dict[str, Any]] = []
         for item in data[:MAX_DISPLAY_ITEMS]:
             signal = item.get("signal", {}) if isinstance(item, dict) else {}
@@ -0,0 +1,167 @@
+"""Read-only per-signal trace summaries and waterfall layouts."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from trading.tracing import TRACE_FILE_PREFIX
+
+from .masking import mask_text
+
+DEFAULT_TRACE_DIR = Path("runtime") / "traces"
+MAX_TRACE_FILE_BYTES = 4 * 1024 * 1024
+MAX_TRACE_FILES = 3
+MAX_LISTED_TRACES = 100
+ROW_HEIGHT = 22
+LABEL_WIDTH = 260
+CHART_WIDTH = 640
+
+
+def trace_directory() -> Path:
+    configured = os.environ.get("TRACE_DIR", "").strip()
+    return Path(configured) if configured else DEFAULT_TRACE_DIR
+
+
+def _recent_records(directory: Path) -> list[dict[str, Any]]:
+    """Return parsed trace records, newest first, from the bounded tail of recent files."""
+
+    files = sorted(directory.glob(f"{TRACE_FILE_PREFIX}*.jsonl"), reverse=True)[:MAX_TRACE_FILES]
+    records: list[dict[str, Any]] = []
+    for path in files:
+        with path.open("rb") as handle:
+            handle.seek(0, 2)
+            size = handle.tell()
+            handle.seek(max(0, size - MAX_TRACE_FILE_BYTES))
+            text = handle.read(MAX_TRACE_FILE_BYTES).decode("utf-8", errors="replace")
+        lines = text.splitlines()
+        if size > MAX_TRACE_FILE_BYTES and lines:
+            lines = lines[1:]  # the first line is probably cut off
+        for line in reversed(lines):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(record, dict) and isinstance(record.get("spans"), list) and record["spans"]:
+                records.append(record)
+    return records
+
+
+def _root_attribute(record: dict[str, Any], name: str) -> str:
+    attrs = record["spans"][0].get("attrs") or {}
+    value = attrs.get(name)
+    return "" if value is None else mask_text(str(value), os.environ)
+
+
+def list_traces(limit: int = MAX_LISTED_TRACES, *, directory: Path | None = None) -> dict[str, Any]:
+    selected = directory or trace_directory()
+    enabled = bool(os.environ.get("TRACE_DIR", "").strip())
+    try:
+        records = _recent_records(selected) if selected.is_dir() else []
+    except OSError as exc:
+        return {"ok": False, "enabled": enabled, "traces": [], "error": mask_text(str(exc), os.environ)}
+    traces = [
+        {
+            "trace_id": mask_text(str(record.get("trace_id", "")), os.environ),
+            "name": str(record.get("name", "")),
+            "ts": str(record.get("ts", "")),
+            "ms": record.get("ms"),
+            "spans": len(record["spans"]),
+            "ticker": _root_attribute(record, "ticker"),
+            "type": _root_attribute(record, "type"),
+            "status": _root_attribute(record, "status"),
+            "error": bool(any(span.get("error") for span in record["spans"])),
+        }
+        for record in records[:limit]
+    ]
+    return {"ok": True, "enabled": enabled, "traces": traces, "error": None}
+
+
+def _ordered_rows(spans: list[dict[str, Any]]) -> list[tuple[dict[str, Any], int]]:
+    """Depth-first order so each span is drawn below its parent."""
+
+    children: dict[Any, list[dict[str, Any]]] = {}
+    for span in spans:
+        children.setdefault(span.get("parent"), []).append(span)
+    for siblings in children.values():
+        siblings.sort(key=lambda item: float(item.get("start_ms") or 0.0))
+    ordered: list[tuple[dict[str, Any], int]] = []
+    known = {span.get("id") for span in spans}
+    stack = [(span, 0) for span in reversed(children.get(None, []))]
+    # Spans whose parent is missing (a truncated record) are drawn at the top level.
+    stack.extend(
+        (span, 0)
+        for parent, orphans in children.items()
+        if parent is not None and parent not in known
+        for span in reversed(orphans)
+    )
+    while stack:
+        span, depth = stack.pop()
+        ordered.append((span, depth))
+        stack.extend((child, depth + 1) for child in reversed(children.get(span.get("id"), [])))
+    return ordered
+
+
+def waterfall(record: dict[str, Any]) -> dict[str, Any]:
+    """Lay out one trace as SVG rows: bar offsets and widths in chart pixels."""
+
+    spans = record["spans"]
+    total_ms = max(
+        [float(record.get("ms") or 0.0)]
+        + [float(span.get("start_ms") or 0.0) + float(span.get("ms") or 0.0) for span in spans]
+    ) or 1.0
+    scale = CHART_WIDTH / total_ms
+    rows = []
+    for index, (span, depth) in enumerate(_ordered_rows(spans)):
+        start_ms = float(span.get("start_ms") or 0.0)
+        duration_ms = float(span.get("ms") or 0.0)
+        attrs = span.get("attrs") or {}
+        details = ", ".join(f"{key}={value}" for key, value in attrs.items())
+        rows.append(
+            {
+                "label": mask_text(str(span.get("name", "")), os.environ),
+                "indent": 8 + depth * 12,
+                "y": index * ROW_HEIGHT,
+                "x": LABEL_WIDTH + start_ms * scale,
+                "width": max(1.0, duration_ms * scale),
+                "start_ms": round(start_ms, 3),
+                "ms": round(duration_ms, 3),
+                "details": mask_text(details, os.environ),
+                "error": mask_text(str(span.get("error") or ""), os.environ),
+            }
+        )
+    return {
+        "rows": rows,
+        "total_ms": round(total_ms, 3),
+        "width": LABEL_WIDTH + CHART_WIDTH + 90,
+        "height": max(1, len(rows)) * ROW_HEIGHT,
+        "label_width": LABEL_WIDTH,
+        "row_height": ROW_HEIGHT,
+    }
+
+
+def get_trace(trace_id: str, *, directory: Path | None = None) -> dict[str, Any]:
+    selected = directory or trace_directory()
+    try:
+        records = _recent_records(selected) if selected.is_dir() else []
+    except OSError as exc:
+        return {"ok": False, "trace": None, "error": mask_text(str(exc), os.environ)}
+    for record in records:
+        if str(record.get("trace_id")) == trace_id:
+            return {
+                "ok": True,
+                "trace": {
+                    "trace_id": mask_text(str(record.get("trace_id", "")), os.environ),
+                    "name": str(record.get("name", "")),
+                    "ts": str(record.get("ts", "")),
+                    "ms": record.get("ms"),
+                    "ticker": _root_attribute(record, "ticker"),
+                    "type": _root_attribute(record, "type"),
+                    "status": _root_attribute(record, "status"),
+                },
+                "waterfall": waterfall(record),
+                "error": None,
+            }
+    return {"ok": False, "trace": None, "error": "Trace not found in recent trace files"}